@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+run_investigation 지연 벤치마크 (오프라인, 비전 모델 스텁)
+
+Bedrock 대신 고정 지연의 가짜 비전 모델/거부 분류기를 사용해
+기존 순차 방식(변형마다 변환 + PNG 인코딩 + 모델 호출을 하나씩)과
+변형 사전 계획 + 동시 검사 방식(staged / eager)을 비교합니다.
+
+- 가짜 비전 모델은 시나리오에서 지정한 변형 이미지에만 답변하고 나머지는 거부합니다
+- wall: 이미지 한 장의 조사 시간, calls: 비전 모델 호출 수
+- cold/warm: 변형 캐시가 비어 있을 때 / 같은 이미지를 다시 조사할 때
+
+Usage:
+    python benchmark_investigation.py
+    python benchmark_investigation.py --vision-latency 2.0 --classify-latency 0.5
+"""
+
+import os
+import time
+import argparse
+import threading
+import contextlib
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")  # utils creates a Bedrock client at import
+
+import utils
+from utils import (
+    IMAGE_VARIANTS,
+    encode_image,
+    load_and_prep_images,
+    plan_image_variants,
+    rotate_image,
+    run_investigation,
+    upscale_image_to_1568,
+)
+
+DENIAL_TEXT = "I apologize, but I do not feel comfortable analyzing this image."
+ACCEPT_TEXT = "The image shows a close-up of glossy red lips."
+
+
+class StubModels:
+    """가짜 비전 모델 + 거부 분류기 (지정한 변형에만 답변, 호출 수 기록)"""
+
+    def __init__(self, accepted_images, vision_latency, classify_latency):
+        self.accepted_images = accepted_images  # base64 PNG strings the model answers
+        self.vision_latency = vision_latency
+        self.classify_latency = classify_latency
+        self.vision_calls = 0
+        self.classify_calls = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt, image, tools=False):
+        # Like invoke_prompt_with_image: PIL images are PNG-encoded on every call
+        img_str = image if isinstance(image, str) else encode_image(image)
+        with self._lock:
+            self.vision_calls += 1
+        time.sleep(self.vision_latency)
+        return ACCEPT_TEXT if img_str in self.accepted_images else DENIAL_TEXT
+
+    def classify(self, response):
+        with self._lock:
+            self.classify_calls += 1
+        time.sleep(self.classify_latency)
+        return "DENIAL" if response == DENIAL_TEXT else "ACCEPTED"
+
+
+def run_legacy(prompt, prepped_images, models):
+    """기존 run_investigation의 순차 재시도 흐름 재현 (변형마다 변환/인코딩 후 모델 호출)"""
+    for image in prepped_images:
+        if models.classify(models.invoke(prompt, image['image'])) != "DENIAL":
+            continue
+        if models.classify(models.invoke(prompt, upscale_image_to_1568(image['image']))) != "DENIAL":
+            continue
+        for i in range(1, 4):
+            rotated_image = rotate_image(image['image'], i)
+            if models.classify(models.invoke(prompt, rotated_image)) != "DENIAL":
+                break
+            if models.classify(models.invoke(prompt, upscale_image_to_1568(rotated_image))) != "DENIAL":
+                break
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sequential vs planned/concurrent image variant investigation")
+    parser.add_argument("--vision-latency", type=float, default=1.0, help="Stub vision model latency (s)")
+    parser.add_argument("--classify-latency", type=float, default=0.3, help="Stub denial classifier latency (s)")
+    args = parser.parse_args()
+
+    prepped_images = load_and_prep_images(directory="sample_img")[:1]
+    labels = [label for label, _, _ in IMAGE_VARIANTS]
+    encoded = {label: load() for label, load in plan_image_variants(prepped_images[0]['image'])}
+    scenarios = [("original", {encoded["original"]}),
+                 ("rotated 90 degrees 2 times", {encoded["rotated 90 degrees 2 times"]}),
+                 (labels[-1], {encoded[labels[-1]]}),
+                 ("none (all denied)", set())]
+
+    prompt = "Describe the image in detail."
+    variants = [
+        # (name, run, clear variant cache first)
+        ("legacy (sequential)", lambda models: run_legacy(prompt, prepped_images, models), False),
+        ("staged (cold cache)", lambda models: run_investigation(
+            prompt, prepped_images, invoke=models.invoke, classify=models.classify), True),
+        ("staged (warm cache)", lambda models: run_investigation(
+            prompt, prepped_images, invoke=models.invoke, classify=models.classify), False),
+        ("eager (warm cache)", lambda models: run_investigation(
+            prompt, prepped_images, eager=True, invoke=models.invoke, classify=models.classify), False),
+    ]
+
+    for scenario_name, accepted_images in scenarios:
+        print(f"\n📊 accepted variant: {scenario_name}")
+        print(f"{'variant':<24}{'wall(s)':>9}{'vision calls':>14}{'classify calls':>16}")
+        print("-" * 63)
+        for variant_name, run, clear_cache in variants:
+            if clear_cache:
+                utils._variant_cache.clear()
+            models = StubModels(accepted_images, args.vision_latency, args.classify_latency)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(open(os.devnull, "w")):
+                run(models)
+            wall = time.perf_counter() - start
+            print(f"{variant_name:<24}{wall:>9.2f}{models.vision_calls:>14}{models.classify_calls:>16}")
+
+
+if __name__ == "__main__":
+    main()
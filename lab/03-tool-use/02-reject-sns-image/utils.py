@@ -1,4 +1,9 @@
 import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from PIL import Image
 import base64
 from io import BytesIO
@@ -68,6 +73,65 @@ def upscale_image_to_1568(image):
     # Resize the image
     return image.resize((new_width, new_height), Image.LANCZOS)
 
+# Candidate variants in the order the sequential investigation tried them: (label, rotations, upscaled)
+IMAGE_VARIANTS = [("original", 0, False), ("upscaled", 0, True)] + [
+    variant
+    for i in range(1, 4)
+    for variant in ((f"rotated 90 degrees {i} times", i, False), (f"upscaled, rotated 90 degrees {i} times", i, True))
+]
+VARIANT_CACHE_SIZE = 256
+
+_variant_cache = OrderedDict()  # (source content hash, label) -> base64 PNG
+_variant_cache_lock = threading.Lock()
+
+def image_content_hash(image):
+    # Hash of the decoded pixels, so the same picture hits the cache regardless of file name or PIL object
+    digest = hashlib.sha256(f"{image.mode}:{image.width}x{image.height}:".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+def encode_image(image):
+    # Convert PIL Image to base64 PNG string
+    buffered = BytesIO()
+    image.save(buffered, format="PNG")
+    return base64.b64encode(buffered.getvalue()).decode('utf-8')
+
+def plan_image_variants(image, variants=IMAGE_VARIANTS):
+    """
+    Pre-computes every candidate transform of an image once and returns [(label, load)], where load()
+    returns the variant as a base64 PNG. Rotations share the decoded source pixels and upscales reuse the
+    rotated pixels. Encoded bytes are cached by source content hash, and the (slow) PNG encoding is left to
+    load() so it runs inside the concurrent checks and only for variants that actually get checked.
+    """
+    source_hash = image_content_hash(image)
+    rotated = {0: image}
+    planned = []
+    for label, rotations, upscaled in variants:
+        key = (source_hash, label)
+        with _variant_cache_lock:
+            cached = _variant_cache.get(key)
+        if cached is not None:
+            planned.append((label, lambda cached=cached: cached))
+            continue
+        if rotations not in rotated:
+            rotated[rotations] = rotate_image(image, rotations)
+        pixels = upscale_image_to_1568(rotated[rotations]) if upscaled else rotated[rotations]
+        planned.append((label, lambda key=key, pixels=pixels: _encode_variant(key, pixels)))
+    return planned
+
+def _encode_variant(key, pixels):
+    with _variant_cache_lock:
+        cached = _variant_cache.get(key)
+        if cached is not None:
+            _variant_cache.move_to_end(key)
+            return cached
+    img_str = encode_image(pixels)
+    with _variant_cache_lock:
+        _variant_cache[key] = img_str
+        while len(_variant_cache) > VARIANT_CACHE_SIZE:
+            _variant_cache.popitem(last=False)
+    return img_str
+
 
 
 
@@ -92,14 +156,9 @@ def unpack_comments(response):
 
 def invoke_prompt_with_image(prompt, image, tools=False):
     client = AnthropicBedrock()
-    
-    # Convert PIL Image to bytes
-    buffered = BytesIO()
-    image.save(buffered, format="PNG")
-    img_bytes = buffered.getvalue()
 
-    # Encode bytes to base64 string
-    img_str = base64.b64encode(img_bytes).decode('utf-8')
+    # Accepts a PIL Image or an already encoded base64 PNG string (see plan_image_variants)
+    img_str = image if isinstance(image, str) else encode_image(image)
 
     messages = [
         {
@@ -152,48 +211,74 @@ def classify_denial(response):
     ai_msg = mistral_large.invoke([message])
     return ai_msg.content
 
-def run_investigation(prompt, prepped_images, tools = False):
+def check_image_variant(prompt, load, tools, decided, invoke, classify):
+    # Another variant already passed: skip the remaining encode/model calls
+    if decided.is_set():
+        return None, None
+    response = invoke(prompt, load(), tools=tools)
+    if decided.is_set():
+        return response, None
+    return response, classify(response)
+
+def run_investigation(prompt, prepped_images, tools = False, eager = False, max_workers = len(IMAGE_VARIANTS),
+                      invoke = None, classify = None):
+    """
+    Checks whether the model refuses each image, retrying with upscaled/rotated variants on denial.
+
+    The original image is tried first (eager=False); on denial the remaining variants are checked
+    concurrently and the first non-denial wins. eager=True checks all variants at once from the start
+    (lowest latency, more model calls). invoke/classify default to the Bedrock calls and can be replaced
+    with stubs (see benchmark_investigation.py).
+    """
+    invoke = invoke or invoke_prompt_with_image
+    classify = classify or classify_denial
+    results = []
+
     for image in prepped_images:
-        passed = False
-        
-        response = invoke_prompt_with_image(prompt, image['image'], tools = tools)
-        print("response: \n", response)
-        classification = classify_denial(response)
-        
-        if classification != "DENIAL":
-            passed = True
+        start = time.perf_counter()
+        stages = [IMAGE_VARIANTS] if eager else [IMAGE_VARIANTS[:1], IMAGE_VARIANTS[1:]]
+        passed, passed_variant, calls = False, None, 0
+
+        for stage_variants in stages:
+            stage = plan_image_variants(image['image'], stage_variants)
+            decided = threading.Event()
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            futures = {
+                executor.submit(check_image_variant, prompt, load, tools, decided, invoke, classify): label
+                for label, load in stage
+            }
+            calls += len(futures)
+            try:
+                for future in as_completed(futures):
+                    label = futures[future]
+                    try:
+                        response, classification = future.result()
+                    except Exception as e:
+                        print(f"Image: {image['filename']}, {label}, Error: {e}")
+                        continue
+                    if label == "original":
+                        print("response: \n", response)
+                    print(f"Image: {image['filename']}, {label}, Classification: {classification}")
 
-        
-        print(f"Image: {image['filename']}, Classification: {classification}")
-        
-        if classification == "DENIAL":
-            upscaled_image = upscale_image_to_1568(image['image'])
-            response = invoke_prompt_with_image(prompt, upscaled_image, tools = tools)
-            classification = classify_denial(response)
-            print(f"Image: {image['filename']}, upscaled, Classification: {classification}")
-            
-            if classification != "DENIAL":
-                passed = True
-            else:
-                for i in range(1, 4):
-                    rotated_image = rotate_image(image['image'], i)
-                    response = invoke_prompt_with_image(prompt, rotated_image, tools = tools)
-                    classification = classify_denial(response)
-                    print(f"Image: {image['filename']}, rotated 90 degrees {i} times, Classification: {classification}")
-                    
                     if classification != "DENIAL":
-                        passed = True
+                        passed, passed_variant = True, label
+                        decided.set()
                         break
-                    
-                    if not passed:
-                        upscaled_image = upscale_image_to_1568(rotated_image)
-                        response = invoke_prompt_with_image(prompt, upscaled_image, tools = tools)
-                        classification = classify_denial(response)
-                        print(f"Image: {image['filename']}, upscaled, rotated 90 degrees {i} times, Classification: {classification}")
-                        
-                        if classification != "DENIAL":
-                            passed = True
-                            break
-                    
-        print(f"Image: {image['filename']}, passed: {passed}\n")
-        print()    
\ No newline at end of file
+            finally:
+                # Don't wait for the remaining (now irrelevant) checks
+                executor.shutdown(wait=False, cancel_futures=True)
+            if passed:
+                break
+
+        elapsed = time.perf_counter() - start
+        print(f"Image: {image['filename']}, passed: {passed} ({passed_variant or '-'}, {elapsed:.2f}s)\n")
+        print()
+        results.append({
+            'filename': image['filename'],
+            'passed': passed,
+            'variant': passed_variant,
+            'calls': calls,
+            'elapsed': elapsed,
+        })
+
+    return results
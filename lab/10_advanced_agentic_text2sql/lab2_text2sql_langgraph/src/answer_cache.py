@@ -0,0 +1,184 @@
+import os
+import re
+import json
+import time
+import atexit
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+
+DEFAULT_CACHE_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "cache", "sql_answer_cache.npz"
+)
+DEFAULT_THRESHOLD = 0.92
+DEFAULT_MAX_ENTRIES = 2000
+EMBEDDING_MEMO_SIZE = 256
+DEFAULT_SAVE_EVERY = 20          # 변경 N 건마다 .npz 저장
+DEFAULT_SAVE_INTERVAL = 30.0     # 또는 마지막 저장 후 N 초가 지나면 저장
+
+# 질문 속 리터럴: 따옴표 문자열과 숫자 (연도, top-N, 금액 등)
+_LITERAL_PATTERN = re.compile(r"'[^']*'|\"[^\"]*\"|\d+(?:[.,]\d+)*")
+
+
+def extract_literals(question: str) -> List[str]:
+    """질문에 포함된 리터럴 목록 (정렬). 임베딩은 비슷해도 리터럴이 다르면 다른 SQL 이 필요합니다."""
+    return sorted(literal.replace(",", "") for literal in _LITERAL_PATTERN.findall(question or ""))
+
+
+class SemanticAnswerCache:
+    """
+    질문 임베딩 → 검증된 SQL 캐시 (로컬 vector store)
+    - 정규화된 질문 임베딩 행렬에 대한 cosine 유사도가 threshold 이상이면 hit
+    - 질문의 리터럴(숫자, 따옴표 문자열)이 같은 엔트리만 후보: "2009년 매출" 과 "2010년 매출" 은 별도 엔트리
+    - 스키마 버전 단위로 분리: 다른 스키마 버전에서 만든 SQL 은 재사용하지 않음
+    - 임베딩 행렬과 메타데이터를 .npz 파일 하나에 저장하여 프로세스 재시작 후에도 유지
+      (변경 save_every 건 또는 save_interval 초마다 저장, 종료 시 flush)
+    """
+
+    def __init__(self, emb, threshold: float = DEFAULT_THRESHOLD, cache_file: Optional[str] = None,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, save_every: int = DEFAULT_SAVE_EVERY,
+                 save_interval: float = DEFAULT_SAVE_INTERVAL):
+        self.emb = emb
+        self.threshold = threshold
+        self.cache_file = cache_file or os.getenv("TEXT2SQL_ANSWER_CACHE_FILE", DEFAULT_CACHE_FILE)
+        self.max_entries = max_entries
+        self.save_every = save_every
+        self.save_interval = save_interval
+        self.matrix: Optional[np.ndarray] = None
+        self.entries: List[dict] = []
+        self._embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+        self._unsaved = 0
+        self._last_save = time.monotonic()
+        self._load()
+        atexit.register(self.flush)
+
+    def _load(self) -> None:
+        if not os.path.exists(self.cache_file):
+            return
+        with np.load(self.cache_file, allow_pickle=False) as data:
+            self.matrix = data["matrix"].astype(np.float32)
+            self.entries = json.loads(str(data["entries"]))
+        for entry in self.entries:
+            entry.setdefault("literals", extract_literals(entry["question"]))
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_file)), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.cache_file)), suffix=".npz")
+        os.close(fd)
+        matrix = self.matrix if self.matrix is not None else np.zeros((0, 0), dtype=np.float32)
+        np.savez(tmp_path, matrix=matrix, entries=np.array(json.dumps(self.entries, ensure_ascii=False)))
+        os.replace(tmp_path, self.cache_file)
+        self._unsaved = 0
+        self._last_save = time.monotonic()
+
+    def _mark_changed(self) -> None:
+        """변경을 기록하고 save_every 건 / save_interval 초가 쌓였을 때만 파일을 다시 씁니다 (lock 보유 상태)."""
+        self._unsaved += 1
+        if self._unsaved >= self.save_every or time.monotonic() - self._last_save >= self.save_interval:
+            self._save()
+
+    def flush(self) -> None:
+        """저장되지 않은 변경을 파일에 씁니다."""
+        with self._lock:
+            if self._unsaved:
+                self._save()
+
+    def embed(self, question: str) -> np.ndarray:
+        """정규화된 질문 임베딩. 같은 질문은 lookup → add 사이에 다시 임베딩하지 않도록 메모합니다."""
+        with self._lock:
+            if question in self._embeddings:
+                self._embeddings.move_to_end(question)
+                return self._embeddings[question]
+        vector = np.asarray(self.emb.embed_query(question), dtype=np.float32)
+        vector /= np.linalg.norm(vector) + 1e-12
+        with self._lock:
+            self._embeddings[question] = vector
+            while len(self._embeddings) > EMBEDDING_MEMO_SIZE:
+                self._embeddings.popitem(last=False)
+        return vector
+
+    def _best_match(self, vector: np.ndarray, schema_version, literals: List[str]):
+        if self.matrix is None or not self.entries:
+            return None, 0.0
+        scores = self.matrix @ vector
+        mask = np.array([e["schema_version"] == schema_version and e["literals"] == literals for e in self.entries])
+        if not mask.any():
+            return None, 0.0
+        scores = np.where(mask, scores, -np.inf)
+        best = int(np.argmax(scores))
+        return best, float(scores[best])
+
+    def lookup(self, question: str, schema_version) -> Optional[dict]:
+        """
+        유사한 질문의 캐시 엔트리를 반환합니다 (없으면 None).
+        Returns:
+            dict: {"question", "query", "schema_version", "score", ...}
+        """
+        vector = self.embed(question)
+        literals = extract_literals(question)
+        with self._lock:
+            best, score = self._best_match(vector, schema_version, literals)
+            if best is None or score < self.threshold:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry = self.entries[best]
+            entry["hits"] = entry.get("hits", 0) + 1
+            return {**entry, "score": score}
+
+    def add(self, question: str, query: str, schema_version) -> None:
+        """실행에 성공한 SQL 을 저장합니다. 같은 스키마 버전의 거의 같은 질문이 있으면 덮어씁니다."""
+        vector = self.embed(question)
+        literals = extract_literals(question)
+        with self._lock:
+            best, score = self._best_match(vector, schema_version, literals)
+            entry = {"question": question, "query": query, "schema_version": schema_version,
+                     "literals": literals, "created_at": time.time(), "hits": 0}
+            if best is not None and score >= self.threshold:
+                self.entries[best] = entry
+                self.matrix[best] = vector
+            else:
+                self.entries.append(entry)
+                self.matrix = vector[None, :] if self.matrix is None or not len(self.matrix) else np.vstack([self.matrix, vector])
+                if len(self.entries) > self.max_entries:
+                    # 가장 오래된 엔트리부터 제거
+                    drop = len(self.entries) - self.max_entries
+                    self.entries = self.entries[drop:]
+                    self.matrix = self.matrix[drop:]
+            self.stores += 1
+            self._mark_changed()
+
+    def invalidate(self, question: str, schema_version) -> bool:
+        """question 에 매칭되는 엔트리를 제거합니다 (캐시된 SQL 실행이 실패한 경우)."""
+        vector = self.embed(question)
+        literals = extract_literals(question)
+        with self._lock:
+            best, score = self._best_match(vector, schema_version, literals)
+            if best is None or score < self.threshold:
+                return False
+            del self.entries[best]
+            self.matrix = np.delete(self.matrix, best, axis=0)
+            self.invalidations += 1
+            self._mark_changed()
+            return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "stores": self.stores,
+                "invalidations": self.invalidations,
+                "entries": len(self.entries),
+                "unsaved": self._unsaved,
+            }
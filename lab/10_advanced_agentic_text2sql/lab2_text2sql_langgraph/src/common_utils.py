@@ -6,6 +6,7 @@ import yaml
 import re
 from PIL import Image, UnidentifiedImageError
 from langchain.callbacks.base import BaseCallbackHandler
+from .schema_catalog import refresh_schema_catalog
 
 class ToolStreamHandler(BaseCallbackHandler):
     def __init__(self, container, initial_text=""):
@@ -303,5 +304,7 @@ def schema_desc_indexing(os_client, lang_config):
             if response["errors"]:
                 st.error("Failed")
             else:
+                # 재인덱싱한 스키마로 메모리 카탈로그도 갱신
+                refresh_schema_catalog(schema_data)
                 st.success("Success")
     
\ No newline at end of file
@@ -0,0 +1,51 @@
+import time
+import functools
+from typing import Callable, Dict
+
+
+def merge_timings(left: Dict[str, list], right: Dict[str, list]) -> Dict[str, list]:
+    """
+    GraphState.node_timings reducer. 병렬 노드가 같은 superstep 에서 함께 기록해도 충돌하지 않도록
+    노드 이름별 실행 기록 목록을 합칩니다. (노드가 state 전체를 다시 반환해도 중복 기록하지 않음)
+    """
+    merged = {k: list(v) for k, v in (left or {}).items()}
+    for name, records in (right or {}).items():
+        merged.setdefault(name, [])
+        merged[name].extend(r for r in records if r not in merged[name])
+    return merged
+
+
+def timed_node(name: str, fn: Callable) -> Callable:
+    """
+    노드 함수를 감싸 (시작 시각, 소요 시간) 을 node_timings 에 기록합니다.
+    시작 시각은 perf_counter 기준이므로 같은 실행 안에서 노드 간 겹침(병렬 여부)을 비교할 수 있습니다.
+    """
+    @functools.wraps(fn)
+    def wrapper(state):
+        start = time.perf_counter()
+        update = fn(state) or {}
+        elapsed = time.perf_counter() - start
+        record = {"start": round(start, 4), "elapsed_ms": round(elapsed * 1000, 1)}
+        update = dict(update)
+        update["node_timings"] = {name: [record]}
+        return update
+    return wrapper
+
+
+def summarize_timings(timings: Dict[str, list]) -> str:
+    """노드별 실행 기록을 시작 순서대로 정리 (wall time 과 노드 시간 합계 비교)"""
+    records = sorted(
+        ((name, r) for name, rs in (timings or {}).items() for r in rs),
+        key=lambda x: x[1]["start"]
+    )
+    if not records:
+        return "no timings"
+    t0 = records[0][1]["start"]
+    end = max(r["start"] + r["elapsed_ms"] / 1000 for _, r in records)
+    lines = [
+        f"{name:<28} +{(r['start'] - t0) * 1000:8.1f} ms  {r['elapsed_ms']:8.1f} ms"
+        for name, r in records
+    ]
+    total = sum(r["elapsed_ms"] for _, r in records)
+    lines.append(f"{'wall time':<28} {(end - t0) * 1000:9.1f} ms (sum of nodes {total:.1f} ms)")
+    return "\n".join(lines)
@@ -7,6 +7,7 @@ from langchain_aws import BedrockEmbeddings
 from langchain_community.utilities import SQLDatabase
 from sqlalchemy import create_engine
 from src.opensearch import OpenSearchHybridRetriever, OpenSearchClient
+from src.schema_catalog import get_schema_catalog, SchemaCatalogRetriever
 
     
 def converse_with_bedrock(sys_prompt, usr_prompt):
@@ -37,10 +38,16 @@ def init_search_resources(region_name, k=10):
     table_search_client = OpenSearchClient(emb=embedding_model, index_name='schema_descriptions', mapping_name='mappings-detailed-schema', vector="table_summary_v", text="table_summary", output=["table_name", "table_summary"])
 
     sql_retriever = OpenSearchHybridRetriever(sql_search_client, k=k)
-    table_retriever = OpenSearchHybridRetriever(table_search_client, k=k)
+    # 테이블 검색은 메모리 스키마 카탈로그 (스키마 파일이 없으면 OpenSearch)
+    table_retriever = SchemaCatalogRetriever(emb=embedding_model, k=k, fallback=OpenSearchHybridRetriever(table_search_client, k=k))
     return sql_search_client, table_search_client, sql_retriever, table_retriever
 
 def get_column_description(table_name):
+    # 정적 스키마는 메모리 카탈로그에서 조회 (없는 테이블만 OpenSearch 조회)
+    catalog = get_schema_catalog()
+    if catalog and table_name in catalog.tables:
+        return catalog.get_column_description(table_name)
+
     query = {
         "query": {
             "match": {
@@ -68,6 +75,11 @@ def create_prompt(sys_template, user_template, **kwargs):
 
 
 def search_by_keywords(keyword):
+    # 컬럼 설명 검색은 메모리 inverted index(BM25) 사용
+    catalog = get_schema_catalog()
+    if catalog:
+        return json.dumps(catalog.search_columns(keyword), ensure_ascii=False)
+
     query = {
         "size": 10, 
         "query": {
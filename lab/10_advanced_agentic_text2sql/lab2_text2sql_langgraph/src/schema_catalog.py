@@ -0,0 +1,226 @@
+import os
+import re
+import json
+import math
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+DEFAULT_SCHEMA_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..", "..", "lab1_text2sql_schema_preparation", "database", "chinook_detailed_schema.json"
+)
+
+_TOKEN_PATTERN = re.compile(r"[0-9A-Za-z_]+|[가-힣]+")
+_HANGUL_PATTERN = re.compile(r"[가-힣]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    영문/숫자는 소문자 단어 단위, 한글은 어절과 2-gram을 함께 사용합니다.
+    (OpenSearch nori 형태소 분석 없이도 '앨범의' ~ '앨범' 같은 조사 변형이 매칭되도록)
+    """
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(text or ""):
+        if _HANGUL_PATTERN.fullmatch(token):
+            tokens.append(token)
+            tokens.extend(token[i:i + 2] for i in range(len(token) - 1))
+        else:
+            tokens.append(token.lower())
+    return tokens
+
+
+class BM25Index:
+    """작은 문서 집합용 in-memory inverted index + BM25 스코어링"""
+
+    def __init__(self, documents: List[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_len = []
+        self.postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        for doc_id, text in enumerate(documents):
+            tokens = tokenize(text)
+            self.doc_len.append(len(tokens))
+            for token in tokens:
+                self.postings[token][doc_id] = self.postings[token].get(doc_id, 0) + 1
+        self.n_docs = len(documents)
+        self.avg_len = (sum(self.doc_len) / self.n_docs) if self.n_docs else 0.0
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[int, float]]:
+        scores: Dict[int, float] = defaultdict(float)
+        for token in set(tokenize(query)):
+            posting = self.postings.get(token)
+            if not posting:
+                continue
+            idf = math.log(1 + (self.n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc_id, tf in posting.items():
+                norm = self.k1 * (1 - self.b + self.b * self.doc_len[doc_id] / self.avg_len)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return sorted(scores.items(), key=lambda x: x[1], reverse=True)[:k]
+
+
+class SchemaCatalog:
+    """
+    상세 스키마(chinook_detailed_schema.json)를 한 번 로드해 메모리에서 조회합니다.
+    - 테이블별 컬럼 설명: O(1) dict 조회
+    - 컬럼 설명 / 테이블 설명 키워드 검색: BM25 inverted index
+    - 테이블 요약 임베딩(table_summary_v) 행렬: semantic table lookup
+    schema_desc_indexing 으로 OpenSearch 인덱스를 다시 만들면 refresh() 로 함께 갱신됩니다.
+    """
+
+    def __init__(self, schema_data: Optional[list] = None, schema_file: Optional[str] = None):
+        self.schema_file = schema_file or os.getenv("TEXT2SQL_SCHEMA_FILE", DEFAULT_SCHEMA_FILE)
+        self.version = 0
+        self._lock = threading.Lock()
+        self.refresh(schema_data)
+
+    def refresh(self, schema_data: Optional[list] = None) -> None:
+        if schema_data is None:
+            with open(self.schema_file, 'r', encoding='utf-8') as file:
+                schema_data = json.load(file)
+
+        tables = {}
+        for table in schema_data:
+            for table_name, table_info in table.items():
+                tables[table_name] = {
+                    "table_name": table_name,
+                    "table_desc": table_info.get("table_desc", ""),
+                    "columns": {col["col"]: col["col_desc"] for col in table_info.get("cols", [])},
+                    "table_summary": table_info.get("table_summary", ""),
+                    "table_summary_v": table_info.get("table_summary_v"),
+                }
+
+        table_names = list(tables)
+        column_docs = [(t, col, desc) for t in table_names for col, desc in tables[t]["columns"].items()]
+        column_index = BM25Index([desc for _, _, desc in column_docs])
+        table_index = BM25Index([
+            " ".join([t, tables[t]["table_desc"], tables[t]["table_summary"], " ".join(tables[t]["columns"])])
+            for t in table_names
+        ])
+
+        vectors = [tables[t]["table_summary_v"] for t in table_names]
+        if table_names and all(v is not None for v in vectors):
+            matrix = np.asarray(vectors, dtype=np.float32)
+            matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12
+        else:
+            matrix = None
+
+        # 검색 중인 호출이 반쯤 갱신된 상태를 보지 않도록 한 번에 교체
+        with self._lock:
+            self.tables = tables
+            self.table_names = table_names
+            self.column_docs = column_docs
+            self.column_index = column_index
+            self.table_index = table_index
+            self.embedding_matrix = matrix
+            self.version += 1
+
+    def get_column_description(self, table_name: str) -> Dict[str, str]:
+        table = self.tables.get(table_name)
+        return dict(table["columns"]) if table else {}
+
+    def search_columns(self, keyword: str, max_tables: int = 10, max_results: int = 5) -> List[dict]:
+        """
+        컬럼 설명 키워드 검색. OpenSearch nested 쿼리(inner_hits size 1)와 같이
+        테이블마다 가장 관련 있는 컬럼 하나씩, 최대 max_results 개를 반환합니다.
+        """
+        results, seen_tables = [], set()
+        for doc_id, _ in self.column_index.search(keyword, k=len(self.column_docs)):
+            table_name, col_name, col_desc = self.column_docs[doc_id]
+            if table_name in seen_tables:
+                continue
+            seen_tables.add(table_name)
+            results.append({"table_name": table_name, "column_name": col_name, "column_description": col_desc})
+            if len(results) >= max_results or len(seen_tables) >= max_tables:
+                break
+        return results
+
+    def search_tables_lexical(self, query: str, k: int = 5) -> List[Tuple[str, float]]:
+        return [(self.table_names[i], score) for i, score in self.table_index.search(query, k=k)]
+
+    def search_tables_semantic(self, query_vector, k: int = 5) -> List[Tuple[str, float]]:
+        if self.embedding_matrix is None:
+            return []
+        q = np.asarray(query_vector, dtype=np.float32)
+        q /= np.linalg.norm(q) + 1e-12
+        scores = self.embedding_matrix @ q
+        top = np.argsort(-scores)[:k]
+        return [(self.table_names[i], float(scores[i])) for i in top]
+
+    def search_tables(self, query: str, emb=None, k: int = 5, ensemble: Tuple[float, float] = (0.6, 0.4)) -> List[dict]:
+        """
+        OpenSearchHybridRetriever 와 같은 방식(최고점 정규화 후 가중합)으로 semantic + lexical 결과를 결합합니다.
+        emb 가 없거나 semantic 가중치가 0 이면 임베딩 호출 없이 lexical 결과만 사용합니다.
+        """
+        doc_lists = []
+        if emb is not None and ensemble[0] > 0:
+            doc_lists.append((self.search_tables_semantic(emb.embed_query(query), k=k), ensemble[0]))
+        doc_lists.append((self.search_tables_lexical(query, k=k), ensemble[1] if doc_lists else 1.0))
+
+        hybrid_scores: Dict[str, float] = defaultdict(float)
+        for docs, weight in doc_lists:
+            if not docs:
+                continue
+            max_score = max(score for _, score in docs) or 1.0
+            for table_name, score in docs:
+                hybrid_scores[table_name] += score / max_score * weight
+
+        ranked = sorted(hybrid_scores.items(), key=lambda x: x[1], reverse=True)[:k]
+        return [
+            {"table_name": t, "table_summary": self.tables[t]["table_summary"]}
+            for t, _ in ranked
+        ]
+
+
+class SchemaCatalogRetriever(BaseRetriever):
+    """
+    table_retriever 용 in-memory retriever. OpenSearchHybridRetriever 와 같은 invoke(query, ensemble=[semantic, lexical])
+    인터페이스와 문서 형식(page_content: {"table_name", "table_summary"} JSON, metadata.id: 테이블명)을 유지하고,
+    OpenSearch 대신 SchemaCatalog 의 임베딩 행렬 / BM25 index 로 검색합니다.
+    카탈로그(스키마 파일)가 없으면 fallback retriever(OpenSearch)를 사용합니다.
+    """
+    emb: Any = None
+    k: int = 5
+    fallback: Optional[BaseRetriever] = None
+
+    def _get_relevant_documents(self, query: str, *, ensemble: List, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        catalog = get_schema_catalog()
+        if catalog is None:
+            if self.fallback is None:
+                return []
+            return self.fallback.invoke(query, ensemble=ensemble)
+        return [
+            Document(page_content=json.dumps(table), metadata={"id": table["table_name"]})
+            for table in catalog.search_tables(query, emb=self.emb, k=self.k, ensemble=tuple(ensemble))
+        ]
+
+
+_catalog: Optional[SchemaCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_schema_catalog() -> Optional[SchemaCatalog]:
+    """프로세스당 한 번 로드. 스키마 파일이 없으면 None (호출 측에서 OpenSearch로 fallback)"""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            try:
+                _catalog = SchemaCatalog()
+            except FileNotFoundError:
+                return None
+        return _catalog
+
+
+def refresh_schema_catalog(schema_data: Optional[list] = None) -> SchemaCatalog:
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = SchemaCatalog(schema_data)
+        else:
+            _catalog.refresh(schema_data)
+        return _catalog
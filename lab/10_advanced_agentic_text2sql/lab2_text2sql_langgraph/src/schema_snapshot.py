@@ -0,0 +1,116 @@
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from sqlalchemy import MetaData, func, select, text
+from sqlalchemy.schema import CreateTable
+
+DEFAULT_SAMPLE_ROWS = 3         # SQLDatabase 기본값(sample_rows_in_table_info=3)과 동일
+MAX_SAMPLE_VALUE_CHARS = 100
+
+
+class SchemaSnapshot:
+    """
+    describe_schema 용 스키마 스냅샷. 시작 시 한 번 DB 를 introspect 하여 테이블별로 보관합니다.
+    - create_table_sql: SQLDatabase.get_table_info 와 같은 CREATE TABLE 문
+    - sample_data: "N rows from X table:" + 탭 구분 샘플 행 (SQLDatabase 와 같은 형식)
+    - foreign_keys / FK 그래프(양방향 인접 리스트), row_count(스냅샷 시점)
+    스키마 버전(SQLite PRAGMA schema_version)이 바뀌면 get() 호출 시 다시 만듭니다.
+    """
+
+    def __init__(self, engine, sample_rows: int = DEFAULT_SAMPLE_ROWS):
+        self.engine = engine
+        self.sample_rows = sample_rows
+        self.version = None
+        self.tables: Dict[str, dict] = {}
+        self.fk_graph: Dict[str, set] = {}
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def schema_version(self):
+        if self.engine.dialect.name != "sqlite":
+            return None
+        with self.engine.connect() as conn:
+            return conn.execute(text("PRAGMA schema_version")).scalar()
+
+    def refresh(self) -> None:
+        version = self.schema_version()
+        metadata = MetaData()
+        metadata.reflect(bind=self.engine)
+
+        tables, fk_graph = {}, defaultdict(set)
+        with self.engine.connect() as conn:
+            for name, table in metadata.tables.items():
+                create_table_sql = str(CreateTable(table).compile(self.engine)).strip()
+                rows = conn.execute(select(table).limit(self.sample_rows)).fetchall()
+                row_count = conn.execute(select(func.count()).select_from(table)).scalar()
+
+                columns_str = "\t".join(col.name for col in table.columns)
+                rows_str = "\n".join("\t".join(str(v)[:MAX_SAMPLE_VALUE_CHARS] for v in row) for row in rows)
+                sample_data = (
+                    f"{self.sample_rows} rows from {name} table:\n{columns_str}\n{rows_str}"
+                    if rows else "No sample data available"
+                )
+
+                foreign_keys = []
+                for fk in table.foreign_keys:
+                    ref_table = fk.column.table.name
+                    foreign_keys.append({
+                        "column": fk.parent.name,
+                        "ref_table": ref_table,
+                        "ref_column": fk.column.name,
+                    })
+                    fk_graph[name].add(ref_table)
+                    fk_graph[ref_table].add(name)
+
+                tables[name] = {
+                    "table": name,
+                    "create_table_sql": create_table_sql,
+                    "sample_data": sample_data,
+                    "foreign_keys": foreign_keys,
+                    "row_count": row_count,
+                }
+
+        # 조회 중인 호출이 반쯤 만들어진 상태를 보지 않도록 한 번에 교체
+        with self._lock:
+            self.tables = tables
+            self.fk_graph = dict(fk_graph)
+            self.version = version
+
+    def ensure_current(self) -> None:
+        """스키마 버전이 바뀐 경우에만 다시 introspect (PRAGMA 한 번)"""
+        version = self.schema_version()
+        if version is not None and version != self.version:
+            self.refresh()
+
+    def get(self, table_name: str) -> Optional[dict]:
+        return self.tables.get(table_name)
+
+    def describe(self, table_names: List[str]) -> List[dict]:
+        """요청한 테이블들의 스냅샷 (없는 테이블은 제외, 요청 순서 유지)"""
+        tables = self.tables
+        return [dict(tables[t]) for t in dict.fromkeys(table_names) if t in tables]
+
+    def related_tables(self, table_names: List[str]) -> List[str]:
+        """FK 로 직접 연결된 테이블 중 요청 목록에 없는 테이블"""
+        selected = set(table_names)
+        related = set()
+        for t in selected:
+            related |= self.fk_graph.get(t, set())
+        return sorted(related - selected)
+
+
+_snapshots: Dict[str, SchemaSnapshot] = {}
+_snapshots_lock = threading.Lock()
+
+
+def get_schema_snapshot(engine, sample_rows: int = DEFAULT_SAMPLE_ROWS) -> SchemaSnapshot:
+    """engine(DB URL) 당 하나의 스냅샷. 호출 시 스키마 버전을 확인하여 바뀐 경우에만 다시 만듭니다."""
+    key = str(engine.url)
+    with _snapshots_lock:
+        snapshot = _snapshots.get(key)
+        if snapshot is None:
+            snapshot = _snapshots[key] = SchemaSnapshot(engine, sample_rows)
+            return snapshot
+    snapshot.ensure_current()
+    return snapshot
@@ -0,0 +1,286 @@
+import os
+import re
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+DEFAULT_DB_URL = "sqlite:///database/Chinook.db"
+
+DEFAULT_MAX_ROWS = 500              # LLM 에 전달할 최대 행 수
+DEFAULT_MAX_BYTES = 64 * 1024       # LLM 에 전달할 최대 결과 크기 (repr 기준)
+DEFAULT_CHUNK_SIZE = 200            # cursor fetchmany 단위
+DEFAULT_COUNT_LIMIT = 1_000_000     # 상한 초과 후 전체 행 수를 세는 최대 행 수
+DEFAULT_CACHE_SIZE = 256
+
+EXPLAIN_STATEMENTS = {
+    'mysql': "EXPLAIN {query}",
+    'mariadb': "EXPLAIN {query}",
+    'sqlite': "EXPLAIN QUERY PLAN {query}",
+    'oracle': "EXPLAIN PLAN FOR\n{query}\n\nSELECT * FROM TABLE(DBMS_XPLAN.DISPLAY);",
+    'postgresql': "EXPLAIN ANALYZE {query}",
+    'postgres': "EXPLAIN ANALYZE {query}",
+    'presto': "EXPLAIN ANALYZE {query}",
+    'sqlserver': "SET STATISTICS PROFILE ON; {query}; SET STATISTICS PROFILE OFF;"
+}
+
+_COMMENT_PATTERN = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_TOKEN_PATTERN = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\s+|[^'\"\s]+")
+_READ_ONLY_PATTERN = re.compile(r"^\s*(select|with|explain|pragma|values)\b", re.IGNORECASE)
+
+
+def normalize_sql(query: str) -> str:
+    """
+    캐시 키용 SQL 정규화: 주석 제거, 따옴표 밖 공백 축약 및 소문자화, 끝의 세미콜론 제거
+    (문자열 리터럴/따옴표 식별자는 그대로 유지)
+    """
+    query = _COMMENT_PATTERN.sub(" ", query or "")
+    parts = []
+    for token in _TOKEN_PATTERN.findall(query):
+        if token.isspace():
+            parts.append(" ")
+        elif token[0] in ("'", '"'):
+            parts.append(token)
+        else:
+            parts.append(token.lower())
+    return "".join(parts).strip().rstrip(";").strip()
+
+
+@dataclass
+class QueryResult:
+    """
+    타입이 지정된 컬럼 단위 결과
+    - data: {컬럼명: [값, ...]} (최대 max_rows 행 / max_bytes)
+    - total_count: 전체 결과 행 수 (count_exact 가 False 이면 하한값)
+    """
+    columns: List[str]
+    types: List[str]
+    data: Dict[str, List[Any]]
+    row_count: int
+    total_count: int
+    count_exact: bool = True
+    truncated: bool = False
+    truncated_reason: str = ""
+    elapsed_ms: float = 0.0
+    cached: bool = False
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    def rows(self) -> List[tuple]:
+        return list(zip(*[self.data[c] for c in self.columns])) if self.columns else []
+
+    def copy(self, **changes) -> "QueryResult":
+        """컬럼 리스트/meta 까지 복사한 QueryResult (캐시에 저장된 객체와 공유하지 않음)"""
+        values = {**self.__dict__, **changes}
+        values.update(
+            columns=list(self.columns),
+            types=list(self.types),
+            data={column: list(column_values) for column, column_values in self.data.items()},
+            meta=dict(self.meta),
+        )
+        return QueryResult(**values)
+
+    def to_text(self) -> str:
+        """
+        SQLDatabase.run 과 같은 list[tuple] 문자열 + 잘린 경우 안내 문구 (LLM 프롬프트용)
+        결과가 없으면 SQLDatabase.run 과 같이 "" 를 반환합니다.
+        (첫 행부터 상한을 넘어 표시할 행이 없어도 잘린 경우에는 안내 문구를 반환합니다)
+        """
+        rows = self.rows()
+        if self.truncated:
+            total = f"{self.total_count}" if self.count_exact else f"{self.total_count}+"
+            notice = f"(결과 {total}행 중 {self.row_count}행만 표시, 제한: {self.truncated_reason})"
+            return f"{rows}\n{notice}" if rows else notice
+        return str(rows) if rows else ""
+
+    def to_dict(self) -> dict:
+        return {
+            "columns": self.columns,
+            "types": self.types,
+            "data": self.data,
+            "row_count": self.row_count,
+            "total_count": self.total_count,
+            "count_exact": self.count_exact,
+            "truncated": self.truncated,
+            "truncated_reason": self.truncated_reason,
+            "elapsed_ms": round(self.elapsed_ms, 2),
+            "cached": self.cached,
+        }
+
+
+class SQLExecutor:
+    """
+    text2sql 그래프의 validate_query / execute_query 용 SQL 실행 서비스
+    - 프로세스 당 하나의 pooled SQLAlchemy engine
+    - cursor 결과를 chunk 단위로 읽으며 행/바이트 상한 적용 (나머지는 세기만 함)
+    - (정규화된 SQL, DB 버전) 키의 LRU 결과 캐시. SQLite 는 DB 파일과 -wal 파일의 mtime/size 로 버전을 판단하므로
+      데이터가 바뀌면 자동으로 캐시를 우회합니다. 읽기 전용 문장만 캐시합니다.
+    """
+
+    def __init__(
+        self,
+        db_url: str = DEFAULT_DB_URL,
+        max_rows: int = DEFAULT_MAX_ROWS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        count_limit: int = DEFAULT_COUNT_LIMIT,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        engine=None,
+    ):
+        self.db_url = db_url
+        self.engine = engine or create_engine(db_url, pool_pre_ping=True)
+        self.dialect = self.engine.dialect.name
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.count_limit = count_limit
+        self.cache_size = cache_size
+        url = make_url(db_url)
+        self._db_file = url.database if url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:") else None
+        self._cache: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def data_version(self):
+        """
+        캐시 무효화용 DB 버전. SQLite 는 DB 파일과 -wal 파일의 (mtime_ns, size), 그 외 DB 는 None (캐시 사용 안 함)
+        (WAL 모드에서는 commit 이 checkpoint 전까지 -wal 파일에만 기록되므로 함께 확인합니다)
+        """
+        if self._db_file is None:
+            return None
+        try:
+            stat = os.stat(self._db_file)
+        except OSError:
+            return None
+        try:
+            wal = os.stat(self._db_file + "-wal")
+            wal_version = (wal.st_mtime_ns, wal.st_size)
+        except OSError:
+            wal_version = None
+        return (stat.st_mtime_ns, stat.st_size, wal_version)
+
+    def _cache_get(self, key):
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            self.misses += 1
+            return None
+
+    def _cache_put(self, key, value):
+        with self._lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _cache_key(self, kind: str, query: str, **limits):
+        version = self.data_version()
+        if version is None or not _READ_ONLY_PATTERN.match(query or ""):
+            return None
+        return (kind, normalize_sql(query), version, tuple(sorted(limits.items())))
+
+    def run(self, query: str, max_rows: Optional[int] = None, max_bytes: Optional[int] = None) -> QueryResult:
+        """
+        쿼리를 실행하고 상한이 적용된 QueryResult 를 반환합니다. 실행 오류는 그대로 raise 합니다.
+        """
+        max_rows = self.max_rows if max_rows is None else max_rows
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        key = self._cache_key("run", query, max_rows=max_rows, max_bytes=max_bytes)
+        if key is not None:
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached.copy(cached=True, elapsed_ms=0.0)
+
+        start = time.perf_counter()
+        result = self._execute(query, max_rows, max_bytes)
+        result.elapsed_ms = (time.perf_counter() - start) * 1000
+        if key is not None:
+            self._cache_put(key, result.copy())
+        return result
+
+    def _execute(self, query: str, max_rows: int, max_bytes: int) -> QueryResult:
+        with self.engine.connect() as conn:
+            cursor = conn.execution_options(stream_results=True).execute(text(query))
+            if not cursor.returns_rows:
+                affected = cursor.rowcount
+                conn.commit()
+                return QueryResult([], [], {}, 0, max(affected, 0), meta={"rowcount": affected})
+
+            columns = list(cursor.keys())
+            data = {c: [] for c in columns}
+            types = [None] * len(columns)
+            row_count, total, size = 0, 0, 0
+            truncated_reason = ""
+            count_exact = True
+
+            while True:
+                chunk = cursor.fetchmany(self.chunk_size)
+                if not chunk:
+                    break
+                for row in chunk:
+                    total += 1
+                    if truncated_reason:
+                        continue
+                    row_size = len(repr(tuple(row)))
+                    if row_count >= max_rows:
+                        truncated_reason = f"max_rows={max_rows}"
+                        continue
+                    if size + row_size > max_bytes:
+                        truncated_reason = f"max_bytes={max_bytes}"
+                        continue
+                    for i, value in enumerate(row):
+                        data[columns[i]].append(value)
+                        if types[i] is None and value is not None:
+                            types[i] = type(value).__name__
+                    row_count += 1
+                    size += row_size
+                if truncated_reason and total >= self.count_limit:
+                    # 남은 결과는 세지 않고 하한값만 기록
+                    count_exact = False
+                    break
+            cursor.close()
+
+        return QueryResult(
+            columns=columns,
+            types=[t or "NoneType" for t in types],
+            data=data,
+            row_count=row_count,
+            total_count=total,
+            count_exact=count_exact,
+            truncated=bool(truncated_reason),
+            truncated_reason=truncated_reason,
+            meta={"bytes": size},
+        )
+
+    def explain(self, query: str, dialect: Optional[str] = None) -> str:
+        """
+        쿼리 플랜 문자열 (validate_query 용). 같은 쿼리/DB 버전이면 캐시된 플랜을 반환합니다.
+        지원하지 않는 dialect 는 " " 를 반환합니다.
+        """
+        template = EXPLAIN_STATEMENTS.get((dialect or self.dialect).lower())
+        if template is None:
+            return " "
+        explain_query = template.format(query=query)
+        key = self._cache_key("explain", explain_query)
+        if key is not None:
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
+        plan = self._execute(explain_query, max_rows=self.max_rows, max_bytes=self.max_bytes).to_text()
+        if key is not None:
+            self._cache_put(key, plan)
+        return plan
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._cache)}
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
@@ -0,0 +1,41 @@
+"""
+Tests for the SQL executor result caps.
+Run with: pytest test_sql_executor.py -v
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from sql_executor import SQLExecutor
+
+
+@pytest.fixture
+def executor():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE Track (TrackId INTEGER, Name TEXT)"))
+        conn.execute(text("INSERT INTO Track VALUES (1, 'For Those About To Rock'), (2, 'Balls to the Wall'), (3, 'Fast As a Shark')"))
+    return SQLExecutor(db_url="sqlite://", engine=engine)
+
+
+class TestToText:
+    """Test the LLM-facing result text."""
+
+    def test_empty_result(self, executor):
+        assert executor.run("SELECT * FROM Track WHERE TrackId = 0").to_text() == ""
+
+    def test_row_cap(self, executor):
+        result = executor.run("SELECT * FROM Track", max_rows=2)
+        assert result.truncated
+        assert result.to_text() == (
+            "[(1, 'For Those About To Rock'), (2, 'Balls to the Wall')]\n"
+            "(결과 3행 중 2행만 표시, 제한: max_rows=2)"
+        )
+
+    def test_first_row_over_byte_cap(self, executor):
+        result = executor.run("SELECT * FROM Track", max_bytes=10)
+        assert result.truncated
+        assert result.row_count == 0
+        assert result.total_count == 3
+        assert result.to_text() == "(결과 3행 중 0행만 표시, 제한: max_bytes=10)"
@@ -8,6 +8,7 @@ from src.tools.coder_tools import coder_tool_config, process_coder_tool
 # from src.tools.browser_tools import browser_tool_config, process_browser_tool
 from src.tools.reporter_tools import reporter_tool_config, process_reporter_tool
 from src.tools.validator_tools import validator_tool_config, process_validator_tool
+from src.tools.python_repl import repl_session
 
 from src.agents.llm import llm_call_langfuse
 
@@ -61,6 +62,12 @@ class create_react_agent():
         
     def invoke(self, **kwargs):
 
+        # 작업마다 새 python_repl 세션 (다른 에이전트/이전 작업과 변수를 공유하지 않음)
+        with repl_session(self.agent_name):
+            return self._invoke(**kwargs)
+
+    def _invoke(self, **kwargs):
+
         state = kwargs.get("state", None)
         prompt_cache, cache_type = AGENT_PROMPT_CACHE_MAP[self.agent_name]
         system_prompts, messages = apply_prompt_template(self.agent_name, state, prompt_cache=prompt_cache, cache_type=cache_type)    
@@ -166,6 +173,12 @@ class create_react_agent_langfuse():
         
     def invoke(self, **kwargs):
 
+        # 작업마다 새 python_repl 세션 (다른 에이전트/이전 작업과 변수를 공유하지 않음)
+        with repl_session(self.agent_name):
+            return self._invoke(**kwargs)
+
+    def _invoke(self, **kwargs):
+
         state = kwargs.get("state", None)
         prompt_cache, cache_type = AGENT_PROMPT_CACHE_MAP[self.agent_name]
         system_prompts, messages = apply_prompt_template(self.agent_name, state, prompt_cache=prompt_cache, cache_type=cache_type)    
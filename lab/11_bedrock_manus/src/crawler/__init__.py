@@ -1,7 +1,10 @@
 from .article import Article
 from .crawler import Crawler
+from .crawl_service import CrawlService, get_crawl_service
 
 __all__ = [
     "Article",
     "Crawler",
+    "CrawlService",
+    "get_crawl_service",
 ]
@@ -6,12 +6,16 @@ from markdownify import markdownify as md
 
 class Article:
     url: str
+    # CrawlService가 캐시/프로세스 풀에서 미리 변환한 markdown (title 포함)
+    markdown: str = None
 
     def __init__(self, title: str, html_content: str):
         self.title = title
         self.html_content = html_content
 
     def to_markdown(self, including_title: bool = True) -> str:
+        if self.markdown is not None and including_title:
+            return self.markdown
         markdown = ""
         if including_title:
             markdown += f"# {self.title}\n\n"
@@ -0,0 +1,57 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """
+    URL 등을 키로 하는 단순 TTL 디스크 캐시.
+    엔트리 하나를 JSON 파일 하나로 저장하며, 파일명은 (namespace, key)의 sha256 입니다.
+    여러 프로세스/태스크가 같은 디렉토리를 공유해도 되도록 임시 파일에 쓴 뒤 rename 합니다.
+    """
+
+    def __init__(self, cache_dir: str, ttl: float):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, namespace: str, key: str) -> str:
+        digest = hashlib.sha256(f"{namespace}:{key}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, namespace, digest[:2], f"{digest}.json")
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        path = self._path(namespace, key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if time.time() - entry["created_at"] > self.ttl:
+            self.delete(namespace, key)
+            return None
+        return entry["value"]
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        path = self._path(namespace, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {"key": key, "created_at": time.time(), "value": value}
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write cache entry for {key}: {e}")
+            if os.path.exists(tmp_path): os.remove(tmp_path)
+
+    def delete(self, namespace: str, key: str) -> None:
+        try:
+            os.remove(self._path(namespace, key))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,164 @@
+import os
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlparse
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
+
+from .article import Article
+from .cache import DiskCache
+from .jina_client import JINA_READER_URL, build_jina_headers
+from .readability_extractor import ReadabilityExtractor
+
+logger = logging.getLogger(__name__)
+
+
+def _extract(html: str) -> Dict[str, str]:
+    # Process pool에서 실행되는 CPU-heavy 단계 (readability 추출 + markdown 변환)
+    article = ReadabilityExtractor().extract_article(html)
+    return {
+        "title": article.title,
+        "html_content": article.html_content,
+        "markdown": article.to_markdown(),
+    }
+
+
+class CrawlService:
+    """
+    Async crawl service.
+
+    - 하나의 httpx.AsyncClient(connection pool)를 모든 요청이 공유
+    - host 별 동시 요청 수 제한 (per_host_limit), 전체 동시 요청 수 제한 (max_connections)
+    - 가져온 HTML과 추출된 article/markdown을 URL 키의 TTL 디스크 캐시에 저장
+    - readability 추출은 ProcessPoolExecutor로 오프로드
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        cache_ttl: Optional[float] = None,
+        max_connections: int = 20,
+        per_host_limit: int = 4,
+        timeout: float = 30.0,
+        max_workers: Optional[int] = None,
+    ):
+        self.cache = DiskCache(
+            cache_dir or os.getenv("CRAWLER_CACHE_DIR", os.path.join(".cache", "crawler")),
+            cache_ttl if cache_ttl is not None else float(os.getenv("CRAWLER_CACHE_TTL", "86400")),
+        )
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.max_workers = max_workers
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_semaphores[host]
+
+    async def fetch_html(self, url: str) -> str:
+        html = self.cache.get("html", url)
+        if html is not None:
+            logger.debug(f"HTML cache hit: {url}")
+            return html
+
+        # Jina reader를 거치므로 실제 연결은 r.jina.ai로 가지만,
+        # 제한은 대상 사이트 기준으로 걸어 한 사이트에 요청이 몰리지 않게 합니다.
+        async with self._host_semaphore(url):
+            response = await self._get_client().post(
+                JINA_READER_URL,
+                headers=build_jina_headers("html"),
+                json={"url": url},
+            )
+        response.raise_for_status()
+        html = response.text
+        self.cache.set("html", url, html)
+        return html
+
+    async def crawl(self, url: str) -> Article:
+        extracted = self.cache.get("article", url)
+        if extracted is None:
+            html = await self.fetch_html(url)
+            loop = asyncio.get_running_loop()
+            extracted = await loop.run_in_executor(self._get_executor(), _extract, html)
+            self.cache.set("article", url, extracted)
+        else:
+            logger.debug(f"Article cache hit: {url}")
+
+        article = Article(title=extracted["title"], html_content=extracted["html_content"])
+        article.markdown = extracted["markdown"]
+        article.url = url
+        return article
+
+    async def crawl_many(self, urls: List[str]) -> List[Union[Article, Exception]]:
+        """
+        여러 URL을 동시에 crawl 합니다. 결과는 입력 순서를 따르며,
+        실패한 URL은 해당 위치에 예외 객체가 들어갑니다.
+        """
+        return await asyncio.gather(*(self.crawl(url) for url in urls), return_exceptions=True)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+class _BackgroundLoop:
+    """동기 코드(tool handler)에서 CrawlService를 쓰기 위한 전용 이벤트 루프 스레드"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="crawl-service-loop", daemon=True)
+        self.thread.start()
+
+    def run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+
+_service: Optional[CrawlService] = None
+_loop: Optional[_BackgroundLoop] = None
+_lock = threading.Lock()
+
+
+def get_crawl_service() -> CrawlService:
+    global _service
+    with _lock:
+        if _service is None:
+            _service = CrawlService()
+        return _service
+
+
+def run_in_background_loop(coro):
+    # 공유 CrawlService(httpx client, semaphore)는 하나의 루프에 묶여 있으므로 항상 같은 루프에서 실행합니다.
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = _BackgroundLoop()
+    return _loop.run(coro)
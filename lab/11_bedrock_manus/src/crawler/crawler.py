@@ -1,8 +1,8 @@
 import sys
+from typing import List, Union
 
 from .article import Article
-from .jina_client import JinaClient
-from .readability_extractor import ReadabilityExtractor
+from .crawl_service import get_crawl_service, run_in_background_loop
 
 
 class Crawler:
@@ -17,12 +17,15 @@ class Crawler:
         #
         # Instead of using Jina's own markdown converter, we'll use
         # our own solution to get better readability results.
-        jina_client = JinaClient()
-        html = jina_client.crawl(url, return_format="html")
-        extractor = ReadabilityExtractor()
-        article = extractor.extract_article(html)
-        article.url = url
-        return article
+        #
+        # Fetching, caching and extraction are delegated to the shared
+        # CrawlService (pooled HTTP client, TTL disk cache, process pool).
+        return run_in_background_loop(get_crawl_service().crawl(url))
+
+    def crawl_many(self, urls: List[str]) -> List[Union[Article, Exception]]:
+        # Crawl several urls concurrently. Failed urls yield the exception
+        # at their position instead of raising.
+        return run_in_background_loop(get_crawl_service().crawl_many(urls))
 
 
 if __name__ == "__main__":
@@ -5,19 +5,32 @@ import requests
 
 logger = logging.getLogger(__name__)
 
+JINA_READER_URL = "https://r.jina.ai/"
+
+
+def build_jina_headers(return_format: str = "html") -> dict:
+    headers = {
+        "Content-Type": "application/json",
+        "X-Return-Format": return_format,
+    }
+    if os.getenv("JINA_API_KEY"):
+        headers["Authorization"] = f"Bearer {os.getenv('JINA_API_KEY')}"
+    else:
+        logger.warning(
+            "Jina API key is not set. Provide your own key to access a higher rate limit. See https://jina.ai/reader for more information."
+        )
+    return headers
+
 
 class JinaClient:
+    # 모든 인스턴스가 하나의 Session(connection pool)을 공유합니다.
+    _session = requests.Session()
+
+    def __init__(self, timeout: float = 30.0):
+        self.timeout = timeout
+
     def crawl(self, url: str, return_format: str = "html") -> str:
-        headers = {
-            "Content-Type": "application/json",
-            "X-Return-Format": return_format,
-        }
-        if os.getenv("JINA_API_KEY"):
-            headers["Authorization"] = f"Bearer {os.getenv('JINA_API_KEY')}"
-        else:
-            logger.warning(
-                "Jina API key is not set. Provide your own key to access a higher rate limit. See https://jina.ai/reader for more information."
-            )
+        headers = build_jina_headers(return_format)
         data = {"url": url}
-        response = requests.post("https://r.jina.ai/", headers=headers, json=data)
+        response = self._session.post(JINA_READER_URL, headers=headers, json=data, timeout=self.timeout)
         return response.text
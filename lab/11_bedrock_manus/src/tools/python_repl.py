@@ -33,11 +33,144 @@ class Colors:
 import subprocess
 import sys
 import os
+import json
+import uuid
+import select
+import atexit
+import threading
+import itertools
+import contextlib
+import contextvars
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "repl_worker.py")
+
+class REPLWorker:
+    """
+    repl_worker.py를 실행하는 장기 실행 워커 프로세스 하나를 관리합니다.
+    stdin/stdout 파이프의 JSON lines 프로토콜로 통신하며, 세션별 네임스페이스는 워커 안에 유지됩니다.
+    """
+
+    def __init__(self, python_executable, env, memory_limit_mb, startup_timeout):
+        self.python_executable = python_executable
+        self.env = env
+        self.memory_limit_mb = memory_limit_mb
+        self.startup_timeout = startup_timeout
+        self.lock = threading.Lock()
+        self.sessions = set()
+        self.process = None
+        self._buffer = b""
+        self._ids = itertools.count()
+        self.start()
+
+    def _limit_resources(self):
+        # 자식 프로세스에서 exec 직전에 호출되어 워커의 메모리 상한을 설정
+        if resource is not None and self.memory_limit_mb > 0:
+            limit = self.memory_limit_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    def start(self):
+        self.process = subprocess.Popen(
+            [self.python_executable, "-u", WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env=self.env,
+            preexec_fn=self._limit_resources if resource is not None else None
+        )
+        self._buffer = b""
+        self.sessions = set()
+        message = self._read_message(time.monotonic() + self.startup_timeout)
+        if message is None or message.get("type") != "ready":
+            self.kill()
+            raise RuntimeError("Python REPL worker failed to start")
+        logger.debug(f"{Colors.BLUE}REPL worker {message['pid']} ready (preloaded: {message['preloaded']}){Colors.END}")
+
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def kill(self):
+        if self.process is None: return
+        try:
+            self.process.kill()
+            self.process.wait(timeout=5)
+        except Exception:
+            pass
+        for stream in (self.process.stdin, self.process.stdout):
+            try: stream.close()
+            except Exception: pass
+        self.process = None
+
+    def restart(self):
+        self.kill()
+        self.start()
+
+    def _read_message(self, deadline):
+        """다음 JSON 메시지 하나를 읽습니다. 시간 초과면 TimeoutError, 워커가 죽었으면 None"""
+
+        fd = self.process.stdout.fileno()
+        while b"\n" not in self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0: raise TimeoutError
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready: continue
+            chunk = os.read(fd, 65536)
+            if not chunk: return None
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return json.loads(line)
+
+    def request(self, payload, timeout):
+        """
+        요청 하나를 보내고 완료될 때까지 stdout/stderr 청크를 수집합니다.
+        Returns: (ok, stdout, stderr, error)
+        """
+
+        payload = dict(payload, id=next(self._ids))
+        self.process.stdin.write((json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8"))
+        self.process.stdin.flush()
+
+        deadline = time.monotonic() + timeout
+        stdout, stderr = [], []
+        while True:
+            message = self._read_message(deadline)
+            if message is None:
+                try: returncode = self.process.wait(timeout=5)
+                except subprocess.TimeoutExpired: returncode = None
+                raise ChildProcessError(f"worker exited with code {returncode}")
+            if message.get("id") != payload["id"]: continue
+            if message["type"] == "stdout":
+                stdout.append(message["data"])
+            elif message["type"] == "stderr":
+                stderr.append(message["data"])
+            elif message["type"] == "done":
+                return message["ok"], "".join(stdout), "".join(stderr), message["error"]
 
 class PythonREPL:
+    """
+    Pre-spawn 된 워커 프로세스 풀에서 코드를 실행합니다.
+    - 워커는 pandas/matplotlib 등을 미리 import 해 두어 매 호출마다 인터프리터 기동/임포트 비용을 내지 않습니다.
+    - session_id 별로 네임스페이스가 유지되어 이전 스니펫의 변수를 이어서 사용할 수 있습니다.
+    - 실행마다 wall-clock/CPU 시간 제한, 워커별 메모리 제한이 적용되고
+      제한 초과나 크래시가 발생하면 워커를 교체합니다 (해당 워커의 세션 상태는 초기화됨).
+    """
+
     def __init__(self):
         # 콘다 환경 Python 경로 설정
         self.python_executable = os.getenv('PYTHON_EXECUTABLE', sys.executable)
+        self.pool_size = int(os.getenv('REPL_POOL_SIZE', '2'))
+        self.timeout = float(os.getenv('REPL_TIMEOUT', '600'))
+        self.cpu_limit = int(os.getenv('REPL_CPU_LIMIT', '0'))  # 0: 제한 없음
+        self.memory_limit_mb = int(os.getenv('REPL_MEMORY_LIMIT_MB', '4096'))  # 0: 제한 없음
+        self.startup_timeout = float(os.getenv('REPL_STARTUP_TIMEOUT', '120'))
+        self.preload_modules = os.getenv('REPL_PRELOAD_MODULES', 'numpy,pandas,matplotlib,matplotlib.pyplot')
+
+        self.workers = []
+        self.session_map = {}
+        self.pool_lock = threading.Lock()
         
         # 콘다 환경 정보 로깅
         conda_env = os.getenv('CONDA_ENV_NAME', 'None')
@@ -46,50 +179,128 @@ class PythonREPL:
         # logger.info(f"{Colors.BLUE}  - Environment Name: {conda_env}{Colors.END}")
         # logger.info(f"{Colors.BLUE}  - Python Executable: {self.python_executable}{Colors.END}")
         # logger.info(f"{Colors.BLUE}  - Conda Prefix: {conda_prefix}{Colors.END}")
-        
-    def run(self, command):
+
+    def _worker_env(self):
+        # 콘다 환경 설정
+        env = os.environ.copy()
+        conda_prefix = os.getenv('CONDA_PREFIX')
+        if conda_prefix:
+            env['CONDA_PREFIX'] = conda_prefix
+            env['PATH'] = f"{conda_prefix}/bin:{env.get('PATH', '')}"
+        env['REPL_PRELOAD_MODULES'] = self.preload_modules
+        env.setdefault('MPLBACKEND', 'Agg')
+        env['PYTHONUNBUFFERED'] = '1'
+        return env
+
+    def _start_pool(self):
+        if self.workers: return
+        env = self._worker_env()
+        self.workers = [
+            REPLWorker(self.python_executable, env, self.memory_limit_mb, self.startup_timeout)
+            for _ in range(self.pool_size)
+        ]
+        atexit.register(self.close)
+
+    def _get_worker(self, session_id):
+        # 세션은 최초 실행 시 가장 적게 배정된 워커에 고정됩니다 (네임스페이스가 워커 안에 있으므로)
+        with self.pool_lock:
+            self._start_pool()
+            if session_id not in self.session_map:
+                worker = min(self.workers, key=lambda w: len(w.sessions))
+                self.session_map[session_id] = worker
+            worker = self.session_map[session_id]
+            worker.sessions.add(session_id)
+            return worker
+
+    def _recover(self, worker, reason):
+        # 워커를 교체하고, 해당 워커에 고정되어 있던 세션 매핑을 정리
+        logger.info(f"{Colors.YELLOW}Restarting Python REPL worker: {reason}{Colors.END}")
+        with self.pool_lock:
+            for session_id in list(worker.sessions):
+                self.session_map.pop(session_id, None)
+        worker.restart()
+
+    def run(self, command, session_id="default", timeout=None):
+        """
+        Args:
+            command: 실행할 파이썬 코드
+            session_id: 네임스페이스를 공유할 세션 식별자
+            timeout: wall-clock 제한 (초), 기본값은 REPL_TIMEOUT
+        """
         try:
-            # 콘다 환경 설정
-            env = os.environ.copy()
-            conda_prefix = os.getenv('CONDA_PREFIX')
-            if conda_prefix:
-                env['CONDA_PREFIX'] = conda_prefix
-                env['PATH'] = f"{conda_prefix}/bin:{env.get('PATH', '')}"
-                # logger.info(f"{Colors.YELLOW}Executing Python code in Conda environment: {os.getenv('CONDA_ENV_NAME', 'default')}{Colors.END}")
-            else:
-                # logger.info(f"{Colors.YELLOW}Executing Python code in system environment{Colors.END}")
-                pass
-            
-            # logger.info(f"{Colors.YELLOW}Using Python executable: {self.python_executable}{Colors.END}")
-            
-            # 입력된 명령어 실행 (콘다 환경의 Python 사용)
-            result = subprocess.run(
-                [self.python_executable, "-c", command],
-                capture_output=True,
-                text=True,
-                timeout=600,  # 타임아웃 설정
-                env=env  # 콘다 환경 전달
-            )
-            
+            worker = self._get_worker(session_id)
+            with worker.lock:
+                if not worker.alive(): self._recover(worker, "worker not running")
+                try:
+                    ok, stdout, stderr, error = worker.request(
+                        {"session": session_id, "code": command, "cpu_limit": self.cpu_limit},
+                        timeout=timeout or self.timeout
+                    )
+                except TimeoutError:
+                    self._recover(worker, "execution timed out")
+                    return f"Error: Execution timed out after {timeout or self.timeout} seconds. Session state has been reset."
+                except ChildProcessError as e:
+                    self._recover(worker, str(e))
+                    return f"Error: Python worker crashed ({str(e)}). Session state has been reset."
+
             # 결과 반환
-            if result.returncode == 0:
-                return result.stdout
+            if ok:
+                return stdout
             else:
-                return f"Error: {result.stderr}"
+                return f"Error: {stderr}{error}"
         except Exception as e:
             return f"Exception: {str(e)}"
 
+    def reset(self, session_id="default"):
+        # 세션 네임스페이스 초기화 (실행된 적 없는 세션이면 아무것도 하지 않음)
+        with self.pool_lock:
+            worker = self.session_map.pop(session_id, None)
+            if worker is None: return
+            worker.sessions.discard(session_id)
+        with worker.lock:
+            try:
+                if worker.alive(): worker.request({"op": "reset", "session": session_id}, timeout=30)
+            except (TimeoutError, ChildProcessError) as e:
+                self._recover(worker, f"reset failed: {e}")
+
+    def close(self):
+        with self.pool_lock:
+            for worker in self.workers: worker.kill()
+            self.workers = []
+            self.session_map = {}
+
 repl = PythonREPL()
 
+# 현재 에이전트 작업의 REPL 세션 (repl_session 밖에서 호출되면 "default")
+_current_session = contextvars.ContextVar("python_repl_session", default="default")
+
+@contextlib.contextmanager
+def repl_session(agent_name):
+    """
+    에이전트 작업(task) 하나 동안 사용할 REPL 세션.
+    작업마다 새 세션 id 로 빈 네임스페이스에서 시작하므로 다른 에이전트나 이전 작업의 변수가 보이지 않고,
+    작업이 끝나면 워커의 네임스페이스를 정리합니다. 같은 작업 안의 python_repl_tool 호출끼리는 변수를 공유합니다.
+    """
+    session_id = f"{agent_name}-{uuid.uuid4().hex[:8]}"
+    token = _current_session.set(session_id)
+    try:
+        yield session_id
+    finally:
+        _current_session.reset(token)
+        repl.reset(session_id)
+
 @log_io
-def handle_python_repl_tool(code: Annotated[str, "The python code to execute to do further analysis or calculation."]):
+def handle_python_repl_tool(
+    code: Annotated[str, "The python code to execute to do further analysis or calculation."],
+    session_id: Annotated[str, "REPL session whose variables are kept between calls (defaults to the current agent task)."] = None
+):
     """
     Use this to execute python code and do data analysis or calculation. If you want to see the output of a value,
     you should print it out with `print(...)`. This is visible to the user.
     """
     logger.info(f"{Colors.GREEN}===== Executing Python code ====={Colors.END}")
     try:
-        result = repl.run(code)
+        result = repl.run(code, session_id=session_id or _current_session.get())
     except BaseException as e:
         error_msg = f"Failed to execute. Error: {repr(e)}"
         #logger.error(error_msg)
@@ -0,0 +1,217 @@
+"""
+Long-lived Python REPL worker process.
+
+PythonREPL(python_repl.py)가 spawn 하는 워커 프로세스의 엔트리포인트입니다.
+src 패키지에 의존하지 않도록 표준 라이브러리만 사용합니다.
+
+fd 1 은 파이프로 돌려 print 뿐 아니라 os.system / subprocess / C 확장이 fd 에 직접 쓰는 출력도
+실행 순서대로 현재 요청의 stdout 청크로 전달합니다.
+fd 0 은 /dev/null 로 돌려 사용자 코드의 input() / 자식 프로세스가 프로토콜 입력을 읽지 못하게 합니다 (EOF).
+
+Pipe protocol (JSON lines):
+    parent -> worker (stdin):  {"id": ..., "session": ..., "code": ..., "cpu_limit": ...}
+                               {"id": ..., "op": "reset", "session": ...}
+    worker -> parent (stdout): {"type": "ready", "pid": ..., "preloaded": [...]}
+                               {"id": ..., "type": "stdout" | "stderr", "data": ...}
+                               {"id": ..., "type": "done", "ok": bool, "error": ...}
+"""
+
+import io
+import os
+import sys
+import json
+import codecs
+import signal
+import threading
+import traceback
+import importlib
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class CPUTimeExceeded(Exception):
+    pass
+
+
+class StreamWriter(io.TextIOBase):
+    """exec 중 sys.stderr 출력을 즉시 부모 프로세스로 전달하는 스트림"""
+
+    def __init__(self, channel, msg_id, stream_type):
+        self.channel = channel
+        self.msg_id = msg_id
+        self.stream_type = stream_type
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if data:
+            self.channel.send({"id": self.msg_id, "type": self.stream_type, "data": data})
+        return len(data)
+
+
+class Channel:
+    def __init__(self, out):
+        self.out = out
+        self.lock = threading.Lock()  # 메인 스레드와 FdCapture 스레드가 함께 사용
+
+    def send(self, message):
+        with self.lock:
+            self.out.write(json.dumps(message, ensure_ascii=False) + "\n")
+            self.out.flush()
+
+
+class FdCapture:
+    """
+    fd 1 을 파이프로 교체하고, 파이프에 쓰인 출력을 현재 요청의 stdout 청크로 전달합니다.
+    end() 는 파이프에 marker 를 써서 그 전까지의 출력이 모두 전달된 뒤에 반환합니다 ("done" 보다 먼저 도착하도록).
+    """
+
+    MARKER = b"\x00\x00repl-flush\x00\x00"
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.msg_id = None
+        self.flushed = threading.Event()
+        self.read_fd, write_fd = os.pipe()
+        os.dup2(write_fd, 1)
+        os.close(write_fd)
+        self.decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        threading.Thread(target=self._pump, name="repl-stdout", daemon=True).start()
+
+    def _forward(self, data):
+        text = self.decoder.decode(data)
+        if not text: return
+        if self.msg_id is None:
+            # 요청 밖의 출력(preload 등)은 부모의 stderr 로
+            os.write(2, text.encode("utf-8"))
+        else:
+            self.channel.send({"id": self.msg_id, "type": "stdout", "data": text})
+
+    def _pump(self):
+        pending = b""
+        while True:
+            chunk = os.read(self.read_fd, 65536)
+            if not chunk: return
+            pending += chunk
+            index = pending.find(self.MARKER)
+            while index >= 0:
+                self._forward(pending[:index])
+                pending = pending[index + len(self.MARKER):]
+                self.flushed.set()
+                index = pending.find(self.MARKER)
+            # 잘려서 도착한 marker 앞부분만 남기고 나머지는 바로 전달
+            keep = next((n for n in range(min(len(pending), len(self.MARKER) - 1), 0, -1)
+                         if self.MARKER.startswith(pending[-n:])), 0)
+            self._forward(pending[:len(pending) - keep])
+            pending = pending[len(pending) - keep:]
+
+    def begin(self, msg_id):
+        self.msg_id = msg_id
+
+    def end(self, timeout=10):
+        try: sys.stdout.flush()
+        except Exception: pass
+        self.flushed.clear()
+        os.write(1, self.MARKER)
+        self.flushed.wait(timeout)
+        self.msg_id = None
+
+
+def _preload(modules):
+
+    preloaded = []
+    for name in modules:
+        name = name.strip()
+        if not name: continue
+        try:
+            importlib.import_module(name)
+            preloaded.append(name)
+        except Exception:
+            pass
+    return preloaded
+
+
+def _on_sigxcpu(signum, frame):
+    raise CPUTimeExceeded("CPU time limit exceeded")
+
+
+def _set_cpu_limit(seconds):
+
+    if resource is None or not seconds: return None
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime)
+    previous = resource.getrlimit(resource.RLIMIT_CPU)
+    hard = previous[1]
+    soft = used + int(seconds)
+    if hard != resource.RLIM_INFINITY: soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    return previous
+
+
+def _execute(channel, capture, namespaces, request):
+
+    msg_id = request.get("id")
+    session = request.get("session", "default")
+
+    if request.get("op") == "reset":
+        namespaces.pop(session, None)
+        channel.send({"id": msg_id, "type": "done", "ok": True, "error": None})
+        return
+
+    namespace = namespaces.setdefault(session, {"__name__": "__main__", "__builtins__": __builtins__})
+    stderr = StreamWriter(channel, msg_id, "stderr")
+
+    ok, error = True, None
+    previous_limit = None
+    capture.begin(msg_id)
+    # print 도 fd 1 (FdCapture 파이프)로 써서 자식 프로세스 출력과 순서가 유지되도록
+    sys.stdin, sys.stdout, sys.stderr = sys.__stdin__, sys.__stdout__, stderr
+    try:
+        previous_limit = _set_cpu_limit(request.get("cpu_limit"))
+        exec(compile(request["code"], "<python_repl>", "exec"), namespace)
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            ok, error = False, f"SystemExit: {e.code}"
+    except BaseException as e:
+        # 워커 내부 프레임은 제외하고 사용자 코드의 traceback만 반환
+        ok, error = False, "".join(traceback.format_exception(type(e), e, e.__traceback__.tb_next))
+    finally:
+        if previous_limit is not None: resource.setrlimit(resource.RLIMIT_CPU, previous_limit)
+        sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+        capture.end()
+
+    channel.send({"id": msg_id, "type": "done", "ok": ok, "error": error})
+
+
+def main():
+
+    # 프로토콜 전용 채널을 확보한 뒤 fd 1은 FdCapture 파이프로 돌려서
+    # 사용자 코드나 자식 프로세스가 fd에 직접 쓰는 출력이 프로토콜을 깨뜨리지 않고 결과에 포함되게 합니다.
+    # fd 0 도 같은 방식으로 요청 전용으로 확보하고 /dev/null 로 교체합니다.
+    requests = os.fdopen(os.dup(0), "r", encoding="utf-8")
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    sys.__stdin__ = sys.stdin = io.TextIOWrapper(os.fdopen(0, "rb", closefd=False), encoding="utf-8")
+    channel = Channel(os.fdopen(os.dup(1), "w", encoding="utf-8"))
+    capture = FdCapture(channel)
+    sys.__stdout__ = sys.stdout = io.TextIOWrapper(os.fdopen(1, "wb", buffering=0, closefd=False), encoding="utf-8", write_through=True)
+
+    if hasattr(signal, "SIGXCPU"): signal.signal(signal.SIGXCPU, _on_sigxcpu)
+
+    preloaded = _preload(os.getenv("REPL_PRELOAD_MODULES", "").split(","))
+    channel.send({"type": "ready", "pid": os.getpid(), "preloaded": preloaded})
+
+    namespaces = {}
+    for line in requests:
+        line = line.strip()
+        if not line: continue
+        _execute(channel, capture, namespaces, json.loads(line))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,11 @@
-import os
-import io
 import time
+import functools
+import contextlib
 import json
 import random
 import pprint
 import base64
 import traceback
-from PIL import Image
 from termcolor import colored
 import matplotlib.pyplot as plt
 
@@ -19,6 +18,9 @@ from langgraph.checkpoint.memory import MemorySaver
 from langchain_core.runnables import RunnableConfig
 
 from utils.common_utils import retry
+from utils.image_store import image_store
+from utils.image_cache import image_cache
+from utils.best_of_n import BestOfN, SELECTION_SYSTEM_PROMPT
 from botocore.exceptions import ClientError, ConnectionError, ConnectTimeoutError, ReadTimeoutError
 
 
@@ -27,6 +29,7 @@ class TimeMeasurement:
     def __init__(self):
         self.start_time = None
         self.measurements = {}
+        self.trace = []  # [(node name, elapsed seconds)] in execution order
 
     def start(self):
         self.start_time = time.time()
@@ -48,6 +51,23 @@ class TimeMeasurement:
             #print(f"{section}: {elapsed_time:.5f} 초")
             print(colored (f"\nelapsed time: {section}: {elapsed_time:.5f} 초", "red"))
 
+    @contextlib.contextmanager
+    def track(self, section_name):
+        # start()/measure() 구간과 별개로 노드 단위 소요 시간을 누적 기록
+        start_time = time.time()
+        try:
+            yield
+        finally:
+            self.trace.append((section_name, time.time() - start_time))
+
+    def reset_trace(self, ):
+        self.trace = []
+
+    def print_trace(self):
+        for section, elapsed_time in self.trace:
+            print(colored(f"node latency: {section}: {elapsed_time:.3f} 초", "red"))
+        print(colored(f"node latency: total: {sum(e for _, e in self.trace):.3f} 초", "red"))
+
 
 
 class GraphState(TypedDict):
@@ -59,6 +79,8 @@ class GraphState(TypedDict):
     image_prompt: dict
     image_model: str
     generated_img_path: str
+    candidates: List[dict]
+    selected_candidate: int
     suggestions: str
     retouch: str
     retry_count: int
@@ -82,6 +104,7 @@ class GenAIOutPainting():
         self.llm=kwargs["llm"]
         self.image_generation_model = kwargs["image_generation_model"]
         self.state = GraphState
+        self.best_of_n = BestOfN(n=kwargs.get("best_of_n"), max_concurrency=kwargs.get("max_concurrency"), deterministic_seeds=kwargs.get("deterministic_seeds"))
 
         self.llm_caller = llm_call(
             llm=self.llm,
@@ -144,17 +167,8 @@ class GenAIOutPainting():
             tuple: (binary_data, base64_string) or error message.
         """
         try:
-            with open(file_path, "rb") as image_file:
-                # Read file in binary mode
-                binary_data = image_file.read()
-                
-                # Encode binary data to base64
-                base64_encoded = base64.b64encode(binary_data)
-                
-                # Decode bytes to string
-                base64_string = base64_encoded.decode('utf-8')
-                
-                return binary_data, base64_string
+            # 생성된 이미지는 메모리에서 (bytes, base64) 를 그대로 반환 (파일 재읽기/재인코딩 없음)
+            return image_store.get(file_path)
                 
         except FileNotFoundError:
             return "Error: 파일을 찾을 수 없습니다."
@@ -172,17 +186,9 @@ class GenAIOutPainting():
         """
         try:
             
-            # Decode base64 string to binary data
-            image_data = base64.b64decode(base64_string)
-            
-            # Convert binary data to image
-            image = Image.open(io.BytesIO(image_data))
-
-            # save images
+            # Keep the PNG from the model response in memory and write the file in the background
             img_path = self.file_name
-            dir_path = os.path.dirname(img_path)
-            
-            image.save(img_path, "PNG")
+            image_store.put(img_path, base64_string)
             
             return img_path
             
@@ -191,7 +197,7 @@ class GenAIOutPainting():
             
     def _body_generator(
             self, image_prompt, taskType="OUTPAINTING", maskImage=None,
-            original_image=None,
+            original_image=None, seed=12,
     ):    
         """Generate request body for image generation API.
         
@@ -200,6 +206,7 @@ class GenAIOutPainting():
             taskType: Type of image generation task.
             maskImage: Optional mask image for outpainting.
             original_image: Optional original image for outpainting.
+            seed: Random seed (fixed unless best-of-N generation is enabled).
             
         Returns:
             str: JSON string for the request body.
@@ -227,7 +234,7 @@ class GenAIOutPainting():
                         "numberOfImages": 1,
                         "quality": "premium",
                         "cfgScale": 10,
-                        "seed": 12,
+                        "seed": seed,
                     }
                 }
             else:
@@ -237,9 +244,51 @@ class GenAIOutPainting():
     
         return json.dumps(body_dict)
 
+    def _select_best_candidate(self, ask, candidates):
+        """Select the best of the best-of-N candidates with one multi-image LLM call.
+        
+        Args:
+            ask: User request the candidates were generated for.
+            candidates: List of base64 encoded candidate images.
+            
+        Returns:
+            int: Index of the selected candidate.
+        """
+        if len(candidates) == 1:
+            return 0
+
+        system_prompts = bedrock_utils.get_system_prompt(
+            system_prompts=dedent(SELECTION_SYSTEM_PROMPT.format(n=len(candidates)))
+        )
+        user_prompts = f"Here is the user requests: <user_requests>{ask}</user_requests>"
+        imgs = [base64.b64decode(candidate) for candidate in candidates]
+        message = BestOfN.candidates_message(role="user", string=user_prompts, imgs=imgs)
+        self.messages.append(message)
+
+        try:
+            resp, ai_message = self.llm_caller.invoke(
+                messages=[message],
+                system_prompts=system_prompts
+            )
+            self.messages.append(ai_message)
+            results = json.loads(resp['text'])
+        except Exception as e:
+            print(f"Best-of-N selection failed, using the first candidate: {str(e)}")
+            return 0
+
+        return BestOfN.parse_choice(results.get("best_image"), len(candidates))
+
     def get_messages(self, ):
         return self.messages
         
+    def _traced(self, name, node):
+        # 노드별 소요 시간을 self.timer.trace 에 기록
+        @functools.wraps(node)
+        def wrapper(state):
+            with self.timer.track(name):
+                return node(state)
+        return wrapper
+
     def _graph_definition(self, **kwargs):
         """Define the workflow graph for image generation.
         
@@ -536,6 +585,49 @@ class GenAIOutPainting():
             print("mask_image", mask_image)
             print("original_image", original_image)
         
+            if self.best_of_n.enabled:
+                # N 개의 seed 로 동시에 생성하고 한 번의 multi-image 호출로 가장 좋은 후보를 선택
+                def generate_candidate(index, seed):
+                    body = self._body_generator(
+                        image_prompt,
+                        taskType=task_type,
+                        maskImage=mask_image,
+                        original_image=original_image,
+                        seed=seed,
+                    )
+                    response = image_cache.invoke_model(
+                        self.image_generation_model.bedrock_client,
+                        body=body,
+                        modelId=self.image_generation_model.model_id,
+                        use_cache=index == 0 or self.best_of_n.deterministic_seeds  # 첫 후보는 고정 seed(12)
+                    )
+                    response_body = json.loads(response.get("body").read())
+                    if not response_body.get("images"):
+                        raise ValueError(response_body.get("error", "No image in the response"))
+                    return response_body["images"][0]
+
+                candidates, errors = self.best_of_n.generate(generate_candidate, self.best_of_n.seeds(first_seed=12, key=image_prompt))
+                if not candidates:
+                    error = errors[0]
+                    error_message = error.response['Error']['Message'] if isinstance(error, ClientError) else str(error)
+                    print(f"Bedrock API error: {error_message}")
+                    return self.state(error_message=error_message, prev_node="IMAGE_GENERATION", error=True)
+
+                selected_candidate = self._select_best_candidate(
+                    ask=image_prompt["main_prompt"],
+                    candidates=[candidate["result"] for candidate in candidates]
+                )
+                print("selected candidate", selected_candidate+1, "seed", candidates[selected_candidate]["seed"])
+                generated_img_path = self.show_save_image(candidates[selected_candidate]["result"])
+
+                return self.state(
+                    generated_img_path=generated_img_path,
+                    candidates=[{"seed": candidate["seed"]} for candidate in candidates],
+                    selected_candidate=selected_candidate,
+                    prev_node="IMAGE_GENERATION",
+                    error=False
+                )
+
             # 이미지 생성 요청 본문 생성
             body = self._body_generator(
                 image_prompt,
@@ -552,7 +644,8 @@ class GenAIOutPainting():
 
             # 이미지 생성 API 호출
             try:
-                response = self.image_generation_model.bedrock_client.invoke_model(
+                response = image_cache.invoke_model(
+                    self.image_generation_model.bedrock_client,
                     body=body,
                     modelId=self.image_generation_model.model_id
                 )
@@ -597,10 +690,10 @@ class GenAIOutPainting():
         workflow = StateGraph(self.state)
 
         # Todo 를 작성합니다.
-        workflow.add_node("ask_reformulation", ask_reformulation)  # 이미지 생성을 위해 필요한 요소들이 준비되었는지 확인합니다.
-        workflow.add_node("check_readness_prompt_generation", check_readness_prompt_generation)  # 이미지 생성을 위해 필요한 요소들이 준비되었는지 확인합니다.
-        workflow.add_node("prompt_generation_for_image", prompt_generation_for_image)  # 요청을 이미지 생성용 프롬프트로 수정하는 노드를 추가합니다.
-        workflow.add_node("image_generation", image_generation)  # 이미지 생성하는 노드를 추가합니다.
+        workflow.add_node("ask_reformulation", self._traced("ask_reformulation", ask_reformulation))  # 이미지 생성을 위해 필요한 요소들이 준비되었는지 확인합니다.
+        workflow.add_node("check_readness_prompt_generation", self._traced("check_readness_prompt_generation", check_readness_prompt_generation))  # 이미지 생성을 위해 필요한 요소들이 준비되었는지 확인합니다.
+        workflow.add_node("prompt_generation_for_image", self._traced("prompt_generation_for_image", prompt_generation_for_image))  # 요청을 이미지 생성용 프롬프트로 수정하는 노드를 추가합니다.
+        workflow.add_node("image_generation", self._traced("image_generation", image_generation))  # 이미지 생성하는 노드를 추가합니다.
         
         workflow.add_edge("ask_reformulation", "check_readness_prompt_generation")
         workflow.add_edge("check_readness_prompt_generation", "prompt_generation_for_image")
@@ -640,6 +733,7 @@ class GenAIOutPainting():
        
 
         # app.stream을 통해 입력된 메시지에 대한 출력을 스트리밍합니다.
+        self.timer.reset_trace()
         for output in self.app.stream(inputs, self.config):
             # 출력된 결과에서 키와 값을 순회합니다.
             for key, value in output.items():
@@ -649,7 +743,15 @@ class GenAIOutPainting():
                 # 출력 값을 예쁘게 출력합니다.
                 pprint.pprint(value, indent=2, width=80, depth=None)
 
+                # 호출 측(UI)이 이 출력의 이미지 파일 경로를 바로 읽으므로 해당 파일의 저장만 기다림
+                image_store.wait_for(value)
+
                 yield {"key": key, "value": value}
                 
             # 각 출력 사이에 구분선을 추가합니다.
-            pprint.pprint("\n---\n")
\ No newline at end of file
+            pprint.pprint("\n---\n")
+
+        # 나머지 백그라운드 저장은 실행이 끝날 때 한 번만 기다림
+        image_store.wait()
+        self.timer.print_trace()
+        print(colored(f"image cache: {image_cache.stats()}", "red"))
@@ -683,10 +683,17 @@ with gr.Blocks(fill_height=True) as demo:
                 
                 elif key == "ImageGeneration":
                     image_generation_step = gr.HTML(f"<h1>Step {value['current_step']} Image Generation<h1>")
-                    image_block = gr.Image(value['condition_image'], type="filepath", label="Generated Image")
-                    generated_images_list.append(value['condition_image'])
+                    if value.get('candidates'):
+                        # best-of-N: 후보를 모두 보여주고, 선택된 이미지는 Reflection 에서 표시
+                        gr.Gallery([candidate['image'] for candidate in value['candidates']], label="Candidates", columns=len(value['candidates']))
+                    else:
+                        image_block = gr.Image(value['condition_image'], type="filepath", label="Generated Image")
+                        generated_images_list.append(value['condition_image'])
 
                 elif key == "Reflection":
+                    if value.get('selected_candidate') is not None:
+                        gr.Image(value['condition_image'], type="filepath", label=f"Selected Candidate {value['selected_candidate']+1}")
+                        generated_images_list.append(value['condition_image'])
                     html_reflection_value = format_reflection_output_to_html(value)
                     reflection = gr.HTML(html_reflection_value)
 
@@ -1,12 +1,10 @@
-import os
-import io
 import time
+import functools
+import contextlib
 import json
 import random
 import pprint
-import base64
 import traceback
-from PIL import Image
 from termcolor import colored
 import matplotlib.pyplot as plt
 
@@ -19,6 +17,9 @@ from langgraph.checkpoint.memory import MemorySaver
 from langchain_core.runnables import RunnableConfig
 
 from utils.common_utils import retry
+from utils.image_store import image_store
+from utils.image_cache import image_cache, derive_seed
+from utils.best_of_n import BestOfN, REFLECTION_ADDENDUM
 import boto3
 from botocore.exceptions import ClientError, ConnectionError, ConnectTimeoutError, ReadTimeoutError
 
@@ -26,6 +27,7 @@ class TimeMeasurement:
     def __init__(self):
         self.start_time = None
         self.measurements = {}
+        self.trace = []  # [(node name, elapsed seconds)] in execution order
 
     def start(self):
         self.start_time = time.time()
@@ -47,6 +49,23 @@ class TimeMeasurement:
             #print(f"{section}: {elapsed_time:.5f} 초")
             print(colored (f"\nelapsed time: {section}: {elapsed_time:.5f} 초", "red"))
 
+    @contextlib.contextmanager
+    def track(self, section_name):
+        # start()/measure() 구간과 별개로 노드 단위 소요 시간을 누적 기록
+        start_time = time.time()
+        try:
+            yield
+        finally:
+            self.trace.append((section_name, time.time() - start_time))
+
+    def reset_trace(self, ):
+        self.trace = []
+
+    def print_trace(self):
+        for section, elapsed_time in self.trace:
+            print(colored(f"node latency: {section}: {elapsed_time:.3f} 초", "red"))
+        print(colored(f"node latency: total: {sum(e for _, e in self.trace):.3f} 초", "red"))
+
 # Set up Agent State
 class GraphState(TypedDict):
     ask: str
@@ -58,6 +77,8 @@ class GraphState(TypedDict):
     seed: int
     current_step: int
     condition_image: str
+    candidates: List[dict]
+    selected_candidate: int
 
     suggestions: str
     ko_suggestions: str
@@ -79,6 +100,7 @@ class genai_analyzer():
         self.llm=kwargs["llm"]
         self.image_generation_model = kwargs["image_generation_model"]
         self.state = GraphState
+        self.best_of_n = BestOfN(n=kwargs.get("best_of_n"), max_concurrency=kwargs.get("max_concurrency"), deterministic_seeds=kwargs.get("deterministic_seeds"))
 
         self.llm_caller = llm_call(
             llm=self.llm,
@@ -116,17 +138,8 @@ class genai_analyzer():
     
     def _png_to_bytes(self, file_path):
         try:
-            with open(file_path, "rb") as image_file:
-                # 파일을 바이너리 모드로 읽기
-                binary_data = image_file.read()
-                
-                # 바이너리 데이터를 base64로 인코딩
-                base64_encoded = base64.b64encode(binary_data)
-                
-                # bytes 타입을 문자열로 디코딩
-                base64_string = base64_encoded.decode('utf-8')
-                
-                return binary_data, base64_string
+            # 생성된 이미지는 메모리에서 (bytes, base64) 를 그대로 반환 (파일 재읽기/재인코딩 없음)
+            return image_store.get(file_path)
                 
         except FileNotFoundError:
             return "Error: 파일을 찾을 수 없습니다."
@@ -137,21 +150,9 @@ class genai_analyzer():
     def show_save_image(self, base64_string, current_step, retry_count):
         try:
             
-            # base64 문자열을 디코딩하여 바이너리 데이터로 변환
-            image_data = base64.b64decode(base64_string)
-            
-            # 바이너리 데이터를 이미지로 변환
-            image = Image.open(io.BytesIO(image_data))
-            
-            # save images
+            # 모델 응답의 PNG 를 그대로 메모리에 보관하고, 파일 저장은 백그라운드에서 수행
             img_path = f'{self.file_path_name}/GENERATED_IMAGE_{current_step}_{retry_count}.png'
-            dir_path = os.path.dirname(img_path)  # Extract the directory path
-
-            # Create the directory if it doesn't exist
-            os.makedirs(dir_path, exist_ok=True)
-            
-            image.save(img_path, "PNG")
-            time.sleep(3)
+            image_store.put(img_path, base64_string)
             
             return img_path
             
@@ -214,6 +215,14 @@ class genai_analyzer():
     def get_messages(self, ):
         return self.messages
         
+    def _traced(self, name, node):
+        # 노드별 소요 시간을 self.timer.trace 에 기록
+        @functools.wraps(node)
+        def wrapper(state):
+            with self.timer.track(name):
+                return node(state)
+        return wrapper
+
     def _graph_definition(self, **kwargs):
 
         def StepwiseTaskDecomposer(state):
@@ -416,7 +425,10 @@ class genai_analyzer():
             control_strength = generation_steps[current_step-1]["control_strength"]
             if prev_node == "PromptReformulation": seed = random.randint(0, 100000)
 
-            seed = random.randint(0, 100000)
+            # 기본은 random seed (같은 프롬프트로 다시 실행해도 새 이미지).
+            # deterministic_seeds 이면 같은 요청(프롬프트/단계/재시도)은 같은 seed → 재실행 시 image_cache 에서 응답
+            if self.best_of_n.deterministic_seeds: seed = derive_seed(pos_prompt, neg_prompt, current_step, retry_count)
+            else: seed = random.randint(0, 100000)
             print ("current_step", current_step)
             print ("retry_count", retry_count)
             print ("condition_image", condition_image)
@@ -429,6 +441,37 @@ class genai_analyzer():
             else:
                 condition_image = None
             
+            if self.best_of_n.enabled:
+                # N 개의 seed 로 동시에 생성하고, 후보 선택은 Reflection 에서 한 번의 호출로 수행
+                def generate_candidate(index, seed):
+                    body = self._body_generator(
+                        pos_prompt=pos_prompt,
+                        neg_prompt=neg_prompt,
+                        condition_image=condition_image,
+                        control_strength=control_strength, # nova랑 반대
+                        seed=seed
+                    )
+                    response = image_cache.invoke_model(
+                        self.image_generation_model.bedrock_client,
+                        body=body,
+                        modelId=self.image_generation_model.model_id,
+                        use_cache=self.best_of_n.deterministic_seeds
+                    )
+                    response_body = json.loads(response.get("body").read())
+                    base64_image = response_body.get("images")[0]
+                    return self.show_save_image(base64_image, current_step, f'{retry_count}_{index+1}')
+
+                candidates, errors = self.best_of_n.generate(generate_candidate, self.best_of_n.seeds(key=(pos_prompt, neg_prompt, current_step, retry_count)))
+                if not candidates: raise errors[0]
+                candidates = [{"seed": candidate["seed"], "image": candidate["result"]} for candidate in candidates]
+
+                return self.state(
+                    condition_image=candidates[0]["image"],
+                    candidates=candidates,
+                    current_step=current_step,
+                    prev_node="ImageGeneration"
+                )
+
             body = self._body_generator(
                 pos_prompt=pos_prompt,
                 neg_prompt=neg_prompt,
@@ -437,9 +480,11 @@ class genai_analyzer():
                 seed=seed
             )
             
-            response = self.image_generation_model.bedrock_client.invoke_model(
+            response = image_cache.invoke_model(
+                self.image_generation_model.bedrock_client,
                 body=body,
-                modelId=self.image_generation_model.model_id
+                modelId=self.image_generation_model.model_id,
+                use_cache=self.best_of_n.deterministic_seeds
             )
             response_body = json.loads(response.get("body").read())
             base64_image = response_body.get("images")[0]
@@ -586,6 +631,7 @@ class genai_analyzer():
             generation_steps = state["steps"]
             current_step = state["current_step"]
             condition_image = state["condition_image"]
+            candidates = state.get("candidates") or []
             retry_count = state.get("retry_count", 0)
 
             pos_prompt = generation_steps[current_step-1]["prompt"]["positive"]
@@ -631,6 +677,9 @@ class genai_analyzer():
                 '''
              )
 
+            if len(candidates) > 1:
+                system_prompts += dedent(REFLECTION_ADDENDUM.format(n=len(candidates)))
+
             system_prompts = bedrock_utils.get_system_prompt(system_prompts=system_prompts)
             user_prompts = dedent(
                 '''
@@ -642,8 +691,13 @@ class genai_analyzer():
             }
             user_prompts = user_prompts.format(**context)
             
-            img_bytes, img_base64 = self._png_to_bytes(condition_image)
-            message = self._get_message_from_string(role="user", string=user_prompts, imgs=[img_bytes])
+            if len(candidates) > 1:
+                # 모든 후보를 한 번의 multi-image 호출로 평가
+                imgs = [self._png_to_bytes(candidate["image"])[0] for candidate in candidates]
+                message = BestOfN.candidates_message(role="user", string=user_prompts, imgs=imgs)
+            else:
+                img_bytes, img_base64 = self._png_to_bytes(condition_image)
+                message = self._get_message_from_string(role="user", string=user_prompts, imgs=[img_bytes])
             messages.append(message)
             self.messages.append(message)
 
@@ -654,6 +708,11 @@ class genai_analyzer():
             self.messages.append(ai_message)
 
             results = json.loads(resp['text'])
+            selected_candidate = None
+            if len(candidates) > 1:
+                selected_candidate = BestOfN.parse_choice(results.get("best_image"), len(candidates))
+                condition_image = candidates[selected_candidate]["image"]
+                print ("selected candidate", selected_candidate+1, "seed", candidates[selected_candidate]["seed"])
             suggestions = results["suggestions"]
             retouch, suggestions = results["retouch"], results["suggestions"]
             
@@ -679,6 +738,8 @@ class genai_analyzer():
                 ko_suggestions=ko_suggestions,
                 retry_count=retry_count,
                 current_step=current_step,
+                condition_image=condition_image,
+                selected_candidate=selected_candidate,
                 should_regeneration=should_regeneration,
                 prev_node="Reflection"
             )
@@ -694,10 +755,10 @@ class genai_analyzer():
         workflow = StateGraph(self.state)
 
         # Todo 를 작성합니다.
-        workflow.add_node("StepwiseTaskDecomposer", StepwiseTaskDecomposer)  # 이미지 생성을 위해 필요한 요소들이 준비되었는지 확인합니다.
-        workflow.add_node("ImageGeneration", ImageGeneration)  # 요청을 이미지 생성용 프롬프트로 수정하는 노드를 추가합니다.
-        workflow.add_node("Reflection", Reflection)  # 사용자의 요청에 맞게 이미지가 생성 되었는지 확인힙니다.
-        workflow.add_node("PromptReformulation", PromptReformulation)  # 사용자의 요청에 맞게 이미지가 생성 되었는지 확인힙니다.
+        workflow.add_node("StepwiseTaskDecomposer", self._traced("StepwiseTaskDecomposer", StepwiseTaskDecomposer))  # 이미지 생성을 위해 필요한 요소들이 준비되었는지 확인합니다.
+        workflow.add_node("ImageGeneration", self._traced("ImageGeneration", ImageGeneration))  # 요청을 이미지 생성용 프롬프트로 수정하는 노드를 추가합니다.
+        workflow.add_node("Reflection", self._traced("Reflection", Reflection))  # 사용자의 요청에 맞게 이미지가 생성 되었는지 확인힙니다.
+        workflow.add_node("PromptReformulation", self._traced("PromptReformulation", PromptReformulation))  # 사용자의 요청에 맞게 이미지가 생성 되었는지 확인힙니다.
         
         workflow.add_conditional_edges(
             "StepwiseTaskDecomposer",
@@ -741,6 +802,7 @@ class genai_analyzer():
         self.file_path_name = kwargs.get('file_path_name')
         
         # app.stream을 통해 입력된 메시지에 대한 출력을 스트리밍합니다.
+        self.timer.reset_trace()
         for output in self.app.stream(inputs, self.config):
             # 출력된 결과에서 키와 값을 순회합니다.
             for key, value in output.items():
@@ -749,7 +811,15 @@ class genai_analyzer():
                 pprint.pprint("---")
                 pprint.pprint(value, indent=2, width=80, depth=None)
 
+                # 호출 측(UI)이 이 출력의 이미지 파일 경로를 바로 읽으므로 해당 파일의 저장만 기다림
+                image_store.wait_for(value)
+
                 yield {"key": key, "value": value}
                 
             # 각 출력 사이에 구분선을 추가합니다.
-            pprint.pprint("\n---\n")
\ No newline at end of file
+            pprint.pprint("\n---\n")
+
+        # 나머지 백그라운드 저장은 실행이 끝날 때 한 번만 기다림
+        image_store.wait()
+        self.timer.print_trace()
+        print(colored(f"image cache: {image_cache.stats()}", "red"))
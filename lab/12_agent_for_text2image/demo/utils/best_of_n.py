@@ -0,0 +1,115 @@
+import os
+import random
+import threading
+from textwrap import dedent
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.image_cache import derive_seed, SEED_RANGE, DETERMINISTIC_SEEDS
+
+'''
+Best-of-N candidate generation shared by the text-to-image agents (agentic_system_for_t2i_*)
+- N seed variants of the same request body are generated concurrently, then scored in one
+  multi-image LLM call (Reflection in the stepwise agent, a selection call in the editing agents).
+- N and the concurrency caps are shared by all agent variants:
+    T2I_BEST_OF_N (default 1 = original single-image behavior)
+    T2I_MAX_CONCURRENCY (default 4, in-flight image generation calls per process across all agents)
+    T2I_DETERMINISTIC_SEEDS (default false, see utils/image_cache.py)
+  Each agent also accepts best_of_n / max_concurrency / deterministic_seeds keyword arguments.
+'''
+
+DEFAULT_N = int(os.getenv("T2I_BEST_OF_N", "1"))
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("T2I_MAX_CONCURRENCY", "4"))
+
+# process-wide cap on image generation calls, so several agents running best-of-N do not multiply the load
+_generation_slots = threading.BoundedSemaphore(DEFAULT_MAX_CONCURRENCY)
+
+REFLECTION_ADDENDUM = '''
+You are given {n} candidate images (Image 1 ... Image {n}) generated for the same request with different seeds.
+Evaluate every candidate and choose the one that best matches the requirements.
+Add "best_image": <number of the chosen image> to the JSON object.
+"retouch", "suggestions" and "evaluation" must describe the chosen image only.
+'''
+
+SELECTION_SYSTEM_PROMPT = '''
+You are an image quality evaluator.
+You are given {n} candidate images (Image 1 ... Image {n}) generated for the same request with different seeds.
+Compare every candidate with the user's requirements and choose the one that matches them best
+(requested elements, counts, positions, natural blending with the original image and overall quality).
+
+Output your evaluation in the following JSON format:
+DO NOT include any text or json symbol (```json```)outside the JSON format in the response
+You must ONLY output the JSON object, nothing else.
+{{
+    "best_image": <number of the chosen image>,
+    "reason": "short reason for the choice"
+}}
+'''
+
+
+class BestOfN:
+
+    def __init__(self, n=None, max_concurrency=None, deterministic_seeds=None):
+        self.n = max(1, int(n if n is not None else DEFAULT_N))
+        self.max_concurrency = max(1, int(max_concurrency if max_concurrency is not None else DEFAULT_MAX_CONCURRENCY))
+        self.deterministic_seeds = DETERMINISTIC_SEEDS if deterministic_seeds is None else bool(deterministic_seeds)
+
+    @property
+    def enabled(self):
+        return self.n > 1
+
+    def seeds(self, first_seed=None, key=None):
+        """
+        N distinct seeds. first_seed (e.g. the fixed seed of the single-image mode) is kept as the first candidate.
+        The other seeds are random, or with deterministic_seeds derived from key (e.g. the prompt)
+        so reruns of the same request reuse the image cache.
+        """
+        rng = random.Random(derive_seed(key)) if self.deterministic_seeds and key is not None else random
+        seeds = [] if first_seed is None else [first_seed]
+        while len(seeds) < self.n:
+            seed = rng.randint(*SEED_RANGE)
+            if seed not in seeds:
+                seeds.append(seed)
+        return seeds[:self.n]
+
+    def generate(self, generate_fn, seeds):
+        """
+        Run generate_fn(index, seed) for every seed concurrently (bounded by max_concurrency and the shared cap).
+        Returns:
+            tuple: (candidates, errors)
+                candidates: [{"index", "seed", "result"}] of the successful calls, in seed order
+                errors: exceptions of the failed calls
+        """
+        def call(index, seed):
+            with _generation_slots:
+                return generate_fn(index, seed)
+
+        with ThreadPoolExecutor(max_workers=min(len(seeds), self.max_concurrency), thread_name_prefix="t2i-best-of-n") as pool:
+            futures = [pool.submit(call, index, seed) for index, seed in enumerate(seeds)]
+
+        candidates, errors = [], []
+        for index, (seed, future) in enumerate(zip(seeds, futures)):
+            try:
+                candidates.append({"index": index, "seed": seed, "result": future.result()})
+            except Exception as e:
+                print(f"Best-of-N candidate {index + 1} (seed {seed}) failed: {str(e)}")
+                errors.append(e)
+        return candidates, errors
+
+    @staticmethod
+    def parse_choice(best_image, n):
+        """1-based "best_image" from the LLM -> 0-based index (falls back to the first candidate)"""
+        try:
+            index = int(str(best_image).strip()) - 1
+        except (TypeError, ValueError):
+            return 0
+        return index if 0 <= index < n else 0
+
+    @staticmethod
+    def candidates_message(role, string, imgs):
+        """Multi-image message with an "Image i:" label before each candidate"""
+        message = {"role": role, "content": []}
+        for i, img in enumerate(imgs):
+            message["content"].append({"text": f"Image {i + 1}:"})
+            message["content"].append({"image": {"format": 'png', "source": {"bytes": img}}})
+        message["content"].append({"text": dedent(string)})
+        return message
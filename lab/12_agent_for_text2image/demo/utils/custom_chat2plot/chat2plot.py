@@ -358,6 +358,8 @@ def chat2plot(
               Defaults to "head" which embeds the contents of df.head(5) in the prompt.
               "dtypes" sends only columns and types to LLMs and does not send the contents of the dataset,
               which allows for privacy but may reduce accuracy.
+              "profile" sends a fixed-size profile (dtypes, cardinality, quantiles, top-k values,
+              datetime ranges and a stratified sample), which keeps the prompt small for large datasets.
         custom_deserializer: A custom function to convert the json returned by the LLM into a object.
         verbose: If `True`, chat2plot will output logs.
 
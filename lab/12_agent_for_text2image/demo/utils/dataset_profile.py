@@ -0,0 +1,161 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from textwrap import dedent
+
+import numpy as np
+import pandas as pd
+
+'''
+Fixed-budget DataFrame profile for LLM prompts
+- Used by custom_chat2plot (description_strategy="profile") and text_to_report.text2chart_chain.
+- The prompt size depends on the number of columns and the budget below, not on the number of rows.
+- Profiles are cached per DataFrame fingerprint, so re-asking questions on the same data is free.
+'''
+
+MAX_COLUMNS = 40        # columns described in detail
+TOP_K = 5               # most frequent values per categorical column
+SAMPLE_ROWS = 10        # rows in the stratified sample
+MAX_CELL_CHARS = 40     # long strings are truncated in the profile
+QUANTILES = [0.0, 0.25, 0.5, 0.75, 1.0]
+CACHE_SIZE = 32
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def dataframe_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Cache key of the DataFrame: shape, column names/dtypes and every row (vectorized row hashing),
+    so a change in any cell gives a new key.
+    Falls back to the object identity when cells are unhashable (e.g. lists/dicts).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((df.shape, list(map(str, df.columns)), list(map(str, df.dtypes)))).encode("utf-8"))
+    try:
+        digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    except TypeError:
+        digest.update(f"id:{id(df)}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _truncate(value) -> str:
+    text = str(value)
+    return text if len(text) <= MAX_CELL_CHARS else text[:MAX_CELL_CHARS - 3] + "..."
+
+
+def _fmt(value) -> str:
+    if isinstance(value, (float, np.floating)):
+        return f"{value:.6g}"
+    return _truncate(value)
+
+
+def _nunique(series: pd.Series) -> int:
+    try:
+        return int(series.nunique(dropna=True))
+    except TypeError:
+        return int(series.astype(str).nunique(dropna=True))
+
+
+def _stratified_sample(df: pd.DataFrame, categorical_cols, n_rows: int) -> pd.DataFrame:
+    """
+    One row per value of the lowest-cardinality categorical column (so every group is visible),
+    topped up with evenly spaced rows; always at most n_rows rows.
+    Bool columns are not used as strata (two values say little about the data).
+    """
+    if len(df) <= n_rows:
+        return df
+
+    strata = [(col, _nunique(df[col])) for col in categorical_cols if not pd.api.types.is_bool_dtype(df[col])]
+    strata = [(col, n) for col, n in strata if 1 < n <= n_rows]
+    picked = pd.Index([])
+    if strata:
+        col = min(strata, key=lambda x: x[1])[0]
+        keys = df[col].astype(str)
+        picked = keys.drop_duplicates().index[:n_rows]
+
+    remaining = n_rows - len(picked)
+    if remaining > 0:
+        positions = np.linspace(0, len(df) - 1, num=remaining + len(picked), dtype=np.int64)
+        spaced = df.index[positions].difference(picked)[:remaining]
+        picked = picked.append(spaced)
+
+    return df.loc[picked].sort_index()
+
+
+def _build_profile(df: pd.DataFrame) -> str:
+    n_rows, n_cols = df.shape
+    columns = list(df.columns[:MAX_COLUMNS])
+    view = df[columns]
+
+    numeric_cols = [c for c in columns if pd.api.types.is_numeric_dtype(view[c]) and not pd.api.types.is_bool_dtype(view[c])]
+    datetime_cols = [c for c in columns if pd.api.types.is_datetime64_any_dtype(view[c])]
+    categorical_cols = [c for c in columns if c not in numeric_cols and c not in datetime_cols]
+
+    # column-wise aggregates in one pass each
+    non_null = view.notna().sum()
+    quantiles = view[numeric_cols].quantile(QUANTILES) if numeric_cols else None
+    means = view[numeric_cols].mean() if numeric_cols else None
+
+    lines = []
+    for col in columns:
+        series = view[col]
+        head = f"- {col} ({series.dtype}): non-null {int(non_null[col])}/{n_rows}, unique {_nunique(series)}"
+        if col in numeric_cols:
+            q = quantiles[col]
+            head += (
+                f", min {_fmt(q.iloc[0])}, p25 {_fmt(q.iloc[1])}, median {_fmt(q.iloc[2])}, "
+                f"p75 {_fmt(q.iloc[3])}, max {_fmt(q.iloc[4])}, mean {_fmt(means[col])}"
+            )
+        elif col in datetime_cols:
+            head += f", range {series.min()} ~ {series.max()}"
+        else:
+            try:
+                counts = series.value_counts(dropna=True).head(TOP_K)
+            except TypeError:
+                counts = series.astype(str).value_counts(dropna=True).head(TOP_K)
+            top = ", ".join(f"{_truncate(value)} ({count})" for value, count in counts.items())
+            head += f", top {TOP_K}: {top}"
+        lines.append(head)
+
+    if n_cols > MAX_COLUMNS:
+        lines.append(f"- ... {n_cols - MAX_COLUMNS} more columns: {', '.join(map(_truncate, df.columns[MAX_COLUMNS:MAX_COLUMNS * 2]))}")
+
+    sample = _stratified_sample(view, categorical_cols, SAMPLE_ROWS)
+    sample = sample.apply(lambda s: s.map(_truncate) if s.name in categorical_cols and not pd.api.types.is_bool_dtype(s) else s)
+    column_profile = "\n".join(lines)
+
+    return dedent(
+        """
+        Dataset profile: {n_rows} rows x {n_cols} columns
+
+        Columns:
+        {column_profile}
+
+        Sample rows ({n_sample} of {n_rows}, stratified):
+        {sample}
+        """
+    ).format(
+        n_rows=n_rows,
+        n_cols=n_cols,
+        column_profile=column_profile,
+        n_sample=len(sample),
+        sample=sample.to_csv(),
+    )
+
+
+def profile_dataframe(df: pd.DataFrame) -> str:
+    """Returns the fixed-budget profile of df (cached by content fingerprint)"""
+
+    key = dataframe_fingerprint(df)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    profile = _build_profile(df)
+    with _cache_lock:
+        _cache[key] = profile
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return profile
@@ -0,0 +1,167 @@
+import io
+import os
+import json
+import random
+import hashlib
+import threading
+
+'''
+Content-addressed on-disk cache for image generation calls of the text-to-image agents (agentic_system_for_t2i_*)
+- Key: sha256 of (model id, canonical JSON request body). The body already holds the prompt, seed and
+  base64 condition/mask image, so the same request across demo reruns or UI sessions is served from disk.
+- Only successful responses (with "images") are stored; errors/filtered responses always go to Bedrock.
+- Only requests with a pinned seed use the cache (use_cache=True): by default the agents pick random seeds so a
+  rerun of the same prompt gives a new image. Deterministic seeding (derive_seed) is opt-in.
+- Size-based LRU eviction (file mtime is touched on every hit), hit metrics in stats().
+- Settings: T2I_IMAGE_CACHE_DIR (default demo/cache/images), T2I_IMAGE_CACHE_MAX_MB (default 1024, 0 disables the cache),
+  T2I_DETERMINISTIC_SEEDS (default false; true derives seeds from the request so reruns are served from the cache)
+'''
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cache", "images")
+DEFAULT_MAX_MB = 1024
+SEED_RANGE = (0, 100000)
+DETERMINISTIC_SEEDS = os.getenv("T2I_DETERMINISTIC_SEEDS", "false").lower() in ("1", "true", "yes")
+
+
+def derive_seed(*parts):
+    """
+    Seed derived from the request (prompt, step, retry count, ...) instead of random.randint (deterministic seeding only),
+    so reruns of the same request produce the same body and hit the cache, while retries still get new seeds.
+    """
+    digest = hashlib.sha256(json.dumps(parts, ensure_ascii=False, default=str).encode("utf-8")).digest()
+    return random.Random(digest).randint(*SEED_RANGE)
+
+
+class ImageGenerationCache:
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.cache_dir = cache_dir or os.getenv("T2I_IMAGE_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes if max_bytes is not None else int(float(os.getenv("T2I_IMAGE_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._sizes = None      # key -> file size, loaded lazily from cache_dir
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    @staticmethod
+    def key(body, model_id):
+        try:
+            canonical = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":"))
+        except (TypeError, ValueError):
+            canonical = body if isinstance(body, str) else body.decode("utf-8")
+        return hashlib.sha256(f"{model_id}\n{canonical}".encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _load_index(self):
+        if self._sizes is not None:
+            return
+        self._sizes = {}
+        if not os.path.isdir(self.cache_dir):
+            return
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".json"):
+                    self._sizes[name[:-len(".json")]] = os.path.getsize(os.path.join(root, name))
+
+    def get(self, body, model_id):
+        """
+        Returns:
+            bytes: cached response body, or None
+        """
+        if not self.enabled:
+            return None
+        key = self.key(body, model_id)
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                response_body = f.read()
+            os.utime(path)  # LRU: mark as recently used
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return response_body
+
+    def put(self, body, model_id, response_body):
+        if not self.enabled:
+            return
+        key = self.key(body, model_id)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(response_body)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._load_index()
+            self._sizes[key] = len(response_body)
+            self.stores += 1
+            self._evict()
+
+    def _evict(self):
+        total = sum(self._sizes.values())
+        if total <= self.max_bytes:
+            return
+        entries = []
+        for key in list(self._sizes):
+            try:
+                entries.append((os.path.getmtime(self._path(key)), key))
+            except OSError:
+                del self._sizes[key]
+        for _, key in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            total -= self._sizes.pop(key)
+            self.evictions += 1
+
+    def invoke_model(self, bedrock_client, body, modelId, use_cache=True):
+        """
+        Drop-in for bedrock_client.invoke_model(body=..., modelId=...): returns {"body": <readable>} like boto3,
+        from the cache when the same request was generated before.
+        use_cache=False (random seed) calls Bedrock directly and does not store the response.
+        """
+        if not use_cache:
+            response = bedrock_client.invoke_model(body=body, modelId=modelId)
+            return {**response, "cached": False}
+
+        cached = self.get(body, modelId)
+        if cached is not None:
+            return {"body": io.BytesIO(cached), "cached": True}
+
+        response = bedrock_client.invoke_model(body=body, modelId=modelId)
+        response_body = response.get("body").read()
+        try:
+            if json.loads(response_body).get("images"):
+                self.put(body, modelId, response_body)
+        except (ValueError, AttributeError):
+            pass
+        return {**response, "body": io.BytesIO(response_body), "cached": False}
+
+    def stats(self):
+        with self._lock:
+            self._load_index()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "entries": len(self._sizes),
+                "bytes": sum(self._sizes.values()),
+            }
+
+image_cache = ImageGenerationCache()
@@ -0,0 +1,122 @@
+import os
+import base64
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+
+'''
+In-memory image store for the text-to-image agents (agentic_system_for_t2i_*)
+- Generated images are kept as (bytes, base64) keyed by their file path, so the next
+  image-to-image call and Reflection reuse them without reading the file or re-encoding.
+- Files are written in a background thread (single writer, so writes to the same path keep their order).
+- Images that were not generated here (e.g. uploaded original/mask images) are read once and cached.
+'''
+
+class ImageStore:
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._images = OrderedDict()    # path -> (mtime or None, bytes, base64)
+        self._pending = {}              # path -> Future
+        self._lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-store-writer")
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, path, mtime, image_bytes, base64_string):
+        with self._lock:
+            self._images[path] = (mtime, image_bytes, base64_string)
+            self._images.move_to_end(path)
+            while len(self._images) > self.max_entries:
+                self._images.popitem(last=False)
+
+    def _write(self, path, image_bytes):
+        dir_path = os.path.dirname(path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(image_bytes)
+        os.replace(tmp_path, path)
+
+    def put(self, path, base64_string):
+        """
+        Register a generated image (base64 from the model response) and persist it asynchronously.
+        Returns:
+            str: path (usable as a key for get() right away)
+        """
+        image_bytes = base64.b64decode(base64_string)
+        self._remember(path, None, image_bytes, base64_string)
+        with self._lock:
+            self._pending[path] = self._writer.submit(self._write, path, image_bytes)
+        return path
+
+    def get(self, path):
+        """
+        Returns:
+            tuple: (bytes, base64_string)
+        Raises:
+            FileNotFoundError: not in memory and not on disk
+        """
+        with self._lock:
+            entry = self._images.get(path)
+        if entry is not None:
+            mtime, image_bytes, base64_string = entry
+            # generated images (mtime None) are authoritative; files read from disk are checked for changes
+            if mtime is None or (os.path.exists(path) and os.path.getmtime(path) == mtime):
+                with self._lock:
+                    self.hits += 1
+                    self._images.move_to_end(path)
+                return image_bytes, base64_string
+
+        with self._lock:
+            self.misses += 1
+        with open(path, "rb") as image_file:
+            image_bytes = image_file.read()
+        base64_string = base64.b64encode(image_bytes).decode("utf-8")
+        self._remember(path, os.path.getmtime(path), image_bytes, base64_string)
+        return image_bytes, base64_string
+
+    def wait(self, paths=None, timeout=None):
+        """
+        Wait until pending writes are on disk (all of them, or only the given paths).
+        Callers that hand file paths to other components (e.g. the Gradio UI) call this (or wait_for) first.
+        """
+        with self._lock:
+            if paths is None:
+                futures = list(self._pending.values())
+            else:
+                futures = [self._pending[p] for p in paths if p in self._pending]
+        wait(futures, timeout=timeout)
+        for future in futures:
+            future.result()
+        with self._lock:
+            for path in [p for p, f in self._pending.items() if f.done()]:
+                del self._pending[path]
+
+    def wait_for(self, value, timeout=None):
+        """
+        Wait only for the pending writes whose paths appear in value (e.g. a node output the UI is
+        about to open by file path). Other writes keep running in the background.
+        """
+        with self._lock:
+            pending = set(self._pending)
+        paths = [path for path in _strings(value) if path in pending] if pending else []
+        if paths:
+            self.wait(paths, timeout=timeout)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._images), "pending_writes": len(self._pending)}
+
+def _strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _strings(item)
+
+image_store = ImageStore()
@@ -4,6 +4,7 @@ from langchain_core.tracers import ConsoleCallbackHandler
 from langchain.schema.output_parser import StrOutputParser
 from langchain_experimental.tools.python.tool import PythonAstREPLTool
 from langchain_core.prompts import ChatPromptTemplate, HumanMessagePromptTemplate, SystemMessagePromptTemplate, MessagesPlaceholder
+from utils.dataset_profile import profile_dataframe
 
 class prompt_repo():
      
@@ -76,13 +77,18 @@ class text2chart_chain():
         self.verbose = kwargs.get("verbose", False)
         self.parsing_pattern = kwargs["parsing_pattern"]
         self.show_chart = kwargs.get("verbose", False)
+        # "sample": num_rows 개 행을 csv 로 전달, "profile": 행 수와 무관한 고정 크기 요약 전달
+        self.description_strategy = kwargs.get("description_strategy", "sample")
         
     def query(self, **kwargs):
         
         df, query, verbose = kwargs["df"], kwargs["query"], kwargs.get("verbose", self.verbose)
         show_chart = kwargs.get("show_chart", self.show_chart)
         
-        if len(df) < self.num_rows: dataset = str(df.to_csv())
+        description_strategy = kwargs.get("description_strategy", self.description_strategy)
+
+        if description_strategy == "profile": dataset = profile_dataframe(df)
+        elif len(df) < self.num_rows: dataset = str(df.to_csv())
         else: dataset = str(df.sample(self.num_rows, random_state=0).to_csv())
         
         invoke_args = {
@@ -2,6 +2,8 @@ from textwrap import dedent
 
 import pandas as pd
 
+from utils.dataset_profile import profile_dataframe
+
 
 def description(
     df: pd.DataFrame, description_strategy: str = "head", num_rows: int = 1
@@ -12,6 +14,8 @@ def description(
         return description_by_head(df, num_rows)
     elif description_strategy == "dtypes":
         return description_by_dtypes(df)
+    elif description_strategy == "profile":
+        return description_by_profile(df)
     else:
         raise ValueError(f"Unknown description_strategy: {description_strategy}")
 
@@ -48,3 +52,9 @@ def description_by_dtypes(df: pd.DataFrame) -> str:
         {str(df.dtypes.to_markdown())}
         """
     )
+
+
+def description_by_profile(df: pd.DataFrame) -> str:
+    # fixed-size summary (dtypes, cardinality, quantiles, top-k values, stratified sample)
+    # prompt size and build time do not grow with the number of rows
+    return profile_dataframe(df)
@@ -0,0 +1,176 @@
+import sys
+import json
+import time
+import random
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+'''
+로컬 테스트용 가짜 기상청(KMA) API 서버
+- 초단기예보(getUltraSrtFcst), ASOS 시간자료(getWthrDataList) 응답을 흉내냅니다.
+- 경로별 요청 횟수를 기록하므로 캐시/coalescing 동작을 확인할 수 있습니다.
+
+사용법:
+    # 1) 서버 실행 후 weather.py 테스트 모드를 가짜 서버로 연결
+    python fake_kma_server.py serve 8765
+    KMA_API_BASE_URL=http://127.0.0.1:8765/1360000 API_KR_WEATHER_SECRET=dummy python weather.py test
+
+    # 2) kma_client 캐시/coalescing 자체 점검
+    python fake_kma_server.py check
+'''
+
+ULTRA_CATEGORIES = {
+    'T1H': lambda: f"{random.uniform(-5, 30):.1f}",
+    'SKY': lambda: random.choice(['1', '3', '4']),
+    'PTY': lambda: random.choice(['0', '0', '1']),
+    'REH': lambda: str(random.randint(20, 95)),
+    'RN1': lambda: random.choice(['0', '1.0']),
+}
+
+class FakeKMAState:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.counts = {}
+        self.lock = threading.Lock()
+
+    def hit(self, name):
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+def _wrap(items, total=None, page_no=1, num_of_rows=None):
+    return {
+        "response": {
+            "header": {"resultCode": "00", "resultMsg": "NORMAL_SERVICE"},
+            "body": {
+                "dataType": "JSON",
+                "items": {"item": items},
+                "pageNo": page_no,
+                "numOfRows": num_of_rows or len(items),
+                "totalCount": total if total is not None else len(items),
+            },
+        }
+    }
+
+def ultra_forecast_response(params):
+    base_date = params.get('base_date', datetime.now().strftime('%Y%m%d'))
+    base_time = params.get('base_time', '0030')
+    base = datetime.strptime(base_date + base_time, '%Y%m%d%H%M')
+    items = []
+    for category, gen in ULTRA_CATEGORIES.items():
+        for h in range(1, 7):
+            fcst = base.replace(minute=0) + timedelta(hours=h)
+            items.append({
+                "baseDate": base_date, "baseTime": base_time, "category": category,
+                "fcstDate": fcst.strftime('%Y%m%d'), "fcstTime": fcst.strftime('%H00'),
+                "fcstValue": gen(), "nx": int(params.get('nx', 60)), "ny": int(params.get('ny', 127)),
+            })
+    return _wrap(items)
+
+def asos_hourly_response(params):
+    start = datetime.strptime(params['startDt'] + params.get('startHh', '01'), '%Y%m%d%H')
+    end = datetime.strptime(params['endDt'] + params.get('endHh', '23'), '%Y%m%d%H')
+    page_no = int(params.get('pageNo', 1))
+    num_of_rows = int(params.get('numOfRows', 10))
+    rows = []
+    cur = start
+    while cur <= end:
+        # 날짜 기반으로 결정적인 값을 만들어 같은 요청에 같은 응답을 돌려줍니다.
+        seed = random.Random(f"{params.get('stnIds')}-{cur:%Y%m%d%H}")
+        rows.append({
+            "tm": cur.strftime('%Y-%m-%d %H:%M'),
+            "stnId": params.get('stnIds', '108'),
+            "ta": f"{seed.uniform(-10, 35):.1f}",
+            "rn": seed.choice(['', '', '', '0.5', '2.0']),
+            "hm": str(seed.randint(20, 95)),
+        })
+        cur += timedelta(hours=1)
+    page = rows[(page_no - 1) * num_of_rows: page_no * num_of_rows]
+    return _wrap(page, total=len(rows), page_no=page_no, num_of_rows=num_of_rows)
+
+ROUTES = {
+    '/1360000/VilageFcstInfoService_2.0/getUltraSrtFcst': ('ultra', ultra_forecast_response),
+    '/1360000/AsosHourlyInfoService/getWthrDataList': ('asos', asos_hourly_response),
+}
+
+def make_handler(state: FakeKMAState):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            route = ROUTES.get(url.path)
+            if route is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+            name, builder = route
+            state.hit(name)
+            if state.delay: time.sleep(state.delay)
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            body = json.dumps(builder(params), ensure_ascii=False).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json;charset=UTF-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+    return Handler
+
+def start_fake_server(port: int = 0, delay: float = 0.0):
+    '''
+    백그라운드 스레드에서 가짜 서버를 띄웁니다.
+    Returns:
+        tuple: (server, state, base_url)
+    '''
+    state = FakeKMAState(delay=delay)
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/1360000"
+    return server, state, base_url
+
+def run_check():
+    import kma_client
+
+    server, state, base_url = start_fake_server(delay=0.2)
+    api_url = f"{base_url}/VilageFcstInfoService_2.0/getUltraSrtFcst"
+
+    async def main():
+        base_date, base_time, _, expires_at = kma_client.ultra_base_time()
+        nx, ny = kma_client.map_to_grid(37.5665, 126.9780)
+        # 동일 요청 10개를 동시에 → upstream 1회
+        results = await asyncio.gather(*[
+            kma_client.fetch_ultra_forecast_items(api_url, 'dummy', nx, ny, base_date, base_time, expires_at)
+            for _ in range(10)
+        ])
+        assert all(r == results[0] for r in results)
+        assert state.counts.get('ultra') == 1, state.counts
+        # 캐시 hit → upstream 호출 없음
+        start = time.perf_counter()
+        await kma_client.fetch_ultra_forecast_items(api_url, 'dummy', nx, ny, base_date, base_time, expires_at)
+        elapsed = time.perf_counter() - start
+        assert state.counts.get('ultra') == 1, state.counts
+        # 만료된 엔트리 → 다시 요청
+        await kma_client.fetch_ultra_forecast_items(api_url, 'dummy', nx + 1, ny, base_date, base_time, time.time() - 1)
+        await kma_client.fetch_ultra_forecast_items(api_url, 'dummy', nx + 1, ny, base_date, base_time, time.time() - 1)
+        assert state.counts.get('ultra') == 3, state.counts
+        await kma_client.close_client()
+        print(f"[OK] upstream calls: {state.counts}, cache stats: {kma_client.forecast_cache.stats()}, cached call: {elapsed * 1000:.2f} ms")
+        print(f"[OK] map_to_grid cache: {kma_client.map_to_grid.cache_info()}")
+
+    asyncio.run(main())
+    server.shutdown()
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "check":
+        run_check()
+    else:
+        port = int(sys.argv[2]) if len(sys.argv) > 2 else 8765
+        server, state, base_url = start_fake_server(port=port)
+        print(f"[DEBUG] Fake KMA server running at {base_url}", file=sys.stderr)
+        try:
+            while True: time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
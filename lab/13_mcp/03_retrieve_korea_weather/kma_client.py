@@ -0,0 +1,195 @@
+import math
+import time
+import asyncio
+import httpx
+from functools import lru_cache
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+'''
+기상청(KMA) API 공용 클라이언트
+- weather.py, 04_retrieve_korea_weather_on_ec2/server_weather.py 에서 함께 사용합니다.
+- 공유 httpx.AsyncClient (connection pool)
+- 위도/경도 → 격자 좌표 변환 LRU 캐시
+- 초단기예보 응답 캐시 (nx, ny, base_date, base_time) + 동일 요청 coalescing
+'''
+
+SEOUL = ZoneInfo("Asia/Seoul")
+
+_client = None
+_client_loop = None
+
+def get_client() -> httpx.AsyncClient:
+    '''
+    이벤트 루프별로 하나의 httpx.AsyncClient 를 공유합니다.
+    (테스트처럼 asyncio.run 이 여러 번 호출되면 루프가 바뀌므로 새 클라이언트를 만듭니다)
+    '''
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(20.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        )
+        _client_loop = loop
+    return _client
+
+async def close_client():
+    global _client, _client_loop
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client, _client_loop = None, None
+
+@lru_cache(maxsize=1024)
+def map_to_grid(lat, lon) -> tuple[int, int]:
+    '''
+    위도/경도를 격자 좌표로 변환하는 함수
+    Args:
+        lat: 위도
+        lon: 경도
+    Returns:
+        tuple[int, int]: 격자 좌표 (nx, ny)
+    '''
+    RE = 6371.00877     # 지도반경
+    grid = 5.0          # 격자간격 (km)
+    slat1 = 30.0        # 표준위도 1
+    slat2 = 60.0        # 표준위도 2
+    olon = 126.0        # 기준점 경도
+    olat = 38.0         # 기준점 위도
+    xo = 43             # 기준점 X좌표
+    yo = 136            # 기준점 Y좌표
+    PI = math.pi        # PI
+
+    DEGRAD = PI / 180.0
+
+    re = RE / grid
+    slat1 = slat1 * DEGRAD
+    slat2 = slat2 * DEGRAD
+    olon = olon * DEGRAD
+    olat = olat * DEGRAD
+
+    sn = math.tan(PI * 0.25 + slat2 * 0.5) / math.tan(PI * 0.25 + slat1 * 0.5)
+    sn = math.log(math.cos(slat1) / math.cos(slat2)) / math.log(sn)
+    sf = math.tan(PI * 0.25 + slat1 * 0.5)
+    sf = math.pow(sf, sn) * math.cos(slat1) / sn
+    ro = math.tan(PI * 0.25 + olat * 0.5)
+    ro = re * sf / math.pow(ro, sn)
+    ra = math.tan(PI * 0.25 + lat * DEGRAD * 0.5)
+    ra = re * sf / pow(ra, sn)
+
+    theta = lon * DEGRAD - olon
+
+    if theta > PI:
+        theta -= 2.0 * PI
+    if theta < -PI:
+        theta += 2.0 * PI
+
+    theta *= sn
+
+    nx = math.floor(ra * math.sin(theta) + xo + 0.5)
+    ny = math.floor(ro - ra * math.cos(theta) + yo + 0.5)
+
+    return (nx, ny)
+
+def ultra_base_time(now: datetime = None):
+    '''
+    초단기예보 발표 기준 시각 계산
+    Returns:
+        tuple: (base_date, base_time, fcst_time, expires_at)
+            expires_at: 다음 발표 기준 시각으로 바뀌는 시점 (epoch seconds)
+    '''
+    now = now or datetime.now(SEOUL)
+    fcst_time = f"{now.hour:02d}00"
+    base = now - timedelta(hours=1)
+    base_time = f"{base.hour:02d}30"
+    base_date = base.strftime('%Y%m%d')
+    next_issue = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    return base_date, base_time, fcst_time, next_issue.timestamp()
+
+class ForecastCache:
+    '''
+    (nx, ny, base_date, base_time) 키의 예보 캐시
+    - 엔트리는 다음 발표 시각(expires_at)까지 유효
+    - 같은 키로 동시에 들어온 요청은 하나의 upstream 요청(Task)을 공유
+    - 실패(None)는 캐시하지 않음
+    '''
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries = {}
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _prune(self):
+        now = time.time()
+        for key in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+        while len(self._entries) >= self.max_entries:
+            # 가장 먼저 만료되는 엔트리부터 제거
+            del self._entries[min(self._entries, key=lambda k: self._entries[k][0])]
+
+    async def get_or_fetch(self, key, expires_at, fetcher):
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.time():
+            self.hits += 1
+            return entry[1]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.misses += 1
+        task = asyncio.ensure_future(fetcher())
+        self._inflight[key] = task
+        try:
+            value = await asyncio.shield(task)
+        finally:
+            self._inflight.pop(key, None)
+        if value is not None:
+            self._prune()
+            self._entries[key] = (expires_at, value)
+        return value
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced, "entries": len(self._entries)}
+
+forecast_cache = ForecastCache()
+
+async def fetch_ultra_forecast_items(api_url: str, service_key: str, nx: int, ny: int, base_date: str, base_time: str, expires_at: float):
+    '''
+    초단기예보 item 목록(모든 fcstTime 포함)을 반환합니다. 캐시/coalescing 적용.
+    Returns:
+        list[dict] | None
+    '''
+    async def _fetch():
+        params = {
+            'serviceKey' : service_key,
+            'pageNo' : 1,
+            'numOfRows' : '60',
+            'dataType' : 'JSON',
+            'base_date' : base_date, # 발표일자
+            'base_time' : base_time, # 발표시각
+            'nx' : nx,
+            'ny' : ny
+        }
+        response = await get_client().get(api_url, params=params)
+        if response.status_code != 200:
+            return None
+        try:
+            result = response.json()
+        except Exception:
+            return None
+        # body 키가 있는지 확인
+        if (
+            'response' not in result or
+            'body' not in result['response'] or
+            'items' not in result['response']['body'] or
+            'item' not in result['response']['body']['items']
+        ):
+            return None
+        return result['response']['body']['items']['item']
+
+    key = (nx, ny, base_date, base_time)
+    return await forecast_cache.get_or_fetch(key, expires_at, _fetch)
@@ -1,5 +1,3 @@
-import math
-import httpx
 import json
 import collections
 import re
@@ -12,13 +10,23 @@ from mcp.server.fastmcp import FastMCP
 from zoneinfo import ZoneInfo
 from datetime import datetime, timedelta
 
+# 공용 KMA 클라이언트 (pooled httpx client, 격자 변환 LRU, 예보 캐시)
+import kma_client
+import weather_stats
+from kma_client import map_to_grid as _mapToGrid
+
 # Initialize FastMCP server
 mcp = FastMCP("kr-weather")
 
+# KMA API base URL (로컬 테스트 시 fake_kma_server.py 주소로 변경)
+KMA_API_BASE_URL = os.getenv('KMA_API_BASE_URL', 'http://apis.data.go.kr/1360000')
 # 현재 초단기예보
-ULTRA_API_URL = 'http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtFcst'
+ULTRA_API_URL = f'{KMA_API_BASE_URL}/VilageFcstInfoService_2.0/getUltraSrtFcst'
 # 과거 단기 예보
-PAST_OBS_API_URL = 'http://apis.data.go.kr/1360000/AsosHourlyInfoService/getWthrDataList'
+PAST_OBS_API_URL = f'{KMA_API_BASE_URL}/AsosHourlyInfoService/getWthrDataList'
+
+# 과거 날씨 통계 최대 조회 기간 (일)
+MAX_PAST_RANGE_DAYS = int(os.getenv('MAX_PAST_RANGE_DAYS', '366'))
 
 # API 키 설정
 load_dotenv()
@@ -56,61 +64,10 @@ LOCATION_TABLE = {
     # 필요시 추가 도시...
 }
 
-def _mapToGrid(lat, lon) -> tuple[int, int]:
-    '''
-    위도/경도를 격자 좌표로 변환하는 함수
-    Args:
-        lat: 위도
-        lon: 경도
-    Returns:
-        tuple[int, int]: 격자 좌표 (nx, ny)
-    '''
-    RE = 6371.00877     # 지도반경
-    grid = 5.0          # 격자간격 (km)
-    slat1 = 30.0        # 표준위도 1
-    slat2 = 60.0        # 표준위도 2
-    olon = 126.0        # 기준점 경도
-    olat = 38.0         # 기준점 위도
-    xo = 43             # 기준점 X좌표
-    yo = 136            # 기준점 Y좌표
-    PI = math.pi        # PI
-
-    DEGRAD = PI / 180.0
-
-    re = RE / grid
-    slat1 = slat1 * DEGRAD
-    slat2 = slat2 * DEGRAD
-    olon = olon * DEGRAD
-    olat = olat * DEGRAD
-
-    sn = math.tan(PI * 0.25 + slat2 * 0.5) / math.tan(PI * 0.25 + slat1 * 0.5)
-    sn = math.log(math.cos(slat1) / math.cos(slat2)) / math.log(sn)
-    sf = math.tan(PI * 0.25 + slat1 * 0.5)
-    sf = math.pow(sf, sn) * math.cos(slat1) / sn
-    ro = math.tan(PI * 0.25 + olat * 0.5)
-    ro = re * sf / math.pow(ro, sn)    
-    ra = math.tan(PI * 0.25 + lat * DEGRAD * 0.5)
-    ra = re * sf / pow(ra, sn)
-
-    theta = lon * DEGRAD - olon
-
-    if theta > PI:
-        theta -= 2.0 * PI
-    if theta < -PI:
-        theta += 2.0 * PI
-
-    theta *= sn
-
-    nx = math.floor(ra * math.sin(theta) + xo + 0.5)
-    ny = math.floor(ro - ra * math.cos(theta) + yo + 0.5)
-
-    return (nx, ny)
-
-
 async def _fetch_weather(lat: float, lon: float, api_url: str):
-    SEOUL = ZoneInfo("Asia/Seoul")
     '''
     날씨 데이터를 요청하는 함수
+    - 같은 격자/발표시각의 예보는 다음 발표 시각까지 캐시된 응답을 재사용합니다.
     Args:
         lat: 위도
         lon: 경도
@@ -118,43 +75,14 @@ async def _fetch_weather(lat: float, lon: float, api_url: str):
     Returns:
         dict: 날씨 데이터
     '''
-    current_time = datetime.now(SEOUL)
-    fcst_time = f"{current_time.hour:02d}00"
-    current_time = current_time - timedelta(hours=1)
-    base_time = f"{current_time.hour:02d}30"
-    base_date = current_time.strftime('%Y%m%d')
+    base_date, base_time, fcst_time, expires_at = kma_client.ultra_base_time()
     nx, ny = _mapToGrid(lat, lon)
-    params ={
-        'serviceKey' : API_KR_WEATHER_SECRET, 
-        'pageNo' : 1, 
-        'numOfRows' : '60', 
-        'dataType' : 'JSON', 
-        'base_date' : base_date, # 발표일자
-        'base_time' : base_time, # 발표시각
-        'nx' : nx, 
-        'ny' : ny
-    }
-    async with httpx.AsyncClient() as client:
-        response = await client.get(api_url, params=params)
-    if response.status_code != 200:
-        # print("API Error:", response.status_code, response.text, file=sys.stderr)
-        return None
-    try:
-        result = response.json()
-    except Exception as e:
-        # print("JSON 파싱 에러:", e, file=sys.stderr)
-        # print("응답 본문:", response.text, file=sys.stderr)
+    items = await kma_client.fetch_ultra_forecast_items(
+        api_url, API_KR_WEATHER_SECRET, nx, ny, base_date, base_time, expires_at
+    )
+    if not items:
+        # print("API 응답에 body/items/item이 없습니다.", file=sys.stderr)
         return None
-    # body 키가 있는지 확인
-    if (
-        'response' not in result or
-        'body' not in result['response'] or
-        'items' not in result['response']['body'] or
-        'item' not in result['response']['body']['items']
-    ):
-        # print("API 응답에 body/items/item이 없습니다. 전체 응답:", result, file=sys.stderr)
-        return None
-    items = result['response']['body']['items']['item']
     data = {}
     for item in items:
         if item['fcstTime'] == fcst_time:
@@ -226,14 +154,15 @@ async def get_past_weather_stats(
         - (선택) start_hh, end_hh: 시간 단위 조회 시 시작/끝 시각 (기본 01~23)
     - 출력: 
         - 일별 최고/최저기온, 평균 강수량, 온도/강수 설명 (JSON)
+        - 31일을 넘는 기간은 월별 요약(monthly)도 함께 반환 (계절 비교용)
         - location: 지역명, 위도, 경도 정보
     - 제한: 
-        - 최대 2주(14일) 이내만 조회 가능 (초과 시 안내 메시지 반환)
+        - 최대 1년(366일) 이내만 조회 가능 (초과 시 안내 메시지 반환)
     - 예시:
         get_past_weather_stats(location_name="서울", start_dt="20250501", end_dt="20250514")
+        get_past_weather_stats(location_name="서울", start_dt="20250101", end_dt="20250630")
     """
     try:
-        from datetime import datetime, timedelta
         # 도시 정보 lookup
         info = LOCATION_TABLE.get(location_name)
         if not info:
@@ -251,150 +180,39 @@ async def get_past_weather_stats(
         start_date = datetime.strptime(start_dt, '%Y%m%d')
         end_date = datetime.strptime(end_dt, '%Y%m%d')
         delta_days = (end_date - start_date).days + 1
-        if delta_days > 14:
-            new_end_date = start_date + timedelta(days=13)
-            guide = f"요청하신 기간({delta_days}일)은 2주(14일)까지 가능합니다. 2주 이내로 입력해 주세요."
-            # 2주 초과 시 안내 메시지만 반환
-            location_info = {
-                "name": location_name,
-                "latitude": latitude,
-                "longitude": longitude
-            }
-            return json.dumps({"guide": guide, "location": location_info}, ensure_ascii=False, indent=2)
-        else:
-            guide = None
-        # 시간 단위 데이터 요청 (직접 API 호출)
-        params = {
-            'ServiceKey': API_KR_WEATHER_SECRET,
-            'pageNo': '1',
-            'numOfRows': '500',
-            'dataType': 'JSON',
-            'dataCd': 'ASOS',
-            'dateCd': 'HR',
-            'startDt': start_dt,
-            'endDt': end_dt,
-            'stnIds': stn_id,
-            'startHh': start_hh or '01',
-            'endHh': end_hh or '23'
-        }
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            response = await client.get(PAST_OBS_API_URL, params=params)
-        if response.status_code != 200:
-            return f"API Error: {response.status_code} {response.text}"
-        try:
-            data = response.json()
-        except Exception as e:
-            return f"JSON 파싱 에러: {e}\n응답 본문: {response.text}"
-        
-        if (
-            'response' not in data or
-            'body' not in data['response'] or
-            'items' not in data['response']['body'] or
-            'item' not in data['response']['body']['items']
-        ):
-            return f"API 응답에 body/items/item이 없습니다. 전체 응답: {json.dumps(data, ensure_ascii=False)}"
-        
-        items = data['response']['body']['items']['item']
-        # 표 형태 문자열 생성 (기존 raw와 동일하게)
-        result_lines = ["일시      기온(°C)  강수량(mm)"]
-        for item in items:
-            tm = item.get('tm', '-')
-            ta = item.get('ta', '-')
-            rn = item.get('rn', '-')
-            result_lines.append(f"{tm}  {ta}      {rn}")
-        raw = '\n'.join(result_lines)
-        # 파싱: 표 형태 문자열을 라인별로 분리
-        lines = raw.splitlines()
-        if len(lines) < 2:
-            return json.dumps({"error": "데이터 없음", "raw": raw}, ensure_ascii=False)
-        header = lines[0].split()
-        data_lines = lines[1:]
-        records = []
-        for line in data_lines:
-            parts = line.split()
-            if len(parts) < 3:
-                continue
-            tm = f"{parts[0]} {parts[1]}"
-            try:
-                ta = float(parts[2])
-            except Exception as e:
-                # print(f"[WARN] 온도 변환 오류: {parts[2]}, 에러: {e}", file=sys.stderr)
-                ta = None
-            if len(parts) > 3:
-                try:
-                    rn = float(parts[3])
-                except Exception as e:
-                    # print(f"[WARN] 강수량 변환 오류: {parts[3]}, 에러: {e}", file=sys.stderr)
-                    rn = 0.0
-            else:
-                rn = 0.0
-            records.append({"tm": tm, "ta": ta, "rn": rn})
-        if not records:
-            return json.dumps({"error": "데이터 없음", "raw": raw}, ensure_ascii=False)
-        import pandas as pd
-        df = pd.DataFrame(records)
-        df['date'] = df['tm'].str[:10]
-        df['ta'] = pd.to_numeric(df['ta'], errors='coerce').fillna(0)
-        df['rn'] = pd.to_numeric(df['rn'], errors='coerce').fillna(0)
-        result = (
-            df.groupby('date').agg(
-                max_temp=('ta', 'max'),
-                min_temp=('ta', 'min'),
-                avg_rain=('rn', 'mean')
-            ).round(2)
-            .reset_index().set_index('date')
-        )
-        def temp_desc(row):
-            max_t = row['max_temp']
-            if max_t < 10:
-                return '춥다'
-            elif max_t < 20:
-                return '선선하다'
-            elif max_t < 28:
-                return '덥다'
-            else:
-                return '매우 덥다'
-        def rain_desc(row):
-            rain = row['avg_rain']
-            if rain == 0:
-                return '강수 없음'
-            elif rain < 5:
-                return '강수 적음'
-            else:
-                return '강수 많음'
-        result['temp_desc'] = result.apply(temp_desc, axis=1)
-        result['rain_desc'] = result.apply(rain_desc, axis=1)
-        result = result.to_dict(orient='index')
-        # 날짜 구간 전체 생성
-        all_dates = []
-        cur = start_date
-        while cur <= end_date:
-            all_dates.append(cur.strftime('%Y-%m-%d'))
-            cur += timedelta(days=1)
-        # 누락된 날짜는 '데이터 없음'으로 추가
-        for d in all_dates:
-            if d not in result:
-                result[d] = {"error": "데이터 없음"}
-        # (정렬 보장)
-        result = {d: result[d] for d in sorted(result)}
-        # location 정보 추가
         location_info = {
             "name": location_name,
             "latitude": latitude,
             "longitude": longitude
         }
-        if guide:
-            return json.dumps({"guide": guide, "location": location_info, "data": result}, ensure_ascii=False, indent=2)
-        else:
-            return json.dumps({"location": location_info, "data": result}, ensure_ascii=False, indent=2)
+        if delta_days > MAX_PAST_RANGE_DAYS:
+            guide = f"요청하신 기간({delta_days}일)은 {MAX_PAST_RANGE_DAYS}일까지 가능합니다. 기간을 나누어 입력해 주세요."
+            # 최대 기간 초과 시 안내 메시지만 반환
+            return json.dumps({"guide": guide, "location": location_info}, ensure_ascii=False, indent=2)
+        # 시간 단위 데이터 (로컬 Parquet 저장소 + 누락 구간만 API 동시 페이지 요청)
+        try:
+            df = await weather_stats.load_hourly(
+                PAST_OBS_API_URL, API_KR_WEATHER_SECRET, stn_id,
+                start_date, end_date, start_hh, end_hh
+            )
+        except weather_stats.KMAAPIError as e:
+            return str(e)
+        if df.empty:
+            return json.dumps({"error": "데이터 없음"}, ensure_ascii=False)
+        result = weather_stats.frame_to_records(weather_stats.daily_stats(df))
+        # 날짜 구간 전체 생성, 누락된 날짜는 '데이터 없음'으로 추가 (정렬 보장)
+        all_dates = pd.date_range(start_date, end_date, freq='D').strftime('%Y-%m-%d')
+        result = {d: result.get(d, {"error": "데이터 없음"}) for d in all_dates}
+        response = {"location": location_info, "data": result}
+        if delta_days > 31:
+            response["monthly"] = weather_stats.frame_to_records(weather_stats.monthly_stats(df))
+        return json.dumps(response, ensure_ascii=False, indent=2)
     except Exception as e:
         return f"[ERROR] get_past_weather_stats: {e}"
 
 def run_tests():
     import asyncio
     import sys
-    from datetime import datetime, timedelta
-    from zoneinfo import ZoneInfo
     # 지역 정보 변수화
     location_name = "서울"  # 원하는 도시명만 지정
     # 테스트용 시작일, 종료일 변수
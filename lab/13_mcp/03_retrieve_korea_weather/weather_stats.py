@@ -0,0 +1,206 @@
+import os
+import math
+import asyncio
+import tempfile
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+
+import kma_client
+
+'''
+과거 관측(ASOS 시간자료) 통계 파이프라인
+- weather.py, 04_retrieve_korea_weather_on_ec2/server_weather.py 의 get_past_weather_stats 에서 사용합니다.
+- API item → 타입이 지정된 DataFrame 으로 바로 변환 (문자열 표 변환/재파싱 없음)
+- 페이지를 동시에 요청하여 수개월 범위도 조회 가능
+- 이미 받은 관측소-일자 데이터는 로컬 Parquet 저장소에 보관하여 겹치는 범위를 다시 요청하지 않음
+'''
+
+PAGE_SIZE = 999             # ASOS API numOfRows 최대값
+MAX_CONCURRENT_PAGES = 4    # 동시 페이지 요청 수
+ASOS_STORE_DIR = os.getenv('ASOS_STORE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'asos'))
+
+class KMAAPIError(Exception):
+    pass
+
+def items_to_frame(items) -> pd.DataFrame:
+    '''
+    ASOS item(list[dict]) → DataFrame[tm: datetime64, stn_id: str, ta: float64, rn: float64]
+    - ta 변환 실패는 NaN (집계에서 제외), rn 빈 값은 0.0 (강수 없음)
+    '''
+    raw = pd.DataFrame.from_records(items or [], columns=['tm', 'stnId', 'ta', 'rn'])
+    frame = pd.DataFrame({
+        'tm': pd.to_datetime(raw['tm'], format='%Y-%m-%d %H:%M', errors='coerce'),
+        'stn_id': raw['stnId'].astype(str),
+        'ta': pd.to_numeric(raw['ta'], errors='coerce').astype('float64'),
+        'rn': pd.to_numeric(raw['rn'], errors='coerce').fillna(0.0).astype('float64'),
+    })
+    return frame.dropna(subset=['tm']).reset_index(drop=True)
+
+def daily_stats(df: pd.DataFrame) -> pd.DataFrame:
+    '''
+    일별 최고/최저기온, 평균 강수량 및 설명 컬럼 (vectorized)
+    '''
+    result = (
+        df.assign(date=df['tm'].dt.strftime('%Y-%m-%d'))
+        .groupby('date').agg(
+            max_temp=('ta', 'max'),
+            min_temp=('ta', 'min'),
+            avg_rain=('rn', 'mean')
+        ).round(2)
+    )
+    result['temp_desc'] = np.select(
+        [result['max_temp'] < 10, result['max_temp'] < 20, result['max_temp'] < 28, result['max_temp'] >= 28],
+        ['춥다', '선선하다', '덥다', '매우 덥다'],
+        default='정보없음'
+    )
+    result['rain_desc'] = np.select(
+        [result['avg_rain'] == 0, result['avg_rain'] < 5],
+        ['강수 없음', '강수 적음'],
+        default='강수 많음'
+    )
+    return result
+
+def monthly_stats(df: pd.DataFrame) -> pd.DataFrame:
+    '''
+    월별 요약 (계절 비교용)
+    '''
+    hourly = df.assign(month=df['tm'].dt.strftime('%Y-%m'), date=df['tm'].dt.date)
+    daily = hourly.groupby(['month', 'date']).agg(max_temp=('ta', 'max'), min_temp=('ta', 'min'), rain=('rn', 'sum'))
+    return daily.groupby('month').agg(
+        avg_max_temp=('max_temp', 'mean'),
+        avg_min_temp=('min_temp', 'mean'),
+        max_temp=('max_temp', 'max'),
+        min_temp=('min_temp', 'min'),
+        total_rain=('rain', 'sum'),
+        rainy_days=('rain', lambda s: int((s > 0).sum())),
+    ).round(2)
+
+def frame_to_records(result: pd.DataFrame) -> dict:
+    # NaN 은 JSON 으로 직렬화되지 않으므로 None 으로 변환
+    return result.astype(object).where(result.notna(), None).to_dict(orient='index')
+
+async def _fetch_asos_page(api_url, service_key, stn_id, start_dt, end_dt, page_no):
+    params = {
+        'ServiceKey': service_key,
+        'pageNo': str(page_no),
+        'numOfRows': str(PAGE_SIZE),
+        'dataType': 'JSON',
+        'dataCd': 'ASOS',
+        'dateCd': 'HR',
+        'startDt': start_dt,
+        'endDt': end_dt,
+        'stnIds': stn_id,
+        'startHh': '00',
+        'endHh': '23'
+    }
+    response = await kma_client.get_client().get(api_url, params=params)
+    if response.status_code != 200:
+        raise KMAAPIError(f"API Error: {response.status_code} {response.text}")
+    try:
+        data = response.json()
+    except Exception as e:
+        raise KMAAPIError(f"JSON 파싱 에러: {e}\n응답 본문: {response.text}")
+    body = data.get('response', {}).get('body')
+    if not body or 'items' not in body:
+        # 데이터가 없는 구간은 body/items 없이 에러 코드만 오는 경우가 있음
+        header = data.get('response', {}).get('header', {})
+        if header.get('resultCode') == '03':  # NO_DATA
+            return [], 0
+        raise KMAAPIError(f"API 응답에 body/items/item이 없습니다. 전체 응답: {data}")
+    items = body['items'].get('item', []) if isinstance(body['items'], dict) else []
+    return items, int(body.get('totalCount', len(items)))
+
+async def fetch_asos_range(api_url, service_key, stn_id, start_date, end_date) -> pd.DataFrame:
+    '''
+    start_date ~ end_date (포함) 전체 시간자료를 페이지 단위로 동시에 받아 DataFrame 으로 반환
+    '''
+    start_dt, end_dt = start_date.strftime('%Y%m%d'), end_date.strftime('%Y%m%d')
+    first_items, total = await _fetch_asos_page(api_url, service_key, stn_id, start_dt, end_dt, 1)
+    pages = math.ceil(total / PAGE_SIZE)
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+    async def _page(page_no):
+        async with semaphore:
+            items, _ = await _fetch_asos_page(api_url, service_key, stn_id, start_dt, end_dt, page_no)
+            return items
+
+    rest = await asyncio.gather(*[_page(p) for p in range(2, pages + 1)])
+    items = first_items + [item for page in rest for item in page]
+    return items_to_frame(items)
+
+def _contiguous_ranges(dates):
+    # 정렬된 날짜 목록을 연속 구간 [(start, end), ...] 으로 묶음
+    ranges = []
+    for d in dates:
+        if ranges and d - ranges[-1][1] == timedelta(days=1):
+            ranges[-1][1] = d
+        else:
+            ranges.append([d, d])
+    return [tuple(r) for r in ranges]
+
+class AsosStore:
+    '''
+    관측소별 Parquet 파일에 시간자료를 누적 저장합니다.
+    - 완전히 지난 날짜(오늘 이전)만 저장하므로 저장된 일자는 다시 요청할 필요가 없음
+    '''
+    def __init__(self, store_dir: str = ASOS_STORE_DIR):
+        self.store_dir = store_dir
+        self._frames = {}
+        self._locks = {}
+
+    def _path(self, stn_id):
+        return os.path.join(self.store_dir, f"asos_{stn_id}.parquet")
+
+    def lock(self, stn_id):
+        if stn_id not in self._locks:
+            self._locks[stn_id] = asyncio.Lock()
+        return self._locks[stn_id]
+
+    def load(self, stn_id) -> pd.DataFrame:
+        if stn_id not in self._frames:
+            path = self._path(stn_id)
+            self._frames[stn_id] = pd.read_parquet(path) if os.path.exists(path) else items_to_frame([])
+        return self._frames[stn_id]
+
+    def missing_dates(self, stn_id, dates):
+        stored = set(self.load(stn_id)['tm'].dt.date)
+        return [d for d in dates if d.date() not in stored]
+
+    def append(self, stn_id, df: pd.DataFrame):
+        today = datetime.now(kma_client.SEOUL).date()
+        df = df[df['tm'].dt.date < today]
+        if df.empty: return
+        merged = (
+            pd.concat([self.load(stn_id), df], ignore_index=True)
+            .drop_duplicates(subset=['tm'], keep='last')
+            .sort_values('tm')
+            .reset_index(drop=True)
+        )
+        os.makedirs(self.store_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, suffix='.parquet.tmp')
+        os.close(fd)
+        merged.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, self._path(stn_id))
+        self._frames[stn_id] = merged
+
+asos_store = AsosStore()
+
+async def load_hourly(api_url, service_key, stn_id, start_date, end_date, start_hh='01', end_hh='23') -> pd.DataFrame:
+    '''
+    저장소에 없는 날짜만 API 에서 받아 채운 뒤, [start_dt start_hh, end_dt end_hh] 구간의 시간자료를 반환
+    '''
+    dates = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+    async with asos_store.lock(stn_id):
+        missing = asos_store.missing_dates(stn_id, dates)
+        fetched = await asyncio.gather(*[
+            fetch_asos_range(api_url, service_key, stn_id, s, e) for s, e in _contiguous_ranges(missing)
+        ])
+        for df in fetched:
+            asos_store.append(stn_id, df)
+
+    frames = [asos_store.load(stn_id)] + list(fetched)  # 오늘 자료는 저장되지 않으므로 함께 사용
+    df = pd.concat(frames, ignore_index=True).drop_duplicates(subset=['tm'])
+    start = start_date + timedelta(hours=int(start_hh or '01'))
+    end = end_date + timedelta(hours=int(end_hh or '23'))
+    return df[(df['tm'] >= start) & (df['tm'] <= end)].sort_values('tm').reset_index(drop=True)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the research agent's step scheduler.
+
+Runs the full workflow against FakeChatModel / FakeCodeInterpreter (no AWS) with different
+step concurrency limits and compares wall-clock time of the research steps with their serial
+time and critical path. With max_parallel_steps=1 the steps and the processing snippets run one
+by one (understand -> collect -> process -> analyze); higher limits let the query analysis overlap
+with data collection and run the independent processing snippets in separate code interpreter
+sessions. "max active" is the highest number of executeCode calls the fake service saw running
+at the same time.
+
+From the `02-Agent-Core-browser-tool` directory:
+    python -m interactive_tools.benchmark_research_steps
+    python -m interactive_tools.benchmark_research_steps --llm-latency 3 --exec-latency 1
+    python -m interactive_tools.benchmark_research_steps --sessions 2
+"""
+
+import argparse
+import time
+
+from langchain_core.messages import HumanMessage
+from rich.console import Console
+from rich.table import Table
+
+from . import dynamic_research_agent_langgraph
+from .dynamic_research_agent_langgraph import ResearchAgent
+from .fake_code_interpreter import FakeChatModel, FakeCodeInterpreterService
+
+QUERY = "Analyze customer satisfaction trends in e-commerce and identify factors that drive repeat purchases"
+
+
+def run_once(max_parallel_steps: int, max_code_sessions: int, llm_latency: float, exec_latency: float) -> dict:
+    service = FakeCodeInterpreterService(latency=exec_latency)
+    llm = FakeChatModel(latency=llm_latency)
+    agent = ResearchAgent(max_parallel_steps=max_parallel_steps, max_code_sessions=max_code_sessions,
+                          llm=llm, code_client_factory=service.client)
+    with agent:
+        start = time.perf_counter()
+        final_state = agent.create_workflow().invoke({
+            "messages": [HumanMessage(content=QUERY)],
+            "research_query": QUERY,
+            "code_session_id": agent.code_session_id,
+            "research_data": {},
+            "completed_tasks": [],
+            "errors": []
+        })
+        total = time.perf_counter() - start
+    return {
+        "total": total,
+        "report": final_state["research_data"]["step_report"],
+        "completed": len(final_state["completed_tasks"]),
+        "errors": final_state["errors"],
+        "llm_calls": llm.calls,
+        "code_calls": service.invocations,
+        "copies": agent.code_pool.copies,
+        "sessions": service.sessions,
+        "max_active": service.max_active,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Research step scheduler benchmark with fake LLM/code interpreter")
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="Fake LLM latency per call (s)")
+    parser.add_argument("--exec-latency", type=float, default=0.5, help="Fake executeCode latency per call (s)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--sessions", type=int, default=None,
+                        help="Max code interpreter sessions (default: same as the step concurrency)")
+    args = parser.parse_args()
+
+    # Keep the agent's own console output out of the benchmark table
+    dynamic_research_agent_langgraph.console.quiet = True
+
+    table = Table(title=f"Research steps (LLM {args.llm_latency}s, executeCode {args.exec_latency}s)")
+    # parallel: max_parallel_steps, sessions: sessions started / limit, LLM/exec: calls made,
+    # copies: input files copied between sessions (readFiles -> writeFiles),
+    # max active: highest number of concurrent executeCode calls
+    for column in ("parallel", "sessions", "steps (s)", "serial (s)", "critical (s)", "total (s)", "LLM", "exec",
+                   "copies", "max active", "completed", "errors"):
+        table.add_column(column, justify="right")
+
+    last = None
+    for max_parallel_steps in args.concurrency:
+        max_code_sessions = args.sessions or max_parallel_steps
+        result = run_once(max_parallel_steps, max_code_sessions, args.llm_latency, args.exec_latency)
+        report = result["report"]
+        table.add_row(
+            str(max_parallel_steps),
+            f"{result['sessions']}/{max_code_sessions}",
+            f"{report['wall_time']:.2f}",
+            f"{report['serial_time']:.2f}",
+            f"{report['critical_path_time']:.2f}",
+            f"{result['total']:.2f}",
+            str(result["llm_calls"]),
+            str(result["code_calls"]),
+            str(result["copies"]),
+            str(result["max_active"]),
+            str(result["completed"]),
+            str(len(result["errors"])),
+        )
+        last = report
+
+    console = Console()
+    console.print(table)
+    console.print(f"Critical path (max_parallel_steps={args.concurrency[-1]}): {' -> '.join(last['critical_path'])}")
+
+
+if __name__ == "__main__":
+    main()
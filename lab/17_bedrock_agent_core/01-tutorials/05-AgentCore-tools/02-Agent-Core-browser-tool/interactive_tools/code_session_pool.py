@@ -0,0 +1,177 @@
+"""
+Pool of Code Interpreter sessions for running independent code snippets at the same time.
+
+A session runs one call at a time against a single interpreter state and working directory
+(clearContext=False), so concurrent snippets need separate sessions. The pool starts up to
+`max_sessions` sessions on demand and checks out one session per snippet. Each session has its own
+sandbox files, so the pool records which sessions hold each declared output file and copies a
+snippet's input files (readFiles -> writeFiles, text files) into its session before it runs.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+
+def extract_output(result: Dict[str, Any]) -> str:
+    """Text output of a code interpreter call (stdout/stderr, or the text content items)"""
+    if "structuredContent" in result:
+        stdout = result["structuredContent"].get("stdout", "")
+        stderr = result["structuredContent"].get("stderr", "")
+        return stdout + (f"\nSTDERR: {stderr}" if stderr else "")
+    return "\n".join(item.get("text", "") for item in result.get("content", []) if item.get("type") == "text")
+
+
+class CodeSession:
+    """One Code Interpreter session; calls on it are made one at a time"""
+
+    def __init__(self, client: Any, session_id: str):
+        self.client = client
+        self.session_id = session_id
+        self.files: List[str] = []  # result of the last listFiles call
+        self._lock = threading.Lock()
+
+    def invoke(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            return self.client.invoke(method, params)
+
+    def list_files(self) -> List[str]:
+        """List the session's files (and remember them for CodeSessionPool.known_files)"""
+        text = extract_output(self.invoke("listFiles", {"path": ""})).strip()
+        self.files = text.split("\n") if text else []
+        return self.files
+
+    def read_file(self, path: str) -> Optional[str]:
+        """Text content of a sandbox file, or None if it cannot be read as text"""
+        result = self.invoke("readFiles", {"paths": [path]})
+        if result.get("isError"):
+            return None
+        for item in result.get("content", []):
+            if item.get("type") == "resource" and "text" in item.get("resource", {}):
+                return item["resource"]["text"]
+            if item.get("type") == "text":
+                return item.get("text", "")
+        return None
+
+    def write_file(self, path: str, text: str) -> bool:
+        result = self.invoke("writeFiles", {"content": [{"path": path, "text": text}]})
+        return not result.get("isError", False)
+
+
+class CodeSessionPool:
+    """Up to max_sessions Code Interpreter sessions, started on demand"""
+
+    def __init__(self, client_factory: Callable[[], Any], max_sessions: int = 4,
+                 on_start: Optional[Callable[[CodeSession], None]] = None):
+        """
+        Args:
+            client_factory: Returns a new code interpreter client (one client per session)
+            max_sessions: Maximum number of sessions (and concurrent snippets)
+            on_start: Called with each new session before it is used (e.g. to set up directories)
+
+        The first session is started right away (see `primary`).
+        """
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+        self.client_factory = client_factory
+        self.max_sessions = max_sessions
+        self.on_start = on_start
+        self.sessions: List[CodeSession] = []
+        self.copies = 0  # input files copied between sessions
+        self._idle: List[CodeSession] = []
+        self._starting = 0
+        self._holders: Dict[str, Set[CodeSession]] = {}  # file path -> sessions with its latest version
+        self._cond = threading.Condition()
+        self.primary = self._start()
+        self._idle.append(self.primary)
+
+    def _start(self) -> CodeSession:
+        client = self.client_factory()
+        session = CodeSession(client, client.start())
+        if self.on_start:
+            self.on_start(session)
+        with self._cond:
+            self.sessions.append(session)
+        return session
+
+    def _checkout(self, inputs: List[str]) -> CodeSession:
+        with self._cond:
+            while True:
+                if self._idle:
+                    # Prefer the idle session that already holds most of the inputs
+                    session = max(self._idle, key=lambda s: sum(s in self._holders.get(path, ()) for path in inputs))
+                    self._idle.remove(session)
+                    return session
+                if len(self.sessions) + self._starting < self.max_sessions:
+                    self._starting += 1
+                    break
+                self._cond.wait()
+        try:
+            return self._start()
+        finally:
+            with self._cond:
+                self._starting -= 1
+                self._cond.notify_all()
+
+    def _release(self, session: CodeSession) -> None:
+        with self._cond:
+            self._idle.append(session)
+            self._cond.notify_all()
+
+    def _copy_inputs(self, session: CodeSession, inputs: List[str]) -> None:
+        for path in inputs:
+            with self._cond:
+                holders = list(self._holders.get(path, ()))
+            if not holders or session in holders:
+                continue  # pre-existing file, or already there
+            text = holders[0].read_file(path)
+            if text is None or not session.write_file(path, text):
+                continue  # the snippet reports the missing file itself
+            with self._cond:
+                current = self._holders.get(path, set())
+                if holders[0] in current:  # not rewritten by another session in the meantime
+                    current.add(session)
+                self.copies += 1
+
+    @contextmanager
+    def session(self, inputs: Iterable[str] = ()) -> Iterator[CodeSession]:
+        """Check out a session (waiting for one if all are busy) with the given input files in place"""
+        inputs = list(inputs)
+        session = self._checkout(inputs)
+        try:
+            self._copy_inputs(session, inputs)
+            yield session
+        finally:
+            self._release(session)
+
+    def record_outputs(self, session: CodeSession, paths: Iterable[str]) -> None:
+        """Mark session as the only holder of the latest version of these files"""
+        with self._cond:
+            for path in paths:
+                self._holders[path] = {session}
+
+    def read_file(self, path: str) -> Optional[str]:
+        """Read a file from a session that holds it (the primary session if no session recorded it)"""
+        with self._cond:
+            holders = list(self._holders.get(path, ()))
+        return (holders[0] if holders else self.primary).read_file(path)
+
+    def known_files(self) -> List[str]:
+        """Files of all sessions as of their last listFiles call"""
+        with self._cond:
+            sessions = list(self.sessions)
+        return sorted({path for session in sessions for path in session.files})
+
+    def list_files(self) -> List[str]:
+        """List the files of every session (union)"""
+        with self._cond:
+            sessions = list(self.sessions)
+        for session in sessions:
+            session.list_files()
+        return self.known_files()
+
+    def stop(self) -> None:
+        with self._cond:
+            sessions, self.sessions, self._idle = list(self.sessions), [], []
+        for session in sessions:
+            session.client.stop()
@@ -6,7 +6,8 @@ With simplified architecture and robust error handling
 import asyncio
 import json
 import os
-from typing import Dict, List, TypedDict, Optional, Any, Annotated
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, TypedDict, Optional, Any, Annotated, Callable
 from datetime import datetime
 
 from langgraph.graph import StateGraph, END
@@ -18,6 +19,9 @@ from rich.panel import Panel
 from rich.markdown import Markdown
 from rich.syntax import Syntax
 
+from .code_session_pool import CodeSession, CodeSessionPool, extract_output
+from .step_scheduler import ResearchStep, StepScheduler
+
 console = Console()
 
 # Define the agent state
@@ -31,26 +35,146 @@ class AgentState(TypedDict):
     errors: List[str]
 
 
+# Synthetic dataset used by the collect_data step
+SYNTHETIC_DATA_CODE = """
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta
+import random
+import os
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+# Ensure directory exists
+os.makedirs('data', exist_ok=True)
+os.makedirs('visualizations', exist_ok=True)
+
+# Set random seed
+np.random.seed(42)
+
+# Customer IDs
+n_customers = 1000
+customer_ids = [f'CUST{i:05d}' for i in range(n_customers)]
+
+# Date range - last 2 years
+end_date = datetime.now()
+start_date = end_date - timedelta(days=730)
+dates = [start_date + timedelta(days=x) for x in range((end_date - start_date).days + 1)]
+
+# Create purchase data - multiple purchases per customer
+purchases = []
+for cust_id in customer_ids:
+    # Random number of purchases (0 to 15)
+    n_purchases = np.random.poisson(3)  
+    for _ in range(n_purchases):
+        purchase_date = np.random.choice(dates)
+        # Higher probability of purchases in recent months
+        days_ago = (end_date - purchase_date).days
+        if days_ago > 365 and random.random() < 0.5:
+            continue  # Skip some older purchases
+            
+        purchases.append({
+            'customer_id': cust_id,
+            'purchase_date': purchase_date,
+            'product_category': np.random.choice(['Electronics', 'Clothing', 'Home', 'Books', 'Beauty', 'Food', 'Sports']),
+            'amount': round(np.random.gamma(shape=2, scale=25), 2),
+            'satisfaction_score': np.random.choice(range(1, 11), p=[0.01, 0.02, 0.03, 0.05, 0.09, 0.15, 0.25, 0.2, 0.1, 0.1]),
+            'delivery_days': np.random.choice(range(1, 10)),
+            'is_return': np.random.choice([0, 1], p=[0.95, 0.05])
+        })
+
+# Convert to DataFrame
+df = pd.DataFrame(purchases)
+
+# Add more features
+df['is_repeat_purchase'] = df.groupby('customer_id')['purchase_date'].rank(method='first') > 1
+df['is_repeat_purchase'] = df['is_repeat_purchase'].astype(int)
+
+# Calculate customer lifetime value
+customer_stats = df.groupby('customer_id').agg(
+    total_spent=('amount', 'sum'),
+    avg_satisfaction=('satisfaction_score', 'mean'),
+    purchase_count=('purchase_date', 'count')
+).reset_index()
+
+# Save data files
+df.to_csv('data/research_data.csv', index=False)
+customer_stats.to_csv('data/customer_stats.csv', index=False)
+
+# Create a simple visualization
+plt.figure(figsize=(10, 6))
+sns.histplot(df['satisfaction_score'], kde=True, bins=10)
+plt.title('Distribution of Customer Satisfaction Scores')
+plt.xlabel('Satisfaction Score')
+plt.ylabel('Count')
+plt.savefig('visualizations/satisfaction_distribution.png', dpi=300)
+
+print(f"Created dataset with {len(df)} purchases from {n_customers} customers")
+print(f"Data saved to data/research_data.csv")
+print(f"Customer stats saved to data/customer_stats.csv")
+print(f"Basic visualization saved to visualizations/satisfaction_distribution.png")
+print("\\nFirst 5 rows of data:")
+print(df.head())
+print("\\nSummary statistics:")
+print(df.describe())
+"""
+
+# Files written by SYNTHETIC_DATA_CODE that later steps read
+COLLECTED_DATA_FILES = ["data/research_data.csv", "data/customer_stats.csv"]
+
+# Independent snippets of the process_data step: (task, files the snippet saves).
+# Each one only reads data/research_data.csv, so they run at the same time in separate sessions.
+PROCESSING_TASKS = [
+    ("Load data/research_data.csv and clean it for the analysis: "
+     "1. Handle missing values "
+     "2. Remove outliers or cap extreme values "
+     "3. Add derived features useful for the analysis "
+     "4. Save processed data as data/processed_data.csv",
+     ["data/processed_data.csv"]),
+    ("Load data/research_data.csv and create summary statistics and distributions of every column. "
+     "Save summary statistics as data/summary_stats.json",
+     ["data/summary_stats.json"]),
+    ("Load data/research_data.csv and create visualizations showing data quality "
+     "(missing values, outliers, distributions) in the visualizations/ directory",
+     []),
+]
+
+
 class ResearchAgent:
     """Streamlined research agent"""
     
-    def __init__(self, region: str = "us-west-2", model: str = "anthropic.claude-3-5-sonnet-20240620-v1:0"):
+    def __init__(self, region: str = "us-west-2", model: str = "anthropic.claude-3-5-sonnet-20240620-v1:0",
+                 max_parallel_steps: int = 4, max_code_sessions: int = 4, llm=None,
+                 code_client_factory: Optional[Callable[[], Any]] = None):
+        """
+        Args:
+            region: AWS region for Bedrock and the Code Interpreter
+            model: Bedrock model ID used for planning, code generation and the report
+            max_parallel_steps: Maximum research steps (and processing snippets) running at the same time
+                (1 = run them one by one)
+            max_code_sessions: Maximum Code Interpreter sessions; concurrent code runs in separate sessions
+            llm: Chat model to use instead of ChatBedrockConverse (e.g. a fake for offline runs)
+            code_client_factory: Returns a new code interpreter client per session instead of
+                CodeInterpreter (e.g. a fake)
+        """
         self.region = region
         self.model = model
-        self.llm = ChatBedrockConverse(
+        self.max_parallel_steps = max_parallel_steps
+        self.llm = llm or ChatBedrockConverse(
             model=model,
             region_name=region
         )
         
         console.print("[cyan]Initializing Bedrock-AgentCore Tools...[/cyan]")
         
-        # Initialize Code Interpreter session
-        self.code_client = CodeInterpreter(region)
-        self.code_session_id = self.code_client.start()
-        console.print(f"✅ Code Interpreter session: {self.code_session_id}")
-        
-        # Set up working environment
-        self._setup_working_environment()
+        # Code Interpreter sessions: the first one is started now, more (up to max_code_sessions) when
+        # steps run code at the same time. Each new session gets the working environment set up.
+        self.code_pool = CodeSessionPool(
+            code_client_factory or (lambda: CodeInterpreter(region)),
+            max_sessions=max_code_sessions,
+            on_start=self._setup_working_environment
+        )
+        self.code_session_id = self.code_pool.primary.session_id
     
     def __enter__(self):
         return self
@@ -60,11 +184,12 @@ class ResearchAgent:
     
     def cleanup(self):
         console.print("\n[yellow]Cleaning up...[/yellow]")
-        if self.code_client:
-            self.code_client.stop()
+        if self.code_pool:
+            self.code_pool.stop()
     
-    def _setup_working_environment(self):
-        """Set up the working environment in the code interpreter with detailed feedback"""
+    def _setup_working_environment(self, session: CodeSession):
+        """Set up the working environment in a new code interpreter session with detailed feedback"""
+        console.print(f"✅ Code Interpreter session: {session.session_id}")
         setup_code = """
 import os
 import sys
@@ -104,31 +229,20 @@ for root, dirs, files in os.walk('.'):
     for file in files:
         print(f"{indent}    {file}")
 """
-        result = self.code_client.invoke("executeCode", {
+        result = session.invoke("executeCode", {
             "code": setup_code,
             "language": "python",
             "clearContext": False
         })
         console.print(self._extract_output(result))
-    
+
     def _refresh_file_list(self):
-        """Get updated list of files in the sandbox"""
-        result = self.code_client.invoke("listFiles", {"path": ""})
-        return self._extract_output(result).strip().split('\n') if self._extract_output(result).strip() else []
+        """Get updated list of files in the sandboxes (all sessions)"""
+        return self.code_pool.list_files()
     
     def _extract_output(self, result: Dict) -> str:
         """Extract output from code execution result"""
-        if "structuredContent" in result:
-            stdout = result["structuredContent"].get("stdout", "")
-            stderr = result["structuredContent"].get("stderr", "")
-            return stdout + (f"\nSTDERR: {stderr}" if stderr else "")
-        
-        output_parts = []
-        if "content" in result:
-            for item in result["content"]:
-                if item.get("type") == "text":
-                    output_parts.append(item.get("text", ""))
-        return "\n".join(output_parts)
+        return extract_output(result)
     
     def _extract_code_block(self, text: str) -> str:
         """Extract code from text that might contain markdown code blocks"""
@@ -148,8 +262,13 @@ for root, dirs, files in os.walk('.'):
         # If no code block is found, return the whole text
         return text.strip()
     
-    def execute_llm_generated_code(self, task_description: str, context: Dict = None) -> Dict[str, Any]:
-        """Have LLM generate and execute code for the task"""
+    def execute_llm_generated_code(self, task_description: str, context: Dict = None,
+                                   inputs: List[str] = (), outputs: List[str] = ()) -> Dict[str, Any]:
+        """Have LLM generate and execute code for the task
+
+        The code runs in a session checked out from the pool with the `inputs` files copied in;
+        the `outputs` it saves are recorded so later code in other sessions can read them.
+        """
         console.print(f"\n[bold blue]🤖 LLM generating code for:[/bold blue] {task_description}")
         
         # Build prompt with context
@@ -179,54 +298,114 @@ Return ONLY the Python code, no explanations."""
         code_preview = generated_code[:300] + "..." if len(generated_code) > 300 else generated_code
         console.print(Syntax(code_preview, "python"))
         
-        # Execute the code
-        result = self.code_client.invoke("executeCode", {
-            "code": generated_code,
-            "language": "python",
-            "clearContext": False
-        })
-        
-        # Extract output
-        output = self._extract_output(result)
-        
-        # Check for error
-        has_error = result.get("isError", False)
-        if has_error:
-            console.print(f"[red]Execution error:[/red]\n{output}")
-        else:
-            console.print(f"[green]✅ Code executed successfully[/green]")
-        
-        # Get updated file list
-        files = self._refresh_file_list()
+        with self.code_pool.session(inputs) as session:
+            # Execute the code
+            result = session.invoke("executeCode", {
+                "code": generated_code,
+                "language": "python",
+                "clearContext": False
+            })
+            
+            # Extract output
+            output = self._extract_output(result)
+            
+            # Check for error
+            has_error = result.get("isError", False)
+            if has_error:
+                console.print(f"[red]Execution error:[/red]\n{output}")
+            else:
+                console.print(f"[green]✅ Code executed successfully[/green]")
+            
+            # Get updated file list
+            session_files = session.list_files()
+            self.code_pool.record_outputs(session, [path for path in outputs if path in session_files])
         
         return {
             "output": output,
             "error": has_error,
-            "files": files
+            "files": self.code_pool.known_files()
         }
     
     def create_workflow(self) -> StateGraph:
-        """Create a simple linear workflow that attempts all steps"""
+        """Create the workflow: research steps (DAG) -> insights, attempting all steps"""
         workflow = StateGraph(AgentState)
         
         # Add nodes
-        workflow.add_node("understand_query", self.understand_query)
-        workflow.add_node("collect_data", self.collect_data)
-        workflow.add_node("process_data", self.process_data)
-        workflow.add_node("analyze_data", self.analyze_data)
+        workflow.add_node("run_research_steps", self.run_research_steps)
         workflow.add_node("generate_insights", self.generate_insights)
         
-        # Set linear flow - attempt all steps
-        workflow.set_entry_point("understand_query")
-        workflow.add_edge("understand_query", "collect_data")
-        workflow.add_edge("collect_data", "process_data")
-        workflow.add_edge("process_data", "analyze_data")
-        workflow.add_edge("analyze_data", "generate_insights")
+        # understand/collect/process/analyze are scheduled by their dependencies inside run_research_steps
+        workflow.set_entry_point("run_research_steps")
+        workflow.add_edge("run_research_steps", "generate_insights")
         workflow.add_edge("generate_insights", END)
         
         return workflow.compile()
     
-    def understand_query(self, state: AgentState) -> AgentState:
+    def build_research_steps(self) -> List[ResearchStep]:
+        """Declare the research steps with the artifacts each one reads and writes.
+
+        Artifacts are sandbox files, except "query_understanding" which is kept in research_data.
+        understand_query (LLM only) and collect_data (fixed code) do not depend on each other, so
+        they run at the same time; process_data (independent snippets, run concurrently) and
+        analyze_data follow in order.
+        """
+        return [
+            ResearchStep(
+                name="understand_query",
+                outputs=["query_understanding"],
+                run=self.understand_query,
+            ),
+            ResearchStep(
+                name="collect_data",
+                outputs=COLLECTED_DATA_FILES + ["visualizations/satisfaction_distribution.png"],
+                run=self.collect_data,
+            ),
+            ResearchStep(
+                name="process_data",
+                inputs=["query_understanding", "data/research_data.csv"],
+                outputs=[path for _, outputs in PROCESSING_TASKS for path in outputs],
+                run=self.process_data,
+            ),
+            ResearchStep(
+                name="analyze_data",
+                inputs=["query_understanding", "data/processed_data.csv"],
+                outputs=["data/analysis_results.json"],
+                run=self.analyze_data,
+            ),
+        ]
+    
+    def run_research_steps(self, state: AgentState) -> AgentState:
+        """Understand the query and collect, process and analyze data, running independent steps concurrently"""
+        console.print(f"\n[bold magenta]📊 Running research steps "
+                      f"(up to {self.max_parallel_steps} at a time)...[/bold magenta]")
+
+        # Steps read and write their results here (each step uses its own keys)
+        research_data: Dict[str, Any] = {}
+        scheduler = StepScheduler(
+            lambda step: step.run(state, research_data),
+            max_concurrency=self.max_parallel_steps,
+        )
+        report = scheduler.run(self.build_research_steps())
+        console.print(report.to_table())
+
+        # Check if we have errors
+        errors = state["errors"] + [f"Error in step {name}" for name in report.order
+                                    if report.results[name].error]
+
+        return {
+            **state,
+            "research_data": {
+                **state["research_data"],
+                **research_data,
+                "step_report": report.to_dict()
+            },
+            "completed_tasks": state["completed_tasks"] + [
+                name for name in report.order if not report.results[name].skipped
+            ],
+            "errors": errors
+        }
+    
+    def understand_query(self, state: AgentState, research_data: Dict[str, Any]) -> Dict[str, Any]:
         """Understand what the user wants to research"""
         console.print(f"\n[bold magenta]🎯 Understanding research query:[/bold magenta] {state['research_query']}")
         
@@ -267,169 +446,63 @@ Respond in JSON format with the following structure:
                 preview = str(value)[:100] + "..." if len(str(value)) > 100 else str(value)
                 console.print(f"[cyan]• {key}:[/cyan] {preview}")
         
-        return {
-            **state,
-            "research_data": {"query_understanding": json_understanding},
-            "completed_tasks": ["understand_query"],
-            "errors": []
-        }
+        research_data["query_understanding"] = json_understanding
+        return {"output": understanding, "error": False}
     
-    def collect_data(self, state: AgentState) -> AgentState:
+    def collect_data(self, state: AgentState, research_data: Dict[str, Any]) -> Dict[str, Any]:
         """Collect data based on the research query"""
         console.print("\n[bold magenta]📊 Collecting data...[/bold magenta]")
         
         # Always create synthetic data directly
-        synthetic_data_code = """
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-import random
-import os
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-# Ensure directory exists
-os.makedirs('data', exist_ok=True)
-os.makedirs('visualizations', exist_ok=True)
-
-# Set random seed
-np.random.seed(42)
-
-# Customer IDs
-n_customers = 1000
-customer_ids = [f'CUST{i:05d}' for i in range(n_customers)]
-
-# Date range - last 2 years
-end_date = datetime.now()
-start_date = end_date - timedelta(days=730)
-dates = [start_date + timedelta(days=x) for x in range((end_date - start_date).days + 1)]
-
-# Create purchase data - multiple purchases per customer
-purchases = []
-for cust_id in customer_ids:
-    # Random number of purchases (0 to 15)
-    n_purchases = np.random.poisson(3)  
-    for _ in range(n_purchases):
-        purchase_date = np.random.choice(dates)
-        # Higher probability of purchases in recent months
-        days_ago = (end_date - purchase_date).days
-        if days_ago > 365 and random.random() < 0.5:
-            continue  # Skip some older purchases
-            
-        purchases.append({
-            'customer_id': cust_id,
-            'purchase_date': purchase_date,
-            'product_category': np.random.choice(['Electronics', 'Clothing', 'Home', 'Books', 'Beauty', 'Food', 'Sports']),
-            'amount': round(np.random.gamma(shape=2, scale=25), 2),
-            'satisfaction_score': np.random.choice(range(1, 11), p=[0.01, 0.02, 0.03, 0.05, 0.09, 0.15, 0.25, 0.2, 0.1, 0.1]),
-            'delivery_days': np.random.choice(range(1, 10)),
-            'is_return': np.random.choice([0, 1], p=[0.95, 0.05])
-        })
-
-# Convert to DataFrame
-df = pd.DataFrame(purchases)
-
-# Add more features
-df['is_repeat_purchase'] = df.groupby('customer_id')['purchase_date'].rank(method='first') > 1
-df['is_repeat_purchase'] = df['is_repeat_purchase'].astype(int)
-
-# Calculate customer lifetime value
-customer_stats = df.groupby('customer_id').agg(
-    total_spent=('amount', 'sum'),
-    avg_satisfaction=('satisfaction_score', 'mean'),
-    purchase_count=('purchase_date', 'count')
-).reset_index()
-
-# Save data files
-df.to_csv('data/research_data.csv', index=False)
-customer_stats.to_csv('data/customer_stats.csv', index=False)
-
-# Create a simple visualization
-plt.figure(figsize=(10, 6))
-sns.histplot(df['satisfaction_score'], kde=True, bins=10)
-plt.title('Distribution of Customer Satisfaction Scores')
-plt.xlabel('Satisfaction Score')
-plt.ylabel('Count')
-plt.savefig('visualizations/satisfaction_distribution.png', dpi=300)
-
-print(f"Created dataset with {len(df)} purchases from {n_customers} customers")
-print(f"Data saved to data/research_data.csv")
-print(f"Customer stats saved to data/customer_stats.csv")
-print(f"Basic visualization saved to visualizations/satisfaction_distribution.png")
-print("\\nFirst 5 rows of data:")
-print(df.head())
-print("\\nSummary statistics:")
-print(df.describe())
-"""
-        
-        # Execute the data creation code directly
-        result = self.code_client.invoke("executeCode", {
-            "code": synthetic_data_code,
-            "language": "python",
-            "clearContext": False
-        })
+        with self.code_pool.session() as session:
+            result = session.invoke("executeCode", {
+                "code": SYNTHETIC_DATA_CODE,
+                "language": "python",
+                "clearContext": False
+            })
+            session.list_files()
+            self.code_pool.record_outputs(session, COLLECTED_DATA_FILES)
         
         output = self._extract_output(result)
         console.print(output)
         
-        # Check if we have errors
-        errors = state["errors"]
-        if result.get("isError", False):
-            errors.append("Error generating synthetic data")
-        
-        return {
-            **state,
-            "research_data": {
-                **state["research_data"],
-                "data_collection_output": output
-            },
-            "completed_tasks": state["completed_tasks"] + ["collect_data"],
-            "errors": errors
-        }
+        research_data["data_collection_output"] = output
+        return {"output": output, "error": result.get("isError", False)}
     
-    def process_data(self, state: AgentState) -> AgentState:
-        """Process and clean the collected data"""
+    def process_data(self, state: AgentState, research_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Process and clean the collected data (independent snippets run concurrently)"""
         console.print("\n[bold magenta]🔧 Processing data...[/bold magenta]")
         
-        # LLM generates data processing code
-        result = self.execute_llm_generated_code(
-            "Load data/research_data.csv and perform thorough data processing: "
-            "1. Handle missing values "
-            "2. Remove outliers or cap extreme values "
-            "3. Create summary statistics and distributions "
-            "4. Add derived features useful for the analysis "
-            "5. Create visualizations showing data quality "
-            "6. Save processed data as data/processed_data.csv "
-            "7. Save summary statistics as data/summary_stats.json",
-            context=state["research_data"]
-        )
-        
-        # Check if we have errors
-        errors = state["errors"]
-        if result["error"]:
-            errors.append("Error processing data")
-        
+        # LLM generates and runs the code of each processing snippet, up to max_parallel_steps at a time
+        context = dict(research_data)
+        with ThreadPoolExecutor(max_workers=min(len(PROCESSING_TASKS), self.max_parallel_steps),
+                                thread_name_prefix="process-data") as executor:
+            futures = [
+                executor.submit(self.execute_llm_generated_code, task, context,
+                                inputs=["data/research_data.csv"], outputs=outputs)
+                for task, outputs in PROCESSING_TASKS
+            ]
+            results = [future.result() for future in futures]
+        
+        output = "\n\n".join(result["output"] for result in results)
+        research_data["processing_output"] = output
+        research_data["available_files"] = self.code_pool.known_files()
         return {
-            **state,
-            "research_data": {
-                **state["research_data"],
-                "processing_output": result["output"],
-                "available_files": result["files"]
-            },
-            "completed_tasks": state["completed_tasks"] + ["process_data"],
-            "errors": errors
+            "output": output,
+            "error": any(result["error"] for result in results),
+            "files": research_data["available_files"]
         }
     
-    def analyze_data(self, state: AgentState) -> AgentState:
+    def analyze_data(self, state: AgentState, research_data: Dict[str, Any]) -> Dict[str, Any]:
         """Perform analysis on the processed data"""
         console.print("\n[bold magenta]📈 Analyzing data...[/bold magenta]")
         
-        # Find the best data file to use
-        available_files = state["research_data"].get("available_files", [])
+        # Find the best data file to use (processing may have failed)
+        available_files = research_data.get("available_files", [])
         data_file = 'data/processed_data.csv' if 'data/processed_data.csv' in available_files else 'data/research_data.csv'
         
         # Get understanding to guide analysis
-        understanding = state["research_data"].get("query_understanding", {})
+        understanding = research_data.get("query_understanding", {})
         
         # LLM generates analysis code based on the research query
         result = self.execute_llm_generated_code(
@@ -444,25 +517,15 @@ print(df.describe())
             context={
                 "query": state["research_query"],
                 "understanding": understanding,
-                "available_files": state["research_data"].get("available_files", [])
-            }
+                "available_files": available_files
+            },
+            inputs=[data_file],
+            outputs=["data/analysis_results.json"]
         )
         
-        # Check if we have errors
-        errors = state["errors"]
-        if result["error"]:
-            errors.append("Error analyzing data")
-        
-        return {
-            **state,
-            "research_data": {
-                **state["research_data"],
-                "analysis_output": result["output"],
-                "available_files": result["files"]
-            },
-            "completed_tasks": state["completed_tasks"] + ["analyze_data"],
-            "errors": errors
-        }
+        research_data["analysis_output"] = result["output"]
+        research_data["available_files"] = result["files"]
+        return result
     
     def generate_insights(self, state: AgentState) -> AgentState:
         """Generate final report with insights regardless of previous step success"""
@@ -481,8 +544,7 @@ print(df.describe())
         analysis_data = {}
         if 'data/analysis_results.json' in available_files:
             try:
-                result = self.code_client.invoke("readFiles", {"paths": ["data/analysis_results.json"]})
-                analysis_content = self._extract_output(result)
+                analysis_content = self.code_pool.read_file("data/analysis_results.json")
                 analysis_data = json.loads(analysis_content) if analysis_content else {}
             except Exception:
                 console.print("[yellow]Could not load analysis results[/yellow]")
@@ -512,10 +574,11 @@ Format as a complete professional markdown document with proper headings, bullet
         
         # Save the report directly
         try:
-            save_result = self.code_client.invoke("executeCode", {
-                "code": f"import os\nos.makedirs('reports', exist_ok=True)\nwith open('reports/final_report.md', 'w') as f:\n    f.write('''{report_content}''')\nprint('Report saved successfully to reports/final_report.md')",
-                "language": "python"
-            })
+            with self.code_pool.session() as session:
+                save_result = session.invoke("executeCode", {
+                    "code": f"import os\nos.makedirs('reports', exist_ok=True)\nwith open('reports/final_report.md', 'w') as f:\n    f.write('''{report_content}''')\nprint('Report saved successfully to reports/final_report.md')",
+                    "language": "python"
+                })
             console.print(self._extract_output(save_result))
         except Exception as e:
             console.print(f"[yellow]Could not save report file: {e}[/yellow]")
@@ -545,7 +608,7 @@ Format as a complete professional markdown document with proper headings, bullet
         }
 
 
-async def run_research(query: str):
+async def run_research(query: str, max_parallel_steps: int = 4, max_code_sessions: int = 4):
     """Run research with dynamic LLM-generated code"""
     console.print(Panel(
         f"[bold cyan]🚀 Dynamic Research Agent[/bold cyan]\n\n"
@@ -554,7 +617,7 @@ async def run_research(query: str):
         border_style="blue"
     ))
     
-    with ResearchAgent() as agent:
+    with ResearchAgent(max_parallel_steps=max_parallel_steps, max_code_sessions=max_code_sessions) as agent:
         workflow = agent.create_workflow()
         
         initial_state = {
@@ -0,0 +1,158 @@
+"""
+Offline stand-ins for the Code Interpreter client and the Bedrock chat model.
+
+They let the research agent run end to end without AWS so that the step scheduler's wall-clock
+time can be measured:
+
+- FakeCodeInterpreter does not run any code. It sleeps for a fixed latency, tracks which sandbox
+  files the code reads and writes (read_csv/open vs to_csv/savefig/open(..., 'w')), and fails the
+  invocation when an input file does not exist yet, so a dependency violation shows up as an error.
+  Each client is one session with its own files (like separate sandboxes), so a file that was not
+  copied into the session also shows up as an error. FakeCodeInterpreterService creates the clients
+  and counts executeCode calls across all sessions, including the highest number running at once.
+- FakeChatModel answers the agent's three prompt types (query analysis, code generation, report)
+  after a fixed latency. Generated code reads the files the task loads ("Load <file>") and writes the
+  files it saves ("... as <file>").
+"""
+
+import json
+import re
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+_READ_PATTERNS = [
+    re.compile(r"read_csv\(\s*['\"]([^'\"]+)['\"]"),
+    re.compile(r"open\(\s*['\"]([^'\"]+)['\"]\s*\)"),
+]
+_WRITE_PATTERNS = [
+    re.compile(r"(?:to_csv|savefig)\(\s*['\"]([^'\"]+)['\"]"),
+    re.compile(r"open\(\s*['\"]([^'\"]+)['\"]\s*,\s*['\"][wa]"),
+]
+_TASK_INPUTS = re.compile(r"Load ([\w/]+\.csv)")
+_TASK_OUTPUTS = re.compile(r" as ([\w/]+\.(?:csv|json))")
+
+
+def _text_result(text: str, is_error: bool = False) -> Dict[str, Any]:
+    return {"content": [{"type": "text", "text": text}], "isError": is_error}
+
+
+class FakeCodeInterpreterService:
+    """Creates fake sessions (client_factory for CodeSessionPool) and counts their calls"""
+
+    def __init__(self, latency: float = 0.5, file_latency: float = 0.05):
+        self.latency = latency            # per executeCode call
+        self.file_latency = file_latency  # per readFiles/writeFiles call
+        self.sessions = 0
+        self.invocations = 0
+        self.file_calls = 0
+        self.active = 0
+        self.max_active = 0   # highest number of concurrent executeCode calls seen (all sessions)
+        self._lock = threading.Lock()
+
+    def client(self) -> "FakeCodeInterpreter":
+        return FakeCodeInterpreter(self)
+
+
+class FakeCodeInterpreter:
+    """Code Interpreter client stub (one session) with fixed latencies and an in-memory file list"""
+
+    def __init__(self, service: FakeCodeInterpreterService):
+        self.service = service
+        self.files: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> str:
+        with self.service._lock:
+            self.service.sessions += 1
+        return f"fake-{uuid.uuid4().hex[:8]}"
+
+    def stop(self) -> None:
+        pass
+
+    def invoke(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        if method == "executeCode":
+            return self._execute(params["code"])
+        if method == "listFiles":
+            with self._lock:
+                return _text_result("\n".join(sorted(self.files)))
+        if method == "readFiles":
+            self._file_call()
+            with self._lock:
+                missing = [path for path in params["paths"] if path not in self.files]
+                if missing:
+                    return _text_result(f"FileNotFoundError: {', '.join(missing)}", is_error=True)
+                return {"content": [{"type": "resource", "resource": {"uri": f"file:///{path}", "text": self.files[path]}}
+                                    for path in params["paths"]], "isError": False}
+        if method == "writeFiles":
+            self._file_call()
+            with self._lock:
+                for item in params["content"]:
+                    self.files[item["path"]] = item["text"]
+            return _text_result(f"Wrote {[item['path'] for item in params['content']]}")
+        raise ValueError(f"Unsupported method: {method}")
+
+    def _file_call(self) -> None:
+        with self.service._lock:
+            self.service.file_calls += 1
+        time.sleep(self.service.file_latency)
+
+    def _execute(self, code: str) -> Dict[str, Any]:
+        service = self.service
+        reads = {path for pattern in _READ_PATTERNS for path in pattern.findall(code)}
+        writes = {path for pattern in _WRITE_PATTERNS for path in pattern.findall(code)}
+        with service._lock:
+            service.invocations += 1
+            service.active += 1
+            service.max_active = max(service.max_active, service.active)
+        try:
+            time.sleep(service.latency)
+            with self._lock:
+                missing = sorted(path for path in reads - writes if path not in self.files)
+                if missing:
+                    return _text_result(f"FileNotFoundError: {', '.join(missing)}", is_error=True)
+                for path in writes:
+                    self.files[path] = "{}" if path.endswith(".json") else "fake"
+            return _text_result(f"Read {sorted(reads)}, wrote {sorted(writes)}")
+        finally:
+            with service._lock:
+                service.active -= 1
+
+
+class FakeChatModel:
+    """Chat model stub: answers query analysis, code generation and report prompts after a fixed latency"""
+
+    def __init__(self, latency: float = 1.0):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, messages: List[Any]) -> SimpleNamespace:
+        prompt = messages[-1].content
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+
+        if prompt.startswith("Analyze this research query"):
+            return SimpleNamespace(content=json.dumps({
+                "data_points": ["satisfaction_score", "purchase_date", "is_repeat_purchase"],
+                "analysis_techniques": ["trend analysis", "correlation", "segmentation"],
+                "expected_insights": ["drivers of repeat purchases"],
+                "recommended_visualizations": ["line chart", "heatmap"],
+            }))
+        if "Task:" in prompt:
+            return SimpleNamespace(content=self._generate_code(prompt))
+        return SimpleNamespace(content="# Research Report\n\nGenerated offline by FakeChatModel.")
+
+    @staticmethod
+    def _generate_code(prompt: str) -> str:
+        task = prompt.split("Task:", 1)[1].split("\n", 1)[0].strip()
+        lines = ["```python", "import pandas as pd"]
+        for path in _TASK_INPUTS.findall(task):
+            lines.append(f"df = pd.read_csv('{path}')")
+        for path in _TASK_OUTPUTS.findall(task):
+            lines.append(f"df.to_csv('{path}')" if path.endswith(".csv") else f"open('{path}', 'w').write('{{}}')")
+        lines.append("```")
+        return "\n".join(lines)
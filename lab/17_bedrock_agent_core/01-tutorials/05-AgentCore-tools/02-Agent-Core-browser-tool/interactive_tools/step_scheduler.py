@@ -0,0 +1,247 @@
+"""
+Dependency-aware step scheduler for Code Interpreter research steps.
+
+Each step declares the artifacts (sandbox files or in-memory results) it reads and writes. The
+scheduler derives a DAG from those declarations, runs every step whose producers have finished
+(up to a concurrency limit), and reports per-step timings with the critical path.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from rich.table import Table
+
+
+@dataclass
+class ResearchStep:
+    """A unit of research work (LLM calls and/or code interpreter invocations)"""
+    name: str
+    inputs: List[str] = field(default_factory=list)   # artifacts read (files produced by other steps or pre-existing)
+    outputs: List[str] = field(default_factory=list)  # artifacts written
+    run: Optional[Callable[..., Dict[str, Any]]] = None  # step function, returns {"output": str, "error": bool}
+
+
+@dataclass
+class StepResult:
+    """Outcome and timing of a single step (times are seconds since the run started)"""
+    name: str
+    depends_on: List[str]
+    output: str = ""
+    error: bool = False
+    skipped: bool = False
+    ready_at: float = 0.0
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    on_critical_path: bool = False
+
+    @property
+    def duration(self) -> float:
+        return self.finished_at - self.started_at
+
+    @property
+    def queued(self) -> float:
+        return self.started_at - self.ready_at
+
+
+@dataclass
+class StepReport:
+    """Per-step results plus run-level totals"""
+    results: Dict[str, StepResult]
+    order: List[str]
+    wall_time: float
+    critical_path: List[str]
+
+    @property
+    def critical_path_time(self) -> float:
+        return sum(self.results[name].duration for name in self.critical_path)
+
+    @property
+    def serial_time(self) -> float:
+        """Time the same steps would take one after another"""
+        return sum(result.duration for result in self.results.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "wall_time": round(self.wall_time, 3),
+            "serial_time": round(self.serial_time, 3),
+            "critical_path": self.critical_path,
+            "critical_path_time": round(self.critical_path_time, 3),
+            "steps": {
+                name: {
+                    "depends_on": result.depends_on,
+                    "started_at": round(result.started_at, 3),
+                    "duration": round(result.duration, 3),
+                    "queued": round(result.queued, 3),
+                    "error": result.error,
+                    "skipped": result.skipped,
+                    "on_critical_path": result.on_critical_path,
+                }
+                for name, result in ((name, self.results[name]) for name in self.order)
+            },
+        }
+
+    def to_table(self) -> Table:
+        table = Table(title=f"Step report: wall {self.wall_time:.2f}s, serial {self.serial_time:.2f}s, "
+                            f"critical path {self.critical_path_time:.2f}s")
+        table.add_column("Step")
+        table.add_column("Depends on")
+        table.add_column("Start", justify="right")
+        table.add_column("Duration", justify="right")
+        table.add_column("Queued", justify="right")
+        table.add_column("Status")
+        for name in self.order:
+            result = self.results[name]
+            status = "skipped" if result.skipped else "error" if result.error else "ok"
+            table.add_row(
+                f"[bold]{name}[/bold] *" if result.on_critical_path else name,
+                ", ".join(result.depends_on) or "-",
+                f"{result.started_at:.2f}s",
+                f"{result.duration:.2f}s",
+                f"{result.queued:.2f}s",
+                status,
+            )
+        table.caption = "* on the critical path"
+        return table
+
+
+def build_step_graph(steps: List[ResearchStep]) -> Dict[str, List[str]]:
+    """
+    Derive step dependencies from declared inputs/outputs.
+
+    A step depends on the step that produces any of its inputs. Inputs that no step produces are
+    treated as pre-existing sandbox files.
+
+    Returns:
+        Mapping of step name -> names of the steps it depends on (in declaration order)
+
+    Raises:
+        ValueError: duplicate step names, an artifact produced by two steps, or a dependency cycle
+    """
+    producers: Dict[str, str] = {}
+    names = [step.name for step in steps]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate step names: {names}")
+    for step in steps:
+        for artifact in step.outputs:
+            if artifact in producers:
+                raise ValueError(f"Artifact '{artifact}' is produced by both '{producers[artifact]}' and '{step.name}'")
+            producers[artifact] = step.name
+
+    graph = {}
+    for step in steps:
+        depends_on = []
+        for artifact in step.inputs:
+            producer = producers.get(artifact)
+            if producer is not None and producer != step.name and producer not in depends_on:
+                depends_on.append(producer)
+        graph[step.name] = depends_on
+
+    # Kahn's algorithm to reject cycles up front
+    remaining = {name: len(depends_on) for name, depends_on in graph.items()}
+    dependents = {name: [other for other, deps in graph.items() if name in deps] for name in graph}
+    ready = [name for name, count in remaining.items() if count == 0]
+    visited = 0
+    while ready:
+        name = ready.pop()
+        visited += 1
+        for dependent in dependents[name]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                ready.append(dependent)
+    if visited != len(graph):
+        cycle = [name for name, count in remaining.items() if count > 0]
+        raise ValueError(f"Dependency cycle between steps: {cycle}")
+    return graph
+
+
+class StepScheduler:
+    """Runs research steps as a DAG with bounded concurrency"""
+
+    def __init__(self, run_step: Callable[[ResearchStep], Dict[str, Any]], max_concurrency: int = 4,
+                 skip_on_failure: bool = False):
+        """
+        Args:
+            run_step: Executes one step and returns {"output": str, "error": bool}
+            max_concurrency: Maximum number of steps running at the same time
+            skip_on_failure: Skip steps whose dependencies failed (default: still attempt them,
+                like the linear workflow which attempts every step)
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.run_step = run_step
+        self.max_concurrency = max_concurrency
+        self.skip_on_failure = skip_on_failure
+
+    def _execute(self, step: ResearchStep, result: StepResult, start: float) -> StepResult:
+        result.started_at = time.perf_counter() - start
+        try:
+            outcome = self.run_step(step)
+            result.output = outcome.get("output", "")
+            result.error = bool(outcome.get("error", False))
+        except Exception as e:
+            result.output = f"{type(e).__name__}: {e}"
+            result.error = True
+        result.finished_at = time.perf_counter() - start
+        return result
+
+    def run(self, steps: List[ResearchStep]) -> StepReport:
+        """Run all steps, starting each one as soon as the steps it depends on have finished."""
+        graph = build_step_graph(steps)
+        by_name = {step.name: step for step in steps}
+        results = {name: StepResult(name=name, depends_on=depends_on) for name, depends_on in graph.items()}
+        pending = dict(graph)
+        done = set()
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="research-step") as executor:
+            running = {}
+            while pending or running:
+                # Submit every step whose dependencies are finished (declaration order breaks ties)
+                for name in [name for name, deps in pending.items() if all(dep in done for dep in deps)]:
+                    del pending[name]
+                    result = results[name]
+                    result.ready_at = time.perf_counter() - start
+                    failed = [dep for dep in graph[name] if results[dep].error or results[dep].skipped]
+                    if self.skip_on_failure and failed:
+                        result.skipped = True
+                        result.output = f"Skipped: dependencies failed ({', '.join(failed)})"
+                        result.started_at = result.finished_at = result.ready_at
+                        done.add(name)
+                        continue
+                    running[executor.submit(self._execute, by_name[name], result, start)] = name
+                if not running:
+                    continue  # only skipped steps were released; re-check what became ready
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done.add(running.pop(future))
+
+        wall_time = time.perf_counter() - start
+        order = sorted(results, key=lambda name: (results[name].started_at, list(graph).index(name)))
+        critical_path = self._critical_path(graph, results)
+        for name in critical_path:
+            results[name].on_critical_path = True
+        return StepReport(results=results, order=order, wall_time=wall_time, critical_path=critical_path)
+
+    @staticmethod
+    def _critical_path(graph: Dict[str, List[str]], results: Dict[str, StepResult]) -> List[str]:
+        """Longest chain of dependent steps by measured duration"""
+        longest: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+
+        def visit(name: str) -> float:
+            if name not in longest:
+                best_dep = max(graph[name], key=visit, default=None)
+                longest[name] = results[name].duration + (longest[best_dep] if best_dep else 0.0)
+                previous[name] = best_dep
+            return longest[name]
+
+        if not graph:
+            return []
+        tail = max(graph, key=visit)
+        path = []
+        while tail is not None:
+            path.append(tail)
+            tail = previous[tail]
+        return list(reversed(path))
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Benchmark dashboard refresh: full rescan vs incremental results index.
+
+Generates a synthetic evaluation history (evaluation_output/ + evaluation_input/) in a temporary
+directory and times dashboard data generation:
+
+- full scan: re-read and re-parse every file (results_index_path=None)
+- index cold: first refresh, every file is ingested
+- index warm: no new files (dashboard_data.js is already current and is not rewritten)
+- index +N: after N new evaluation runs
+
+It also checks that the indexed dashboard data matches the full-scan aggregation.
+
+Usage:
+    python benchmark_results_index.py
+    python benchmark_results_index.py --results 20000 --keep
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from utils import EvaluationClient
+from utils.constants import EVALUATION_INPUT_DIR, EVALUATION_OUTPUT_DIR
+
+EVALUATORS = ["Builtin.Helpfulness", "Builtin.Correctness", "Builtin.Faithfulness",
+              "Builtin.ResponseRelevance", "Builtin.Conciseness"]
+TRACES_PER_SESSION = 3
+RUNS_PER_SESSION = 10
+START_TIME = datetime(2025, 1, 1)
+
+
+def write_run(run: int, session_id: str, experiment: str) -> None:
+    """One evaluate_session() output file: one result per evaluator on one of the session's traces."""
+    trace_id = f"{session_id}-trace-{run % TRACES_PER_SESSION}"
+    timestamp = (START_TIME + timedelta(seconds=run)).strftime("%Y%m%d_%H%M%S")
+    results = [
+        {
+            "evaluator_id": evaluator,
+            "evaluator_name": evaluator,
+            "evaluator_arn": f"arn:aws:bedrock-agentcore:::evaluator/{evaluator}",
+            "value": round(((run * 7 + i * 13) % 100) / 100, 2),
+            "label": "Good" if (run + i) % 3 else "Poor",
+            "explanation": "The response addresses the user's question with relevant details. " * 4,
+            "context": {"spanContext": {"sessionId": session_id, "traceId": trace_id}},
+            "token_usage": {"inputTokens": 1200 + i, "outputTokens": 150 + i},
+            "error": None,
+        }
+        for i, evaluator in enumerate(EVALUATORS)
+    ]
+    data = {"session_id": session_id, "results": results,
+            "metadata": {"experiment": experiment, "description": f"run {run}"}}
+    with open(f"{EVALUATION_OUTPUT_DIR}/output_{session_id}_{timestamp}.json", "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def write_input(session_id: str, trace: int) -> None:
+    """Spans saved with auto_save_input=True for one trace."""
+    trace_id = f"{session_id}-trace-{trace}"
+    spans = [
+        {
+            "traceId": trace_id,
+            "spanId": f"{trace_id}-span-{i}",
+            "timeUnixNano": 1_700_000_000_000_000_000 + i * 250_000_000,
+            "attributes": {"session.id": session_id, "gen_ai.usage.input_tokens": 300, "gen_ai.usage.output_tokens": 80},
+            "body": {
+                "input": {"messages": [{"role": "user", "content": {"content": "What is my BMI?"}}]},
+                "output": {"messages": [{"role": "assistant", "content": {"message": "Your BMI is 22.5."}}]},
+            },
+        }
+        for i in range(4)
+    ]
+    with open(f"{EVALUATION_INPUT_DIR}/input_{trace_id}.json", "w") as f:
+        json.dump(spans, f)
+
+
+def timed(function):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = function()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full rescan vs incremental results index")
+    parser.add_argument("--results", type=int, default=100_000, help="Number of evaluation results in the history")
+    parser.add_argument("--new-runs", type=int, default=100, help="Evaluation runs added before the incremental refresh")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated directory")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="eval-index-bench-")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        os.makedirs(EVALUATION_OUTPUT_DIR)
+        os.makedirs(EVALUATION_INPUT_DIR)
+        runs = args.results // len(EVALUATORS)
+        sessions = max(1, runs // RUNS_PER_SESSION)
+        start = time.perf_counter()
+        for run in range(runs):
+            write_run(run, f"sess-{run % sessions:06d}", f"exp-{run % 4}")
+        for session in range(sessions):
+            for trace in range(TRACES_PER_SESSION):
+                write_input(f"sess-{session:06d}", trace)
+        print(f"Generated {runs * len(EVALUATORS)} results in {runs} output files, {sessions} sessions, "
+              f"{sessions * TRACES_PER_SESSION} input files ({time.perf_counter() - start:.1f}s) in {workdir}")
+
+        full_scan = EvaluationClient(boto_client=object(), results_index_path=None)
+        indexed = EvaluationClient(boto_client=object())
+
+        rows = []
+        elapsed, (_, session_count, total) = timed(full_scan._generate_dashboard_data)
+        rows.append(("full scan", elapsed, session_count, total))
+        full_data = json.loads(Path("dashboard_data.js").read_text().split("const EVALUATION_DATA = ", 1)[1]
+                               .split(";\n\n// Export", 1)[0])
+
+        for name in ("index cold", "index warm (no changes)"):
+            elapsed, (_, session_count, total) = timed(indexed._generate_dashboard_data)
+            rows.append((name, elapsed, session_count, total))
+        index_data = json.loads(indexed.get_results_index().dashboard_json())
+
+        for run in range(runs, runs + args.new_runs):
+            write_run(run, f"sess-{run % sessions:06d}", f"exp-{run % 4}")
+        elapsed, (_, session_count, total) = timed(indexed._generate_dashboard_data)
+        rows.append((f"index +{args.new_runs} runs", elapsed, session_count, total))
+        elapsed, (_, session_count, total) = timed(full_scan._generate_dashboard_data)
+        rows.append((f"full scan +{args.new_runs} runs", elapsed, session_count, total))
+
+        print(f"\n{'dashboard refresh':<28}{'time (s)':>10}{'sessions':>10}{'evaluations':>13}")
+        print("-" * 61)
+        for name, elapsed, session_count, total in rows:
+            print(f"{name:<28}{elapsed:>10.3f}{session_count:>10}{total:>13}")
+
+        index = indexed.get_results_index()
+        elapsed, summary = timed(index.evaluator_summary)
+        averages = ", ".join(f"{row['evaluator_id']}={row['avg_value']:.3f}" for row in summary)
+        print(f"\nevaluator_summary(): {elapsed * 1000:.1f}ms ({averages})")
+        since = (START_TIME + timedelta(seconds=runs)).isoformat()
+        elapsed, recent = timed(lambda: index.evaluator_summary(since=since))
+        print(f"evaluator_summary(since=latest runs): {elapsed * 1000:.1f}ms "
+              f"({sum(row['count'] for row in recent)} results)")
+        elapsed, session_summary = timed(lambda: index.evaluator_summary(session_id="sess-000042"))
+        print(f"evaluator_summary(session_id=...): {elapsed * 1000:.1f}ms "
+              f"({sum(row['count'] for row in session_summary)} results)")
+
+        print(f"\nIndexed dashboard data matches full scan (before new runs): {index_data == full_data}")
+    finally:
+        os.chdir(cwd)
+        if args.keep:
+            print(f"Kept {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
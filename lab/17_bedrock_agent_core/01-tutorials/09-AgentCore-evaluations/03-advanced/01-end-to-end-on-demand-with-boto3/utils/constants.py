@@ -13,6 +13,7 @@ EVALUATION_OUTPUT_DIR = "evaluation_output"
 EVALUATION_INPUT_DIR = "evaluation_input"
 DASHBOARD_DATA_FILE = "dashboard_data.js"
 DASHBOARD_HTML_FILE = "evaluation_dashboard.html"
+EVALUATION_INDEX_FILE = "evaluation_index.db"  # incremental results index used by the dashboard
 EVALUATION_OUTPUT_PATTERN = "*.json"
 DEFAULT_FILE_ENCODING = "utf-8"
 
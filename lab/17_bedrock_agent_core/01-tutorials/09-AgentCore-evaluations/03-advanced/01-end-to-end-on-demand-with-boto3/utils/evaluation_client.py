@@ -5,7 +5,7 @@ import os
 import webbrowser
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import boto3
 from botocore.exceptions import ClientError
@@ -17,12 +17,17 @@ from .constants import (
     DEFAULT_FILE_ENCODING,
     DEFAULT_MAX_EVALUATION_ITEMS,
     DEFAULT_RUNTIME_SUFFIX,
+    EVALUATION_INDEX_FILE,
     EVALUATION_OUTPUT_DIR,
     EVALUATION_OUTPUT_PATTERN,
     SESSION_SCOPED_EVALUATORS,
     SPAN_SCOPED_EVALUATORS,
 )
 from .models import EvaluationRequest, EvaluationResult, EvaluationResults, TraceData
+from .results_index import EvaluationResultsIndex
+
+
+DASHBOARD_INDEX_VERSION_PREFIX = "// Results index version: "
 
 
 class EvaluationClient:
@@ -31,15 +36,22 @@ class EvaluationClient:
     DEFAULT_REGION = "us-east-1"
 
     def __init__(
-        self, region: Optional[str] = None, boto_client: Optional[Any] = None
+        self,
+        region: Optional[str] = None,
+        boto_client: Optional[Any] = None,
+        results_index_path: Optional[str] = EVALUATION_INDEX_FILE,
     ):
         """Initialize evaluation client.
 
         Args:
             region: AWS region (defaults to env var or us-east-1)
             boto_client: Optional pre-configured boto3 client for testing
+            results_index_path: SQLite index the dashboard reads saved results from, relative to the
+                working directory (None re-reads every result file on each dashboard refresh)
         """
         self.region = region or os.getenv("AGENTCORE_EVAL_REGION", self.DEFAULT_REGION)
+        self.results_index_path = results_index_path
+        self._results_index = None
         
         if boto_client:
             self.client = boto_client
@@ -564,11 +576,97 @@ class EvaluationClient:
 
         return list(sessions_map.values())
 
-    def _write_dashboard_data(self, evaluation_data: List[Dict[str, Any]]) -> Path:
+    def get_results_index(self) -> EvaluationResultsIndex:
+        """Open the incremental results index on first use."""
+        if self._results_index is None:
+            self._results_index = EvaluationResultsIndex(
+                str(Path.cwd() / self.results_index_path), self._extract_trace_data_from_input
+            )
+        return self._results_index
+
+    def _generate_dashboard_data(self) -> Optional[Tuple[Path, int, int]]:
+        """Aggregate saved evaluation outputs and write dashboard_data.js.
+
+        With the results index only new or changed files are parsed; otherwise every file is re-read.
+
+        Returns:
+            (dashboard data path, session count, evaluation count), or None if there is nothing to show
+
+        Raises:
+            FileNotFoundError: If evaluation_output directory doesn't exist
+            IOError: If dashboard data file cannot be written
+        """
+        # Step 1: Scan for JSON files
+        json_files = self._scan_evaluation_outputs()
+
+        if not json_files:
+            print("No evaluation outputs to aggregate for dashboard")
+            return None
+
+        print(f"Found {len(json_files)} evaluation output file(s)")
+
+        # Step 2: Aggregate data
+        if self.results_index_path is None:
+            evaluation_data = self._aggregate_evaluation_data(json_files)
+            session_count = len(evaluation_data)
+            total_evaluations = sum(len(session.get("results", [])) for session in evaluation_data)
+        else:
+            index = self.get_results_index()
+            stats = index.refresh(json_files, self._scan_evaluation_inputs())
+            print(
+                f"Results index: {stats['new']} new, {stats['changed']} changed, "
+                f"{stats['removed']} removed, {stats['unchanged']} unchanged file(s)"
+            )
+            session_count = index.count_sessions()
+            total_evaluations = index.count_results()
+            index_version = index.version
+            if session_count:
+                self._print_evaluator_summary(index)
+            if session_count and self._read_dashboard_index_version() == index_version:
+                print("Dashboard data is up to date")
+                return Path.cwd() / DASHBOARD_DATA_FILE, session_count, total_evaluations
+            # The session and trace views need every result, not only the aggregates
+            evaluation_data = index.dashboard_json() if session_count else []
+
+        if not session_count:
+            print("No valid evaluation data found to generate dashboard")
+            return None
+
+        # Step 3: Write dashboard data file
+        index_version = None if self.results_index_path is None else index_version
+        return self._write_dashboard_data(evaluation_data, index_version), session_count, total_evaluations
+
+    @staticmethod
+    def _print_evaluator_summary(index: EvaluationResultsIndex) -> None:
+        """Print per-evaluator counts and scores, aggregated by the results index."""
+        print("Evaluator summary:")
+        for row in index.evaluator_summary():
+            scores = (
+                f"avg {row['avg_value']:.3f} (min {row['min_value']:.3f}, max {row['max_value']:.3f})"
+                if row["scored"] else "no scores"
+            )
+            print(f"  - {row['evaluator_id']}: {row['count']} result(s), {scores}, {row['errors']} error(s)")
+
+    def _read_dashboard_index_version(self) -> Optional[str]:
+        """Results index version recorded in the current dashboard_data.js, if any."""
+        try:
+            with open(Path.cwd() / DASHBOARD_DATA_FILE, "r", encoding=DEFAULT_FILE_ENCODING) as f:
+                header = [f.readline() for _ in range(4)]
+        except OSError:
+            return None
+        for line in header:
+            if line.startswith(DASHBOARD_INDEX_VERSION_PREFIX):
+                return line[len(DASHBOARD_INDEX_VERSION_PREFIX):].strip()
+        return None
+
+    def _write_dashboard_data(
+        self, evaluation_data: Union[List[Dict[str, Any]], str], index_version: Optional[str] = None
+    ) -> Path:
         """Write aggregated evaluation data to dashboard_data.js file.
 
         Args:
-            evaluation_data: List of aggregated session data
+            evaluation_data: List of aggregated session data, or the same data already serialized to JSON
+            index_version: Results index version the data was built from (lets unchanged refreshes skip the write)
 
         Returns:
             Path to the generated dashboard_data.js file
@@ -576,11 +674,12 @@ class EvaluationClient:
         Raises:
             IOError: If file write fails
         """
+        index_version_line = f"{DASHBOARD_INDEX_VERSION_PREFIX}{index_version}\n" if index_version is not None else ""
         js_content = f"""// Auto-generated dashboard data
 // Generated from {EVALUATION_OUTPUT_DIR} directory
 // Sessions aggregated by session_id
-
-const EVALUATION_DATA = {json.dumps(evaluation_data, indent=2)};
+{index_version_line}
+const EVALUATION_DATA = {evaluation_data if isinstance(evaluation_data, str) else json.dumps(evaluation_data, indent=2)};
 
 // Export for use in dashboard
 if (typeof window !== 'undefined') {{
@@ -646,29 +745,14 @@ if (typeof window !== 'undefined') {{
             IOError: If dashboard data file cannot be written
         """
         try:
-            # Step 1: Scan for JSON files
-            json_files = self._scan_evaluation_outputs()
+            # Steps 1-3: Scan, aggregate and write dashboard data
+            generated = self._generate_dashboard_data()
 
-            if not json_files:
-                print("No evaluation outputs to aggregate for dashboard")
+            if generated is None:
                 return
 
-            print(f"Found {len(json_files)} evaluation output file(s)")
-
-            # Step 2: Aggregate data
-            evaluation_data = self._aggregate_evaluation_data(json_files)
-
-            if not evaluation_data:
-                print("No valid evaluation data found to generate dashboard")
-                return
-
-            # Step 3: Write dashboard data file
-            dashboard_data_path = self._write_dashboard_data(evaluation_data)
-
-            total_evaluations = sum(len(session.get("results", [])) for session in evaluation_data)
-            print(
-                f"Dashboard data generated: {len(evaluation_data)} session(s), " f"{total_evaluations} evaluation(s)"
-            )
+            dashboard_data_path, session_count, total_evaluations = generated
+            print(f"Dashboard data generated: {session_count} session(s), " f"{total_evaluations} evaluation(s)")
 
             # Step 4: Open dashboard in browser
             dashboard_html_path = Path.cwd() / DASHBOARD_HTML_FILE
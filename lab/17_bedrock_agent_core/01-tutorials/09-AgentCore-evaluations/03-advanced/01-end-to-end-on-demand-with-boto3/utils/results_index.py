@@ -0,0 +1,385 @@
+"""Incremental SQLite index of saved evaluation results for the dashboard."""
+
+import json
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .constants import DEFAULT_FILE_ENCODING
+
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,             -- 'output' (evaluation results) or 'input' (spans)
+    name TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,          -- bytes ingested; a different size or mtime means re-ingest
+    session_id TEXT,
+    metadata TEXT,
+    result_count INTEGER,
+    error TEXT                      -- reason the file was skipped
+);
+CREATE TABLE IF NOT EXISTS results (
+    path TEXT NOT NULL,
+    seq INTEGER NOT NULL,           -- position of the result within its file
+    session_id TEXT NOT NULL,
+    trace_id TEXT,
+    evaluator_id TEXT,
+    evaluated_at TEXT,
+    value REAL,
+    error TEXT,
+    data TEXT NOT NULL,             -- result as stored in the output file (JSON)
+    PRIMARY KEY (path, seq)
+) WITHOUT ROWID;
+-- Covering indexes for the summary queries (no need to read the result JSON)
+CREATE INDEX IF NOT EXISTS results_by_session ON results (session_id, evaluator_id, evaluated_at, value, error);
+CREATE INDEX IF NOT EXISTS results_by_evaluator ON results (evaluator_id, evaluated_at, value, error);
+CREATE INDEX IF NOT EXISTS results_by_time ON results (evaluated_at, evaluator_id, value, error);
+CREATE TABLE IF NOT EXISTS traces (
+    path TEXT PRIMARY KEY,
+    session_id TEXT,
+    trace_id TEXT,
+    data TEXT                       -- trace summary extracted from the input file (JSON)
+);
+CREATE INDEX IF NOT EXISTS traces_by_key ON traces (session_id, trace_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value NOT NULL
+);
+INSERT OR IGNORE INTO meta VALUES ('generation', 0);   -- incremented whenever the indexed files change
+INSERT OR IGNORE INTO meta VALUES ('index_id', lower(hex(randomblob(8))));   -- new for every created/rebuilt index
+"""
+
+_TIMESTAMP_IN_NAME = re.compile(r"_(\d{8}_\d{6})\.json$")
+
+
+def _evaluated_at(path: Path, mtime_ns: int) -> str:
+    """Evaluation time from the output file name (output_<session>_<YYYYmmdd_HHMMSS>.json), else mtime."""
+    match = _TIMESTAMP_IN_NAME.search(path.name)
+    if match:
+        return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S").isoformat()
+    return datetime.fromtimestamp(mtime_ns / 1e9).isoformat(timespec="seconds")
+
+
+def _numeric(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+class EvaluationResultsIndex:
+    """Append-only index of evaluation output/input files.
+
+    Each refresh only stats the result files and parses the ones that are new or whose mtime/size
+    changed since they were ingested. Dashboard data and summaries are then answered from the index
+    instead of re-reading every file.
+    """
+
+    def __init__(self, db_path: str, extract_trace_data: Callable[[Path], Optional[Dict[str, Any]]]):
+        """Open (or create) the index.
+
+        Args:
+            db_path: SQLite database file path
+            extract_trace_data: Parses an input file into a trace summary
+                (EvaluationClient._extract_trace_data_from_input)
+        """
+        self.db_path = db_path
+        self.extract_trace_data = extract_trace_data
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            # Index format changed: rebuild from the files on next refresh
+            for table in ("files", "results", "traces", "meta"):
+                self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.executescript(SCHEMA)
+
+    @property
+    def generation(self) -> int:
+        """Counter that changes whenever a refresh adds, changes or removes files."""
+        with self._lock:
+            return self._conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0]
+
+    @property
+    def version(self) -> str:
+        """Identifies the indexed file set as '<index id>/<generation>'.
+
+        The generation alone restarts at 0 when the database is deleted or rebuilt, so it is paired with
+        a random id created together with the index.
+        """
+        with self._lock:
+            meta = dict(self._conn.execute("SELECT key, value FROM meta WHERE key IN ('index_id', 'generation')"))
+        return f"{meta['index_id']}/{meta['generation']}"
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def refresh(self, output_files: List[Path], input_files: List[Path]) -> Dict[str, int]:
+        """Bring the index in line with the given result files.
+
+        Args:
+            output_files: All current evaluation output files
+            input_files: All current evaluation input files
+
+        Returns:
+            Counts of files that were new, changed, removed and unchanged
+        """
+        current = {}
+        for kind, files in (("output", output_files), ("input", input_files)):
+            for path in files:
+                stat = path.stat()
+                current[str(path)] = (kind, path, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            known = {
+                path: (mtime_ns, size)
+                for path, mtime_ns, size in self._conn.execute("SELECT path, mtime_ns, size FROM files")
+            }
+            changed = [key for key, (_, _, mtime_ns, size) in current.items()
+                       if key in known and known[key] != (mtime_ns, size)]
+            new = [key for key in current if key not in known]
+            removed = [key for key in known if key not in current]
+            stats = {"new": len(new), "changed": len(changed), "removed": len(removed),
+                     "unchanged": len(current) - len(new) - len(changed)}
+            if not (new or changed or removed):
+                return stats
+
+            skipped_files = []
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for key in changed + removed:
+                    for table in ("files", "results", "traces"):
+                        self._conn.execute(f"DELETE FROM {table} WHERE path = ?", (key,))
+                for key in sorted(changed + new):
+                    kind, path, mtime_ns, size = current[key]
+                    if kind == "output":
+                        error = self._ingest_output(key, path, mtime_ns, size)
+                        if error:
+                            skipped_files.append((path.name, error))
+                    else:
+                        self._ingest_input(key, path, mtime_ns, size)
+                self._conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        if skipped_files:
+            print(f"Warning: Skipped {len(skipped_files)} file(s):")
+            for filename, reason in skipped_files:
+                print(f"  - {filename}: {reason}")
+        return stats
+
+    def _ingest_output(self, key: str, path: Path, mtime_ns: int, size: int) -> Optional[str]:
+        """Index one evaluation output file. Returns the reason if the file was skipped."""
+        session_id, metadata, results, error = None, None, [], None
+        try:
+            with open(path, "r", encoding=DEFAULT_FILE_ENCODING) as f:
+                data = json.load(f)
+            session_id = data.get("session_id")
+            if not session_id:
+                error = "No session_id found"
+            else:
+                metadata = json.dumps(data["metadata"]) if data.get("metadata") else None
+                results = data.get("results", [])
+        except json.JSONDecodeError as e:
+            error = f"JSON decode error: {e}"
+        except PermissionError as e:
+            error = f"Permission denied: {e}"
+        except Exception as e:
+            error = f"Error: {e}"
+
+        self._conn.execute(
+            "INSERT INTO files VALUES (?, 'output', ?, ?, ?, ?, ?, ?, ?)",
+            (key, path.name, mtime_ns, size, session_id, metadata, len(results), error),
+        )
+        if error:
+            return error
+
+        evaluated_at = _evaluated_at(path, mtime_ns)
+        self._conn.executemany(
+            "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    key,
+                    seq,
+                    session_id,
+                    (result.get("context") or {}).get("spanContext", {}).get("traceId"),
+                    result.get("evaluator_id"),
+                    evaluated_at,
+                    _numeric(result.get("value")),
+                    result.get("error"),
+                    json.dumps(result),
+                )
+                for seq, result in enumerate(results)
+            ],
+        )
+        return None
+
+    def _ingest_input(self, key: str, path: Path, mtime_ns: int, size: int) -> None:
+        """Index the trace summary of one evaluation input file (failures are cached as empty rows)."""
+        trace_data = self.extract_trace_data(path)
+        self._conn.execute(
+            "INSERT INTO files (path, kind, name, mtime_ns, size) VALUES (?, 'input', ?, ?, ?)",
+            (key, path.name, mtime_ns, size),
+        )
+        self._conn.execute(
+            "INSERT INTO traces VALUES (?, ?, ?, ?)",
+            (
+                key,
+                trace_data["session_id"] if trace_data else None,
+                trace_data["trace_id"] if trace_data else None,
+                json.dumps(trace_data) if trace_data else None,
+            ),
+        )
+
+    def _collect_sessions(self) -> Tuple[Dict[str, Dict[str, Any]], Dict[Tuple[str, str], Dict[str, Any]]]:
+        """Sessions in first-seen file order with their results as stored JSON text."""
+        sessions = {}
+        with self._lock:
+            for name, session_id, metadata, result_count in self._conn.execute(
+                "SELECT name, session_id, metadata, result_count FROM files "
+                "WHERE kind = 'output' AND error IS NULL ORDER BY path"
+            ):
+                session = sessions.get(session_id)
+                if session is None:
+                    session = sessions[session_id] = {
+                        "metadata": {}, "source_files": [], "evaluation_runs": 0, "results": [], "traces": {}
+                    }
+                if result_count:
+                    session["evaluation_runs"] += 1
+                session["source_files"].append(name)
+                # Later files override earlier ones
+                if metadata:
+                    session["metadata"].update(json.loads(metadata))
+
+            # Primary key order = file order, then position within the file
+            for session_id, trace_id, data in self._conn.execute(
+                "SELECT session_id, trace_id, data FROM results ORDER BY path, seq"
+            ):
+                session = sessions[session_id]
+                session["results"].append(data)
+                if trace_id:
+                    session["traces"].setdefault(trace_id, []).append(data)
+
+            trace_data_map = {
+                (session_id, trace_id): json.loads(data)
+                for session_id, trace_id, data in self._conn.execute(
+                    "SELECT session_id, trace_id, data FROM traces WHERE data IS NOT NULL ORDER BY path"
+                )
+            }
+        return sessions, trace_data_map
+
+    @staticmethod
+    def _trace_fields(trace_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "input": trace_data.get("input_messages", []),
+            "output": trace_data.get("output_messages", []),
+            "tools_used": trace_data.get("tools_used", {}),
+            "span_count": trace_data.get("span_count", 0),
+            "timestamp": trace_data.get("timestamp"),
+            "latency_ms": trace_data.get("latency_ms"),
+            "input_tokens": trace_data.get("input_tokens", 0),
+            "output_tokens": trace_data.get("output_tokens", 0),
+            "total_tokens": trace_data.get("total_tokens", 0),
+        }
+
+    def aggregate(self) -> List[Dict[str, Any]]:
+        """Session-level aggregation in the same shape as EvaluationClient._aggregate_evaluation_data.
+
+        Returns:
+            List of aggregated session data dictionaries with trace-level information
+        """
+        sessions, trace_data_map = self._collect_sessions()
+        aggregated = []
+        for session_id, session in sessions.items():
+            traces = []
+            for trace_id, results in session["traces"].items():
+                traces.append({
+                    "trace_id": trace_id,
+                    "session_id": session_id,
+                    "results": [json.loads(data) for data in results],
+                    **self._trace_fields(trace_data_map.get((session_id, trace_id), {})),
+                })
+            aggregated.append({
+                "session_id": session_id,
+                "results": [json.loads(data) for data in session["results"]],
+                "metadata": session["metadata"],
+                "source_files": session["source_files"],
+                "evaluation_runs": session["evaluation_runs"],
+                "traces": traces,
+            })
+        return aggregated
+
+    def dashboard_json(self) -> str:
+        """Same data as aggregate(), serialized to JSON directly from the stored result text.
+
+        Avoids decoding and re-encoding every result on each dashboard refresh.
+        """
+        sessions, trace_data_map = self._collect_sessions()
+        session_parts = []
+        for session_id, session in sessions.items():
+            trace_parts = []
+            for trace_id, results in session["traces"].items():
+                fields = self._trace_fields(trace_data_map.get((session_id, trace_id), {}))
+                trace_parts.append(
+                    f'{{"trace_id": {json.dumps(trace_id)}, "session_id": {json.dumps(session_id)}, '
+                    f'"results": [{", ".join(results)}], {json.dumps(fields)[1:]}'
+                )
+            session_parts.append(
+                f'{{"session_id": {json.dumps(session_id)}, "results": [{", ".join(session["results"])}], '
+                f'"metadata": {json.dumps(session["metadata"])}, "source_files": {json.dumps(session["source_files"])}, '
+                f'"evaluation_runs": {session["evaluation_runs"]}, "traces": [{", ".join(trace_parts)}]}}'
+            )
+        return "[" + ",\n".join(session_parts) + "]"
+
+    def count_sessions(self) -> int:
+        """Number of sessions with at least one valid output file."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(DISTINCT session_id) FROM files WHERE kind = 'output' AND error IS NULL"
+            ).fetchone()[0]
+
+    def count_results(self) -> int:
+        """Number of indexed evaluation results."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def evaluator_summary(self, session_id: Optional[str] = None, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Per-evaluator result counts and scores (indexed by session/evaluator/time).
+
+        Args:
+            session_id: Only results of this session
+            since: Only results evaluated at or after this ISO timestamp
+
+        Returns:
+            One dictionary per evaluator with count, scored, avg/min/max value, errors and time range
+        """
+        conditions, params = [], []
+        if session_id:
+            conditions.append("session_id = ?")
+            params.append(session_id)
+        if since:
+            conditions.append("evaluated_at >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT evaluator_id, COUNT(*), COUNT(value), AVG(value), MIN(value), MAX(value), "
+                f"COUNT(error), MIN(evaluated_at), MAX(evaluated_at) FROM results {where} "
+                "GROUP BY evaluator_id ORDER BY evaluator_id",
+                params,
+            ).fetchall()
+        columns = ("evaluator_id", "count", "scored", "avg_value", "min_value", "max_value",
+                   "errors", "first_evaluated_at", "last_evaluated_at")
+        return [dict(zip(columns, row)) for row in rows]
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+EcommerceCustomerMemoryHooks 메모리 I/O 벤치마크 (오프라인)
+
+FakeMemoryClient(지연 주입)로 고객 대화 턴을 재생하며, 턴마다 훅이 응답 경로에서
+소비하는 시간(맥락 검색 + 상호작용 저장)을 측정합니다.
+
+- before: 기존 동작 (턴마다 get_memory_strategies, 네임스페이스 순차 검색, create_event 동기 호출)
+- after: 동시 검색 + TTL 검색 캐시 + write-behind 저장
+
+Usage:
+    python lab_helpers/benchmark_memory_hooks.py --turns 40 --latency 0.15
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lab_helpers import ecommerce_memory
+from lab_helpers.ecommerce_memory import EcommerceCustomerMemoryHooks, flush_memory_writes
+from lab_helpers.fake_memory_client import FakeMemoryClient
+
+MEMORY_ID = "benchmark-memory"
+QUERIES = [
+    "지난번에 주문한 원피스 배송 언제 와요?",
+    "건성 피부에 맞는 수분 크림 추천해 주세요",
+    "반품 신청은 어떻게 하나요?",
+    "제 사이즈에 맞는 청바지 있을까요?",
+    "세일 중인 립스틱 보여주세요",
+]
+
+
+class LegacyMemoryHooks:
+    """기존 EcommerceCustomerMemoryHooks의 메모리 I/O 순서를 그대로 재현"""
+
+    def __init__(self, memory_id, client, customer_id, session_id):
+        self.memory_id, self.client = memory_id, client
+        self.customer_id, self.session_id = customer_id, session_id
+        self.namespaces = {
+            strategy["type"]: strategy["namespaces"][0]
+            for strategy in self.client.get_memory_strategies(self.memory_id)
+        }
+
+    def retrieve_customer_context(self, event):
+        query = event.agent.messages[-1]["content"][0]["text"]
+        for namespace in self.namespaces.values():
+            self.client.retrieve_memories(
+                memory_id=self.memory_id,
+                namespace=namespace.format(actorId=self.customer_id),
+                query=query,
+                top_k=3,
+            )
+
+    def save_ecommerce_interaction(self, event):
+        messages = event.agent.messages
+        self.client.create_event(
+            memory_id=self.memory_id,
+            actor_id=self.customer_id,
+            session_id=self.session_id,
+            messages=[(messages[-2]["content"][0]["text"], "USER"), (messages[-1]["content"][0]["text"], "ASSISTANT")],
+        )
+
+
+def run_turns(hooks_factory, queries, customer_id):
+    """
+    Streamlit 앱처럼 턴마다 훅을 새로 만들고, 검색/저장 훅을 호출합니다.
+    직전과 같은 쿼리는 실패한 턴의 재시도로 보고 검색만 수행합니다 (저장 없음).
+    """
+    latencies = []
+    for turn, query in enumerate(queries):
+        retry = turn > 0 and query == queries[turn - 1]
+        start = time.perf_counter()
+        hooks = hooks_factory(customer_id, f"session-{customer_id}")
+        agent = SimpleNamespace(messages=[{"role": "user", "content": [{"text": query}]}])
+        hooks.retrieve_customer_context(SimpleNamespace(agent=agent))
+        if retry:
+            latencies.append((time.perf_counter() - start) * 1000)
+            continue
+        agent.messages.append({"role": "assistant", "content": [{"text": f"답변 {turn}"}]})
+        hooks.save_ecommerce_interaction(SimpleNamespace(agent=agent))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name, latencies, client):
+    latencies = sorted(latencies)
+    print(f"{name:<8} mean {statistics.mean(latencies):7.1f} ms | p50 {latencies[len(latencies) // 2]:7.1f} ms | "
+          f"p99 {latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]:7.1f} ms | API calls: {dict(client.calls)}")
+    return statistics.mean(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory hook latency: serial/sync vs concurrent/cached/write-behind")
+    parser.add_argument("--turns", type=int, default=40, help="Conversation turns per variant")
+    parser.add_argument("--latency", type=float, default=0.15, help="Injected latency per Memory API call (seconds)")
+    parser.add_argument("--retry-ratio", type=float, default=0.3, help="Share of turns retrying the previous (failed) turn")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    queries = []
+    for _ in range(args.turns):
+        repeat = queries and rng.random() < args.retry_ratio
+        queries.append(queries[-1] if repeat else rng.choice(QUERIES))
+
+    print(f"\n{args.turns} turns, {args.latency * 1000:.0f} ms per Memory API call (FakeMemoryClient, no network)\n")
+
+    before_client = FakeMemoryClient(args.latency, args.latency, args.latency)
+    before = report("before", run_turns(
+        lambda customer_id, session_id: LegacyMemoryHooks(MEMORY_ID, before_client, customer_id, session_id),
+        queries, "customer-a",
+    ), before_client)
+
+    after_client = FakeMemoryClient(args.latency, args.latency, args.latency)
+    after_latencies = run_turns(
+        lambda customer_id, session_id: EcommerceCustomerMemoryHooks(MEMORY_ID, after_client, customer_id, session_id),
+        queries, "customer-a",
+    )
+    flush_start = time.perf_counter()
+    flushed = flush_memory_writes(timeout=60)
+    flush_ms = (time.perf_counter() - flush_start) * 1000
+    after = report("after", after_latencies, after_client)
+
+    # 저장 누락 없이 모든 상호작용이 같은 순서로 기록되었는지 확인
+    # (고객 메시지는 맥락 주입 여부에 따라 달라지므로 에이전트 응답으로 비교)
+    stored = [text for event in after_client.events for text, role in event["messages"] if role == "ASSISTANT"]
+    expected = [text for event in before_client.events for text, role in event["messages"] if role == "ASSISTANT"]
+    assert flushed and stored == expected, "write-behind lost or reordered interactions"
+
+    print(f"\nHook time per turn: {before:.1f} ms -> {after:.1f} ms ({before / after:.1f}x)")
+    print(f"Write-behind: {ecommerce_memory.write_behind_queue.stats()}, final flush {flush_ms:.1f} ms")
+    print(f"Retrieval cache: {ecommerce_memory.retrieval_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
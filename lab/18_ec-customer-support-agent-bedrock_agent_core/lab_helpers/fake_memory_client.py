@@ -0,0 +1,65 @@
+"""
+오프라인 테스트/벤치마크용 인메모리 MemoryClient
+
+bedrock_agentcore.memory.MemoryClient 중 EcommerceCustomerMemoryHooks가 사용하는
+get_memory_strategies / retrieve_memories / create_event만 구현합니다.
+호출마다 지정한 지연(latency)을 주입해 AgentCore Memory API 왕복 시간을 흉내냅니다.
+"""
+
+import time
+import threading
+from collections import defaultdict
+
+MAX_RECORD_CHARS = 200
+
+
+class FakeMemoryClient:
+    """AWS 호출 없이 동작하는 MemoryClient 대체 객체"""
+
+    def __init__(self, retrieve_latency: float = 0.15, create_latency: float = 0.2, strategies_latency: float = 0.1):
+        self.retrieve_latency = retrieve_latency
+        self.create_latency = create_latency
+        self.strategies_latency = strategies_latency
+        self.strategies = [
+            {"type": "USER_PREFERENCE", "namespaces": ["ecommerce/customer/{actorId}/preferences"]},
+            {"type": "SEMANTIC", "namespaces": ["ecommerce/customer/{actorId}/semantic"]},
+        ]
+        self.events = []                    # create_event 호출 기록
+        self.records = defaultdict(list)    # namespace -> [memory record]
+        self.calls = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def _record_call(self, name: str, latency: float):
+        with self._lock:
+            self.calls[name] += 1
+        if latency > 0:
+            time.sleep(latency)
+
+    def get_memory_strategies(self, memory_id: str):
+        self._record_call("get_memory_strategies", self.strategies_latency)
+        return [dict(strategy) for strategy in self.strategies]
+
+    def retrieve_memories(self, memory_id: str, namespace: str, query: str, actor_id: str = None, top_k: int = 3):
+        self._record_call("retrieve_memories", self.retrieve_latency)
+        with self._lock:
+            return list(self.records[namespace][-top_k:])
+
+    def create_event(self, memory_id: str, actor_id: str, session_id: str, messages, **kwargs):
+        self._record_call("create_event", self.create_latency)
+        with self._lock:
+            event = {"memoryId": memory_id, "actorId": actor_id, "sessionId": session_id, "messages": list(messages)}
+            self.events.append(event)
+            # 실제 서비스의 장기 메모리 추출을 단순화: 고객 문의를 짧은 레코드로 각 네임스페이스에 바로 기록
+            # (훅이 주입한 "고객 정보:" 맥락은 제외)
+            for text, role in messages:
+                if role == "USER":
+                    fact = text.rsplit("고객 문의:", 1)[-1].strip()[:MAX_RECORD_CHARS]
+                    for strategy in self.strategies:
+                        namespace = strategy["namespaces"][0].format(actorId=actor_id)
+                        self.records[namespace].append({"content": {"text": fact}})
+        return event
+
+    def add_memory(self, namespace: str, text: str):
+        """테스트용 장기 메모리 레코드를 직접 추가합니다."""
+        with self._lock:
+            self.records[namespace].append({"content": {"text": text}})
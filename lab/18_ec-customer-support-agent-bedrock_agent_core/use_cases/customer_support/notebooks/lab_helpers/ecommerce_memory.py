@@ -1,29 +1,230 @@
 """
 이커머스 전용 메모리 훅
 기존 전자제품 프로젝트의 메모리 시스템을 패션/뷰티 도메인으로 전환
+
+메모리 I/O가 사용자 응답 지연에 더해지지 않도록:
+- 네임스페이스별 retrieve_memories를 스레드 풀에서 동시에 호출
+- 고객(actor)별 짧은 TTL 검색 캐시 (해당 고객의 이벤트 저장 시 무효화)
+- create_event는 백그라운드 write-behind 큐로 처리 (크기 제한, 배치 저장, 종료 시 flush)
 """
 
+import os
+import time
+import queue
+import atexit
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from strands.hooks import AfterInvocationEvent, HookProvider, HookRegistry, MessageAddedEvent
 from bedrock_agentcore.memory import MemoryClient
 
 logger = logging.getLogger(__name__)
 
+RETRIEVAL_TOP_K = 3
+RETRIEVAL_MAX_WORKERS = 8
+CACHE_TTL_SECONDS = float(os.getenv("ECOMMERCE_MEMORY_CACHE_TTL", "30"))     # 0이면 캐시 비활성화
+WRITE_QUEUE_SIZE = int(os.getenv("ECOMMERCE_MEMORY_WRITE_QUEUE_SIZE", "256"))
+WRITE_BATCH_SIZE = 10  # create_event 1회에 합칠 최대 상호작용 수 (2 메시지/상호작용)
+
+
+class MemoryRetrievalCache:
+    """고객(actor)별 retrieve_memories 결과 TTL 캐시"""
+
+    def __init__(self, ttl_seconds: float = CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._entries = {}  # (memory_id, actor_id) -> {(namespace, query, top_k): (expires_at, memories)}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, memory_id, actor_id, namespace, query, top_k):
+        if self.ttl_seconds <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get((memory_id, actor_id), {}).get((namespace, query, top_k))
+            if entry is None or entry[0] < time.monotonic():
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def put(self, memory_id, actor_id, namespace, query, top_k, memories):
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            actor_entries = self._entries.setdefault((memory_id, actor_id), {})
+            now = time.monotonic()
+            # 만료 항목 정리
+            for key in [k for k, (expires_at, _) in actor_entries.items() if expires_at < now]:
+                del actor_entries[key]
+            actor_entries[(namespace, query, top_k)] = (now + self.ttl_seconds, memories)
+
+    def invalidate(self, memory_id, actor_id):
+        """해당 고객의 캐시를 모두 제거합니다 (이벤트 저장 시)."""
+        with self._lock:
+            self._entries.pop((memory_id, actor_id), None)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "actors": len(self._entries)}
+
+
+class MemoryWriteBehindQueue:
+    """
+    create_event를 백그라운드 스레드에서 처리하는 write-behind 큐
+
+    - 크기 제한 큐: 가득 차면 호출 스레드에서 동기 저장 (이벤트를 버리지 않음)
+    - 같은 (memory_id, actor_id, session_id)의 연속된 상호작용은 create_event 1회로 합쳐 저장
+    - flush()로 대기 중인 저장 완료를 기다림, 프로세스 종료 시 자동 flush
+    """
+
+    def __init__(self, maxsize: int = WRITE_QUEUE_SIZE, batch_size: int = WRITE_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._worker = None
+        self._lock = threading.Lock()
+        self.written_events = 0
+        self.api_calls = 0
+        self.failed_events = 0
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="memory-write-behind", daemon=True)
+                self._worker.start()
+
+    def submit(self, client, memory_id, actor_id, session_id, messages, on_written=None):
+        """상호작용 저장을 큐에 넣습니다. on_written은 저장 완료 후 호출됩니다."""
+        item = (client, memory_id, actor_id, session_id, list(messages), on_written)
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            logger.warning("메모리 write-behind 큐가 가득 차 동기 저장합니다")
+            self._write([item])
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                # 같은 세션의 연속된 상호작용끼리 묶어서 저장 (순서 유지)
+                group = []
+                for item in batch:
+                    if group and item[:4] != group[0][:4]:
+                        self._write(group)
+                        group = []
+                    group.append(item)
+                if group:
+                    self._write(group)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, group):
+        client, memory_id, actor_id, session_id = group[0][:4]
+        messages = [message for item in group for message in item[4]]
+        try:
+            client.create_event(
+                memory_id=memory_id,
+                actor_id=actor_id,
+                session_id=session_id,
+                messages=messages,
+            )
+            with self._lock:
+                self.api_calls += 1
+                self.written_events += len(group)
+            logger.info(f"이커머스 상호작용 {len(group)}건 메모리에 저장 완료")
+        except Exception as e:
+            with self._lock:
+                self.failed_events += len(group)
+            logger.error(f"이커머스 상호작용 저장 실패: {e}")
+        for item in group:
+            if item[5]:
+                item[5]()
+
+    def flush(self, timeout: float = None) -> bool:
+        """대기 중인 저장이 모두 끝날 때까지 기다립니다. timeout 내에 끝나면 True."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pending": self._queue.unfinished_tasks,
+                "written_events": self.written_events,
+                "api_calls": self.api_calls,
+                "failed_events": self.failed_events,
+            }
+
+
+# 훅 인스턴스 간 공유 (Streamlit 등에서 턴마다 훅을 새로 만들어도 캐시/큐/스레드 풀 재사용)
+retrieval_cache = MemoryRetrievalCache()
+write_behind_queue = MemoryWriteBehindQueue()
+_retrieval_pool = ThreadPoolExecutor(max_workers=RETRIEVAL_MAX_WORKERS, thread_name_prefix="memory-retrieval")
+_namespace_cache = {}  # memory_id -> {strategy type: namespace}
+_namespace_lock = threading.Lock()
+
+
+def get_memory_namespaces(client: MemoryClient, memory_id: str) -> dict:
+    """메모리 전략의 네임스페이스를 조회합니다 (memory_id별 1회)."""
+    with _namespace_lock:
+        namespaces = _namespace_cache.get(memory_id)
+    if namespaces is None:
+        namespaces = {
+            strategy["type"]: strategy["namespaces"][0]
+            for strategy in client.get_memory_strategies(memory_id)
+        }
+        with _namespace_lock:
+            _namespace_cache[memory_id] = namespaces
+    return namespaces
+
+
+def flush_memory_writes(timeout: float = 10) -> bool:
+    """대기 중인 메모리 저장을 완료합니다 (세션 종료/앱 종료 시 호출)."""
+    return write_behind_queue.flush(timeout)
+
+
+atexit.register(flush_memory_writes)
+
 
 class EcommerceCustomerMemoryHooks(HookProvider):
     """패션/뷰티 이커머스 고객 메모리 훅"""
 
     def __init__(
-        self, memory_id: str, client: MemoryClient, customer_id: str, session_id: str
+        self, memory_id: str, client: MemoryClient, customer_id: str, session_id: str,
+        write_behind: bool = True
     ):
         self.memory_id = memory_id
         self.client = client
         self.customer_id = customer_id
         self.session_id = session_id
-        self.namespaces = {
-            strategy["type"]: strategy["namespaces"][0]
-            for strategy in self.client.get_memory_strategies(self.memory_id)
-        }
+        self.write_behind = write_behind  # False: 턴 종료 시 create_event를 동기 호출 (기존 동작)
+        self.namespaces = get_memory_namespaces(self.client, self.memory_id)
+
+    def _retrieve_namespace(self, namespace: str, query: str):
+        """네임스페이스 하나를 검색합니다 (캐시 우선)."""
+        namespace = namespace.format(actorId=self.customer_id)
+        memories = retrieval_cache.get(self.memory_id, self.customer_id, namespace, query, RETRIEVAL_TOP_K)
+        if memories is None:
+            memories = self.client.retrieve_memories(
+                memory_id=self.memory_id,
+                namespace=namespace,
+                query=query,
+                top_k=RETRIEVAL_TOP_K,
+            )
+            retrieval_cache.put(self.memory_id, self.customer_id, namespace, query, RETRIEVAL_TOP_K, memories)
+        return memories
 
     def retrieve_customer_context(self, event: MessageAddedEvent):
         """고객 맥락을 검색하여 개인화된 응답을 제공합니다."""
@@ -37,15 +238,13 @@ class EcommerceCustomerMemoryHooks(HookProvider):
             try:
                 all_context = []
 
-                for context_type, namespace in self.namespaces.items():
-                    # AgentCore Memory에서 고객 맥락 검색
-                    memories = self.client.retrieve_memories(
-                        memory_id=self.memory_id,
-                        namespace=namespace.format(actorId=self.customer_id),
-                        query=user_query,
-                        top_k=3,
-                    )
-                    
+                # AgentCore Memory에서 네임스페이스별 고객 맥락을 동시에 검색
+                results = _retrieval_pool.map(
+                    lambda namespace: self._retrieve_namespace(namespace, user_query),
+                    self.namespaces.values(),
+                )
+
+                for context_type, memories in zip(self.namespaces.keys(), results):
                     # 메모리를 맥락 문자열로 포맷
                     for memory in memories:
                         if isinstance(memory, dict):
@@ -94,21 +293,36 @@ class EcommerceCustomerMemoryHooks(HookProvider):
                         break
 
                 if customer_query and agent_response:
-                    # 이커머스 상호작용 저장
-                    self.client.create_event(
-                        memory_id=self.memory_id,
-                        actor_id=self.customer_id,
-                        session_id=self.session_id,
-                        messages=[
-                            (customer_query, "USER"),
-                            (agent_response, "ASSISTANT"),
-                        ],
-                    )
-                    logger.info("이커머스 상호작용 메모리에 저장 완료")
+                    interaction = [
+                        (customer_query, "USER"),
+                        (agent_response, "ASSISTANT"),
+                    ]
+                    # 새 이벤트가 반영되도록 고객 검색 캐시 무효화 (저장 완료 후 한 번 더)
+                    retrieval_cache.invalidate(self.memory_id, self.customer_id)
+
+                    if self.write_behind:
+                        # 이커머스 상호작용을 백그라운드에서 저장
+                        write_behind_queue.submit(
+                            self.client, self.memory_id, self.customer_id, self.session_id, interaction,
+                            on_written=lambda: retrieval_cache.invalidate(self.memory_id, self.customer_id),
+                        )
+                    else:
+                        # 이커머스 상호작용 저장
+                        self.client.create_event(
+                            memory_id=self.memory_id,
+                            actor_id=self.customer_id,
+                            session_id=self.session_id,
+                            messages=interaction,
+                        )
+                        logger.info("이커머스 상호작용 메모리에 저장 완료")
 
         except Exception as e:
             logger.error(f"이커머스 상호작용 저장 실패: {e}")
 
+    def flush(self, timeout: float = 10) -> bool:
+        """백그라운드 저장이 끝날 때까지 기다립니다."""
+        return write_behind_queue.flush(timeout)
+
     def register_hooks(self, registry: HookRegistry) -> None:
         """이커머스 메모리 훅을 등록합니다."""
         registry.add_callback(MessageAddedEvent, self.retrieve_customer_context)
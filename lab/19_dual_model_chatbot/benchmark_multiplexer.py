@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+스트림 멀티플렉서 지연/TTFT 벤치마크 (오프라인)
+
+Bedrock 대신 스크립트된 가짜 스트림(첫 토큰 지연, 청크 간격, 실패 시점 지정)으로
+기존 chat()의 ThreadPoolExecutor + 버퍼 폴링 방식과 StreamMultiplexer 정책들을 비교합니다.
+
+측정 항목:
+- TTFT: 첫 청크가 출력되기까지의 시간
+- handoff: Micro 출력이 끝난 뒤 Pro 청크가 출력되기 시작할 때까지의 공백
+- total: 마지막 청크 출력까지의 시간
+- generated: 각 스트림이 실제로 생성한 청크 수 (취소되면 그만큼 토큰 절약)
+
+Usage:
+    python benchmark_multiplexer.py
+    python benchmark_multiplexer.py --scale 0.5
+"""
+
+import time
+import asyncio
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from stream_multiplexer import StreamMultiplexer
+
+
+class FakeStream:
+    """스크립트된 가짜 모델 스트림 (생성한 청크 수를 기록)"""
+
+    def __init__(self, name, ttft, chunks, interval, fail_after=None):
+        self.name = name
+        self.ttft = ttft
+        self.chunks = chunks
+        self.interval = interval
+        self.fail_after = fail_after  # 지정 시 해당 시간(초) 후 예외
+        self.generated = 0
+
+    def __call__(self):
+        start = time.perf_counter()
+        time.sleep(self.ttft)
+        for i in range(self.chunks):
+            if self.fail_after is not None and time.perf_counter() - start >= self.fail_after:
+                raise RuntimeError(f"{self.name} throttled")
+            self.generated += 1
+            yield f"{self.name[0]}{i} "
+            time.sleep(self.interval)
+
+
+def scenario(name, scale):
+    """(Micro, Pro) 가짜 스트림 쌍"""
+    if name == "normal":
+        return (FakeStream("micro", 0.3 * scale, 60, 0.02 * scale),
+                FakeStream("pro", 1.0 * scale, 200, 0.015 * scale))
+    if name == "slow-micro":
+        # Micro가 지연되어 Pro가 먼저 첫 토큰을 냄
+        return (FakeStream("micro", 1.5 * scale, 60, 0.02 * scale),
+                FakeStream("pro", 0.8 * scale, 200, 0.015 * scale))
+    if name == "micro-fails":
+        return (FakeStream("micro", 0.3 * scale, 60, 0.02 * scale, fail_after=0.1 * scale),
+                FakeStream("pro", 1.0 * scale, 200, 0.015 * scale))
+    raise ValueError(name)
+
+
+def run_legacy(micro, pro):
+    """기존 chat()의 결합 방식 재현 (ThreadPoolExecutor + 0.05초 폴링 + 타이핑 지연)"""
+    start = time.perf_counter()
+    emits = []
+    pro_buffer = []
+    pro_complete = False
+
+    def collect_pro_stream():
+        nonlocal pro_complete
+        try:
+            for chunk in pro():
+                pro_buffer.append(chunk)
+        except Exception as e:
+            pro_buffer.append(f"\n❌ Nova Pro 오류: {e}")
+        pro_complete = True
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        future_pro = executor.submit(collect_pro_stream)
+        try:
+            for chunk in micro():
+                emits.append(("micro", time.perf_counter() - start))
+                time.sleep(0.02)
+        except Exception:
+            emits.append(("micro", time.perf_counter() - start))  # 오류 메시지 출력
+        buffer_index = 0
+        while not pro_complete or buffer_index < len(pro_buffer):
+            while buffer_index < len(pro_buffer):
+                emits.append(("pro", time.perf_counter() - start))
+                time.sleep(0.01)
+                buffer_index += 1
+            if not pro_complete:
+                time.sleep(0.05)
+        future_pro.result()
+    return emits
+
+
+def run_multiplexer(micro, pro, policy, gate=None):
+    async def consume():
+        multiplexer = StreamMultiplexer([("micro", micro), ("pro", pro)], policy=policy, gate=gate)
+        emits = []
+        async for event in multiplexer.stream():
+            emits.append((event.source, time.perf_counter() - multiplexer.started_at))
+        return emits
+
+    return asyncio.run(consume())
+
+
+def summarize(emits):
+    ttft = emits[0][1] if emits else float("nan")
+    total = emits[-1][1] if emits else float("nan")
+    last_micro = max((t for source, t in emits if source == "micro"), default=None)
+    first_pro = min((t for source, t in emits if source == "pro"), default=None)
+    handoff = first_pro - last_micro if last_micro is not None and first_pro is not None and first_pro > last_micro else None
+    return ttft, handoff, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Legacy polling merge vs asyncio stream multiplexer")
+    parser.add_argument("--scale", type=float, default=1.0, help="Scale factor for the scripted stream timings")
+    args = parser.parse_args()
+
+    variants = [
+        ("legacy (poll)", lambda m, p: run_legacy(m, p)),
+        ("handoff", lambda m, p: run_multiplexer(m, p, "handoff")),
+        ("handoff gate=False", lambda m, p: run_multiplexer(m, p, "handoff", gate=lambda text: False)),
+        ("race", lambda m, p: run_multiplexer(m, p, "race")),
+        ("interleave", lambda m, p: run_multiplexer(m, p, "interleave")),
+    ]
+
+    for scenario_name in ("normal", "slow-micro", "micro-fails"):
+        print(f"\n📊 scenario: {scenario_name}")
+        print(f"{'variant':<20}{'TTFT':>8}{'handoff':>10}{'total':>8}  generated (micro/pro)  emitted (micro/pro)")
+        print("-" * 90)
+        for variant_name, run in variants:
+            micro, pro = scenario(scenario_name, args.scale)
+            emits = run(micro, pro)
+            time.sleep(max(micro.interval, pro.interval) * 3)  # 취소된 스트림 스레드 정리 대기
+            ttft, handoff, total = summarize(emits)
+            emitted_micro = sum(1 for source, _ in emits if source == "micro")
+            emitted_pro = len(emits) - emitted_micro
+            handoff_text = f"{handoff:.3f}" if handoff is not None else "-"
+            print(f"{variant_name:<20}{ttft:>8.3f}{handoff_text:>10}{total:>8.3f}  "
+                  f"{micro.generated:>5}/{pro.generated:<16}{emitted_micro:>5}/{emitted_pro}")
+    print(f"\nActive threads at exit: {threading.active_count()}")
+
+
+if __name__ == "__main__":
+    main()
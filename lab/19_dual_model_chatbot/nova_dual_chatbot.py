@@ -10,9 +10,9 @@ GitHub: https://github.com/your-username/amazon-nova-dual-chatbot
 import boto3
 import json
 import sys
-import time
-from concurrent.futures import ThreadPoolExecutor
+import asyncio
 from botocore.config import Config
+from stream_multiplexer import StreamMultiplexer
 
 class NovaDualChatbot:
     def __init__(self, region='us-east-1'):
@@ -41,12 +41,13 @@ class NovaDualChatbot:
             print("💡 AWS 자격 증명과 리전 설정을 확인해주세요.")
             sys.exit(1)
     
-    def stream_nova_micro(self, prompt: str):
+    def stream_nova_micro(self, prompt: str, raise_errors: bool = False):
         """
         Nova Micro 모델 스트리밍 호출 - 즉각적인 초기 응답
         
         Args:
             prompt (str): 입력 프롬프트
+            raise_errors (bool): True면 오류를 청크로 내보내지 않고 예외로 전달 (멀티플렉서용)
             
         Yields:
             str: Nova Micro의 스트리밍 응답 청크
@@ -78,27 +79,34 @@ class NovaDualChatbot:
             # 스트리밍 응답 처리
             stream = response.get('body')
             if stream:
-                for event in stream:
-                    chunk = event.get('chunk')
-                    if chunk:
-                        chunk_obj = json.loads(chunk.get('bytes').decode())
-                        
-                        # contentBlockDelta에서 텍스트 추출
-                        if 'contentBlockDelta' in chunk_obj:
-                            delta = chunk_obj['contentBlockDelta'].get('delta', {})
-                            text_content = delta.get('text', '')
-                            if text_content:
-                                yield text_content
+                try:
+                    for event in stream:
+                        chunk = event.get('chunk')
+                        if chunk:
+                            chunk_obj = json.loads(chunk.get('bytes').decode())
+                            
+                            # contentBlockDelta에서 텍스트 추출
+                            if 'contentBlockDelta' in chunk_obj:
+                                delta = chunk_obj['contentBlockDelta'].get('delta', {})
+                                text_content = delta.get('text', '')
+                                if text_content:
+                                    yield text_content
+                finally:
+                    # 중간에 취소되면 스트림 연결을 닫아 생성 중단
+                    stream.close()
                                 
         except Exception as e:
+            if raise_errors:
+                raise
             yield f"❌ Nova Micro 스트리밍 오류: {e}"
 
-    def stream_nova_pro(self, prompt: str):
+    def stream_nova_pro(self, prompt: str, raise_errors: bool = False):
         """
         Nova Pro 모델 스트리밍 호출 - 상세한 최종 답변
         
         Args:
             prompt (str): 입력 프롬프트
+            raise_errors (bool): True면 오류를 청크로 내보내지 않고 예외로 전달 (멀티플렉서용)
             
         Yields:
             str: Nova Pro의 스트리밍 응답 청크
@@ -120,8 +128,6 @@ class NovaDualChatbot:
         }
 
         try:
-            print("🏃‍♀️ Nova Pro 스트리밍 시작...")
-            
             response = self.bedrock_runtime.invoke_model_with_response_stream(
                 body=json.dumps(body),
                 modelId=model_id,
@@ -132,19 +138,25 @@ class NovaDualChatbot:
             # 스트리밍 응답 처리
             stream = response.get('body')
             if stream:
-                for event in stream:
-                    chunk = event.get('chunk')
-                    if chunk:
-                        chunk_obj = json.loads(chunk.get('bytes').decode())
-                        
-                        # contentBlockDelta에서 텍스트 추출
-                        if 'contentBlockDelta' in chunk_obj:
-                            delta = chunk_obj['contentBlockDelta'].get('delta', {})
-                            text_content = delta.get('text', '')
-                            if text_content:
-                                yield text_content
+                try:
+                    for event in stream:
+                        chunk = event.get('chunk')
+                        if chunk:
+                            chunk_obj = json.loads(chunk.get('bytes').decode())
+                            
+                            # contentBlockDelta에서 텍스트 추출
+                            if 'contentBlockDelta' in chunk_obj:
+                                delta = chunk_obj['contentBlockDelta'].get('delta', {})
+                                text_content = delta.get('text', '')
+                                if text_content:
+                                    yield text_content
+                finally:
+                    # 중간에 취소되면 스트림 연결을 닫아 생성 중단
+                    stream.close()
 
         except Exception as e:
+            if raise_errors:
+                raise
             yield f"❌ Nova Pro 스트리밍 오류: {e}"
 
     def create_prompts(self, user_query: str):
@@ -181,77 +193,70 @@ class NovaDualChatbot:
 
         return micro_prompt, pro_prompt
 
-    def chat(self, user_query: str):
+    def chat(self, user_query: str, policy: str = "handoff", gate=None):
         """
         듀얼 모델 오케스트레이션 메인 함수
         
         Args:
             user_query (str): 사용자 질문
+            policy (str): 스트림 결합 정책
+                - "handoff": Nova Micro 개요 출력 후 Nova Pro 상세 답변으로 이어감 (기본)
+                - "race": 먼저 첫 토큰을 낸 모델의 답변만 출력, 나머지 모델은 취소
+                - "interleave": 두 모델의 답변을 도착 순서대로 출력
+            gate (callable): handoff 정책에서 Micro 답변을 받아 Pro로 이어갈지 결정
+                (False면 Pro 스트림을 취소해 토큰 절약, 기본: 항상 이어감)
+        
+        Returns:
+            dict: TTFT, 전체 시간, 모델별 청크/취소 통계
+        """
+        return asyncio.run(self.achat(user_query, policy=policy, gate=gate))
+
+    async def achat(self, user_query: str, policy: str = "handoff", gate=None):
+        """
+        chat()의 비동기 버전 (이미 이벤트 루프가 실행 중인 환경용)
         """
         print(f"\n💬 질문: {user_query}")
         print("=" * 60)
         
         # 각 모델용 프롬프트 생성
         micro_prompt, pro_prompt = self.create_prompts(user_query)
+        if policy == "race":
+            # 먼저 응답하는 모델의 답변만 쓰므로 두 모델 모두 독립적인 답변 프롬프트 사용
+            pro_prompt = micro_prompt
         
-        print("🤖 답변:")
+        multiplexer = StreamMultiplexer(
+            [
+                ("Nova Micro", lambda: self.stream_nova_micro(micro_prompt, raise_errors=True)),
+                ("Nova Pro", lambda: self.stream_nova_pro(pro_prompt, raise_errors=True)),
+            ],
+            policy=policy,
+            gate=gate,
+        )
         
-        # Pro 모델의 스트리밍 결과를 저장할 버퍼
-        pro_buffer = []
-        pro_complete = False
+        print("🤖 답변:")
         
-        def collect_pro_stream():
-            """Pro 모델의 스트리밍 결과를 버퍼에 수집"""
-            nonlocal pro_buffer, pro_complete
-            try:
-                for chunk in self.stream_nova_pro(pro_prompt):
-                    pro_buffer.append(chunk)
-                pro_complete = True
-            except Exception as e:
-                pro_buffer.append(f"\n❌ Nova Pro 오류: {e}")
-                pro_complete = True
+        # 도착한 청크를 바로 출력 (모델이 바뀔 때 구분 표시)
+        current_source = None
+        async for event in multiplexer.stream():
+            if event.source != current_source:
+                if current_source is not None:
+                    print("\n")
+                print(f"🏃 {event.source}:")
+                current_source = event.source
+            sys.stdout.write(event.text)
+            sys.stdout.flush()
         
-        # ThreadPoolExecutor로 병렬 실행
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            # Pro 모델을 백그라운드에서 시작
-            future_pro = executor.submit(collect_pro_stream)
-            
-            # 1단계: Nova Micro 스트리밍 (빠른 초기 응답)
-            print("🏃‍♂️ Nova Micro 스트리밍 시작...")
-            try:
-                for chunk in self.stream_nova_micro(micro_prompt):
-                    sys.stdout.write(chunk)
-                    sys.stdout.flush()
-                    time.sleep(0.02)  # 자연스러운 타이핑 효과
-                
-                # Micro 완료 후 줄바꿈
-                print("\n")
-                
-            except Exception as e:
-                print(f"❌ Nova Micro 오류: {e}")
-                print("\n")
-            
-            # 2단계: Pro 모델 결과 출력 (버퍼에서 가져와서 스트리밍처럼 출력)
-            buffer_index = 0
-            
-            while not pro_complete or buffer_index < len(pro_buffer):
-                # 버퍼에 새로운 내용이 있으면 출력
-                while buffer_index < len(pro_buffer):
-                    chunk = pro_buffer[buffer_index]
-                    sys.stdout.write(chunk)
-                    sys.stdout.flush()
-                    time.sleep(0.01)  # 약간 더 빠른 타이핑 효과
-                    buffer_index += 1
-                
-                # Pro 모델이 아직 완료되지 않았다면 잠시 대기
-                if not pro_complete:
-                    time.sleep(0.05)
-            
-            # Pro 작업 완료 대기
-            future_pro.result()
+        stats = multiplexer.get_stats()
+        for name, source_stats in stats["sources"].items():
+            if source_stats["error"]:
+                print(f"\n❌ {name} 오류: {source_stats['error']}")
+            elif source_stats["cancelled"]:
+                print(f"\n⏹️ {name} 스트림 조기 취소 (토큰 절약)")
         
-        print(f"\n\n✅ 응답 완료!")
+        ttft = f"{stats['ttft']:.2f}초" if stats["ttft"] is not None else "-"
+        print(f"\n\n✅ 응답 완료! (첫 토큰 {ttft}, 전체 {stats['total']:.2f}초)")
         print("=" * 60)
+        return stats
 
 def main():
     """
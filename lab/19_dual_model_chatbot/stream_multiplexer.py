@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+듀얼 모델 스트림 멀티플렉서 (asyncio)
+
+각 모델의 동기 스트리밍 제너레이터를 전용 스레드에서 읽어 하나의 asyncio.Queue로 합치고,
+청크가 도착하는 순서(readiness)대로 정책에 따라 출력합니다.
+- 버퍼 폴링(sleep) 대기가 없어 청크가 도착하는 즉시 출력
+- 출력되지 않을 스트림은 조기에 취소 (제너레이터를 닫아 Bedrock 스트림 연결 종료 → 토큰 절약)
+
+정책:
+- "handoff" (기본): 첫 번째(빠른) 스트림을 바로 출력하고 두 번째(느린) 스트림은 버퍼링.
+  빠른 스트림이 끝나면 gate(빠른 답변)가 True일 때 느린 스트림으로 이어서 출력, False면 느린 스트림 취소.
+  빠른 스트림이 실패하면 즉시 느린 스트림으로 전환.
+- "race": 첫 토큰을 먼저 낸 스트림만 출력하고 나머지는 취소.
+- "interleave": 모든 스트림을 도착 순서대로 출력.
+
+사용 예:
+    multiplexer = StreamMultiplexer(
+        [("Nova Micro", lambda: chatbot.stream_nova_micro(p1, raise_errors=True)),
+         ("Nova Pro", lambda: chatbot.stream_nova_pro(p2, raise_errors=True))],
+        policy="handoff",
+    )
+    async for event in multiplexer.stream():
+        print(event.source, event.text)
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+
+POLICIES = ("handoff", "race", "interleave")
+
+_DONE = object()
+
+
+@dataclass
+class StreamEvent:
+    """출력할 청크 (source: 스트림 이름)"""
+    source: str
+    text: str
+
+
+class _Source:
+    """스트림 하나의 읽기 상태"""
+
+    def __init__(self, name, factory):
+        self.name = name
+        self.factory = factory
+        self.cancelled = threading.Event()
+        self.done = False
+        self.error = None
+        self.chunks = []
+        self.first_token_at = None
+        self.finished_at = None
+        self.emitted = 0
+
+    @property
+    def active(self):
+        return not self.done and not self.cancelled.is_set()
+
+    @property
+    def text(self):
+        return "".join(self.chunks)
+
+
+class StreamMultiplexer:
+    """여러 동기 스트림을 asyncio로 합쳐 정책에 따라 출력하는 멀티플렉서"""
+
+    def __init__(self, streams, policy: str = "handoff", gate=None):
+        """
+        Args:
+            streams (list): (이름, 제너레이터 팩토리) 목록. handoff는 (빠른 스트림, 느린 스트림) 2개
+            policy (str): "handoff" | "race" | "interleave"
+            gate (callable): handoff 정책에서 빠른 답변 텍스트를 받아 느린 스트림으로 이어갈지 결정 (기본: 항상 이어감)
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"지원하지 않는 정책입니다: {policy} (가능한 값: {', '.join(POLICIES)})")
+        if policy == "handoff" and len(streams) != 2:
+            raise ValueError("handoff 정책은 (빠른 스트림, 느린 스트림) 2개가 필요합니다")
+        self.sources = [_Source(name, factory) for name, factory in streams]
+        self.policy = policy
+        self.gate = gate or (lambda fast_text: True)
+        self.started_at = None
+        self.first_emit_at = None
+        self.finished_at = None
+
+    def _pump(self, source, loop, queue):
+        """스레드에서 제너레이터를 읽어 큐에 넣습니다. 취소되면 다음 청크에서 제너레이터를 닫습니다."""
+        generator = None
+        try:
+            generator = source.factory()
+            for chunk in generator:
+                if source.cancelled.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, (source, chunk, time.perf_counter()))
+        except Exception as e:
+            source.error = e
+        finally:
+            if generator is not None and hasattr(generator, "close"):
+                generator.close()  # 스트림 연결 종료
+            source.finished_at = time.perf_counter()
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, (source, _DONE, source.finished_at))
+            except RuntimeError:
+                pass  # 소비 측 이벤트 루프가 이미 종료됨 (취소된 스트림)
+
+    def cancel(self, source):
+        """스트림을 취소합니다 (이미 받은 청크는 버림)."""
+        if not source.done:
+            source.cancelled.set()
+
+    def _emit(self, source, chunk):
+        if self.first_emit_at is None:
+            self.first_emit_at = time.perf_counter()
+        source.emitted += 1
+        return StreamEvent(source.name, chunk)
+
+    async def stream(self):
+        """정책에 따라 출력할 StreamEvent를 도착 순서대로 생성합니다."""
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        self.started_at = time.perf_counter()
+
+        for source in self.sources:
+            threading.Thread(
+                target=self._pump, args=(source, loop, queue), name=f"stream-{source.name}", daemon=True
+            ).start()
+
+        fast, slow = (self.sources + [None])[:2]
+        handed_off = False  # handoff: 느린 스트림 출력 단계 여부
+        winner = None       # race: 첫 토큰을 낸 스트림
+
+        try:
+            while any(source.active for source in self.sources):
+                source, chunk, arrived_at = await queue.get()
+
+                if chunk is _DONE:
+                    source.done = True
+                    if self.policy == "handoff" and source is fast and not handed_off:
+                        # 빠른 스트림 종료: 실패했거나 게이트 통과 시 느린 스트림으로 전환, 아니면 취소
+                        if fast.error is None and fast.chunks and not self.gate(fast.text):
+                            self.cancel(slow)
+                        else:
+                            handed_off = True
+                            for buffered in slow.chunks:
+                                yield self._emit(slow, buffered)
+                    elif self.policy == "race" and source is winner:
+                        break
+                    continue
+
+                if source.cancelled.is_set():
+                    continue  # 취소 전에 큐에 들어온 청크
+                if source.first_token_at is None:
+                    source.first_token_at = arrived_at
+                source.chunks.append(chunk)
+
+                if self.policy == "interleave":
+                    yield self._emit(source, chunk)
+                elif self.policy == "race":
+                    if winner is None:
+                        winner = source
+                        for other in self.sources:
+                            if other is not winner:
+                                self.cancel(other)
+                    if source is winner:
+                        yield self._emit(source, chunk)
+                elif source is fast or handed_off:
+                    yield self._emit(source, chunk)
+                # handoff 전의 느린 스트림 청크는 source.chunks에 버퍼링
+        finally:
+            # 소비 측이 중간에 멈춘 경우 남은 스트림 정리
+            for source in self.sources:
+                if source.active:
+                    self.cancel(source)
+            self.finished_at = time.perf_counter()
+
+    def get_stats(self):
+        """TTFT, 전체 시간, 스트림별 청크/취소 통계"""
+        def elapsed(at):
+            return None if at is None or self.started_at is None else at - self.started_at
+
+        return {
+            "policy": self.policy,
+            "ttft": elapsed(self.first_emit_at),
+            "total": elapsed(self.finished_at),
+            "sources": {
+                source.name: {
+                    "first_token": elapsed(source.first_token_at),
+                    "chunks": len(source.chunks),
+                    "emitted": source.emitted,
+                    "cancelled": source.cancelled.is_set(),
+                    "error": str(source.error) if source.error else None,
+                }
+                for source in self.sources
+            },
+        }
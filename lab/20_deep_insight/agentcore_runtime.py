@@ -104,6 +104,9 @@ from src.utils.agentcore_observability import set_session_context, add_span_even
 # Import event queue for unified event processing
 from src.utils.event_queue import clear_queue
 
+# Warm agents for the agent-as-tool wrappers, scoped per request
+from src.utils.agent_registry import agent_registry
+
 # Import Fargate session manager for cleanup
 from src.tools.global_fargate_coordinator import get_global_session
 
@@ -397,6 +400,7 @@ async def agentcore_streaming_execution(
     # Step 2: Initialize request context
     request_id = _generate_request_id()
     _setup_fargate_context(request_id)
+    registry_token = agent_registry.set_session(request_id)
     user_query = _extract_user_query(payload)
 
     context_token = set_session_context(AGENTCORE_SESSION_NAME)
@@ -435,6 +439,8 @@ async def agentcore_streaming_execution(
     finally:
         # Step 8: Clean up resources
         _cleanup_request_session(request_id)
+        agent_registry.clear(request_id)
+        agent_registry.reset_session(registry_token)
         otel_context.detach(context_token)
 
 if __name__ == "__main__":
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-call overhead of the agent-as-tool wrappers
+
+Compares the former pattern (strands_utils.get_agent + asyncio.run on every tool call)
+with the agent registry (warm agent + persistent background event loop).
+BedrockModel.stream is replaced by a fake Bedrock model that streams a fixed answer
+without network calls, so the numbers are pure per-call overhead:
+prompt loading, BedrockModel/boto3 client construction, agent construction, event loop setup.
+
+Usage:
+    python benchmark_agent_registry.py --calls 50
+"""
+
+import os
+import time
+import asyncio
+import argparse
+import statistics
+
+# Fake credentials/region: boto3 clients are constructed but never called
+os.environ.setdefault("AWS_REGION", "us-west-2")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-west-2")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+
+import boto3
+from strands.models import BedrockModel
+
+from src.prompts.template import apply_prompt_template, load_prompt_template
+from src.utils.strands_sdk_utils import strands_utils
+from src.utils.agent_registry import agent_registry, run_async
+from src.utils.event_queue import clear_queue
+
+FAKE_ANSWER = "Analysis complete. The dataset has 3 columns and 100 rows."
+
+
+async def fake_bedrock_stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+    """Fake Bedrock model: a short text answer in the Bedrock ConverseStream event format"""
+    yield {"messageStart": {"role": "assistant"}}
+    yield {"contentBlockStart": {"start": {}}}
+    for word in FAKE_ANSWER.split(" "):
+        yield {"contentBlockDelta": {"delta": {"text": word + " "}}}
+    yield {"contentBlockStop": {}}
+    yield {"messageStop": {"stopReason": "end_turn"}}
+    yield {"metadata": {"usage": {"inputTokens": 10, "outputTokens": 10, "totalTokens": 20}, "metrics": {"latencyMs": 0}}}
+
+
+class ClientCounter:
+    """Counts boto3 client constructions (each one is a new HTTP connection pool)"""
+
+    def __init__(self):
+        self.count = 0
+        self.original = boto3.session.Session.client
+
+    def __enter__(self):
+        counter = self
+
+        def counting_client(session, *args, **kwargs):
+            counter.count += 1
+            return counter.original(session, *args, **kwargs)
+
+        boto3.session.Session.client = counting_client
+        return self
+
+    def __exit__(self, *exc):
+        boto3.session.Session.client = self.original
+
+
+def agent_kwargs(prompt):
+    # Same configuration as coder_agent_tool
+    return dict(
+        agent_name="coder",
+        system_prompts=prompt,
+        agent_type="claude-sonnet-3-7",
+        enable_reasoning=False,
+        tools=[],
+        streaming=True
+    )
+
+
+async def process_stream(agent, message):
+    full_text = ""
+    async for event in strands_utils.process_streaming_response_yield(agent, message, agent_name="coder", source="benchmark"):
+        if event.get("event_type") == "text_chunk":
+            full_text += event.get("data", "")
+    return {"text": full_text}
+
+
+def call_before(i):
+    """Former pattern: read prompt file, build model + agent, new event loop"""
+    load_prompt_template.cache_clear()
+    prompt = apply_prompt_template("coder", {"USER_REQUEST": f"request {i}", "FULL_PLAN": "plan", "EXECUTION_ENVIRONMENT": "local"})
+    agent = strands_utils.get_agent(**agent_kwargs(prompt))
+    return asyncio.run(process_stream(agent, f"task {i}"))
+
+
+def call_after(i):
+    """Registry pattern: cached prompt file, warm agent, persistent background loop"""
+    prompt = apply_prompt_template("coder", {"USER_REQUEST": f"request {i}", "FULL_PLAN": "plan", "EXECUTION_ENVIRONMENT": "local"})
+    agent = agent_registry.acquire(**agent_kwargs(prompt))
+    try:
+        return run_async(process_stream(agent, f"task {i}"))
+    finally:
+        agent_registry.release(agent)
+
+
+def measure(name, call, calls):
+    latencies = []
+    with ClientCounter() as clients:
+        for i in range(calls):
+            start = time.perf_counter()
+            response = call(i)
+            latencies.append((time.perf_counter() - start) * 1000)
+            clear_queue()
+            assert response["text"].strip() == FAKE_ANSWER, response
+    latencies.sort()
+    result = {
+        "mean_ms": statistics.mean(latencies),
+        "p50_ms": latencies[len(latencies) // 2],
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "boto3_clients": clients.count
+    }
+    print(f"{name:<28} mean {result['mean_ms']:7.2f} ms | p50 {result['p50_ms']:7.2f} ms | "
+          f"p99 {result['p99_ms']:7.2f} ms | boto3 clients created: {result['boto3_clients']}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-call overhead of agent tools: fresh agent vs agent registry")
+    parser.add_argument("--calls", type=int, default=50, help="Tool calls per variant")
+    args = parser.parse_args()
+
+    BedrockModel.stream = fake_bedrock_stream
+
+    # Warm-up (imports, first boto3 endpoint resolution)
+    call_before(-1)
+    clear_queue()
+
+    print(f"\n{args.calls} tool calls per variant (fake Bedrock model, no network)\n")
+    before = measure("before (get_agent+asyncio.run)", call_before, args.calls)
+    after = measure("after (registry+bg loop)", call_after, args.calls)
+    print(f"\nPer-call overhead: {before['mean_ms']:.2f} ms -> {after['mean_ms']:.2f} ms "
+          f"({before['mean_ms'] / after['mean_ms']:.1f}x), registry stats: {agent_registry.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
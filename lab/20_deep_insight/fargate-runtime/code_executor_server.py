@@ -40,6 +40,7 @@ HTTP Endpoints:
     GET  /health              - ALB health check (returns session status)
     GET  /container-info      - Container metadata (IP, session_id, sticky session)
     POST /execute             - Execute Python or Bash code
+                                ({"stream": true}: Server-Sent Events with output chunks)
     POST /session/complete    - Force session completion and S3 upload
     POST /file-sync           - S3 file synchronization (upload/download)
 
@@ -51,10 +52,12 @@ Environment Variables:
 
 Code Execution:
     Python Code:
-        - Executed via exec() in isolated namespace
+        - Executed via exec() in a pre-forked worker process (python_sandbox.py)
         - stdout/stderr captured and returned
         - Auto-imports: datetime, json, os
         - Working directory: /app/
+        - Per-execution wall-clock, RSS and CPU limits; a worker exceeding them
+          is killed and replaced, the Flask process keeps serving
 
     Bash Commands:
         - Prefix with "BASH:" to execute shell commands
@@ -75,6 +78,7 @@ Session Lifecycle:
 
 Error Handling:
     - Execution errors: Captured with compact traceback
+    - Runaway code: TimeoutError / MemoryLimitExceeded / CPULimitExceeded errors
     - Large outputs: Truncated to 8192 chars for streaming stability
     - Container crashes: Prevented with explicit exception handling
     - S3 upload failures: Logged but don't block completion
@@ -83,6 +87,8 @@ Performance:
     - Mid-session S3 uploads: DISABLED (caused HTTP 502 errors)
     - S3 uploads: Only at session completion (one batch upload)
     - Output streaming: Compact format to prevent network issues
+    - Streaming mode: stdout/stderr chunks as SSE "output" events while the code
+      runs, "progress" heartbeats keep the ALB idle timeout from firing
     - Auto-shutdown: 1 hour timeout to prevent resource leaks
 
 Related Files:
@@ -103,6 +109,11 @@ Usage:
     curl -X POST http://container:8080/execute \
       -H "Content-Type: application/json" \
       -d '{"code": "BASH: ls -la /app/data"}'
+
+    # Stream output while the code runs (events: start, output, progress, result)
+    curl -N -X POST http://container:8080/execute \
+      -H "Content-Type: application/json" \
+      -d '{"code": "import time\nfor i in range(3):\n    print(i)\n    time.sleep(1)", "stream": true}'
 """
 
 import sys
@@ -112,18 +123,22 @@ import uuid
 import traceback
 import threading
 import time
+import queue
 import subprocess
 import re
 from datetime import datetime
-from io import StringIO
-import contextlib
 import boto3
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from pathlib import Path
 import shutil
+from python_sandbox import SandboxPool
 
 app = Flask(__name__)
 
+# Streaming mode of /execute
+STREAM_HEARTBEAT_INTERVAL = 10    # Progress event after this many seconds without output (ALB idle timeout keep-alive)
+STREAM_OUTPUT_LIMIT = 4096 * 16   # Max streamed output chars per execution (the final result is compacted as usual)
+
 # Global session state management
 class SessionManager:
     def __init__(self):
@@ -276,6 +291,19 @@ class SessionManager:
 # Initialize session manager
 session_manager = SessionManager()
 
+# Pre-forked worker processes for Python executions (limits: see python_sandbox.py)
+# Created on first use, not at import: worker processes re-import this module as __mp_main__
+sandbox_pool = None
+sandbox_pool_lock = threading.Lock()
+
+def get_sandbox_pool():
+    """Return the sandbox pool, starting its workers on first call"""
+    global sandbox_pool
+    with sandbox_pool_lock:
+        if sandbox_pool is None:
+            sandbox_pool = SandboxPool(exec_globals={'workspace': session_manager.workspace})
+        return sandbox_pool
+
 def create_compact_error_response(exception, traceback_text=None):
     """
     Create compact error response suitable for streaming
@@ -287,9 +315,20 @@ def create_compact_error_response(exception, traceback_text=None):
     Returns:
         dict: Compact error information
     """
-    error_type = type(exception).__name__
-    error_message = str(exception)
+    return create_compact_error_from_parts(type(exception).__name__, str(exception), traceback_text)
 
+def create_compact_error_from_parts(error_type, error_message, traceback_text=None):
+    """
+    Create compact error response from an error reported by a sandbox worker
+
+    Args:
+        error_type: Exception class name
+        error_message: str(exception)
+        traceback_text: Formatted traceback
+
+    Returns:
+        dict: Compact error information
+    """
     # Limit message length (8192 chars)
     if len(error_message) > 4096*2:
         error_message = error_message[:4096*2] + "..."
@@ -392,8 +431,61 @@ def create_compact_output(output_text, output_type="stdout", max_length=500):
 
     return compact_text
 
-def execute_code(code_string, execution_num):
-    """Execute dynamic code and return results (Python code or Bash commands)"""
+def run_bash_streaming(bash_command, on_output, timeout=30):
+    """
+    Run a bash command and pass its stdout/stderr lines to on_output(stream, text) as they arrive
+
+    Returns:
+        tuple: (return_code, stdout, stderr)
+
+    Raises:
+        subprocess.TimeoutExpired: Command did not finish within timeout (process is killed)
+    """
+    process = subprocess.Popen(
+        bash_command,
+        shell=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        bufsize=1,
+        cwd="/app"
+    )
+    captured = {"stdout": [], "stderr": []}
+
+    def pump(stream_name, pipe):
+        for line in pipe:
+            captured[stream_name].append(line)
+            on_output(stream_name, line)
+
+    readers = [
+        threading.Thread(target=pump, args=("stdout", process.stdout), daemon=True),
+        threading.Thread(target=pump, args=("stderr", process.stderr), daemon=True)
+    ]
+    for reader in readers:
+        reader.start()
+
+    try:
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+        raise
+    finally:
+        for reader in readers:
+            reader.join(timeout=1)
+
+    return process.returncode, "".join(captured["stdout"]), "".join(captured["stderr"])
+
+def execute_code(code_string, execution_num, on_output=None):
+    """
+    Execute dynamic code and return results (Python code or Bash commands)
+
+    Args:
+        code_string: Python code, or a bash command prefixed with "BASH:"
+        execution_num: Execution number in the session
+        on_output: Optional callback(stream, text) receiving stdout/stderr chunks
+                   while the code runs (streaming mode of /execute)
+    """
 
     print(f"🚀 Execution {execution_num} starting...", flush=True)
 
@@ -433,58 +525,52 @@ def execute_code(code_string, execution_num):
     try:
         if code_type == "bash":
             # Execute bash command (set working directory to /app/)
-            process = subprocess.run(
-                bash_command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                cwd="/app",
-                timeout=30
-            )
-
-            result["status"] = "completed" if process.returncode == 0 else "failed"
-            result["stdout"] = process.stdout
-            result["stderr"] = process.stderr
-
-            if process.returncode != 0:
+            if on_output:
+                return_code, stdout, stderr = run_bash_streaming(bash_command, on_output, timeout=30)
+            else:
+                process = subprocess.run(
+                    bash_command,
+                    shell=True,
+                    capture_output=True,
+                    text=True,
+                    cwd="/app",
+                    timeout=30
+                )
+                return_code, stdout, stderr = process.returncode, process.stdout, process.stderr
+
+            result["status"] = "completed" if return_code == 0 else "failed"
+            result["stdout"] = stdout
+            result["stderr"] = stderr
+
+            if return_code != 0:
                 result["error"] = {
                     "type": "BashError",
-                    "message": f"Command failed with return code {process.returncode}",
-                    "return_code": process.returncode
+                    "message": f"Command failed with return code {return_code}",
+                    "return_code": return_code
                 }
-                print(f"❌ Bash execution {execution_num} failed with code {process.returncode}", flush=True)
+                print(f"❌ Bash execution {execution_num} failed with code {return_code}", flush=True)
             else:
                 print(f"✅ Bash execution {execution_num} completed successfully", flush=True)
 
         else:
-            # Execute Python code
-            stdout_capture = StringIO()
-            stderr_capture = StringIO()
-
-            with contextlib.redirect_stdout(stdout_capture), contextlib.redirect_stderr(stderr_capture):
-                # Add necessary imports automatically
-                exec_globals = {
-                    '__builtins__': __builtins__,
-                    'datetime': datetime,
-                    'json': json,
-                    'os': os,
-                    'workspace': session_manager.workspace
-                }
+            # Execute Python code in a sandbox worker process
+            outcome = get_sandbox_pool().execute(code_string, on_output=on_output)
 
-                # Execute code - Explicit exception handling to prevent container instability
-                try:
-                    exec(code_string, exec_globals)
-                    result["status"] = "completed"
-                except Exception as exec_error:
-                    # Catch exec() errors immediately to prevent container crash
-                    result["status"] = "failed"
-                    traceback_text = traceback.format_exc()
-                    result["error"] = create_compact_error_response(exec_error, traceback_text)
-                    print(f"❌ Python execution {execution_num} failed during exec(): {exec_error}", flush=True)
-
-            # Capture stdout/stderr regardless of success or failure
-            result["stdout"] = stdout_capture.getvalue()
-            result["stderr"] = stderr_capture.getvalue()
+            result["status"] = outcome["status"]
+            result["stdout"] = outcome["stdout"]
+            result["stderr"] = outcome["stderr"]
+
+            if outcome["killed"]:
+                # Worker exceeded a limit (or crashed) and was replaced
+                result["error"] = {
+                    "type": outcome["error"]["type"],
+                    "message": outcome["error"]["message"]
+                }
+                print(f"⏰ Python execution {execution_num} killed ({outcome['killed']}): {outcome['error']['message']}", flush=True)
+            elif outcome["error"]:
+                error = outcome["error"]
+                result["error"] = create_compact_error_from_parts(error["type"], error["message"], error["traceback"])
+                print(f"❌ Python execution {execution_num} failed during exec(): {error['type']}: {error['message']}", flush=True)
 
             if result["status"] == "completed":
                 print(f"✅ Python execution {execution_num} completed successfully", flush=True)
@@ -499,9 +585,6 @@ def execute_code(code_string, execution_num):
 
     except Exception as e:
         result["status"] = "failed"
-        if code_type == "python":
-            result["stdout"] = stdout_capture.getvalue()
-            result["stderr"] = stderr_capture.getvalue()
 
         # Create compact error response suitable for streaming
         traceback_text = traceback.format_exc()
@@ -523,7 +606,8 @@ def health():
         "session_id": session_manager.session_id,
         "executions_completed": len(session_manager.executions),
         "max_executions": session_manager.max_executions,
-        "is_complete": session_manager.is_complete
+        "is_complete": session_manager.is_complete,
+        "sandbox": dict(sandbox_pool.stats) if sandbox_pool else None
     })
 
 
@@ -555,9 +639,94 @@ def container_info():
         "executions_completed": len(session_manager.executions)
     })
 
+def build_execute_response(result, execution_num):
+    """Response body of /execute (also the final "result" event of the streaming mode)"""
+    # Limit stdout/stderr output size for streaming stability
+    compact_stdout = create_compact_output(result["stdout"], "stdout", max_length=4096*2)
+    compact_stderr = create_compact_output(result["stderr"], "stderr", max_length=4096*2)
+
+    return {
+        "session_id": session_manager.session_id,
+        "execution_num": execution_num,
+        "status": result["status"],
+        "stdout": compact_stdout,
+        "stderr": compact_stderr,
+        "error": result["error"],
+        "execution_time_ms": result["execution_time_ms"],
+        "total_executions": len(session_manager.executions),
+        "is_session_complete": session_manager.is_complete,
+        "s3_backup": "skipped_until_session_end"  # S3 upload only at session completion
+    }
+
+def format_sse(event, data):
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def stream_execution(code, execution_num):
+    """
+    Run code in a background thread and stream its output as Server-Sent Events
+
+    Events:
+        start:    {"session_id", "execution_num"}
+        output:   {"stream": "stdout"|"stderr", "text"} while the code runs
+        progress: {"execution_num", "elapsed_ms"} after STREAM_HEARTBEAT_INTERVAL without output
+        result:   Same body as the non-streaming /execute response
+    """
+    events = queue.Queue()
+    streamed = {"chars": 0}
+
+    def on_output(stream_name, text):
+        remaining = STREAM_OUTPUT_LIMIT - streamed["chars"]
+        if remaining <= 0:
+            return
+        streamed["chars"] += min(len(text), remaining)
+        events.put(("output", {
+            "stream": stream_name,
+            "text": text[:remaining],
+            "truncated": len(text) > remaining
+        }))
+
+    def run():
+        try:
+            result = execute_code(code, execution_num, on_output=on_output)
+            session_manager.add_execution(result)
+            events.put(("result", build_execute_response(result, execution_num)))
+        except Exception as e:
+            print(f"❌ Streaming execution {execution_num} failed: {e}", flush=True)
+            events.put(("result", {
+                "session_id": session_manager.session_id,
+                "execution_num": execution_num,
+                "status": "failed",
+                "error": create_compact_error_response(e, traceback.format_exc())
+            }))
+
+    # The execution finishes (and is saved) even if the client disconnects
+    threading.Thread(target=run, daemon=True).start()
+
+    def generate():
+        start_time = time.time()
+        yield format_sse("start", {"session_id": session_manager.session_id, "execution_num": execution_num})
+        while True:
+            try:
+                event, payload = events.get(timeout=STREAM_HEARTBEAT_INTERVAL)
+            except queue.Empty:
+                yield format_sse("progress", {
+                    "execution_num": execution_num,
+                    "elapsed_ms": int((time.time() - start_time) * 1000)
+                })
+                continue
+            yield format_sse(event, payload)
+            if event == "result":
+                break
+
+    return Response(generate(), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"  # Disable proxy buffering
+    })
+
 @app.route('/execute', methods=['POST'])
 def execute():
-    """Code execution endpoint"""
+    """Code execution endpoint ({"stream": true} for Server-Sent Events)"""
 
     if session_manager.is_complete:
         return jsonify({
@@ -573,31 +742,17 @@ def execute():
     code = data['code']
     execution_num = len(session_manager.executions) + 1
 
+    if data.get('stream'):
+        return stream_execution(code, execution_num)
+
     # Execute code
     result = execute_code(code, execution_num)
 
     # Save execution result
     session_manager.add_execution(result)
 
-    # Limit stdout/stderr output size for streaming stability
-    compact_stdout = create_compact_output(result["stdout"], "stdout", max_length=4096*2)
-    compact_stderr = create_compact_output(result["stderr"], "stderr", max_length=4096*2)
-
     # Return response
-    response_data = {
-        "session_id": session_manager.session_id,
-        "execution_num": execution_num,
-        "status": result["status"],
-        "stdout": compact_stdout,
-        "stderr": compact_stderr,
-        "error": result["error"],
-        "execution_time_ms": result["execution_time_ms"],
-        "total_executions": len(session_manager.executions),
-        "is_session_complete": session_manager.is_complete,
-        "s3_backup": "skipped_until_session_end"  # S3 upload only at session completion
-    }
-
-    return jsonify(response_data)
+    return jsonify(build_execute_response(result, execution_num))
 
 @app.route('/session/complete', methods=['POST'])
 def complete_session():
@@ -777,5 +932,8 @@ if __name__ == "__main__":
     shutdown_thread.daemon = True
     shutdown_thread.start()
 
+    # Start sandbox workers before accepting requests
+    get_sandbox_pool()
+
     # Start Flask server
     app.run(host='0.0.0.0', port=8080, debug=False)
\ No newline at end of file
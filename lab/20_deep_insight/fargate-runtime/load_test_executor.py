@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Local Load Test for the Code Executor Server
+
+Purpose:
+    Pushes a mixed workload of normal and pathological Python snippets through
+    POST /execute and reports p50/p99 latency per snippet type, to check that
+    runaway code (infinite loops, memory bombs, crashes) is contained by the
+    sandbox pool and does not stall the normal executions.
+
+Usage:
+    # Terminal 1: start the server locally with short limits
+    EXECUTOR_TIMEOUT_SEC=5 EXECUTOR_MAX_RSS_MB=512 EXECUTOR_CPU_LIMIT_SEC=10 \\
+        python3 code_executor_server.py
+
+    # Terminal 2: run the load test
+    python3 load_test_executor.py --url http://localhost:8080 --requests 120 --concurrency 8
+
+Note:
+    Every request counts towards the 300-execution session limit of the server;
+    restart the server between runs.
+"""
+
+import json
+import time
+import random
+import argparse
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# (name, weight, code)
+SNIPPETS = [
+    ("normal", 10, "total = sum(i * i for i in range(100000))\nprint(total)"),
+    ("pandas", 4, "import pandas as pd\ndf = pd.DataFrame({'a': range(1000)})\nprint(df['a'].sum())"),
+    ("exception", 3, "raise ValueError('bad input')"),
+    ("sleep", 2, "import time\ntime.sleep(1)\nprint('woke up')"),
+    ("infinite_loop", 1, "while True:\n    pass"),
+    ("memory_bomb", 1, "blocks = []\nwhile True:\n    blocks.append(bytearray(64 * 1024 * 1024))\n    blocks[-1][::4096] = b'x' * len(blocks[-1][::4096])"),
+    ("sleep_forever", 1, "import time\ntime.sleep(10 ** 6)"),
+    ("crash", 1, "import os\nos._exit(3)"),
+    ("sys_exit", 1, "import sys\nsys.exit(1)"),
+]
+
+
+def percentile(values, q):
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def post_execute(url, code, timeout):
+    body = json.dumps({"code": code}).encode("utf-8")
+    req = urllib.request.Request(f"{url}/execute", data=body, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            result = json.loads(response.read())
+        error = result.get("error") or {}
+        outcome = result.get("status", "unknown") if not error else error.get("type", "error")
+    except Exception as e:
+        outcome = f"http_error:{type(e).__name__}"
+    return time.perf_counter() - start, outcome
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test POST /execute with pathological snippets")
+    parser.add_argument("--url", default="http://localhost:8080", help="Code executor base URL")
+    parser.add_argument("--requests", type=int, default=120, help="Total number of /execute requests")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent client requests")
+    parser.add_argument("--timeout", type=float, default=180, help="Client HTTP timeout (seconds)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the workload mix")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    names = [name for name, weight, _ in SNIPPETS for _ in range(weight)]
+    codes = {name: code for name, _, code in SNIPPETS}
+    workload = [rng.choice(names) for _ in range(args.requests)]
+
+    print(f"🔥 {args.requests} requests, concurrency {args.concurrency} → {args.url}/execute")
+    latencies = defaultdict(list)
+    outcomes = defaultdict(lambda: defaultdict(int))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = [(name, pool.submit(post_execute, args.url, codes[name], args.timeout)) for name in workload]
+        for name, future in futures:
+            latency, outcome = future.result()
+            latencies[name].append(latency)
+            latencies["ALL"].append(latency)
+            outcomes[name][outcome] += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{'snippet':<15}{'count':>7}{'p50 (s)':>10}{'p99 (s)':>10}  outcomes")
+    print("-" * 80)
+    for name in [name for name, _, _ in SNIPPETS if name in latencies] + ["ALL"]:
+        values = latencies[name]
+        summary = ", ".join(f"{k}={v}" for k, v in sorted(outcomes[name].items())) if name != "ALL" else ""
+        print(f"{name:<15}{len(values):>7}{percentile(values, 50):>10.3f}{percentile(values, 99):>10.3f}  {summary}")
+    print(f"\nThroughput: {args.requests / elapsed:.2f} req/s ({elapsed:.1f}s total)")
+
+    try:
+        with urllib.request.urlopen(f"{args.url}/health", timeout=5) as response:
+            health = json.loads(response.read())
+        print(f"Server health: {health.get('status')}, sandbox stats: {health.get('sandbox')}")
+    except Exception as e:
+        print(f"❌ Server health check failed: {e}")
+
+
+if __name__ == "__main__":
+    main()
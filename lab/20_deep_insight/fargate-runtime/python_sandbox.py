@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Sandboxed Python Execution Pool for the Fargate Code Executor
+
+Purpose:
+    Runs the Python snippets of POST /execute in a pool of pre-forked worker
+    processes instead of exec() inside the Flask process, so a runaway snippet
+    (infinite loop, memory bomb, crash in a C extension) only costs one worker
+    and never the container with every session pinned to it.
+
+Architecture:
+    - Workers are forked from a forkserver that has the heavy data-science
+      modules (numpy, pandas, matplotlib) already imported, so a replacement
+      worker is ready in milliseconds instead of re-importing them
+    - Idle workers wait in a queue; each execution checks one out, sends the
+      code over a pipe and waits for the result
+    - Each worker runs in its own process group, so subprocesses started by
+      the snippet are killed together with it
+
+Limits (per execution):
+    - Wall clock: the parent kills the worker after EXECUTOR_TIMEOUT_SEC
+    - RSS: the parent samples /proc/<pid>/statm and kills the worker above
+      EXECUTOR_MAX_RSS_MB
+    - CPU: RLIMIT_CPU soft limit inside the worker (SIGXCPU after
+      EXECUTOR_CPU_LIMIT_SEC of CPU time)
+    A killed or crashed worker is replaced in the background; workers are also
+    recycled after EXECUTOR_MAX_TASKS_PER_WORKER executions.
+
+Streaming:
+    execute(code, on_output=callback) calls callback(stream, text) with
+    stdout/stderr chunks while the snippet runs (sent at least every 100 ms),
+    for the SSE mode of POST /execute. Output streamed before a kill is kept.
+
+Environment Variables:
+    - EXECUTOR_POOL_SIZE: Number of worker processes (default: 2)
+    - EXECUTOR_TIMEOUT_SEC: Wall-clock limit per execution (default: 170,
+      below the 180s client timeout of fargate_container_controller.py)
+    - EXECUTOR_MAX_RSS_MB: Resident memory limit per worker (default: 3072)
+    - EXECUTOR_CPU_LIMIT_SEC: CPU time limit per execution (default: 300)
+    - EXECUTOR_MAX_TASKS_PER_WORKER: Executions before a worker is recycled (default: 50)
+    - EXECUTOR_PRELOAD: Comma-separated modules imported once by the forkserver
+      (default: numpy,pandas,matplotlib)
+
+Usage:
+    from python_sandbox import SandboxPool
+
+    pool = SandboxPool(exec_globals={'workspace': '/tmp/session_x'})
+    outcome = pool.execute("print('hello')")
+    # {"status": "completed", "stdout": "hello\\n", "stderr": "", "error": None, "killed": None}
+"""
+
+import io
+import os
+import sys
+import time
+import queue
+import signal
+import resource
+import threading
+import traceback
+import contextlib
+import multiprocessing
+from io import StringIO
+
+POOL_SIZE = int(os.environ.get('EXECUTOR_POOL_SIZE', '2'))
+TIMEOUT_SEC = float(os.environ.get('EXECUTOR_TIMEOUT_SEC', '170'))
+MAX_RSS_MB = int(os.environ.get('EXECUTOR_MAX_RSS_MB', '3072'))
+CPU_LIMIT_SEC = int(os.environ.get('EXECUTOR_CPU_LIMIT_SEC', '300'))
+MAX_TASKS_PER_WORKER = int(os.environ.get('EXECUTOR_MAX_TASKS_PER_WORKER', '50'))
+PRELOAD_MODULES = [m.strip() for m in os.environ.get('EXECUTOR_PRELOAD', 'numpy,pandas,matplotlib').split(',') if m.strip()]
+
+RSS_POLL_INTERVAL = 0.05  # seconds between RSS samples while a snippet runs
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+STREAM_FLUSH_INTERVAL = 0.1  # seconds; streamed output reaches the parent at least this often
+STREAM_FLUSH_BYTES = 4096    # ... or as soon as this much is pending
+
+
+class _StreamCapture(io.TextIOBase):
+    """
+    stdout/stderr replacement inside the worker: keeps the full text like StringIO and,
+    in streaming mode, also sends ("output", stream, text) messages to the parent.
+    Pending text is sent by the worker's flusher thread every STREAM_FLUSH_INTERVAL,
+    on print(..., flush=True), or when STREAM_FLUSH_BYTES are pending.
+    """
+
+    def __init__(self, send, name, streaming):
+        self.send = send
+        self.name = name
+        self.streaming = streaming
+        self.buffer = StringIO()
+        self.pending = []
+        self.pending_size = 0
+        self.lock = threading.Lock()
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if not isinstance(text, str):
+            raise TypeError(f"write() argument must be str, not {type(text).__name__}")
+        self.buffer.write(text)
+        if self.streaming and text:
+            with self.lock:
+                self.pending.append(text)
+                self.pending_size += len(text)
+            if self.pending_size >= STREAM_FLUSH_BYTES:
+                self.flush()
+        return len(text)
+
+    def flush(self):
+        # Sent under the lock, so a concurrent flush cannot overtake the final result message
+        with self.lock:
+            if not self.pending:
+                return
+            self.send(("output", self.name, "".join(self.pending)))
+            self.pending = []
+            self.pending_size = 0
+
+    def getvalue(self):
+        return self.buffer.getvalue()
+
+
+def _worker_main(conn, exec_globals):
+    """Worker process loop: receive code, exec() it with fresh globals, send the outcome back"""
+    # Own process group: the parent kills snippet-spawned subprocesses with os.killpg
+    os.setsid()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    import datetime as datetime_module
+    import json
+
+    base_cwd = os.getcwd()
+    _, cpu_hard = resource.getrlimit(resource.RLIMIT_CPU)
+
+    # The flusher thread and the main loop share the pipe
+    send_lock = threading.Lock()
+    active_captures = []
+
+    def send(message):
+        with send_lock:
+            conn.send(message)
+
+    def flusher():
+        while True:
+            time.sleep(STREAM_FLUSH_INTERVAL)
+            for capture in list(active_captures):
+                try:
+                    capture.flush()
+                except Exception:
+                    pass
+
+    threading.Thread(target=flusher, daemon=True).start()
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        if message is None:
+            break
+        code_string, cpu_limit, streaming = message
+
+        # RLIMIT_CPU counts the whole process lifetime, so the soft limit is moved forward per execution
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        cpu_soft = int(usage.ru_utime + usage.ru_stime) + max(1, int(cpu_limit))
+        if cpu_hard != resource.RLIM_INFINITY:
+            cpu_soft = min(cpu_soft, cpu_hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_soft, cpu_hard))
+
+        outcome = {"status": "running", "stdout": "", "stderr": "", "error": None}
+        stdout_capture = _StreamCapture(send, "stdout", streaming)
+        stderr_capture = _StreamCapture(send, "stderr", streaming)
+        if streaming:
+            active_captures[:] = [stdout_capture, stderr_capture]
+
+        with contextlib.redirect_stdout(stdout_capture), contextlib.redirect_stderr(stderr_capture):
+            # Same globals as the former in-process exec(): fresh namespace per execution
+            snippet_globals = {
+                '__builtins__': __builtins__,
+                'datetime': datetime_module.datetime,
+                'json': json,
+                'os': os,
+            }
+            snippet_globals.update(exec_globals)
+
+            try:
+                exec(code_string, snippet_globals)
+                outcome["status"] = "completed"
+            except BaseException as exec_error:
+                # SystemExit/KeyboardInterrupt from the snippet must not end the worker loop
+                outcome["status"] = "failed"
+                outcome["error"] = {
+                    "type": type(exec_error).__name__,
+                    "message": str(exec_error),
+                    "traceback": traceback.format_exc()
+                }
+
+        active_captures.clear()
+        try:
+            stdout_capture.flush()
+            stderr_capture.flush()
+        except Exception:
+            pass
+        outcome["stdout"] = stdout_capture.getvalue()
+        outcome["stderr"] = stderr_capture.getvalue()
+
+        # Undo state a snippet may have changed for the next one
+        try:
+            os.chdir(base_cwd)
+        except OSError:
+            pass
+        if 'matplotlib.pyplot' in sys.modules:
+            sys.modules['matplotlib.pyplot'].close('all')
+
+        try:
+            send(("result", outcome))
+        except Exception as send_error:
+            # e.g. unpicklable exception message; report it instead of losing the result
+            send(("result", {
+                "status": "failed",
+                "stdout": outcome["stdout"],
+                "stderr": outcome["stderr"],
+                "error": {"type": type(send_error).__name__, "message": str(send_error), "traceback": None}
+            }))
+
+
+class _Worker:
+    """Parent-side handle of one worker process"""
+
+    def __init__(self, context, exec_globals):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, exec_globals), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    def rss_bytes(self):
+        """Resident set size from /proc (0 if the process is gone)"""
+        try:
+            with open(f"/proc/{self.pid}/statm") as f:
+                return int(f.read().split()[1]) * PAGE_SIZE
+        except (OSError, IndexError, ValueError):
+            return 0
+
+    def kill(self):
+        """Kill the worker and everything in its process group"""
+        try:
+            os.killpg(self.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError, TypeError):
+            pass
+        try:
+            self.process.kill()
+        except Exception:
+            pass
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def stop(self):
+        """Graceful shutdown (used when recycling an idle worker)"""
+        try:
+            self.conn.send(None)
+        except Exception:
+            pass
+        self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+class SandboxPool:
+    """
+    Pool of pre-forked, resource-limited Python worker processes.
+
+    Args:
+        size: Number of workers (concurrent executions)
+        timeout: Wall-clock limit per execution in seconds
+        max_rss_mb: Resident memory limit per worker in MB (0 = unlimited)
+        cpu_limit: CPU time limit per execution in seconds
+        max_tasks_per_worker: Recycle a worker after this many executions (0 = never)
+        exec_globals: Extra globals for every snippet (must be picklable, e.g. {'workspace': path})
+        preload: Modules the forkserver imports once before forking workers
+    """
+
+    def __init__(self, size=POOL_SIZE, timeout=TIMEOUT_SEC, max_rss_mb=MAX_RSS_MB,
+                 cpu_limit=CPU_LIMIT_SEC, max_tasks_per_worker=MAX_TASKS_PER_WORKER,
+                 exec_globals=None, preload=None):
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024
+        self.cpu_limit = cpu_limit
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.exec_globals = dict(exec_globals or {})
+
+        # forkserver: workers are forked from a clean single-threaded server process,
+        # not from the multi-threaded Flask process
+        self.context = multiprocessing.get_context('forkserver')
+        self.context.set_forkserver_preload(PRELOAD_MODULES if preload is None else preload)
+
+        self.idle = queue.Queue()
+        self.lock = threading.Lock()
+        self.stats = {"executions": 0, "timeouts": 0, "memory_kills": 0, "cpu_kills": 0, "crashes": 0, "replaced": 0}
+
+        for _ in range(self.size):
+            self.idle.put(self._spawn())
+        print(f"🧰 Sandbox pool ready: {self.size} workers "
+              f"(timeout={self.timeout}s, rss={max_rss_mb}MB, cpu={self.cpu_limit}s)", flush=True)
+
+    def _spawn(self):
+        return _Worker(self.context, self.exec_globals)
+
+    def _replace(self, worker, reason):
+        """Kill a worker and put a fresh one into the pool without blocking the request"""
+        def replace():
+            if reason == "recycle":
+                worker.stop()
+            else:
+                worker.kill()
+            self.idle.put(self._spawn())
+
+        with self.lock:
+            self.stats["replaced"] += 1
+        threading.Thread(target=replace, daemon=True).start()
+
+    def _count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def execute(self, code_string, timeout=None, on_output=None):
+        """
+        Run a Python snippet in a worker process.
+
+        Args:
+            code_string: Python code
+            timeout: Wall-clock limit (default: pool timeout)
+            on_output: Optional callback(stream, text) called with stdout/stderr chunks
+                       while the snippet runs (streaming mode)
+
+        Returns:
+            dict: status ("completed"/"failed"), stdout, stderr,
+                  error ({"type", "message", "traceback"} or None),
+                  killed (None, "timeout", "memory", "cpu" or "crash")
+        """
+        timeout = self.timeout if timeout is None else timeout
+        worker = self.idle.get()
+        self._count("executions")
+
+        try:
+            worker.conn.send((code_string, self.cpu_limit, on_output is not None))
+        except (BrokenPipeError, OSError):
+            # Worker died while idle: replace it and retry on another one
+            self._count("crashes")
+            self._replace(worker, "crash")
+            return self.execute(code_string, timeout, on_output)
+
+        deadline = time.monotonic() + timeout
+        peak_rss = 0
+        killed = None
+        streamed = {"stdout": [], "stderr": []}  # kept so output survives a kill
+
+        try:
+            while True:
+                try:
+                    message = worker.conn.recv() if worker.conn.poll(RSS_POLL_INTERVAL) else None
+                except (EOFError, OSError):
+                    # Worker exited mid-execution (SIGXCPU, segfault, os._exit, ...)
+                    worker.process.join(timeout=1)
+                    killed = "cpu" if worker.process.exitcode == -signal.SIGXCPU else "crash"
+                    break
+                if message is not None:
+                    kind, *payload = message
+                    if kind == "result":
+                        outcome = payload[0]
+                        break
+                    stream, text = payload
+                    streamed[stream].append(text)
+                    # Outside the try above: an OSError from the callback is not a worker crash
+                    on_output(stream, text)
+                    continue
+
+                rss = worker.rss_bytes()
+                peak_rss = max(peak_rss, rss)
+                if self.max_rss_bytes and rss > self.max_rss_bytes:
+                    killed = "memory"
+                    break
+                if time.monotonic() >= deadline:
+                    killed = "timeout"
+                    break
+        except BaseException:
+            # on_output raised (or the caller was interrupted) while the snippet is still running:
+            # the worker cannot be reused, so kill it and keep the pool at full size
+            self._replace(worker, "interrupted")
+            raise
+
+        if killed is None:
+            outcome["killed"] = None
+            worker.tasks += 1
+            if self.max_tasks_per_worker and worker.tasks >= self.max_tasks_per_worker:
+                self._replace(worker, "recycle")
+            else:
+                self.idle.put(worker)
+            return outcome
+
+        self._count({"timeout": "timeouts", "memory": "memory_kills", "cpu": "cpu_kills", "crash": "crashes"}[killed])
+        self._replace(worker, killed)
+
+        messages = {
+            "timeout": ("TimeoutError", f"Execution timed out after {timeout} seconds"),
+            "memory": ("MemoryLimitExceeded",
+                       f"Execution exceeded the memory limit of {self.max_rss_bytes // (1024 * 1024)} MB "
+                       f"(RSS {peak_rss // (1024 * 1024)} MB)"),
+            "cpu": ("CPULimitExceeded", f"Execution exceeded the CPU time limit of {self.cpu_limit} seconds"),
+            "crash": ("WorkerCrashed", f"Python worker exited unexpectedly (exit code {worker.process.exitcode})"),
+        }
+        error_type, message = messages[killed]
+        return {
+            "status": "failed",
+            "stdout": "".join(streamed["stdout"]),
+            "stderr": "".join(streamed["stderr"]),
+            "error": {"type": error_type, "message": message, "traceback": None},
+            "killed": killed
+        }
+
+    def shutdown(self):
+        """Stop all idle workers"""
+        while True:
+            try:
+                self.idle.get_nowait().stop()
+            except queue.Empty:
+                break
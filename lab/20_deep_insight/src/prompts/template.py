@@ -1,9 +1,16 @@
 import os
 from datetime import datetime
+from functools import lru_cache
+
+@lru_cache(maxsize=None)
+def load_prompt_template(prompt_name: str) -> str:
+    """Read a prompt template once per process (agent tools apply it on every call)"""
+    with open(os.path.join(os.path.dirname(__file__), f"{prompt_name}.md")) as f: ## Template.py가 있는 dir이 기준
+        return f.read()
 
 def apply_prompt_template(prompt_name: str, prompt_context={}) -> str:
     
-    system_prompts = open(os.path.join(os.path.dirname(__file__), f"{prompt_name}.md")).read() ## Template.py가 있는 dir이 기준
+    system_prompts = load_prompt_template(prompt_name)
     context = {"CURRENT_TIME": datetime.now().strftime("%a %b %d %Y %H:%M:%S %z")}
     context.update(prompt_context)
     system_prompts = system_prompts.format(**context)
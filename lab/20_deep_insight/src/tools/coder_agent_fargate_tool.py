@@ -2,10 +2,10 @@
 
 import os
 import logging
-import asyncio
 from typing import Any, Annotated
 from strands.types.tools import ToolResult, ToolUse
 from src.utils.strands_sdk_utils import strands_utils
+from src.utils.agent_registry import agent_registry, run_async
 from src.prompts.template import apply_prompt_template
 from src.utils.common_utils import get_message_from_string
 from src.tools import fargate_python_tool, fargate_bash_tool
@@ -96,7 +96,7 @@ def handle_coder_agent_fargate_tool(task: Annotated[str, "The coding task or que
 
         # Create coder agent with Fargate-enabled tools using consistent pattern
         logger.info(f"{Colors.BLUE}📦 Creating coder agent with Fargate tools{Colors.END}")
-        coder_agent = strands_utils.get_agent(
+        coder_agent = agent_registry.acquire(
             agent_name="coder-fargate",
             system_prompts=apply_prompt_template(
                 prompt_name="coder",
@@ -126,7 +126,10 @@ def handle_coder_agent_fargate_tool(task: Annotated[str, "The coding task or que
                     full_text += event.get("data", "")
             return {"text": full_text}
 
-        response = asyncio.run(process_coder_stream())
+        try:
+            response = run_async(process_coder_stream())
+        finally:
+            agent_registry.release(coder_agent)
         result_text = response['text']
 
         # Update clues
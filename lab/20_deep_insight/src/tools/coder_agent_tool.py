@@ -1,10 +1,10 @@
 
 import os
 import logging
-import asyncio
 from typing import Any, Annotated
 from strands.types.tools import ToolResult, ToolUse
 from src.utils.strands_sdk_utils import strands_utils
+from src.utils.agent_registry import agent_registry, run_async
 from src.prompts.template import apply_prompt_template
 from src.utils.common_utils import get_message_from_string
 from src.tools import python_repl_tool, bash_tool
@@ -78,7 +78,7 @@ def handle_coder_agent_tool(task: Annotated[str, "The coding task or question th
         clues, messages = shared_state.get("clues", ""), shared_state.get("messages", [])
 
         # Create coder agent with specialized tools using consistent pattern
-        coder_agent = strands_utils.get_agent(
+        coder_agent = agent_registry.acquire(
             agent_name="coder",
             system_prompts=apply_prompt_template(prompt_name="coder", prompt_context={"USER_REQUEST": request_prompt, "FULL_PLAN": full_plan}),
             agent_type="claude-sonnet-3-7", # claude-sonnet-3-5-v-2, claude-sonnet-3-7
@@ -100,7 +100,10 @@ def handle_coder_agent_tool(task: Annotated[str, "The coding task or question th
                 if event.get("event_type") == "text_chunk": full_text += event.get("data", "")
             return {"text": full_text}
 
-        response = asyncio.run(process_coder_stream())
+        try:
+            response = run_async(process_coder_stream())
+        finally:
+            agent_registry.release(coder_agent)
         result_text = response['text']
 
         # Update clues
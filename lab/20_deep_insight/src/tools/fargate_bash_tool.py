@@ -58,7 +58,7 @@ def handle_fargate_bash_tool(cmd: Annotated[str, "The bash command to be execute
             bash_code = f"BASH: {cmd}"
 
             # 코드 실행
-            result = session_manager.execute_code(bash_code, f"Bash: {cmd}")
+            result = session_manager.execute_code_stream(bash_code, f"Bash: {cmd}", source="fargate_bash_tool")
 
             # 에러 처리
             if result.get('error'):
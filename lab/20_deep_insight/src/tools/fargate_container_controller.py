@@ -30,6 +30,7 @@ Key Features:
        - Fixed container per session (no container switching)
        - HTTP-based code execution via ALB
        - Timeout handling (180s default for large operations)
+       - Streaming mode: stdout/stderr chunks via Server-Sent Events (execute_code_stream)
        - Error handling with workflow termination
 
     4. Network Configuration
@@ -83,11 +84,12 @@ Notes:
 """
 
 import os
+import json
 import boto3
 import time
 import uuid
 import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -119,6 +121,7 @@ class SessionBasedFargateManager:
     TASK_IP_POLL_INTERVAL = 3          # Polling interval for task IP check (seconds)
     HEALTH_CHECK_TIMEOUT = 5           # Timeout for container health check (seconds)
     CODE_EXECUTION_TIMEOUT = 180       # Timeout for code execution (seconds)
+    STREAM_READ_TIMEOUT = 60           # Max silence on a streaming execution (server sends progress every 10s)
     SESSION_COMPLETE_TIMEOUT = 10      # Timeout for session completion signal (seconds)
     STATUS_CHECK_TIMEOUT = 5           # Timeout for session status check (seconds)
     S3_UPLOAD_WAIT = 15                # Wait time for S3 upload completion (seconds)
@@ -548,6 +551,82 @@ class SessionBasedFargateManager:
         except Exception as e:
             self._raise_container_error("EXECUTION", e)
 
+    @staticmethod
+    def _iter_sse(response):
+        """Yield (event, data) pairs from a text/event-stream response as they arrive"""
+        event, data_lines = "message", []
+        # chunk_size=None: hand over each chunk as soon as it is received
+        for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+            if not line:
+                if data_lines:
+                    yield event, json.loads("\n".join(data_lines))
+                event, data_lines = "message", []
+            elif line.startswith(":"):
+                continue  # SSE comment
+            elif line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                data_lines.append(line[len("data:"):].lstrip())
+
+    def execute_code_stream(self, code: str, description: str = "",
+                            on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Execute code on fixed container, receiving output while it runs (SSE mode of /execute)
+        - Same result and error handling as execute_code
+        - Progress events keep the connection active, so long analyses do not hit ALB idle timeouts
+
+        Args:
+            code: Code to execute
+            description: Execution description
+            on_event: Callback(event, data) for "start", "output" ({"stream", "text"}) and "progress" events
+
+        Returns:
+            Execution result (same as execute_code)
+        """
+        self._ensure_active_session()
+        self._ensure_http_session()
+
+        print(f"🔄 [Session {self.current_session['session_id']}] Streaming execution on FIXED container: {description}", flush=True)
+
+        try:
+            response = self.http_session.post(
+                f"http://{self.alb_dns}/execute",
+                json={"code": code, "stream": True},
+                headers={"Accept": "text/event-stream"},
+                stream=True,
+                timeout=(self.HEALTH_CHECK_TIMEOUT, self.STREAM_READ_TIMEOUT)
+            )
+
+            with response:
+                if response.status_code != 200:
+                    self._raise_container_error("NOT RESPONDING", Exception(f"HTTP {response.status_code}"))
+
+                # Container image without streaming support: plain JSON response
+                if not response.headers.get("Content-Type", "").startswith("text/event-stream"):
+                    result = response.json()
+                    print(f"✅ Execution completed on fixed container: {result['execution_num']}/{result['total_executions']}", flush=True)
+                    return result
+
+                for event, data in self._iter_sse(response):
+                    if event == "result":
+                        if 'total_executions' in data:
+                            print(f"✅ Execution completed on fixed container: {data['execution_num']}/{data['total_executions']}", flush=True)
+                        return data
+
+                    if on_event:
+                        try:
+                            on_event(event, data)
+                        except Exception as callback_error:
+                            print(f"⚠️ Stream event callback failed: {callback_error}", flush=True)
+
+            self._raise_container_error("NOT RESPONDING", Exception("Stream ended without result"))
+
+        except requests.exceptions.RequestException as e:
+            self._raise_container_error("CONNECTION", e)
+
+        except Exception as e:
+            self._raise_container_error("EXECUTION", e)
+
     def complete_session(self, wait_for_s3: bool = True) -> Dict[str, Any]:
         """
         Complete current session and cleanup
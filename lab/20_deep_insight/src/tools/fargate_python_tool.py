@@ -60,7 +60,7 @@ def handle_fargate_python_tool(code: Annotated[str, "The python code to execute
             session_manager = get_global_session()
 
             # 코드 실행
-            result = session_manager.execute_code(code, "Python execution")
+            result = session_manager.execute_code_stream(code, "Python execution", source="fargate_python_tool")
 
             # 에러 처리
             if result.get('error'):
@@ -55,6 +55,9 @@ Usage Example:
     # Execute code in container
     result = session_mgr.execute_code("import pandas as pd\\ndf = pd.read_csv('data.csv')")
 
+    # Execute with streamed output (stdout/stderr chunks go to the event queue while the code runs)
+    result = session_mgr.execute_code_stream("df.describe()", agent_name="coder-fargate")
+
     # Cleanup when done
     session_mgr.cleanup_session()
     ```
@@ -293,6 +296,37 @@ class GlobalFargateSessionManager:
         Returns:
             dict: Execution result or error
         """
+        return self._execute_with_retry(lambda: self._session_manager.execute_code(code, description))
+
+    def execute_code_stream(self, code: str, description: str = "", agent_name: str = "fargate",
+                            source: str = "fargate_code_output"):
+        """
+        Execute code like execute_code, streaming its output into the event queue
+
+        stdout/stderr chunks are put on the global event queue (src.utils.event_queue)
+        as text_chunk events while the code runs, instead of after the whole execution.
+
+        Args:
+            code: Python code to execute
+            description: Description of the code execution
+            agent_name: agent_name of the emitted events
+            source: source of the emitted events
+
+        Returns:
+            dict: Execution result or error (same as execute_code)
+        """
+        from src.utils.event_queue import put_event
+
+        def on_event(event, data):
+            if event == "output" and data.get("text"):
+                put_event(self._code_output_event(data["text"], agent_name, source))
+
+        return self._execute_with_retry(
+            lambda: self._session_manager.execute_code_stream(code, description, on_event=on_event)
+        )
+
+    def _execute_with_retry(self, execute_fn):
+        """Run execute_fn with session management, retrying connection errors"""
         for attempt in range(1, self.CODE_EXECUTION_MAX_RETRIES + 1):
             try:
                 # Ensure session exists
@@ -300,7 +334,7 @@ class GlobalFargateSessionManager:
                     return {"error": "Failed to create or maintain session"}
 
                 # Execute code
-                result = self._session_manager.execute_code(code, description)
+                result = execute_fn()
 
                 # Return immediately on success
                 return result
@@ -401,6 +435,20 @@ class GlobalFargateSessionManager:
     # 🔧 SESSION MANAGEMENT (PRIVATE HELPERS)
     # ========================================================================
 
+    @staticmethod
+    def _code_output_event(text: str, agent_name: str, source: str) -> dict:
+        """Container output chunk in the AgentCore text_chunk event format (see strands_utils._convert_to_agentcore_event)"""
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "session_id": "ABC",  # Dummy session_id (replaced by agentcore_runtime)
+            "agent_name": agent_name,
+            "source": source,
+            "type": "agent_text_stream",
+            "event_type": "text_chunk",
+            "data": text,
+            "chunk_size": len(text)
+        }
+
     def _get_aws_region(self) -> str:
         """
         Get AWS region from environment with validation
@@ -2,10 +2,10 @@
 
 import os
 import logging
-import asyncio
 from typing import Any, Annotated
 from strands.types.tools import ToolResult, ToolUse
 from src.utils.strands_sdk_utils import strands_utils
+from src.utils.agent_registry import agent_registry, run_async
 from src.prompts.template import apply_prompt_template
 from src.utils.common_utils import get_message_from_string
 from src.tools import fargate_python_tool, fargate_bash_tool
@@ -84,7 +84,7 @@ def handle_reporter_agent_fargate_tool(task: Annotated[str, "The reporting task
 
         # Create reporter agent with Fargate-enabled tools using consistent pattern
         logger.info(f"{Colors.BLUE}📦 Creating reporter agent with Fargate tools{Colors.END}")
-        reporter_agent = strands_utils.get_agent(
+        reporter_agent = agent_registry.acquire(
             agent_name="reporter",  # 기존 이름 유지
             system_prompts=apply_prompt_template(
                 prompt_name="reporter",
@@ -115,7 +115,10 @@ def handle_reporter_agent_fargate_tool(task: Annotated[str, "The reporting task
                     full_text += event.get("data", "")
             return {"text": full_text}
 
-        response = asyncio.run(process_reporter_stream())
+        try:
+            response = run_async(process_reporter_stream())
+        finally:
+            agent_registry.release(reporter_agent)
         result_text = response['text']
 
         # Update clues
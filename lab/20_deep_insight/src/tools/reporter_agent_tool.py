@@ -1,9 +1,9 @@
 import os
 import logging
-import asyncio
 from typing import Any, Annotated
 from strands.types.tools import ToolResult, ToolUse
 from src.utils.strands_sdk_utils import strands_utils
+from src.utils.agent_registry import agent_registry, run_async
 from src.prompts.template import apply_prompt_template
 from src.utils.common_utils import get_message_from_string
 
@@ -81,7 +81,7 @@ def handle_reporter_agent_tool(_task: Annotated[str, "The reporting task or inst
         clues, messages = shared_state.get("clues", ""), shared_state.get("messages", [])
         
         # Create reporter agent with specialized tools using consistent pattern
-        reporter_agent = strands_utils.get_agent(
+        reporter_agent = agent_registry.acquire(
             agent_name="reporter",
             system_prompts=apply_prompt_template(prompt_name="reporter", prompt_context={"USER_REQUEST": request_prompt, "FULL_PLAN": full_plan}),
             agent_type="claude-sonnet-3-7", # claude-sonnet-3-5-v-2, claude-sonnet-3-7
@@ -103,7 +103,10 @@ def handle_reporter_agent_tool(_task: Annotated[str, "The reporting task or inst
                 if event.get("event_type") == "text_chunk": full_text += event.get("data", "")
             return {"text": full_text}
         
-        response = asyncio.run(process_reporter_stream())
+        try:
+            response = run_async(process_reporter_stream())
+        finally:
+            agent_registry.release(reporter_agent)
         result_text = response['text']
         
         # Update clues
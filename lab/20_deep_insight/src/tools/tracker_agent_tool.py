@@ -1,8 +1,8 @@
 import logging
-import asyncio
 from typing import Any, Annotated
 from strands.types.tools import ToolResult, ToolUse
 from src.utils.strands_sdk_utils import strands_utils
+from src.utils.agent_registry import agent_registry, run_async
 from src.prompts.template import apply_prompt_template
 from src.utils.common_utils import get_message_from_string
 
@@ -73,7 +73,7 @@ def handle_tracker_agent_tool(completed_agent: Annotated[str, "The name of the a
     messages = shared_state.get("messages", [])
     
     # Create tracker agent - uses reasoning LLM like planner and supervisor
-    tracker_agent = strands_utils.get_agent(
+    tracker_agent = agent_registry.acquire(
         agent_name="tracker",
         system_prompts=apply_prompt_template(
             prompt_name="tacker", 
@@ -106,7 +106,10 @@ def handle_tracker_agent_tool(completed_agent: Annotated[str, "The name of the a
                 full_text += event.get("data", "")
         return {"text": full_text}
     
-    response = asyncio.run(process_tracker_stream())
+    try:
+        response = run_async(process_tracker_stream())
+    finally:
+        agent_registry.release(tracker_agent)
     
     result_text = response['text']
     
@@ -1,9 +1,9 @@
 import os
 import logging
-import asyncio
 from typing import Any, Annotated, Dict, List
 from strands.types.tools import ToolResult, ToolUse
 from src.utils.strands_sdk_utils import strands_utils
+from src.utils.agent_registry import agent_registry, run_async
 from src.prompts.template import apply_prompt_template
 from src.utils.common_utils import get_message_from_string
 
@@ -125,7 +125,7 @@ def handle_validator_agent_fargate_tool(task: Annotated[str, "The validation tas
 
         # Create validator agent with Fargate-enabled tools using consistent pattern
         logger.info(f"{Colors.BLUE}📦 Creating validator agent with Fargate tools{Colors.END}")
-        validator_agent = strands_utils.get_agent(
+        validator_agent = agent_registry.acquire(
             agent_name="validator",
             system_prompts=apply_prompt_template(
                 prompt_name="validator",
@@ -154,7 +154,10 @@ def handle_validator_agent_fargate_tool(task: Annotated[str, "The validation tas
                 if event.get("event_type") == "text_chunk": full_text += event.get("data", "")
             return {"text": full_text}
 
-        response = asyncio.run(process_validator_fargate_stream())
+        try:
+            response = run_async(process_validator_fargate_stream())
+        finally:
+            agent_registry.release(validator_agent)
         result_text = response['text']
 
         # Update clues
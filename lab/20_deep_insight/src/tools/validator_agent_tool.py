@@ -1,9 +1,9 @@
 import os
 import logging
-import asyncio
 from typing import Any, Annotated, Dict, List
 from strands.types.tools import ToolResult, ToolUse
 from src.utils.strands_sdk_utils import strands_utils
+from src.utils.agent_registry import agent_registry, run_async
 from src.prompts.template import apply_prompt_template
 from src.utils.common_utils import get_message_from_string
 import json
@@ -149,7 +149,7 @@ def handle_validator_agent_tool(_task: Annotated[str, "The validation task or in
         clues, messages = shared_state.get("clues", ""), shared_state.get("messages", [])
         
         # Create validator agent with specialized tools using consistent pattern
-        validator_agent = strands_utils.get_agent(
+        validator_agent = agent_registry.acquire(
             agent_name="validator",
             system_prompts=apply_prompt_template(prompt_name="validator", prompt_context={"USER_REQUEST": request_prompt, "FULL_PLAN": full_plan}),
             agent_type="claude-sonnet-3-7", # claude-sonnet-3-5-v-2, claude-sonnet-3-7
@@ -178,7 +178,10 @@ def handle_validator_agent_tool(_task: Annotated[str, "The validation task or in
             
             return validator_agent, response
         
-        validator_agent, response = asyncio.run(process_validator_stream())
+        try:
+            validator_agent, response = run_async(process_validator_stream())
+        finally:
+            agent_registry.release(validator_agent)
         result_text = response['text']
         
         # Update clues
@@ -0,0 +1,234 @@
+"""
+Agent registry and persistent background event loop for the agent-as-tool wrappers.
+
+The agent tools (coder_agent_tool, reporter_agent_fargate_tool, ...) used to build a new
+Strands agent with strands_utils.get_agent and drive it with asyncio.run on every call,
+paying for BedrockModel/boto3 client construction and event loop setup each time.
+
+- run_async(coro): runs a coroutine on one long-lived event loop thread (thread-safe submit)
+- agent_registry.agent(...): context manager that checks out a warm agent for
+  (session, agent_name, config); the agent's conversation and state are reset, the system
+  prompt is replaced, and the model (and its boto3 client / HTTP connection pool) is reused
+- Models are shared by every agent with the same model config, across sessions
+- agent_registry.set_session(request_id) scopes new agents to the current request; the session
+  is a context variable, so concurrent requests do not overwrite each other's session id
+- agent_registry.clear(session_id) drops a session's agents at the end of a request
+
+Usage:
+    from src.utils.agent_registry import agent_registry, run_async
+
+    with agent_registry.agent(agent_name="coder", system_prompts=prompt, tools=[...]) as coder_agent:
+        response = run_async(process_coder_stream(coder_agent))
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Coroutine, Dict, Optional
+
+from strands import Agent
+from strands.agent.state import AgentState
+
+from src.utils.strands_sdk_utils import strands_utils
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+DEFAULT_SESSION = "default"
+
+# Session of the current request (asyncio tasks and asyncio.to_thread calls inherit it)
+_current_session: contextvars.ContextVar = contextvars.ContextVar("agent_registry_session", default=DEFAULT_SESSION)
+
+
+class BackgroundEventLoop:
+    """Event loop running forever in a daemon thread; coroutines are submitted from any thread"""
+
+    def __init__(self, name: str = "agent-event-loop"):
+        self.name = name
+        self.loop = None
+        self.thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_running(self):
+        with self._lock:
+            if self.thread is not None and self.thread.is_alive():
+                return
+            self.loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def run_loop():
+                asyncio.set_event_loop(self.loop)
+                self.loop.call_soon(started.set)
+                self.loop.run_forever()
+
+            self.thread = threading.Thread(target=run_loop, name=self.name, daemon=True)
+            self.thread.start()
+            started.wait()
+
+    def submit(self, coro: Coroutine):
+        """Schedule a coroutine on the loop; returns a concurrent.futures.Future"""
+        self._ensure_running()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the loop and wait for its result (drop-in for asyncio.run)"""
+        if threading.current_thread() is self.thread:
+            coro.close()
+            raise RuntimeError("run() called from the background loop thread; await the coroutine instead")
+        return self.submit(coro).result(timeout=timeout)
+
+
+_background_loop = BackgroundEventLoop()
+
+
+def get_background_loop() -> BackgroundEventLoop:
+    return _background_loop
+
+
+async def _in_session(coro: Coroutine, session_id: str) -> Any:
+    # Tasks on the background loop do not inherit the caller's context; carry the registry session over
+    _current_session.set(session_id)
+    return await coro
+
+
+def run_async(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on the shared background event loop (in the caller's session) and return its result"""
+    return _background_loop.run(_in_session(coro, _current_session.get()), timeout=timeout)
+
+
+class AgentRegistry:
+    """
+    Per-session pool of warm Strands agents.
+
+    Agents are keyed by (session_id, agent_name, model config, tools). A checked-out agent is
+    used by one caller at a time; concurrent calls for the same key get separate agents.
+    """
+
+    def __init__(self):
+        self._idle = defaultdict(list)  # (session_id, agent_name, config) -> [Agent]
+        self._models = {}               # model config -> BedrockModel
+        self._checked_out = {}          # session_id -> number of agents currently checked out
+        self._cleared = set()           # cleared sessions that still have agents checked out
+        self._lock = threading.Lock()
+        self.stats = {"created": 0, "reused": 0, "models_created": 0}
+
+    @property
+    def session_id(self) -> str:
+        """Session of the current request context"""
+        return _current_session.get()
+
+    def set_session(self, session_id: Optional[str]) -> contextvars.Token:
+        """
+        Set the session new agents are registered under (e.g. the AgentCore request id) for the
+        current request context. Returns a token for reset_session.
+        """
+        return _current_session.set(session_id or DEFAULT_SESSION)
+
+    def reset_session(self, token: contextvars.Token):
+        """Restore the session that was current before set_session"""
+        _current_session.reset(token)
+
+    def _get_model(self, agent_type: str, cache_type: Optional[str], enable_reasoning: bool, streaming: bool):
+        key = (agent_type, cache_type, enable_reasoning, streaming)
+        with self._lock:
+            model = self._models.get(key)
+        if model is None:
+            model = strands_utils.get_model(llm_type=agent_type, cache_type=cache_type, enable_reasoning=enable_reasoning)
+            model.config["streaming"] = streaming
+            with self._lock:
+                model = self._models.setdefault(key, model)
+                self.stats["models_created"] += 1
+        return model
+
+    def acquire(self, session_id: Optional[str] = None, **kwargs) -> Agent:
+        """
+        Check out an agent. Accepts the same keyword arguments as strands_utils.get_agent.
+
+        Returns:
+            Agent with empty conversation/state and the given system prompt
+        """
+        agent_name, system_prompts = kwargs["agent_name"], kwargs["system_prompts"]
+        agent_type = kwargs.get("agent_type", "claude-sonnet-3-7")
+        enable_reasoning = kwargs.get("enable_reasoning", False)
+        _, cache_type = kwargs.get("prompt_cache_info", (False, None))
+        tools = kwargs.get("tools", None)
+        streaming = kwargs.get("streaming", True)
+
+        tools_key = tuple(getattr(t, "__name__", repr(t)) for t in tools) if tools else ()
+        key = (session_id or self.session_id, agent_name, agent_type, enable_reasoning, cache_type, streaming, tools_key)
+
+        with self._lock:
+            agent = self._idle[key].pop() if self._idle[key] else None
+
+        if agent is not None:
+            # Same state as a freshly built agent: new system prompt, no history
+            agent.system_prompt = system_prompts
+            agent.messages = []
+            agent.state = AgentState()
+            with self._lock:
+                self.stats["reused"] += 1
+            logger.info(f"{agent_name.upper()} - Reusing warm agent")
+        else:
+            agent = Agent(
+                model=self._get_model(agent_type, cache_type, enable_reasoning, streaming),
+                system_prompt=system_prompts,
+                tools=tools,
+                callback_handler=None  # async iterator로 대체 하기 때문에 None 설정
+            )
+            with self._lock:
+                self.stats["created"] += 1
+
+        agent._registry_key = key
+        with self._lock:
+            self._checked_out[key[0]] = self._checked_out.get(key[0], 0) + 1
+        return agent
+
+    def release(self, agent: Agent):
+        """Return a checked-out agent to the pool (dropped if its session was cleared meanwhile)"""
+        key = getattr(agent, "_registry_key", None)
+        if key is None:
+            return
+        agent._registry_key = None
+        session_id = key[0]
+        with self._lock:
+            remaining = self._checked_out.pop(session_id, 1) - 1
+            if remaining > 0:
+                self._checked_out[session_id] = remaining
+            if session_id in self._cleared:
+                if remaining <= 0:
+                    self._cleared.discard(session_id)
+                return
+            self._idle[key].append(agent)
+
+    @contextmanager
+    def agent(self, **kwargs):
+        """Context manager around acquire/release"""
+        agent = self.acquire(**kwargs)
+        try:
+            yield agent
+        finally:
+            self.release(agent)
+
+    def clear(self, session_id: Optional[str] = None):
+        """Drop the agents of a session (all sessions if None); shared models are kept"""
+        with self._lock:
+            if session_id is not None and self._checked_out.get(session_id):
+                # Agents still checked out are dropped on release
+                self._cleared.add(session_id)
+            for key in list(self._idle):
+                if session_id is None or key[0] == session_id:
+                    del self._idle[key]
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self.stats,
+                "idle_agents": sum(len(agents) for agents in self._idle.values()),
+                "checked_out": sum(self._checked_out.values()),
+            }
+
+
+agent_registry = AgentRegistry()
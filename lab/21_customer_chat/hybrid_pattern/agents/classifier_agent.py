@@ -73,18 +73,32 @@ def classify_query(query: str) -> dict:
         category = result.get("category", "주문")
     except:
         # JSON 파싱 실패시 키워드 기반 폴백
-        query_lower = query.lower()
-        if any(word in query_lower for word in ["반품", "불량", "하자"]):
-            category = "반품"
-        elif any(word in query_lower for word in ["환불", "돈"]):
-            category = "환불"
-        elif any(word in query_lower for word in ["취소", "안받"]):
-            category = "취소"
-        elif any(word in query_lower for word in ["배송", "추적", "택배"]):
-            category = "배송"
-        else:
-            category = "주문"
-        result = {"category": category, "confidence": 0.8, "reasoning": "키워드 기반 분류"}
+        result = keyword_classify(query)
+        category = result["category"]
 
     print(f"[분류 에이전트] 분류 결과: {category}")
     return result
+
+
+def keyword_classify(query: str) -> dict:
+    """
+    키워드 기반으로 고객 문의를 분류합니다 (LLM 응답 파싱 실패시 폴백).
+
+    Args:
+        query: 고객 문의
+
+    Returns:
+        dict: 분류 결과 {"category": str, "confidence": float, "reasoning": str}
+    """
+    query_lower = query.lower()
+    if any(word in query_lower for word in ["반품", "불량", "하자"]):
+        category = "반품"
+    elif any(word in query_lower for word in ["환불", "돈"]):
+        category = "환불"
+    elif any(word in query_lower for word in ["취소", "안받"]):
+        category = "취소"
+    elif any(word in query_lower for word in ["배송", "추적", "택배"]):
+        category = "배송"
+    else:
+        category = "주문"
+    return {"category": category, "confidence": 0.8, "reasoning": "키워드 기반 분류"}
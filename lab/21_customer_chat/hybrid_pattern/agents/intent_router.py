@@ -0,0 +1,200 @@
+"""
+의도 라우터 (분류 에이전트 앞단)
+로컬 임베딩 기반 최근접 중심(nearest-centroid) 분류기와 결과 캐시로
+LLM 분류 호출 없이 대부분의 문의를 즉시 라우팅합니다.
+
+- 임베딩: 정규화된 문의의 문자 n-gram TF-IDF 벡터 (외부 모델/의존성 없음)
+- 분류: 라벨링된 예시(data/intent_examples.json)로 만든 카테고리별 중심 벡터와의 코사인 유사도
+- 캐시: 정규화된 문의(주문번호/숫자/문장부호 제거) → 분류 결과 (LRU)
+- 신뢰도(유사도, 1-2위 차이)가 임계값 미만일 때만 분류 에이전트(LLM)로 폴백
+"""
+
+import json
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+
+from agents.classifier_agent import classify_query
+
+EXAMPLES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "intent_examples.json")
+
+MIN_SIMILARITY = 0.25   # 최고 유사도가 이보다 낮으면 LLM 폴백
+MIN_MARGIN = 0.03       # 1위와 2위 유사도 차이가 이보다 작으면 LLM 폴백
+CACHE_SIZE = 1024
+NGRAM_RANGE = (1, 3)
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키/임베딩용 정규화: 유니코드 정규화, 소문자, 주문번호/숫자 마스킹, 문장부호 제거"""
+    text = unicodedata.normalize("NFKC", query).lower()
+    text = re.sub(r"ord\d+", " ord ", text)
+    text = re.sub(r"\d+", "0", text)
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+def extract_features(normalized: str) -> Counter:
+    """단어 + 단어 내부 문자 n-gram (한국어 조사/어미 변화에 강함)"""
+    features = Counter()
+    for token in normalized.split():
+        features[f"w:{token}"] += 1
+        padded = f" {token} "
+        for n in range(NGRAM_RANGE[0], NGRAM_RANGE[1] + 1):
+            for i in range(len(padded) - n + 1):
+                gram = padded[i:i + n]
+                if gram.strip():
+                    features[gram] += 1
+    return features
+
+
+def _l2_normalize(vector: dict) -> dict:
+    norm = math.sqrt(sum(value * value for value in vector.values()))
+    return {key: value / norm for key, value in vector.items()} if norm else {}
+
+
+class IntentRouter:
+    """로컬 최근접 중심 분류기 + 결과 캐시 + LLM 폴백"""
+
+    def __init__(self, examples: dict = None, fallback=None, min_similarity: float = MIN_SIMILARITY,
+                 min_margin: float = MIN_MARGIN, cache_size: int = CACHE_SIZE):
+        """
+        Args:
+            examples: {카테고리: [예시 문의]} (기본: data/intent_examples.json)
+            fallback: 신뢰도가 낮을 때 호출할 분류 함수 (기본: 분류 에이전트 classify_query)
+            min_similarity: 로컬 분류를 채택할 최소 코사인 유사도
+            min_margin: 로컬 분류를 채택할 1-2위 유사도 최소 차이
+            cache_size: 결과 캐시 최대 항목 수 (0이면 캐시 비활성화)
+        """
+        if examples is None:
+            with open(EXAMPLES_PATH, "r", encoding="utf-8") as f:
+                examples = json.load(f)
+        self.fallback = fallback or classify_query
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"cache": 0, "local": 0, "llm": 0, "llm_errors": 0}
+        self.fit(examples)
+
+    def fit(self, examples: dict):
+        """라벨링된 예시로 IDF와 카테고리별 중심 벡터를 만듭니다."""
+        documents = [(category, extract_features(normalize_query(query)))
+                     for category, queries in examples.items() for query in queries]
+        document_frequency = Counter(feature for _, features in documents for feature in features)
+        self.idf = {feature: math.log((1 + len(documents)) / (1 + df)) + 1
+                    for feature, df in document_frequency.items()}
+
+        sums = {category: Counter() for category in examples}
+        for category, features in documents:
+            for feature, weight in self._embed_features(features).items():
+                sums[category][feature] += weight
+        self.centroids = {category: _l2_normalize(vector) for category, vector in sums.items()}
+        with self._lock:
+            self._cache.clear()
+
+    def _embed_features(self, features: Counter) -> dict:
+        # 학습 예시에 없는 특징은 분류에 기여하지 않으므로 제외
+        return _l2_normalize({
+            feature: (1 + math.log(count)) * self.idf[feature]
+            for feature, count in features.items() if feature in self.idf
+        })
+
+    def embed(self, query: str) -> dict:
+        """문의를 희소 TF-IDF 벡터로 변환합니다."""
+        return self._embed_features(extract_features(normalize_query(query)))
+
+    def predict(self, query: str):
+        """
+        로컬 분류만 수행합니다.
+
+        Returns:
+            tuple: (카테고리, 최고 유사도, 1-2위 유사도 차이)
+        """
+        vector = self.embed(query)
+        scores = sorted(
+            ((sum(weight * centroid.get(feature, 0.0) for feature, weight in vector.items()), category)
+             for category, centroid in self.centroids.items()),
+            reverse=True,
+        )
+        best_score, best_category = scores[0]
+        margin = best_score - scores[1][0] if len(scores) > 1 else best_score
+        return best_category, best_score, margin
+
+    def route(self, query: str) -> dict:
+        """
+        고객 문의를 분류합니다 (캐시 → 로컬 분류 → LLM 폴백 순).
+
+        Returns:
+            dict: 분류 결과 {"category": str, "confidence": float, "reasoning": str, "source": str}
+        """
+        key = normalize_query(query)
+        if self.cache_size > 0:
+            with self._lock:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    self.stats["cache"] += 1
+            if cached is not None:
+                print(f"[의도 라우터] 캐시 적중: {cached['category']}")
+                return {**cached, "source": "cache"}
+
+        category, similarity, margin = self.predict(query)
+        if similarity >= self.min_similarity and margin >= self.min_margin:
+            result = {
+                "category": category,
+                "confidence": round(similarity, 3),
+                "reasoning": f"로컬 임베딩 분류 (유사도 {similarity:.2f}, 차이 {margin:.2f})",
+                "source": "local",
+            }
+            print(f"[의도 라우터] 로컬 분류: {category} (유사도 {similarity:.2f})")
+        else:
+            print(f"[의도 라우터] 신뢰도 낮음 (유사도 {similarity:.2f}, 차이 {margin:.2f}) → 분류 에이전트 호출")
+            try:
+                result = {**self.fallback(query), "source": "llm"}
+            except Exception as e:
+                # LLM 호출 실패시 로컬 분류 결과를 그대로 사용 (캐시하지 않음)
+                print(f"[의도 라우터] 분류 에이전트 호출 실패: {e}")
+                with self._lock:
+                    self.stats["llm_errors"] += 1
+                return {"category": category, "confidence": round(similarity, 3),
+                        "reasoning": "분류 에이전트 실패로 로컬 분류 사용", "source": "local"}
+
+        with self._lock:
+            self.stats[result["source"]] += 1
+            if self.cache_size > 0:
+                self._cache[key] = result
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return result
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {**self.stats, "cache_entries": len(self._cache)}
+
+
+_intent_router = None
+_intent_router_lock = threading.Lock()
+
+
+def get_intent_router() -> IntentRouter:
+    """프로세스 공용 의도 라우터 (최초 호출 시 예시 로드/학습)"""
+    global _intent_router
+    with _intent_router_lock:
+        if _intent_router is None:
+            _intent_router = IntentRouter()
+        return _intent_router
+
+
+def route_query(query: str) -> dict:
+    """
+    고객 문의를 분류합니다. classify_query와 같은 형식의 결과에 "source"(cache/local/llm)가 추가됩니다.
+    """
+    start = time.perf_counter()
+    result = get_intent_router().route(query)
+    print(f"[의도 라우터] 분류 완료 ({result['source']}, {(time.perf_counter() - start) * 1000:.1f}ms)")
+    return result
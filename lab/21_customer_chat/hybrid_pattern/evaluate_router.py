@@ -0,0 +1,90 @@
+"""
+의도 라우터 평가 스크립트
+번들된 평가셋(data/intent_eval.json)으로 라우팅 정확도와 지연 시간을 측정합니다.
+
+- 기본(오프라인): LLM 폴백을 키워드 분류 + 고정 지연(--llm-latency)으로 대체해 AWS 호출 없이 실행
+- --llm: 실제 분류 에이전트(Bedrock)를 폴백과 비교 기준으로 사용
+
+사용법:
+    uv run python evaluate_router.py
+    uv run python evaluate_router.py --llm
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+
+from agents.classifier_agent import classify_query, keyword_classify
+from agents.intent_router import IntentRouter
+
+EVAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "intent_eval.json")
+
+# 메인 그래프 라우팅 기준 (주문_그래프 / 반품_그래프)
+GRAPH_OF = {"주문": "주문_그래프", "배송": "주문_그래프", "취소": "주문_그래프",
+            "반품": "반품_그래프", "환불": "반품_그래프", "교환": "반품_그래프"}
+
+
+def simulated_llm(latency: float):
+    """오프라인 LLM 폴백: 고정 지연 후 키워드 분류"""
+    def classify(query: str) -> dict:
+        time.sleep(latency)
+        return keyword_classify(query)
+    return classify
+
+
+def evaluate(name, classify, dataset):
+    """문의별 분류 결과/지연 시간을 모아 정확도를 계산합니다."""
+    latencies, correct, graph_correct, sources = [], 0, 0, {}
+    for item in dataset:
+        start = time.perf_counter()
+        result = classify(item["query"])
+        latencies.append((time.perf_counter() - start) * 1000)
+        correct += result["category"] == item["category"]
+        graph_correct += GRAPH_OF.get(result["category"]) == GRAPH_OF[item["category"]]
+        source = result.get("source", "llm")
+        sources[source] = sources.get(source, 0) + 1
+    latencies.sort()
+    print(f"{name:<34}{correct / len(dataset):>9.1%}{graph_correct / len(dataset):>9.1%}"
+          f"{statistics.mean(latencies):>11.1f}{latencies[len(latencies) // 2]:>10.1f}"
+          f"{latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]:>10.1f}  {sources}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Intent router accuracy/latency on the bundled eval set")
+    parser.add_argument("--llm", action="store_true", help="Use the real classifier agent (Bedrock) as fallback/baseline")
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="Simulated LLM latency in seconds (offline mode)")
+    args = parser.parse_args()
+
+    with open(EVAL_PATH, "r", encoding="utf-8") as f:
+        dataset = json.load(f)
+
+    llm = classify_query if args.llm else simulated_llm(args.llm_latency)
+    llm_name = "분류 에이전트 (LLM)" if args.llm else f"simulated LLM ({args.llm_latency:.1f}s)"
+
+    # 로컬 분류기만 사용했을 때 임계값별 커버리지/정확도
+    router = IntentRouter(fallback=llm, cache_size=0)
+    predictions = [(router.predict(item["query"]), item["category"]) for item in dataset]
+    print(f"\n📊 로컬 분류기 임계값별 커버리지 (평가셋 {len(dataset)}건)")
+    print(f"{'min_similarity':>15}{'min_margin':>12}{'coverage':>10}{'accuracy(local)':>17}")
+    for min_similarity, min_margin in [(0.0, 0.0), (0.25, 0.03), (0.35, 0.05), (0.45, 0.08), (0.55, 0.1)]:
+        accepted = [(category == label) for (category, similarity, margin), label in predictions
+                    if similarity >= min_similarity and margin >= min_margin]
+        accuracy = sum(accepted) / len(accepted) if accepted else float("nan")
+        print(f"{min_similarity:>15.2f}{min_margin:>12.2f}{len(accepted) / len(dataset):>10.1%}{accuracy:>17.1%}")
+
+    print(f"\n📊 라우팅 정확도/지연 (ms)")
+    print(f"{'variant':<34}{'category':>9}{'graph':>9}{'mean':>11}{'p50':>10}{'p95':>10}  sources")
+    print("-" * 106)
+    evaluate(f"baseline: {llm_name}", llm, dataset)
+    evaluate("local only", lambda query: {"category": router.predict(query)[0], "source": "local"}, dataset)
+
+    router = IntentRouter(fallback=llm)
+    evaluate("router (cold cache)", router.route, dataset)
+    evaluate("router (warm cache)", router.route, dataset)
+    print(f"\n라우터 통계: {router.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@
 전체 고객 지원 시스템의 메인 워크플로우를 정의합니다.
 """
 
-from agents.classifier_agent import classify_query
+from agents.intent_router import route_query
 from graphs.order_graph import execute_order_graph
 from graphs.return_graph import execute_return_graph
 
@@ -13,7 +13,7 @@ async def execute_customer_support(query: str) -> dict:
     고객 지원 메인 그래프를 실행합니다 (간단한 PoC).
 
     흐름:
-    1. 분류 에이전트로 문의 분류
+    1. 문의 분류 (의도 라우터: 캐시 → 로컬 임베딩 분류 → 신뢰도가 낮을 때만 분류 에이전트)
     2. 분류 결과에 따라 적절한 서브그래프로 라우팅
     3. 서브그래프 실행 (주문 그래프 또는 반품 그래프)
     4. 최종 응답 생성
@@ -23,11 +23,11 @@ async def execute_customer_support(query: str) -> dict:
     print(f"문의: {query}")
     print(f"{'='*80}\n")
 
-    # Step 1: 분류 에이전트 호출
-    print(f"[단계 1] 분류 에이전트 호출")
-    classification = classify_query(query)
+    # Step 1: 문의 분류 (확실한 문의는 LLM 호출 없이 라우팅)
+    print(f"[단계 1] 의도 라우터 호출")
+    classification = route_query(query)
     category = classification.get("category", "주문")
-    print(f"[단계 1] 분류 결과: {category}")
+    print(f"[단계 1] 분류 결과: {category} ({classification.get('source', 'llm')})")
 
     # Step 2: 라우팅
     print(f"\n[단계 2] 서브 그래프 라우팅")
@@ -0,0 +1,163 @@
+"""
+세션 관리자 벤치마크: FileSessionManager vs SQLiteSessionManager
+세션에 저장된 메시지 수(10 / 1k / 10k)별로 메시지 추가(append)와 세션 복원(restore) 지연을 비교합니다.
+
+- 모델 호출 없이 Strands 훅(MessageAddedEvent, AfterInvocationEvent)을 직접 발생시켜
+  한 턴(사용자 메시지 + 에이전트 응답 + agent.state 변경)을 재현합니다
+- append: 해당 크기의 세션에 재접속한 뒤 한 턴을 저장하는 데 걸린 시간 (메시지당)
+- restore: 새 세션 관리자 생성 + 에이전트 복원 시간 (앱 재시작 후 재접속)
+
+실행 방법:
+    cd /home/ubuntu/Self-Study-Generative-AI/lab/22_strands_session_manager
+    uv run python code/benchmark_session_manager.py
+"""
+import asyncio
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+# 모델은 호출하지 않으므로 리전만 설정 (BedrockModel 클라이언트 생성용)
+os.environ.setdefault("AWS_REGION", "us-east-1")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+from strands import Agent
+from strands.hooks import AfterInvocationEvent, MessageAddedEvent
+from strands.models import BedrockModel
+from strands.session.file_session_manager import FileSessionManager
+from strands.types.session import SessionMessage
+from sqlite_session_manager import SQLiteSessionManager
+from utils import print_header
+
+
+# ----------------------------------------------------------------------
+# 설정
+# ----------------------------------------------------------------------
+SIZES = [10, 1_000, 10_000]   # 세션에 저장된 메시지 수
+MEASURE_TURNS = 50            # append 측정 턴 수
+RESTORE_RUNS = 5              # restore 측정 반복 수
+MODEL = BedrockModel()        # 에이전트 생성 비용을 줄이기 위해 공유
+LOOP = asyncio.new_event_loop()  # 비동기 훅 콜백 실행용
+
+
+def create_agent(session_manager):
+    return Agent(
+        model=MODEL,
+        system_prompt="당신은 친절한 한국어 도우미입니다.",
+        session_manager=session_manager,
+        callback_handler=None,
+    )
+
+
+def invoke_hooks(agent, event):
+    """에이전트 루프처럼 훅 콜백을 실행합니다 (비동기 콜백 포함)."""
+    if hasattr(agent.hooks, "invoke_callbacks_async"):
+        LOOP.run_until_complete(agent.hooks.invoke_callbacks_async(event))
+    else:
+        agent.hooks.invoke_callbacks(event)
+
+
+def add_message(agent, role: str, text: str):
+    """에이전트 루프처럼 메시지를 추가하고 MessageAddedEvent를 발생시킵니다."""
+    message = {"role": role, "content": [{"text": text}]}
+    agent.messages.append(message)
+    invoke_hooks(agent, MessageAddedEvent(agent=agent, message=message))
+
+
+def run_turn(agent, turn: int):
+    """한 턴: 사용자 메시지 + 에이전트 응답 + 상태 변경 + 턴 종료 이벤트"""
+    add_message(agent, "user", f"질문 {turn}: 추천 시스템 프로젝트 진행 상황을 정리해 주세요.")
+    add_message(agent, "assistant", f"답변 {turn}: " + "협업 필터링과 콘텐츠 기반 추천을 결합한 하이브리드 방식입니다. " * 4)
+    agent.state.set("turns", turn)
+    invoke_hooks(agent, AfterInvocationEvent(agent=agent))
+
+
+def prefill(session_manager, agent, count: int):
+    """이전 대화 count개 메시지를 저장소에 직접 기록합니다 (훅 경로를 거치지 않아 빠르게 채움)."""
+    for message_id in range(count):
+        role, prefix = ("user", "질문") if message_id % 2 == 0 else ("assistant", "답변")
+        message = {"role": role, "content": [{"text": f"{prefix} {message_id // 2}: 이전 대화"}]}
+        session_manager.session_repository.create_message(
+            session_manager.session_id, agent.agent_id, SessionMessage.from_message(message, message_id)
+        )
+
+
+def benchmark(name, factory, size):
+    """size개 메시지가 저장된 세션에서 append/restore 지연을 측정합니다."""
+    session_id = f"bench-{size}"
+    measure_turns = min(MEASURE_TURNS, size // 2)
+
+    # 세션을 (size - 측정 메시지 수)까지 채운 뒤 닫음
+    session_manager = factory(session_id)
+    prefill(session_manager, create_agent(session_manager), size - 2 * measure_turns)
+    if hasattr(session_manager, "close"):
+        session_manager.close()
+
+    # append: 재접속한 에이전트로 마지막 measure_turns 턴 진행
+    session_manager = factory(session_id)
+    agent = create_agent(session_manager)
+    turn_latencies = []
+    for turn in range(size // 2 - measure_turns, size // 2):
+        start = time.perf_counter()
+        run_turn(agent, turn)
+        turn_latencies.append(time.perf_counter() - start)
+    if hasattr(session_manager, "close"):
+        session_manager.close()
+
+    # restore: 새 관리자 + 에이전트로 재접속
+    restore_latencies = []
+    for _ in range(RESTORE_RUNS):
+        start = time.perf_counter()
+        restored_manager = factory(session_id)
+        restored_agent = create_agent(restored_manager)
+        restore_latencies.append(time.perf_counter() - start)
+        restored_messages = len(restored_agent.messages)
+        assert restored_agent.state.get("turns") == size // 2 - 1
+        if hasattr(restored_manager, "close"):
+            restored_manager.close()
+
+    append_ms = statistics.mean(turn_latencies) / 2 * 1000
+    restore_ms = statistics.median(restore_latencies) * 1000
+    print(f"{name:<22}{size:>10}{append_ms:>16.3f}{restore_ms:>14.2f}{restored_messages:>12}")
+    return append_ms, restore_ms
+
+
+def main():
+    print_header("세션 관리자 벤치마크: FileSessionManager vs SQLiteSessionManager")
+    workdir = tempfile.mkdtemp(prefix="session-bench-")
+    try:
+        sessions_dir = os.path.join(workdir, "sessions")
+        db_path = os.path.join(workdir, "sessions.db")
+        managers = [
+            ("FileSessionManager", lambda session_id: FileSessionManager(session_id=session_id, storage_dir=sessions_dir)),
+            ("SQLiteSessionManager", lambda session_id: SQLiteSessionManager(session_id=session_id, db_path=db_path)),
+        ]
+
+        print(f"\n{'manager':<22}{'messages':>10}{'append(ms/msg)':>16}{'restore(ms)':>14}{'restored':>12}")
+        print("-" * 74)
+        results = {}
+        for size in SIZES:
+            for name, factory in managers:
+                results[(name, size)] = benchmark(name, factory, size)
+
+        print("\n[SQLite 대비 속도]")
+        for size in SIZES:
+            file_append, file_restore = results[("FileSessionManager", size)]
+            sqlite_append, sqlite_restore = results[("SQLiteSessionManager", size)]
+            print(f"  {size:>6} messages: append {file_append / sqlite_append:.1f}x, restore {file_restore / sqlite_restore:.1f}x")
+
+        # 복원 창 밖의 이전 메시지는 페이지 단위로 지연 조회
+        manager = SQLiteSessionManager(session_id=f"bench-{SIZES[-1]}", db_path=db_path)
+        start = time.perf_counter()
+        first_page = [message for _, message in zip(range(100), manager.iter_messages("default"))]
+        print(f"\niter_messages(): 가장 오래된 100개 메시지 조회 {(time.perf_counter() - start) * 1000:.2f}ms "
+              f"(message_id {first_page[0].message_id}~{first_page[-1].message_id}, "
+              f"전체 {manager.count_messages('default')}개)")
+        manager.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+"""
+SQLite 기반 Strands 세션 관리자
+FileSessionManager와 같은 인터페이스로 세션/에이전트/메시지를 하나의 SQLite(WAL) 파일에 저장합니다.
+
+FileSessionManager와의 차이:
+- 메시지마다 JSON 파일을 만들지 않고, 한 턴의 쓰기를 메모리에 모았다가
+  턴 종료(AfterInvocationEvent) 시 하나의 트랜잭션으로 커밋 (group commit)
+- 세션 복원 시 전체 대화가 아니라 최근 restore_window개 메시지만 로드 → 긴 세션도 일정한 복원 시간
+  (창은 user 메시지로 시작하도록 턴 경계에 맞춤)
+- 이전 메시지는 iter_messages()로 페이지 단위 지연 조회
+
+주의:
+- 커밋 전(턴 진행 중) 프로세스가 종료되면 해당 턴의 쓰기는 저장되지 않습니다 (턴 단위 원자성)
+- close() 또는 프로세스 종료 시 남은 쓰기를 커밋합니다
+
+사용 예:
+    from sqlite_session_manager import SQLiteSessionManager
+
+    session_manager = SQLiteSessionManager(session_id="user-alice", db_path="./sessions.db")
+    agent = Agent(session_manager=session_manager)
+"""
+import atexit
+import json
+import sqlite3
+import threading
+import weakref
+from typing import Any, Iterator, Optional
+
+from strands.hooks import AfterInvocationEvent, HookRegistry
+from strands.session.repository_session_manager import RepositorySessionManager
+from strands.session.session_repository import SessionRepository
+from strands.types.exceptions import SessionException
+from strands.types.session import Session, SessionAgent, SessionMessage
+
+
+# ----------------------------------------------------------------------
+# 설정
+# ----------------------------------------------------------------------
+DEFAULT_DB_PATH = "./sessions.db"
+DEFAULT_RESTORE_WINDOW = 200   # 복원 시 로드할 최근 메시지 수 (None이면 전체)
+MAX_PENDING_WRITES = 256       # 턴이 길어져도 이 개수를 넘으면 중간 커밋
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS agents (
+    session_id TEXT NOT NULL,
+    agent_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, agent_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS messages (
+    session_id TEXT NOT NULL,
+    agent_id TEXT NOT NULL,
+    message_id INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, agent_id, message_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS multi_agents (
+    session_id TEXT NOT NULL,
+    multi_agent_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, multi_agent_id)
+) WITHOUT ROWID;
+"""
+
+
+def _dumps(data: dict) -> str:
+    return json.dumps(data, ensure_ascii=False)
+
+
+def _is_turn_start(data: dict) -> bool:
+    """저장된 메시지가 턴을 시작하는 user 메시지(toolResult 아님)인지 확인합니다."""
+    message = data.get("message", {})
+    return message.get("role") == "user" and not any("toolResult" in block for block in message.get("content", []))
+
+
+# ----------------------------------------------------------------------
+# 세션 관리자
+# ----------------------------------------------------------------------
+class SQLiteSessionManager(RepositorySessionManager, SessionRepository):
+    """SQLite(WAL) 단일 파일 기반 세션 관리자 (턴 단위 group commit, 최근 메시지 창 복원)"""
+
+    def __init__(
+        self,
+        session_id: str,
+        db_path: str = DEFAULT_DB_PATH,
+        restore_window: Optional[int] = DEFAULT_RESTORE_WINDOW,
+        max_pending_writes: int = MAX_PENDING_WRITES,
+        **kwargs: Any,
+    ):
+        """SQLite 세션 관리자를 생성합니다.
+
+        Args:
+            session_id: 세션 식별자
+            db_path: SQLite 데이터베이스 파일 경로 (여러 세션이 같은 파일을 공유)
+            restore_window: 복원 시 로드할 최근 메시지 수 (None이면 FileSessionManager처럼 전체)
+            max_pending_writes: 턴 중간 커밋 기준 (커밋 전 버퍼링할 최대 쓰기 수)
+        """
+        self.db_path = db_path
+        self.restore_window = restore_window
+        self.max_pending_writes = max_pending_writes
+        self._pending = []          # 커밋 대기 중인 (sql, params)
+        self._lock = threading.RLock()
+        self._restoring = False     # initialize() 중 list_messages는 최근 창만 조회
+        self._created_at = {}       # (session_id, agent_id) -> created_at (update_agent 시 재조회 방지)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")   # WAL에서는 커밋 단위 내구성 유지
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(SCHEMA)
+
+        # 프로세스 종료 시 남은 쓰기 커밋
+        atexit.register(SQLiteSessionManager._close_ref, weakref.ref(self))
+
+        super().__init__(session_id=session_id, session_repository=self)
+
+    # ------------------------------------------------------------------
+    # 쓰기 버퍼 / 커밋
+    # ------------------------------------------------------------------
+    def _write(self, sql: str, params: tuple) -> None:
+        with self._lock:
+            self._pending.append((sql, params))
+            if len(self._pending) >= self.max_pending_writes:
+                self.commit()
+
+    def commit(self) -> None:
+        """버퍼링된 쓰기를 하나의 트랜잭션으로 커밋합니다."""
+        with self._lock:
+            if not self._pending or self._conn is None:
+                return
+            pending, self._pending = self._pending, []
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                for sql, params in pending:
+                    self._conn.execute(sql, params)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                self._pending = pending + self._pending
+                raise
+
+    def _query(self, sql: str, params: tuple) -> list:
+        # 같은 관리자에서 쓴 데이터가 보이도록 읽기 전에 커밋
+        with self._lock:
+            self.commit()
+            return self._conn.execute(sql, params).fetchall()
+
+    def close(self) -> None:
+        """남은 쓰기를 커밋하고 연결을 닫습니다."""
+        with self._lock:
+            if self._conn is None:
+                return
+            self.commit()
+            self._conn.close()
+            self._conn = None
+
+    @staticmethod
+    def _close_ref(ref) -> None:
+        manager = ref()
+        if manager is not None:
+            manager.close()
+
+    def register_hooks(self, registry: HookRegistry, **kwargs: Any) -> None:
+        """기본 세션 훅 + 턴 종료 시 group commit"""
+        super().register_hooks(registry, **kwargs)
+
+        def commit_turn(event: AfterInvocationEvent):
+            # AfterInvocationEvent는 역순 호출이므로 커밋 전에 최종 상태를 직접 동기화 (변경 없으면 건너뜀)
+            self.sync_agent(event.agent)
+            self.commit()
+
+        registry.add_callback(AfterInvocationEvent, commit_turn)
+
+    def initialize(self, agent, **kwargs: Any) -> None:
+        """세션에서 에이전트를 복원합니다 (메시지는 최근 restore_window개만 로드)."""
+        self._restoring = True
+        try:
+            super().initialize(agent, **kwargs)
+        finally:
+            self._restoring = False
+        self.commit()
+
+    # ------------------------------------------------------------------
+    # SessionRepository 구현
+    # ------------------------------------------------------------------
+    def create_session(self, session: Session, **kwargs: Any) -> Session:
+        """새 세션을 생성합니다."""
+        if self.read_session(session.session_id) is not None:
+            raise SessionException(f"Session {session.session_id} already exists")
+        self._write("INSERT INTO sessions VALUES (?, ?)", (session.session_id, _dumps(session.to_dict())))
+        self.commit()
+        return session
+
+    def read_session(self, session_id: str, **kwargs: Any) -> Optional[Session]:
+        """세션 정보를 조회합니다."""
+        rows = self._query("SELECT data FROM sessions WHERE session_id = ?", (session_id,))
+        return Session.from_dict(json.loads(rows[0][0])) if rows else None
+
+    def delete_session(self, session_id: str, **kwargs: Any) -> None:
+        """세션과 관련 데이터를 모두 삭제합니다."""
+        if self.read_session(session_id) is None:
+            raise SessionException(f"Session {session_id} does not exist")
+        for table in ("messages", "agents", "multi_agents", "sessions"):
+            self._write(f"DELETE FROM {table} WHERE session_id = ?", (session_id,))
+        self.commit()
+        self._created_at = {key: value for key, value in self._created_at.items() if key[0] != session_id}
+
+    def create_agent(self, session_id: str, session_agent: SessionAgent, **kwargs: Any) -> None:
+        """세션에 에이전트를 생성합니다."""
+        self._created_at[(session_id, session_agent.agent_id)] = session_agent.created_at
+        self._write(
+            "INSERT OR REPLACE INTO agents VALUES (?, ?, ?)",
+            (session_id, session_agent.agent_id, _dumps(session_agent.to_dict())),
+        )
+
+    def read_agent(self, session_id: str, agent_id: str, **kwargs: Any) -> Optional[SessionAgent]:
+        """에이전트 정보를 조회합니다."""
+        rows = self._query("SELECT data FROM agents WHERE session_id = ? AND agent_id = ?", (session_id, agent_id))
+        if not rows:
+            return None
+        session_agent = SessionAgent.from_dict(json.loads(rows[0][0]))
+        self._created_at[(session_id, agent_id)] = session_agent.created_at
+        return session_agent
+
+    def update_agent(self, session_id: str, session_agent: SessionAgent, **kwargs: Any) -> None:
+        """에이전트 정보를 갱신합니다 (created_at 유지)."""
+        agent_id = session_agent.agent_id
+        created_at = self._created_at.get((session_id, agent_id))
+        if created_at is None:
+            previous_agent = self.read_agent(session_id=session_id, agent_id=agent_id)
+            if previous_agent is None:
+                raise SessionException(f"Agent {agent_id} in session {session_id} does not exist")
+            created_at = previous_agent.created_at
+        session_agent.created_at = created_at
+        self._write(
+            "UPDATE agents SET data = ? WHERE session_id = ? AND agent_id = ?",
+            (_dumps(session_agent.to_dict()), session_id, agent_id),
+        )
+
+    def create_message(self, session_id: str, agent_id: str, session_message: SessionMessage, **kwargs: Any) -> None:
+        """에이전트의 새 메시지를 저장합니다."""
+        self._write(
+            "INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?)",
+            (session_id, agent_id, session_message.message_id, _dumps(session_message.to_dict())),
+        )
+
+    def read_message(self, session_id: str, agent_id: str, message_id: int, **kwargs: Any) -> Optional[SessionMessage]:
+        """메시지를 조회합니다."""
+        rows = self._query(
+            "SELECT data FROM messages WHERE session_id = ? AND agent_id = ? AND message_id = ?",
+            (session_id, agent_id, message_id),
+        )
+        return SessionMessage.from_dict(json.loads(rows[0][0])) if rows else None
+
+    def update_message(self, session_id: str, agent_id: str, session_message: SessionMessage, **kwargs: Any) -> None:
+        """메시지를 갱신합니다 (가드레일 redact 등, created_at 유지)."""
+        message_id = session_message.message_id
+        previous_message = self.read_message(session_id=session_id, agent_id=agent_id, message_id=message_id)
+        if previous_message is None:
+            raise SessionException(f"Message {message_id} does not exist")
+        session_message.created_at = previous_message.created_at
+        self._write(
+            "UPDATE messages SET data = ? WHERE session_id = ? AND agent_id = ? AND message_id = ?",
+            (_dumps(session_message.to_dict()), session_id, agent_id, message_id),
+        )
+
+    def list_messages(
+        self, session_id: str, agent_id: str, limit: Optional[int] = None, offset: int = 0, **kwargs: Any
+    ) -> list:
+        """메시지 목록을 조회합니다 (message_id 순).
+
+        에이전트 복원(initialize) 중 limit 없이 호출되면 offset 이후 메시지 중 최근 restore_window개만 반환합니다.
+        창이 잘린 경우 시작을 턴 경계에 맞춥니다 (_align_window).
+        """
+        if limit is None and self._restoring and self.restore_window is not None:
+            rows = self._query(
+                "SELECT message_id, data FROM messages WHERE session_id = ? AND agent_id = ? "
+                "ORDER BY message_id DESC LIMIT ?",
+                (session_id, agent_id, self.restore_window),
+            )
+            # 대화 관리자가 이미 제거한 앞부분(offset)은 창에서 제외
+            available = self.count_messages(agent_id, session_id=session_id) - offset
+            rows = [(message_id, json.loads(data)) for message_id, data in rows[:max(0, available)]]
+            rows.reverse()
+            if len(rows) < available:
+                rows = self._align_window(session_id, agent_id, rows, available)
+            return [SessionMessage.from_dict(data) for _, data in rows]
+
+        rows = self._query(
+            "SELECT data FROM messages WHERE session_id = ? AND agent_id = ? "
+            "ORDER BY message_id LIMIT ? OFFSET ?",
+            (session_id, agent_id, -1 if limit is None else limit, offset),
+        )
+        return [SessionMessage.from_dict(json.loads(data)) for (data,) in rows]
+
+    def _align_window(self, session_id: str, agent_id: str, rows: list, available: int) -> list:
+        """잘린 복원 창의 시작을 턴 경계(toolResult가 아닌 user 메시지)에 맞춥니다.
+
+        assistant 메시지나 짝 잃은 toolResult로 시작하는 대화는 Bedrock Converse가 거부하므로
+        창 안의 첫 턴 시작까지 앞부분을 버리고, 창 안에 턴 시작이 없으면(긴 도구 호출 루프)
+        이전 메시지를 페이지 단위로 읽어 직전 턴 시작까지 창을 넓힙니다.
+
+        Args:
+            rows: message_id 순 (message_id, data) 목록
+            available: offset 이후 전체 메시지 수 (창을 넓힐 수 있는 한도)
+        """
+        for index, (_, data) in enumerate(rows):
+            if _is_turn_start(data):
+                return rows[index:]
+
+        page_size = max(1, self.restore_window)
+        remaining = available - len(rows)
+        while rows and remaining > 0:
+            page = self._query(
+                "SELECT message_id, data FROM messages WHERE session_id = ? AND agent_id = ? "
+                "AND message_id < ? ORDER BY message_id DESC LIMIT ?",
+                (session_id, agent_id, rows[0][0], min(page_size, remaining)),
+            )
+            if not page:
+                break
+            remaining -= len(page)
+            older = []
+            for message_id, data in page:
+                older.append((message_id, json.loads(data)))
+                if _is_turn_start(older[-1][1]):
+                    break
+            older.reverse()
+            rows = older + rows
+            if _is_turn_start(rows[0][1]):
+                break
+        return rows
+
+    def create_multi_agent(self, session_id: str, multi_agent, **kwargs: Any) -> None:
+        """멀티 에이전트 상태를 생성합니다."""
+        self._write(
+            "INSERT OR REPLACE INTO multi_agents VALUES (?, ?, ?)",
+            (session_id, multi_agent.id, _dumps(multi_agent.serialize_state())),
+        )
+
+    def read_multi_agent(self, session_id: str, multi_agent_id: str, **kwargs: Any) -> Optional[dict]:
+        """멀티 에이전트 상태를 조회합니다."""
+        rows = self._query(
+            "SELECT data FROM multi_agents WHERE session_id = ? AND multi_agent_id = ?", (session_id, multi_agent_id)
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    def update_multi_agent(self, session_id: str, multi_agent, **kwargs: Any) -> None:
+        """멀티 에이전트 상태를 갱신합니다."""
+        if self.read_multi_agent(session_id=session_id, multi_agent_id=multi_agent.id) is None:
+            raise SessionException(f"MultiAgent state {multi_agent.id} in session {session_id} does not exist")
+        self.create_multi_agent(session_id, multi_agent)
+
+    # ------------------------------------------------------------------
+    # 지연 조회
+    # ------------------------------------------------------------------
+    def count_messages(self, agent_id: str, session_id: Optional[str] = None) -> int:
+        """에이전트의 저장된 메시지 수를 반환합니다."""
+        rows = self._query(
+            "SELECT COUNT(*) FROM messages WHERE session_id = ? AND agent_id = ?",
+            (session_id or self.session_id, agent_id),
+        )
+        return rows[0][0]
+
+    def iter_messages(
+        self, agent_id: str, page_size: int = 100, session_id: Optional[str] = None, reverse: bool = False
+    ) -> Iterator[SessionMessage]:
+        """복원 창 밖의 이전 메시지까지 페이지 단위로 지연 조회합니다 (keyset pagination).
+
+        Args:
+            agent_id: 에이전트 ID
+            page_size: 한 번에 읽을 메시지 수
+            session_id: 세션 ID (기본: 현재 세션)
+            reverse: True면 최신 메시지부터
+        """
+        session_id = session_id or self.session_id
+        comparison, order = ("<", "DESC") if reverse else (">", "ASC")
+        last_id = None
+        while True:
+            if last_id is None:
+                rows = self._query(
+                    f"SELECT message_id, data FROM messages WHERE session_id = ? AND agent_id = ? "
+                    f"ORDER BY message_id {order} LIMIT ?",
+                    (session_id, agent_id, page_size),
+                )
+            else:
+                rows = self._query(
+                    f"SELECT message_id, data FROM messages WHERE session_id = ? AND agent_id = ? "
+                    f"AND message_id {comparison} ? ORDER BY message_id {order} LIMIT ?",
+                    (session_id, agent_id, last_id, page_size),
+                )
+            for _, data in rows:
+                yield SessionMessage.from_dict(json.loads(data))
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1][0]
@@ -0,0 +1,91 @@
+"""
+Throughput benchmark for batched MetricX-24 / COMET-KIWI scoring (sentences/s)
+
+Scores the quality test data repeated up to --segments, once per batch size, with the model
+loaded once (process-wide cache) and a warm-up batch excluded from timing.
+
+Run:
+    cd script
+    uv run benchmark_neural_metrics.py --metric metricx --segments 512 --batch-sizes 1,8,16,32 --threads 16
+    uv run benchmark_neural_metrics.py --metric metricx --int8 --model google/metricx-24-hybrid-large-v2p6 --tokenizer google/mt5-large
+    uv run benchmark_neural_metrics.py --metric cometkiwi --batch-sizes 8,32,64
+"""
+
+import argparse
+import time
+
+from neural_metrics import (
+    METRICX_MODEL,
+    METRICX_TOKENIZER,
+    COMET_MODEL,
+    load_metricx,
+    resolve_device,
+    score_cometkiwi,
+    score_metricx,
+    set_cpu_threads,
+)
+from util import get_quality_test_data
+
+
+def make_segments(n: int) -> list[dict]:
+    """Repeat the quality test data up to n segments."""
+    data = get_quality_test_data()
+    return [data[i % len(data)] for i in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MetricX / COMET-KIWI throughput benchmark")
+    parser.add_argument("--metric", choices=["metricx", "cometkiwi"], default="metricx")
+    parser.add_argument("--segments", type=int, default=256)
+    parser.add_argument("--batch-sizes", default="1,8,16,32")
+    parser.add_argument("--threads", type=int, default=None, help="torch thread count for CPU runs")
+    parser.add_argument("--int8", action="store_true", help="int8 dynamic-quantized MetricX (CPU only)")
+    parser.add_argument("--device", default=None, help="cpu / cuda (default: auto)")
+    parser.add_argument("--model", default=None, help=f"default: {METRICX_MODEL} / {COMET_MODEL}")
+    parser.add_argument("--tokenizer", default=METRICX_TOKENIZER, help="MetricX tokenizer")
+    args = parser.parse_args()
+
+    segments = make_segments(args.segments)
+    batch_sizes = [int(b) for b in args.batch_sizes.split(",")]
+    device = resolve_device(args.device)
+    threads = set_cpu_threads(args.threads)
+
+    print("=" * 80)
+    print(f"{args.metric} benchmark: {len(segments)} segments, device={device}, threads={threads}, int8={args.int8}")
+    print("=" * 80)
+
+    if args.metric == "metricx":
+        tokenizer, model, device = load_metricx(args.model or METRICX_MODEL, args.tokenizer, device, args.int8)
+
+        def run(batch, batch_size):
+            return score_metricx(batch, batch_size=batch_size, num_threads=args.threads, tokenizer=tokenizer, model=model)
+    else:
+        def run(batch, batch_size):
+            return score_cometkiwi(batch, batch_size=batch_size, num_threads=args.threads, device=device,
+                                   model_name=args.model or COMET_MODEL).scores
+
+    run(segments[:max(batch_sizes)], max(batch_sizes))  # warm-up (model load, allocator)
+
+    print(f"{'batch_size':<12} {'seconds':<10} {'sentences/s':<12} {'speedup':<8}")
+    print("-" * 44)
+    baseline = None
+    reference_scores = None
+    for batch_size in batch_sizes:
+        start = time.perf_counter()
+        scores = run(segments, batch_size)
+        elapsed = time.perf_counter() - start
+        throughput = len(segments) / elapsed
+        baseline = baseline or throughput
+        print(f"{batch_size:<12} {elapsed:<10.2f} {throughput:<12.2f} {throughput / baseline:<8.2f}")
+
+        # Padding must not change the scores
+        if reference_scores is None:
+            reference_scores = scores
+        else:
+            max_diff = max(abs(a - b) for a, b in zip(scores, reference_scores))
+            if max_diff > 1e-2:
+                print(f"  WARNING: max score difference vs batch_size={batch_sizes[0]}: {max_diff:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,11 +14,12 @@ Requirements:
     - AWS credentials with Bedrock access for Claude models
 """
 
+import argparse
+
+from judge_runner import DEFAULT_MAX_WORKERS, DEFAULT_REQUESTS_PER_SECOND, run_judges
 from util import (
     check_hf_login, 
     get_quality_test_data,
-    create_bedrock_client,
-    evaluate_single_claude,
     print_detailed_results
 )
 
@@ -42,60 +43,15 @@ CLAUDE_MODELS = {
 }
 
 
-def run_claude_evaluation(data, model_id: str, model_name: str, verbose: bool = True):
-    """Evaluate translations using Claude model via Bedrock."""
-    print(f"Loading {model_name} via Bedrock...")
-    print(f"Model ID: {model_id}")
-    
-    try:
-        bedrock_client = create_bedrock_client("us-west-2")
-        print("Bedrock client initialized successfully.")
-    except Exception as e:
-        neutral_scores = [0.5] * len(data)
-        error_justifications = [f"API Error: {str(e)}"] * len(data)
-        return neutral_scores, error_justifications
-
-    scores = []
-    justifications = []
-    
-    if verbose:
-        print(f"Evaluating {len(data)} translations with {model_name}...")
-    
-    for i, item in enumerate(data):
-        if not verbose:
-            print(f"Evaluating {i+1}/{len(data)} with {model_name}: ", end="", flush=True)
-        
-        score, justification = evaluate_single_claude(bedrock_client, model_id, item['src'], item['mt'])
-        scores.append(score)
-        justifications.append(justification)
-        
-        if not verbose:
-            print(f"Score {score:.4f}")
-        elif verbose:
-            print(f"Processing {i+1}/{len(data)}:")
-            print(f"  Source (Korean): {item['src']}")
-            print(f"  Translation (English): {item['mt']}")
-            
-            expected_quality = item.get('quality', 'unknown')
-            error_type = item.get('error_type') or 'none'
-            
-            if expected_quality == 'good':
-                status = "✓ Correct" if score >= 0.7 else "✗ Missed"
-            else:
-                status = "✓ Correct" if score < 0.7 else "✗ Missed"
-            
-            print(f"  Score: {score:.4f}")
-            print(f"  Status: {status}")
-            print(f"  Error Type: {error_type}")
-            print(f"  Justification: {justification}")
-            print()
-    
-    print(f"{model_name} evaluation completed.")
-    return scores, justifications
-
-
 def main():
     """Main comparison function for Claude 4.5 family models."""
+    parser = argparse.ArgumentParser(description="Claude 4.5 family comparison")
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS, help='Concurrent Bedrock requests (all models)')
+    parser.add_argument('--rps', type=float, default=DEFAULT_REQUESTS_PER_SECOND, help='Requests per second per model')
+    parser.add_argument('--results', default=None, help='JSONL file for incremental results (resumes an interrupted run)')
+    parser.add_argument('--no-cache', action='store_true', help='Do not use the SQLite judge cache')
+    args = parser.parse_args()
+
     check_hf_login()
 
     print("=" * 100)
@@ -107,21 +63,19 @@ def main():
 
     data = get_quality_test_data()
 
-    # Run all three Claude models (with brief output for comparison mode)
-    print("\n1. Running Claude Sonnet 4.5...")
-    sonnet_scores, sonnet_justifications = run_claude_evaluation(
-        data, CLAUDE_MODELS['sonnet4.5']['id'], CLAUDE_MODELS['sonnet4.5']['name'], verbose=False
-    )
-    
-    print("\n2. Running Claude Haiku 4.5...")
-    haiku_scores, haiku_justifications = run_claude_evaluation(
-        data, CLAUDE_MODELS['haiku4.5']['id'], CLAUDE_MODELS['haiku4.5']['name'], verbose=False
-    )
-    
-    print("\n3. Running Claude Opus 4.5...")
-    opus_scores, opus_justifications = run_claude_evaluation(
-        data, CLAUDE_MODELS['opus4.5']['id'], CLAUDE_MODELS['opus4.5']['name'], verbose=False
+    # Run all three Claude models concurrently (per-model rate limit, brief output for comparison mode)
+    print("\nRunning Claude Sonnet 4.5 | Haiku 4.5 | Opus 4.5...")
+    results = run_judges(
+        data,
+        [(CLAUDE_MODELS[key]['id'], CLAUDE_MODELS[key]['name']) for key in ('sonnet4.5', 'haiku4.5', 'opus4.5')],
+        max_workers=args.workers,
+        requests_per_second=args.rps,
+        results_path=args.results,
+        use_cache=not args.no_cache,
     )
+    sonnet_scores, sonnet_justifications = results[CLAUDE_MODELS['sonnet4.5']['id']]
+    haiku_scores, haiku_justifications = results[CLAUDE_MODELS['haiku4.5']['id']]
+    opus_scores, opus_justifications = results[CLAUDE_MODELS['opus4.5']['id']]
 
     # Show detailed results for each model
     print("\n" + "=" * 120)
@@ -21,27 +21,26 @@ Requirements:
     - AWS credentials with Bedrock access for Claude models
 """
 
-import torch
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
-from comet import download_model, load_from_checkpoint
-from transformers import AutoTokenizer, MT5ForConditionalGeneration
 
+from neural_metrics import (
+    DEFAULT_BATCH_SIZE,
+    METRICX_MODEL,
+    COMET_MODEL,
+    resolve_device,
+    release_models,
+    score_metricx,
+    score_cometkiwi,
+)
+from judge_runner import DEFAULT_MAX_WORKERS, DEFAULT_REQUESTS_PER_SECOND, run_judges
 from util import (
     check_hf_login, 
     get_quality_test_data,
-    create_bedrock_client,
-    evaluate_single_claude,
     print_detailed_results
 )
 
-# MetricX settings
-METRICX_MODEL = "google/metricx-24-hybrid-xxl-v2p6"
-METRICX_TOKENIZER = "google/mt5-xxl"
-METRICX_TOKEN_ID = 250089
-
-# COMET settings
-COMET_MODEL = "Unbabel/wmt22-cometkiwi-da"
-
 # Claude settings
 CLAUDE_SONNET_MODEL_ID = "global.anthropic.claude-sonnet-4-5-20250929-v1:0"
 CLAUDE_HAIKU_MODEL_ID = "global.anthropic.claude-haiku-4-5-20251001-v1:0"
@@ -64,13 +63,22 @@ def normalize_metricx(score: float) -> float:
     return 1.0 - (score / 25.0)
 
 
-def run_metricx(data: List[Dict[str, str]], verbose: bool = False) -> tuple[List[float], List[str]]:
+def run_metricx(
+    data: List[Dict[str, str]],
+    verbose: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    num_threads: int | None = None,
+    quantize: bool = False,
+) -> tuple[List[float], List[str]]:
     """
     Evaluate translations using MetricX-24 XXL model.
     
     Args:
         data: List of dicts with 'src' and 'mt' keys
         verbose: Whether to show detailed processing output
+        batch_size: Segments per forward pass (length-sorted, dynamic padding)
+        num_threads: torch thread count for CPU runs
+        quantize: Use the int8 dynamic-quantized model (CPU only)
         
     Returns:
         Tuple of (raw MetricX scores (0-25, lower = better), justifications)
@@ -78,87 +86,55 @@ def run_metricx(data: List[Dict[str, str]], verbose: bool = False) -> tuple[List
     print("Loading MetricX-24 XXL...")
     print(f"Model: {METRICX_MODEL}")
     
-    tokenizer = AutoTokenizer.from_pretrained(METRICX_TOKENIZER)
-    model = MT5ForConditionalGeneration.from_pretrained(
-        METRICX_MODEL, 
-        torch_dtype=torch.float16,
-        device_map="auto"  # Automatically distribute across GPUs
-    )
-    model.eval()
-
-    scores = []
-    justifications = ["No reasoning provided (MetricX-24 is a neural metric)"] * len(data)
-    
     if verbose:
         print(f"Evaluating {len(data)} translations with MetricX-24...")
     
-    with torch.no_grad():
-        for i, item in enumerate(data):
-            if verbose:
-                print(f"Processing {i+1}/{len(data)}:")
-                print(f"  Source (Korean): {item['src']}")
-                print(f"  Translation (English): {item['mt']}")
+    scores = score_metricx(data, batch_size=batch_size, num_threads=num_threads, quantize=quantize)
+    justifications = ["No reasoning provided (MetricX-24 is a neural metric)"] * len(data)
+    
+    if verbose:
+        for i, (item, raw_score) in enumerate(zip(data, scores)):
+            print(f"Processing {i+1}/{len(data)}:")
+            print(f"  Source (Korean): {item['src']}")
+            print(f"  Translation (English): {item['mt']}")
             
-            input_text = f"source: {item['src']} candidate: {item['mt']}"
-
-            inputs = tokenizer(
-                input_text,
-                return_tensors="pt",
-                max_length=1536,
-                truncation=True,
-                padding=True,
-            )
-
-            # Get device from model's first parameter
-            device = next(model.parameters()).device
-            inputs = inputs.to(device)
+            normalized_score = normalize_metricx(raw_score)
+            expected_quality = item.get('quality', 'unknown')
+            error_type = item.get('error_type') or 'none'
             
-            inputs["input_ids"] = inputs["input_ids"][:, :-1]
-            inputs["attention_mask"] = inputs["attention_mask"][:, :-1]
-            decoder_input_ids = torch.zeros((1, 1), dtype=torch.long, device=device)
-
-            outputs = model(
-                input_ids=inputs["input_ids"],
-                attention_mask=inputs["attention_mask"],
-                decoder_input_ids=decoder_input_ids,
-            )
-
-            raw_score = outputs.logits[:, 0, METRICX_TOKEN_ID].item()
-            raw_score = max(0.0, min(25.0, raw_score))
-            scores.append(raw_score)
+            if expected_quality == 'good':
+                status = "✓ Correct" if normalized_score >= 0.7 else "✗ Missed"
+            else:  # expected_quality == 'bad'
+                status = "✓ Correct" if normalized_score < 0.7 else "✗ Missed"
             
-            if verbose:
-                normalized_score = normalize_metricx(raw_score)
-                expected_quality = item.get('quality', 'unknown')
-                error_type = item.get('error_type') or 'none'
-                
-                if expected_quality == 'good':
-                    status = "✓ Correct" if normalized_score >= 0.7 else "✗ Missed"
-                else:  # expected_quality == 'bad'
-                    status = "✓ Correct" if normalized_score < 0.7 else "✗ Missed"
-                
-                print(f"  Score: {normalized_score:.4f}")
-                print(f"  Status: {status}")
-                print(f"  Error Type: {error_type}")
-                print(f"  Justification: Neural quality estimation score (no textual reasoning)")
-                print()
-
-    # Clear GPU memory
-    del model
-    del tokenizer
-    torch.cuda.empty_cache()
+            print(f"  Score: {normalized_score:.4f}")
+            print(f"  Status: {status}")
+            print(f"  Error Type: {error_type}")
+            print(f"  Justification: Neural quality estimation score (no textual reasoning)")
+            print()
+
+    # Free GPU memory for COMET-KIWI (the XXL model stays cached on CPU runs)
+    if resolve_device() == "cuda":
+        release_models()
     print("MetricX-24 evaluation completed.")
 
     return scores, justifications
 
 
-def run_cometkiwi(data: List[Dict[str, str]], verbose: bool = False) -> tuple[List[float], List[str]]:
+def run_cometkiwi(
+    data: List[Dict[str, str]],
+    verbose: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    num_threads: int | None = None,
+) -> tuple[List[float], List[str]]:
     """
     Evaluate translations using COMET-KIWI model.
     
     Args:
         data: List of dicts with 'src' and 'mt' keys
         verbose: Whether to show detailed processing output
+        batch_size: Segments per forward pass
+        num_threads: torch thread count for CPU runs
         
     Returns:
         Tuple of (COMET scores (0-1, higher = better), justifications)
@@ -166,17 +142,12 @@ def run_cometkiwi(data: List[Dict[str, str]], verbose: bool = False) -> tuple[Li
     print("Loading COMET-KIWI...")
     print(f"Model: {COMET_MODEL}")
     
-    model_path = download_model(COMET_MODEL)
-    model = load_from_checkpoint(model_path)
-
-    comet_data = [{"src": item["src"], "mt": item["mt"]} for item in data]
-    
     if verbose:
         print(f"Evaluating {len(data)} translations with COMET-KIWI...")
     else:
-        print(f"Evaluating {len(data)} translations with batch_size=8...")
+        print(f"Evaluating {len(data)} translations with batch_size={batch_size}...")
     
-    output = model.predict(comet_data, batch_size=8, gpus=1)
+    output = score_cometkiwi(data, batch_size=batch_size, num_threads=num_threads)
     scores = output.scores
     justifications = ["No reasoning provided (COMET-KIWI is a neural metric)"] * len(data)
     
@@ -204,74 +175,21 @@ def run_cometkiwi(data: List[Dict[str, str]], verbose: bool = False) -> tuple[Li
     return scores, justifications
 
 
-def run_claude_judge(data: List[Dict[str, str]], model_id: str, model_name: str, verbose: bool = False) -> tuple[List[float], List[str]]:
-    """
-    Evaluate translations using Claude LLM as Judge via Amazon Bedrock.
-    Uses shared utilities for consistent behavior across all Claude evaluations.
-    
-    Args:
-        data: List of dicts with 'src' and 'mt' keys
-        model_id: Bedrock model ID for Claude
-        model_name: Human-readable model name for logging
-        verbose: Whether to show detailed processing output
-        
-    Returns:
-        Tuple of (scores (0-1, higher = better), justifications)
-    """
-    print(f"Loading {model_name} via Bedrock...")
-    print(f"Model ID: {model_id}")
-    
-    try:
-        bedrock_client = create_bedrock_client("us-west-2")
-        print("Bedrock client initialized successfully.")
-    except Exception as e:
-        neutral_scores = [0.5] * len(data)
-        error_justifications = [f"API Error: {str(e)}"] * len(data)
-        return neutral_scores, error_justifications
-
-    scores = []
-    justifications = []
-    
-    if verbose:
-        print(f"Evaluating {len(data)} translations with {model_name}...")
-    
-    for i, item in enumerate(data):
-        if verbose:
-            print(f"Processing {i+1}/{len(data)}:")
-            print(f"  Source (Korean): {item['src']}")
-            print(f"  Translation (English): {item['mt']}")
-        
-        # Use shared evaluation function for consistency
-        score, justification = evaluate_single_claude(bedrock_client, model_id, item['src'], item['mt'])
-        scores.append(score)
-        justifications.append(justification)
-        
-        if verbose:
-            expected_quality = item.get('quality', 'unknown')
-            error_type = item.get('error_type') or 'none'
-            
-            if expected_quality == 'good':
-                status = "✓ Correct" if score >= 0.7 else "✗ Missed"
-            else:  # expected_quality == 'bad'
-                status = "✓ Correct" if score < 0.7 else "✗ Missed"
-            
-            print(f"  Score: {score:.4f}")
-            print(f"  Status: {status}")
-            print(f"  Error Type: {error_type}")
-            print(f"  Justification: {justification}")
-            print()
-        else:
-            print(f"Evaluating {i+1}/{len(data)} with {model_name}: Score {score:.4f}")
-    
-    print(f"{model_name} evaluation completed.")
-    return scores, justifications
-
-
 def main():
     """
     Main evaluation function that runs all five translation quality assessment methods
     and provides comprehensive comparison results.
     """
+    parser = argparse.ArgumentParser(description="Compare five translation evaluation methods")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="MetricX/COMET batch size")
+    parser.add_argument("--threads", type=int, default=None, help="torch thread count for CPU runs")
+    parser.add_argument("--int8", action="store_true", help="int8 dynamic-quantized MetricX (CPU only)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="Concurrent Bedrock requests (all Claude models)")
+    parser.add_argument("--rps", type=float, default=DEFAULT_REQUESTS_PER_SECOND, help="Requests per second per Claude model")
+    parser.add_argument("--results", default=None, help="JSONL file for incremental Claude results (resumes an interrupted run)")
+    parser.add_argument("--no-cache", action="store_true", help="Do not use the SQLite judge cache")
+    args = parser.parse_args()
+
     check_hf_login()
 
     print("=" * 120)
@@ -283,22 +201,39 @@ def main():
 
     data = get_quality_test_data()
 
-    # Run all five methods (without verbose output for comparison mode)
-    print("\n1. Running MetricX-24...")
-    metricx_raw, metricx_justifications = run_metricx(data, verbose=False)
-    metricx_norm = [normalize_metricx(s) for s in metricx_raw]
-    
-    print("\n2. Running COMET-KIWI...")
-    comet_scores, comet_justifications = run_cometkiwi(data, verbose=False)
-    
-    print("\n3. Running Claude Sonnet 4.5...")
-    sonnet_scores, sonnet_justifications = run_claude_judge(data, CLAUDE_SONNET_MODEL_ID, "Claude Sonnet 4.5", verbose=False)
-    
-    print("\n4. Running Claude Haiku 4.5...")
-    haiku_scores, haiku_justifications = run_claude_judge(data, CLAUDE_HAIKU_MODEL_ID, "Claude Haiku 4.5", verbose=False)
-    
-    print("\n5. Running Claude Opus 4.5...")
-    opus_scores, opus_justifications = run_claude_judge(data, CLAUDE_OPUS_MODEL_ID, "Claude Opus 4.5", verbose=False)
+    # Run all five methods (without verbose output for comparison mode).
+    # The three Claude judges only wait on Bedrock, so they run in the background while the neural metrics score.
+    claude_models = [
+        (CLAUDE_SONNET_MODEL_ID, "Claude Sonnet 4.5"),
+        (CLAUDE_HAIKU_MODEL_ID, "Claude Haiku 4.5"),
+        (CLAUDE_OPUS_MODEL_ID, "Claude Opus 4.5"),
+    ]
+    print("\n3-5. Starting Claude Sonnet 4.5 | Haiku 4.5 | Opus 4.5 in the background...")
+    with ThreadPoolExecutor(max_workers=1) as background:
+        claude_future = background.submit(
+            run_judges, data, claude_models,
+            max_workers=args.workers,
+            requests_per_second=args.rps,
+            results_path=args.results,
+            use_cache=not args.no_cache,
+        )
+
+        print("\n1. Running MetricX-24...")
+        metricx_raw, metricx_justifications = run_metricx(
+            data, verbose=False, batch_size=args.batch_size, num_threads=args.threads, quantize=args.int8
+        )
+        metricx_norm = [normalize_metricx(s) for s in metricx_raw]
+        
+        print("\n2. Running COMET-KIWI...")
+        comet_scores, comet_justifications = run_cometkiwi(
+            data, verbose=False, batch_size=args.batch_size, num_threads=args.threads
+        )
+
+        claude_results = claude_future.result()
+
+    sonnet_scores, sonnet_justifications = claude_results[CLAUDE_SONNET_MODEL_ID]
+    haiku_scores, haiku_justifications = claude_results[CLAUDE_HAIKU_MODEL_ID]
+    opus_scores, opus_justifications = claude_results[CLAUDE_OPUS_MODEL_ID]
 
     # Show detailed results for each model
     print("\n" + "=" * 120)
@@ -6,32 +6,35 @@ Run:
     uv run eval_cometkiwi.py
 """
 
-from comet import download_model, load_from_checkpoint
+import argparse
 
+from neural_metrics import DEFAULT_BATCH_SIZE, score_cometkiwi
 from util import check_hf_login, get_quality_test_data, print_detailed_results
 
-MODEL_NAME = "Unbabel/wmt22-cometkiwi-da"
 
-
-def evaluate(data: list[dict], verbose: bool = True) -> tuple[list[float], float, list[str]]:
+def evaluate(
+    data: list[dict],
+    verbose: bool = True,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    num_threads: int | None = None,
+) -> tuple[list[float], float, list[str]]:
     """
     Evaluate translations using COMET-KIWI (reference-free).
 
     Args:
         data: List of dicts with 'src' and 'mt' keys
         verbose: Whether to show processing output
+        batch_size: Segments per forward pass
+        num_threads: torch thread count for CPU runs
 
     Returns:
         Tuple of (scores list, system score, justifications list)
         Scores range 0-1 (higher = better)
     """
-    model_path = download_model(MODEL_NAME)
-    model = load_from_checkpoint(model_path)
-    
     if verbose:
-        print(f"Evaluating {len(data)} translations with COMET-KIWI...")
+        print(f"Evaluating {len(data)} translations with COMET-KIWI (batch_size={batch_size})...")
     
-    output = model.predict(data, batch_size=8, gpus=1)
+    output = score_cometkiwi(data, batch_size=batch_size, num_threads=num_threads)
     scores = output.scores
     system_score = output.system_score
     
@@ -63,6 +66,11 @@ def evaluate(data: list[dict], verbose: bool = True) -> tuple[list[float], float
 
 
 def main():
+    parser = argparse.ArgumentParser(description="COMET-KIWI evaluation")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--threads", type=int, default=None, help="torch thread count for CPU runs")
+    args = parser.parse_args()
+
     check_hf_login()
 
     print("=" * 80)
@@ -71,7 +79,7 @@ def main():
     print("=" * 80)
 
     data = get_quality_test_data()
-    scores, system_score, justifications = evaluate(data)
+    scores, system_score, justifications = evaluate(data, batch_size=args.batch_size, num_threads=args.threads)
 
     # Display detailed results with all requested information
     print_detailed_results(data, scores, justifications, "COMET-KIWI")
@@ -29,12 +29,12 @@ import json
 import sys
 from typing import Tuple
 
+from judge_runner import DEFAULT_MAX_WORKERS, DEFAULT_REQUESTS_PER_SECOND, run_judge
 from util import (
     check_hf_login, 
     get_quality_test_data, 
     print_detailed_results,
-    create_bedrock_client,
-    evaluate_single_claude
+    create_bedrock_client
 )
 
 # Model configurations
@@ -62,7 +62,16 @@ REGION_NAME = "us-west-2"
 # All Claude evaluation functionality has been moved to util.py for reuse
 
 
-def evaluate(data: list[dict], model_id: str, model_name: str, verbose: bool = True) -> Tuple[list[float], float, list[str]]:
+def evaluate(
+    data: list[dict],
+    model_id: str,
+    model_name: str,
+    verbose: bool = True,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+    results_path: str | None = None,
+    use_cache: bool = True,
+) -> Tuple[list[float], float, list[str]]:
     """
     Evaluate translations using Claude 4.5 family as LLM judge.
     
@@ -71,6 +80,10 @@ def evaluate(data: list[dict], model_id: str, model_name: str, verbose: bool = T
         model_id: Bedrock model ID for Claude
         model_name: Human-readable model name for display
         verbose: Whether to print progress and justifications
+        max_workers: Concurrent Bedrock requests
+        requests_per_second: Rate limit for the model
+        results_path: JSONL file for incremental results / resume (optional)
+        use_cache: Reuse judgments of identical (model, src, mt) pairs from the SQLite cache
         
     Returns:
         Tuple of (scores list, system score, justifications list)
@@ -78,30 +91,31 @@ def evaluate(data: list[dict], model_id: str, model_name: str, verbose: bool = T
     """
     # Initialize Bedrock client using shared utility
     try:
-        bedrock_client = create_bedrock_client(REGION_NAME)
+        bedrock_client = create_bedrock_client(REGION_NAME, max_pool_connections=max_workers)
         if verbose:
             print(f"Bedrock client initialized for region: {REGION_NAME}")
     except Exception as e:
         # Return neutral scores on error
         return [0.5] * len(data), 0.5, ["Error: Failed to initialize client"] * len(data)
 
-    scores = []
-    justifications = []
-    
     if verbose:
-        print(f"Evaluating {len(data)} translations with {model_name}...")
+        print(f"Evaluating {len(data)} translations with {model_name} ({max_workers} workers)...")
+    
+    scores, justifications = run_judge(
+        data, model_id, model_name,
+        bedrock_client=bedrock_client,
+        max_workers=max_workers,
+        requests_per_second=requests_per_second,
+        results_path=results_path,
+        use_cache=use_cache,
+    )
     
-    for i, item in enumerate(data):
+    for i, (item, score, justification) in enumerate(zip(data, scores, justifications)):
         if verbose:
             print(f"Processing {i+1}/{len(data)}:")
             print(f"  Source (Korean): {item['src']}")
             print(f"  Translation (English): {item['mt']}")
-        
-        score, justification = evaluate_single_claude(bedrock_client, model_id, item['src'], item['mt'])
-        scores.append(score)
-        justifications.append(justification)
-        
-        if verbose:
+            
             # Determine status and get error type
             expected_quality = item.get('quality', 'unknown')
             error_type = item.get('error_type') or 'none'
@@ -147,6 +161,10 @@ Examples:
         default='sonnet4.5',
         help='Claude model to use for evaluation (default: sonnet4.5)'
     )
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS, help='Concurrent Bedrock requests')
+    parser.add_argument('--rps', type=float, default=DEFAULT_REQUESTS_PER_SECOND, help='Requests per second per model')
+    parser.add_argument('--results', default=None, help='JSONL file for incremental results (resumes an interrupted run)')
+    parser.add_argument('--no-cache', action='store_true', help='Do not use the SQLite judge cache')
     
     return parser.parse_args()
 
@@ -171,7 +189,13 @@ def main():
 
     # Use quality test data instead of sample data
     data = get_quality_test_data()
-    scores, system_score, justifications = evaluate(data, model_id, model_name)
+    scores, system_score, justifications = evaluate(
+        data, model_id, model_name,
+        max_workers=args.workers,
+        requests_per_second=args.rps,
+        results_path=args.results,
+        use_cache=not args.no_cache,
+    )
 
     # Display detailed results with all requested information
     print_detailed_results(data, scores, justifications, f"{model_name} (LLM Judge)")
@@ -0,0 +1,255 @@
+"""
+Concurrent LLM-as-judge runner shared by the evaluation scripts
+
+- (model, item) pairs are scored concurrently by a thread pool (boto3 clients are thread-safe)
+- Per-model token-bucket rate limiter (requests/s, every attempt including retries), so several
+  models can run at once without one of them hitting Bedrock throttling
+- Persistent SQLite cache keyed by (model_id, sha256(prompt)): reruns do not rescore identical
+  (model, src, mt) pairs. API and parse failures (neutral 0.5 fallback) are never cached.
+- Optional JSONL results file written incrementally; an interrupted run resumes from it
+
+Usage:
+    from judge_runner import run_judge, run_judges
+
+    scores, justifications = run_judge(data, model_id, model_name, max_workers=8)
+    results = run_judges(data, [(sonnet_id, "Sonnet"), (haiku_id, "Haiku")], results_path="results.jsonl")
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+from util import call_claude_with_retry, create_bedrock_client, create_claude_evaluation_prompt
+
+REGION_NAME = "us-west-2"
+DEFAULT_MAX_WORKERS = int(os.getenv("JUDGE_MAX_WORKERS", "8"))
+DEFAULT_REQUESTS_PER_SECOND = float(os.getenv("JUDGE_RPS", "4"))
+DEFAULT_CACHE_PATH = os.getenv(
+    "JUDGE_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "judge_cache.sqlite"),
+)
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+class RateLimiter:
+    """Thread-safe token bucket: at most `rate` requests/s with bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(model_id: str, rate: float = DEFAULT_REQUESTS_PER_SECOND) -> RateLimiter:
+    """One limiter per model id, shared by every runner in the process."""
+    with _rate_limiters_lock:
+        if model_id not in _rate_limiters:
+            _rate_limiters[model_id] = RateLimiter(rate)
+        return _rate_limiters[model_id]
+
+
+class JudgeCache:
+    """SQLite cache of (model_id, prompt hash) -> (score, justification)."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS judgments ("
+            " model_id TEXT NOT NULL, prompt_hash TEXT NOT NULL,"
+            " score REAL NOT NULL, justification TEXT, created_at REAL NOT NULL,"
+            " PRIMARY KEY (model_id, prompt_hash))"
+        )
+        self.conn.commit()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model_id: str, key: str) -> Optional[Tuple[float, Optional[str]]]:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT score, justification FROM judgments WHERE model_id = ? AND prompt_hash = ?",
+                (model_id, key),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0], row[1]
+
+    def put(self, model_id: str, key: str, score: float, justification: Optional[str]):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO judgments VALUES (?, ?, ?, ?, ?)",
+                (model_id, key, score, justification, time.time()),
+            )
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def is_fallback_score(justification: Optional[str]) -> bool:
+    """Neutral 0.5 fallbacks: "API Error after N attempts" (call_claude_with_retry) and
+    "Parse error (...)" (parse_claude_response could not find a score)."""
+    return bool(justification) and justification.startswith(("API Error", "Parse error"))
+
+
+def load_results(results_path: Optional[str]) -> Dict[Tuple[str, int, str], dict]:
+    """Completed records of a previous (possibly interrupted) run, keyed by (model_id, index, prompt hash)."""
+    done = {}
+    if not results_path or not os.path.exists(results_path):
+        return done
+    with open(results_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # partially written last line of an interrupted run
+            done[(record["model_id"], record["index"], record["prompt_hash"])] = record
+    return done
+
+
+def run_judges(
+    data: List[dict],
+    models: List[Tuple[str, str]],
+    bedrock_client=None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+    results_path: Optional[str] = None,
+    use_cache: bool = True,
+    verbose: bool = False,
+) -> Dict[str, Tuple[List[float], List[Optional[str]]]]:
+    """
+    Score every (model, item) pair concurrently.
+
+    Args:
+        data: List of dicts with 'src' and 'mt' keys
+        models: List of (model_id, model_name)
+        bedrock_client: Boto3 Bedrock runtime client (created when None)
+        max_workers: Concurrent requests across all models
+        requests_per_second: Rate limit per model
+        results_path: JSONL file for incremental results / resume (optional)
+        use_cache: Use the persistent SQLite judge cache
+        verbose: Print source/translation/justification per item
+
+    Returns:
+        {model_id: (scores, justifications)} in the order of data
+    """
+    if bedrock_client is None:
+        try:
+            bedrock_client = create_bedrock_client(REGION_NAME, max_pool_connections=max_workers)
+        except Exception as e:
+            # Neutral scores on error, like the single-model evaluators
+            return {model_id: ([0.5] * len(data), [f"API Error: {str(e)}"] * len(data)) for model_id, _ in models}
+    cache = JudgeCache() if use_cache else None
+    done = load_results(results_path)
+    results = {model_id: ([None] * len(data), [None] * len(data)) for model_id, _ in models}
+    names = dict(models)
+
+    prompts = [create_claude_evaluation_prompt(item["src"], item["mt"]) for item in data]
+    keys = [prompt_hash(prompt) for prompt in prompts]
+
+    # Interleave models so the workers are not all queued on one model's rate limiter
+    tasks = []
+    for i, key in enumerate(keys):
+        for model_id, _ in models:
+            record = done.get((model_id, i, key))
+            if record is not None:
+                results[model_id][0][i] = record["score"]
+                results[model_id][1][i] = record["justification"]
+            else:
+                tasks.append((model_id, i))
+    if done:
+        print(f"Resuming from {results_path}: {len(models) * len(data) - len(tasks)} already scored")
+
+    write_lock = threading.Lock()
+    results_file = open(results_path, "a", encoding="utf-8") if results_path else None
+
+    def judge(model_id: str, i: int):
+        key = keys[i]
+        cached = cache.get(model_id, key) if cache else None
+        if cached is not None:
+            score, justification = cached
+        else:
+            score, justification = call_claude_with_retry(
+                bedrock_client, model_id, prompts[i],
+                before_attempt=get_rate_limiter(model_id, requests_per_second).acquire,
+            )
+            if cache and not is_fallback_score(justification):
+                cache.put(model_id, key, score, justification)
+        return model_id, i, score, justification, cached is not None
+
+    completed = 0
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(judge, model_id, i) for model_id, i in tasks]
+            for future in as_completed(futures):
+                model_id, i, score, justification, from_cache = future.result()
+                results[model_id][0][i] = score
+                results[model_id][1][i] = justification
+                completed += 1
+
+                if results_file and not is_fallback_score(justification):
+                    with write_lock:
+                        results_file.write(json.dumps({
+                            "model_id": model_id, "index": i, "prompt_hash": keys[i],
+                            "score": score, "justification": justification,
+                        }, ensure_ascii=False) + "\n")
+                        results_file.flush()
+
+                item = data[i]
+                if verbose:
+                    print(f"[{names[model_id]}] Processing {i+1}/{len(data)}:")
+                    print(f"  Source (Korean): {item['src']}")
+                    print(f"  Translation (English): {item['mt']}")
+                    print(f"  Score: {score:.4f}{' (cached)' if from_cache else ''}")
+                    print(f"  Justification: {justification}")
+                    print()
+                else:
+                    print(f"Evaluated {completed}/{len(tasks)} ({names[model_id]}, item {i+1}): "
+                          f"Score {score:.4f}{' (cached)' if from_cache else ''}")
+    finally:
+        if results_file:
+            results_file.close()
+        if cache:
+            print(f"Judge cache: {cache.hits} hits, {cache.misses} misses ({cache.path})")
+            cache.close()
+
+    return results
+
+
+def run_judge(data: List[dict], model_id: str, model_name: str, **kwargs) -> Tuple[List[float], List[Optional[str]]]:
+    """Single-model run_judges. Returns (scores, justifications) in the order of data."""
+    return run_judges(data, [(model_id, model_name)], **kwargs)[model_id]
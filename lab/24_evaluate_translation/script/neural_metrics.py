@@ -0,0 +1,214 @@
+"""
+Batched MetricX-24 / COMET-KIWI scoring shared by the evaluation scripts
+
+- Process-wide model cache: each (model, device, precision) is loaded once per process
+- MetricX: length-sorted batches with dynamic padding (pad to the longest input in the batch)
+- CPU runs: configurable batch size and torch thread count, optional int8 dynamic quantization
+  (torch.ao.quantization.quantize_dynamic on the nn.Linear layers)
+
+Usage:
+    from neural_metrics import score_metricx, score_cometkiwi
+
+    raw_scores = score_metricx(data, batch_size=16, num_threads=8, quantize=True)
+    comet_scores = score_cometkiwi(data, batch_size=32, num_threads=8)
+"""
+
+import os
+from typing import Dict, List, Optional
+
+import torch
+
+# MetricX settings
+METRICX_MODEL = "google/metricx-24-hybrid-xxl-v2p6"
+METRICX_TOKENIZER = "google/mt5-xxl"
+METRICX_MAX_INPUT_LENGTH = 1536
+METRICX_TOKEN_ID = 250089  # <extra_id_10> token
+
+# COMET settings
+COMET_MODEL = "Unbabel/wmt22-cometkiwi-da"
+
+DEFAULT_BATCH_SIZE = int(os.getenv("EVAL_BATCH_SIZE", "16"))
+
+_models: Dict[tuple, object] = {}
+
+
+def resolve_device(device: Optional[str] = None) -> str:
+    """'cuda' when a GPU is available, otherwise 'cpu' (override with device or EVAL_DEVICE)."""
+    device = device or os.getenv("EVAL_DEVICE")
+    if device:
+        return device
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def set_cpu_threads(num_threads: Optional[int] = None):
+    """Set the torch intra-op thread count for CPU runs (default: EVAL_NUM_THREADS or torch default)."""
+    num_threads = num_threads or int(os.getenv("EVAL_NUM_THREADS", "0"))
+    if num_threads > 0:
+        torch.set_num_threads(num_threads)
+    return torch.get_num_threads()
+
+
+def make_metricx_input(source: str, hypothesis: str, reference: str = "") -> str:
+    """
+    Create input string for MetricX model.
+
+    For QE mode (reference-free), pass empty reference.
+    """
+    if reference:
+        return f"source: {source} candidate: {hypothesis} reference: {reference}"
+    else:
+        return f"source: {source} candidate: {hypothesis}"
+
+
+def load_metricx(
+    model_name: str = METRICX_MODEL,
+    tokenizer_name: str = METRICX_TOKENIZER,
+    device: Optional[str] = None,
+    quantize: bool = False,
+):
+    """
+    Load (or reuse) the MetricX tokenizer and model.
+
+    GPU: float16 with device_map="auto" (multi-GPU), as before.
+    CPU: float32, optionally int8 dynamic-quantized.
+
+    Returns:
+        Tuple of (tokenizer, model, device)
+    """
+    from transformers import AutoTokenizer, MT5ForConditionalGeneration
+
+    device = resolve_device(device)
+    quantize = quantize and device == "cpu"  # dynamic quantization is a CPU-only path
+    key = ("metricx", model_name, tokenizer_name, device, quantize)
+    if key not in _models:
+        print(f"Loading tokenizer: {tokenizer_name}")
+        tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
+
+        print(f"Loading model: {model_name} (device={device}, int8={quantize})")
+        if device == "cpu":
+            model = MT5ForConditionalGeneration.from_pretrained(model_name, torch_dtype=torch.float32)
+            if quantize:
+                model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        else:
+            model = MT5ForConditionalGeneration.from_pretrained(
+                model_name,
+                torch_dtype=torch.float16,
+                device_map="auto"  # Automatically distribute across GPUs
+            )
+        model.eval()
+        _models[key] = (tokenizer, model)
+
+    tokenizer, model = _models[key]
+    return tokenizer, model, device
+
+
+def score_metricx(
+    data: List[Dict[str, str]],
+    use_reference: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    num_threads: Optional[int] = None,
+    quantize: bool = False,
+    device: Optional[str] = None,
+    model_name: str = METRICX_MODEL,
+    tokenizer_name: str = METRICX_TOKENIZER,
+    tokenizer=None,
+    model=None,
+) -> List[float]:
+    """
+    Score translations with MetricX-24 in length-sorted, dynamically padded batches.
+
+    Args:
+        data: List of dicts with 'src' and 'mt' keys (and 'ref' when use_reference)
+        use_reference: If True, use reference-based evaluation
+        batch_size: Number of segments per forward pass
+        num_threads: torch thread count for CPU runs
+        quantize: Use the int8 dynamic-quantized model (CPU only)
+        device: 'cpu' / 'cuda' (default: auto)
+        tokenizer, model: Already loaded tokenizer/model (skips load_metricx)
+
+    Returns:
+        Raw MetricX scores in the order of data (0-25, lower = better)
+    """
+    if model is None or tokenizer is None:
+        tokenizer, model, device = load_metricx(model_name, tokenizer_name, device, quantize)
+    set_cpu_threads(num_threads)
+
+    texts = [
+        make_metricx_input(item["src"], item["mt"], item.get("ref", "") if use_reference else "")
+        for item in data
+    ]
+    encoded = tokenizer(texts, max_length=METRICX_MAX_INPUT_LENGTH, truncation=True)
+    # Remove EOS token per segment as per MetricX implementation (before padding)
+    features = [
+        {"input_ids": ids[:-1], "attention_mask": mask[:-1]}
+        for ids, mask in zip(encoded["input_ids"], encoded["attention_mask"])
+    ]
+
+    # Longest first, so similar lengths share a batch and the first batch shows peak memory
+    order = sorted(range(len(features)), key=lambda i: len(features[i]["input_ids"]), reverse=True)
+    model_device = next(model.parameters()).device
+    scores = [0.0] * len(features)
+
+    with torch.inference_mode():
+        for start in range(0, len(order), batch_size):
+            batch_index = order[start:start + batch_size]
+            batch = tokenizer.pad([features[i] for i in batch_index], padding="longest", return_tensors="pt")
+            batch = {k: v.to(model_device) for k, v in batch.items()}
+
+            # Create decoder input (single token: 0)
+            decoder_input_ids = torch.zeros((len(batch_index), 1), dtype=torch.long, device=model_device)
+
+            outputs = model(
+                input_ids=batch["input_ids"],
+                attention_mask=batch["attention_mask"],
+                decoder_input_ids=decoder_input_ids,
+            )
+
+            # Extract score from logits at <extra_id_10> position, clamp to valid range [0, 25]
+            batch_scores = outputs.logits[:, 0, METRICX_TOKEN_ID].float().clamp(0.0, 25.0).tolist()
+            for i, score in zip(batch_index, batch_scores):
+                scores[i] = score
+
+    return scores
+
+
+def load_cometkiwi(model_name: str = COMET_MODEL):
+    """Load (or reuse) the COMET-KIWI model."""
+    from comet import download_model, load_from_checkpoint
+
+    key = ("comet", model_name)
+    if key not in _models:
+        model_path = download_model(model_name)
+        _models[key] = load_from_checkpoint(model_path)
+    return _models[key]
+
+
+def score_cometkiwi(
+    data: List[Dict[str, str]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    num_threads: Optional[int] = None,
+    device: Optional[str] = None,
+    model_name: str = COMET_MODEL,
+):
+    """
+    Score translations with COMET-KIWI (reference-free).
+
+    COMET already sorts by length inside predict (length_batching); this adds the cached model,
+    CPU thread count and gpus=0 on CPU-only hosts.
+
+    Returns:
+        COMET Prediction (scores 0-1, higher = better, and system_score)
+    """
+    model = load_cometkiwi(model_name)
+    set_cpu_threads(num_threads)
+    gpus = 1 if resolve_device(device) == "cuda" else 0
+
+    comet_data = [{"src": item["src"], "mt": item["mt"]} for item in data]
+    return model.predict(comet_data, batch_size=batch_size, gpus=gpus, progress_bar=False)
+
+
+def release_models():
+    """Drop cached models (e.g. before loading another large model on the same GPU)."""
+    _models.clear()
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
@@ -3,11 +3,12 @@ Common utilities for translation evaluation
 """
 
 import boto3
+from botocore.config import Config
 import json
 import os
 import sys
 import time
-from typing import Tuple, Optional
+from typing import Callable, Tuple, Optional
 
 from huggingface_hub import HfFolder
 
@@ -48,12 +49,13 @@ def get_quality_test_data() -> list[dict]:
         sys.exit(1)
 
 
-def create_bedrock_client(region_name: str = "us-west-2"):
+def create_bedrock_client(region_name: str = "us-west-2", max_pool_connections: int = 10):
     """
     Create and return a configured Bedrock runtime client.
     
     Args:
         region_name: AWS region for Bedrock service
+        max_pool_connections: HTTP connection pool size (raise for concurrent requests)
         
     Returns:
         Boto3 Bedrock runtime client
@@ -62,7 +64,11 @@ def create_bedrock_client(region_name: str = "us-west-2"):
         Exception: If client initialization fails
     """
     try:
-        client = boto3.client(service_name="bedrock-runtime", region_name=region_name)
+        client = boto3.client(
+            service_name="bedrock-runtime",
+            region_name=region_name,
+            config=Config(max_pool_connections=max_pool_connections),
+        )
         return client
     except Exception as e:
         print(f"Error initializing Bedrock client: {e}")
@@ -179,7 +185,8 @@ def parse_claude_response(response_text: str) -> Tuple[float, Optional[str]]:
         return 0.5, f"Parse error ({e}): {response_text[:50]}..."
 
 
-def call_claude_with_retry(bedrock_client, model_id: str, prompt: str, max_retries: int = 3, debug: bool = False) -> Tuple[float, Optional[str]]:
+def call_claude_with_retry(bedrock_client, model_id: str, prompt: str, max_retries: int = 3, debug: bool = False,
+                           before_attempt: Optional[Callable[[], None]] = None) -> Tuple[float, Optional[str]]:
     """
     Call Claude via Bedrock with retry logic and exponential backoff.
     
@@ -189,6 +196,7 @@ def call_claude_with_retry(bedrock_client, model_id: str, prompt: str, max_retri
         prompt: Evaluation prompt
         max_retries: Maximum retry attempts
         debug: Whether to print debug information
+        before_attempt: Called before every attempt, retries included (e.g. a rate limiter's acquire)
         
     Returns:
         Tuple of (score from 0.0 to 1.0, justification text or None)
@@ -199,6 +207,8 @@ def call_claude_with_retry(bedrock_client, model_id: str, prompt: str, max_retri
     }]
 
     for attempt in range(max_retries):
+        if before_attempt:
+            before_attempt()
         try:
             if debug:
                 print(f"  Debug: Calling Bedrock API with model {model_id}")